@@ -0,0 +1,7 @@
+# src/__main__.py
+# Ermöglicht `python -m src <befehl> ...` (siehe src/cli.py)
+
+from src.cli import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# src/cli.py
+"""
+Zentraler Einstiegspunkt für alle Pipeline-Schritte.
+
+    python -m src <befehl> [optionen des Moduls]
+    python -m src --help
+
+Der Dispatcher kennt die Module nur als Strings und importiert ausschließlich
+das gewählte Modul (importlib). So bleiben z. B. `validate-config`, `registry`
+oder `dataset-spec` frei von torch/lightning/pandas-Importen.
+Die Optionen nach dem Befehl werden unverändert an `main()` des Moduls gereicht.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from typing import Dict, List, Tuple
+
+# Befehl -> (Modul mit main(), Kurzbeschreibung) – Reihenfolge wie in PipelineOrder.md
+COMMANDS: Dict[str, Tuple[str, str]] = {
+    # data
+    "view-data": ("src.data.view_data", "Rohdaten sichten (Shape, Spalten, Head)"),
+    "align": ("src.data.data_alignment", "Schritt 1: Zeitreihen auf 2020-Niveau angleichen"),
+    "clean": ("src.data.data_cleaning", "Schritt 2: Ausreißer/Lockdown bereinigen"),
+    "features": ("src.data.feature_engineering", "Schritt 3A: Kalender-Features, time_idx, Feiertage"),
+    "holidays": ("src.data.holiday_calendar", "Feiertagskalender je Land bauen/cachen"),
+    "cyclical": ("src.data.cyclical_encoder", "Schritt 3B: zyklische Sin/Cos-Kodierung"),
+    "lags": ("src.data.lag_features", "Schritt 3C: Lag- und Rolling-Features"),
+    "data-pipeline": ("src.data.pipeline", "Schritte 1–4 in einem Lauf (--engine pandas|duckdb)"),
+    "dag": ("src.utils.dag_scheduler", "Pipeline als DAG: unabhängige Schritte parallel, aktuelle überspringen"),
+    "engine-parity": ("src.data.engine_parity", "pandas-Pfad und DuckDB-Engine auf Gleichheit prüfen"),
+    "feature-store": ("src.data.feature_store", "Feature-Store: materialisieren, Point-in-Time-Lookup, Parität prüfen"),
+    "rollups": ("src.data.rollups", "Rollups (raw/aligned/cleaned) für die Diagnose-Plots neu erzeugen"),
+    # modeling
+    "model-dataset": ("src.modeling.model_dataset", "Schritt 4: Train/Val/Test-Split + meta.json"),
+    "subsample-dataset": ("src.modeling.subsample", "Schritt 4 auf geschichteter Reihen-Teilmenge (schnelle Experimente)"),
+    "validate-data": ("src.modeling.validation", "Splits prüfen (Duplikate, Lücken, unbekannte Gruppen)"),
+    "dataset-spec": ("src.modeling.dataset_tft", "Schritt 5: dataset_spec.json erzeugen"),
+    "memory-plan": ("src.modeling.memory_planner", "Speicherbedarf Datensatz/Batch schätzen, Lade-Strategie"),
+    "train-tft": ("src.modeling.trainer_tft", "Schritt 6: TFT-Training nach YAML"),
+    "lr-find": ("src.modeling.lr_range_test", "Lernraten-Suchlauf (exponentiell) mit Empfehlung, gecachter Datensatz"),
+    "distill-report": ("src.modeling.distill_tft", "Schüler vs. Lehrer: Genauigkeit, Latenz, Durchsatz (CPU)"),
+    "benchmark-tft": ("src.modeling.benchmark_tft", "Benchmark bf16/compile/Determinismus gegen Referenz-Config"),
+    "tune-dataloader": ("src.modeling.tune_dataloader", "Dataloader-Einstellungen benchmarken und übernehmen"),
+    "train-baseline": ("src.modeling.trainer_baseline", "Statistische Baselines trainieren/bewerten"),
+    # evaluation
+    "evaluate": ("src.evaluation.evaluate_tft", "Bestes Checkpoint auf val/test bewerten"),
+    "reconcile": ("src.evaluation.reconciliation", "Prognosen über country/store/product kohärent machen"),
+    "forecast": ("src.evaluation.forecast", "Prognosen ab Cutoff, mit Prognose-Cache vor dem Modell"),
+    "subset-transfer": ("src.evaluation.subset_transfer", "Config-Rangliste Teilmenge vs. volles Panel vergleichen"),
+    "interpret": ("src.evaluation.interpret_tft", "Variablen-Wichtigkeiten und Attention je Zeitreihe"),
+    # utils
+    "load-model": ("src.utils.load_trained_tft", "Checkpoint über die Run-Registry laden"),
+    "registry": ("src.utils.run_registry", "Run-Registry abfragen (list/best/show/rebuild)"),
+    "validate-config": ("src.utils.config_loader", "YAML-Konfigurationen strikt prüfen"),
+    "forecast-cache": ("src.utils.forecast_cache", "Prognose-Cache: Kennzahlen, Purge, Invalidierung"),
+    "import-budget": ("src.utils.import_budget", "Importzeiten der CLI-Module prüfen"),
+    # visualization
+    "plot-view-data": ("src.visualization.view_data_plot", "Tagesverkäufe je Produkt/Store/Land"),
+    "plot-alignment": ("src.visualization.data_alignment_plot", "Angeglichene Verkaufszahlen plotten"),
+    "plot-cleaning": ("src.visualization.data_cleaning_plot_compare", "Bereinigte Verkaufszahlen plotten"),
+    "plot-cleaning-overview": ("src.visualization.data_cleaning_plot_overview", "Vorher/Nachher-Vergleich 2020"),
+    "plot-cleaning-diff": ("src.visualization.data_cleaning_plot_diff", "Differenz cleaned - aligned"),
+    "plot-report": ("src.visualization.report", "Alle Diagnose-Plots headless und parallel als PNG"),
+    "plot-loss": ("src.visualization.plot_learning_rate", "Train/Val-Loss eines Runs plotten"),
+}
+
+
+def _usage() -> str:
+    width = max(len(c) for c in COMMANDS)
+    lines = ["Aufruf: python -m src <befehl> [optionen]", "", "Befehle:"]
+    lines += [f"  {name:<{width}}  {desc}" for name, (_, desc) in COMMANDS.items()]
+    lines += ["", "Optionen eines Befehls: python -m src <befehl> --help"]
+    return "\n".join(lines)
+
+
+def main(argv: List[str] | None = None) -> None:
+    argv = list(sys.argv[1:] if argv is None else argv)
+
+    if not argv or argv[0] in ("-h", "--help"):
+        print(_usage())
+        return
+
+    cmd, rest = argv[0], argv[1:]
+    if cmd not in COMMANDS:
+        print(f"[cli] Unbekannter Befehl: {cmd}\n")
+        print(_usage())
+        sys.exit(2)
+
+    module_name, _ = COMMANDS[cmd]
+    # argparse der Module liest sys.argv -> Programmname und Restargumente umsetzen
+    sys.argv = [f"python -m src {cmd}", *rest]
+    importlib.import_module(module_name).main()
@@ -13,6 +13,73 @@ DATA_DIR = BASE_DIR / "data"
 RAW_DIR = DATA_DIR / "raw"
 INTERIM_DIR = DATA_DIR / "interim"
 PROCESSED_DIR = DATA_DIR / "processed"
+RESULTS_DIR = BASE_DIR / "results"
+
+# Lokale Run-Registry (SQLite-Index über alle Trainingsläufe)
+RUN_REGISTRY_PATH = RESULTS_DIR / "run_registry.sqlite"
+
+# Prognose-Cache vor der Inferenz (SQLite, Schlüssel: Checkpoint, dataset_spec, Reihe, Cutoff)
+FORECAST_CACHE: dict = {
+    "path": RESULTS_DIR / "forecast_cache.sqlite",
+    "ttl_hours": 168,                # Einträge älter als 7 Tage gelten als Miss
+    "max_mb": 512,                   # darüber werden die am längsten ungenutzten Einträge verdrängt
+}
+
+# Lokaler DAG-Scheduler (src/utils/dag_scheduler.py): Zustand, Logs, Zeitbericht, Kapazität
+DAG_CONF: dict = {
+    "state_path": RESULTS_DIR / "dag" / "state.json",
+    "log_dir": RESULTS_DIR / "dag" / "logs",
+    "report_path": RESULTS_DIR / "dag" / "last_run.json",
+    "workers": 0,                    # 0 = Anzahl CPU-Kerne
+    "memory_gb": 8,                  # Summe der Speicher-Hinweise gleichzeitig laufender Tasks
+}
+
+# Geschichtete Reihen-Teilmenge für schnelle Experimente (src/modeling/subsample.py)
+SUBSAMPLE: dict = {
+    "fraction": None,                # None = volles Panel; z. B. 0.25 = ein Viertel der Reihen
+    "seed": 42,
+    "bins": 3,                       # Quantil-Klassen je Kennzahl (Volumen, Volatilität, Historie)
+}
+
+# Speicherplanung für den TFT-Datensatz (src/modeling/memory_planner.py)
+MEMORY_PLANNER: dict = {
+    "budget_gb": 0,                  # 0 = budget_fraction × verfügbarer Speicher
+    "budget_fraction": 0.7,
+    "chunk_rows": 262_144,           # Zeilen je Lesevorgang im chunked-Pfad
+}
+
+# Lernraten-Suchlauf (src/modeling/lr_range_test.py)
+LR_RANGE_TEST: dict = {
+    "out_dir": RESULTS_DIR / "lr_find",
+    "cache_dir": PROCESSED_DIR / "tsds_cache",   # gebaute TimeSeriesDataSet-Objekte je Dataset-Fingerprint
+    "min_lr": 1e-6,
+    "max_lr": 1.0,
+    "steps": 100,                    # Trainings-Batches des Suchlaufs (exponentiell steigende LR)
+    "divergence_factor": 4.0,        # Abbruch, wenn geglätteter Loss > Faktor × bisheriges Minimum
+    "skip_begin": 10,                # erste Punkte (Glättung läuft noch ein) nicht für die Empfehlung nutzen
+}
+
+# Feature-Store (src/data/feature_store.py): Offline-Partitionen je Monat, Online-Zustand je Reihe
+FEATURE_STORE: dict = {
+    "root": DATA_DIR / "feature_store",
+    "source": INTERIM_DIR / "train_cleaned.parquet",   # Basisdaten (ID_COLS, Datum, Ziel) für die Materialisierung
+    "max_future_days": 366,          # Online-Lookup höchstens so weit nach dem letzten Stand einer Reihe
+}
+
+# Voraggregierte Rollups für die Diagnose-Plots (raw/aligned/cleaned)
+ROLLUP_DIR = INTERIM_DIR / "rollups"
+
+# -----------------------------------------------------------------------------
+# Engine für die Datenstufen (align … lags + Split)
+#   "pandas": Einzelschritte eager im Speicher (Standard, schreibt alle Zwischenstände)
+#   "duckdb": ein lazy Query-Plan über die Rohdaten, mehrthreadig und out-of-core
+# -----------------------------------------------------------------------------
+DATA_ENGINE: str = "pandas"
+LAZY_ENGINE: dict = {
+    "threads": 0,                    # 0 = alle Kerne
+    "memory_limit": "4GB",           # darüber lagert DuckDB nach temp_dir aus
+    "temp_dir": INTERIM_DIR / "duckdb_tmp",
+}
 
 # -----------------------------------------------------------------------------
 # Spalten / Schema
@@ -49,6 +116,8 @@ SPLIT_RATIOS: tuple[float, float, float] = (0.80, 0.10, 0.10)
 
 # Optional: gruppenweise Skalierung (falls in der Pipeline genutzt)
 SCALE_COLS: list[str] = []
+SCALE_MODE: str = "standard"         # "standard" (Mittelwert/Std) | "robust" (Median/IQR)
+SCALE_LOG1P: bool = False            # log1p vor der Skalierung (schiefe Mengen-Spalten)
 
 
 # -----------------------------------------------------------------------------
@@ -62,11 +131,34 @@ LAG_CONF: dict = {
     "prefix": "lag_",                # muss zu dataset_tft.py passen
 }
 
+# -----------------------------------------------------------------------------
+# Feiertagskalender (holiday_calendar.py, genutzt von feature_engineering.py)
+# -----------------------------------------------------------------------------
+HOLIDAY_CONF: dict = {
+    # Wert der Spalte "country" -> ISO-Code für `holidays.country_holidays`
+    "countries": {
+        "Belgium": "BE",
+        "France": "FR",
+        "Germany": "DE",
+        "Italy": "IT",
+        "Poland": "PL",
+        "Spain": "ES",
+    },
+    "subdivisions": {},              # optional je Land, z. B. {"Germany": "NW"} -> inkl. regionaler Feiertage
+    "flag_countries": ["DE"],        # feste Flags is_holiday_<cc> (landesweit, für alle Zeilen gleich)
+    "max_distance": 30,              # Abstand zum nächsten/letzten Feiertag wird hier gekappt
+    "cache_dir": INTERIM_DIR / "holidays",
+}
+
 # -----------------------------------------------------------------------------
 # TFT-Dataset-Metadaten (für Feature-Pipeline / Dataset-Bau)
 # -----------------------------------------------------------------------------
 TFT_DATASET: dict = {
     "max_encoder_length": 28,
+    # kürzere Historie zulassen (neue Produkte); kurze Fenster werden im Training
+    # per batch_sampler "bucketed" nach Länge gruppiert; Evaluation/Prognose (build_eval_dataset) nutzt je
+    # Decoder-Start nur das Fenster mit dem längsten Encoder
+    "min_encoder_length": 7,
     "max_prediction_length": 7,
     # bekannte reelle Features (typisch: Kalenderzyklen), werden als "known" behandelt
     "known_real_prefixes": ["cyc_"],        # z. B. cyc_dow_sin/cos, cyc_month_sin/cos
@@ -5,11 +5,15 @@ import numpy as np
 import pandas as pd
 
 from src.config import RAW_DIR, INTERIM_DIR
+from src.data.rollups import write_rollups
 
 # Rohdaten-Input (Kaggle Booksales) und Output nach zentraler Config
 RAW = RAW_DIR / "tabular-playground-series-sep-2022" / "train.csv"
 OUT = INTERIM_DIR / "train_aligned.parquet"
 
+# Referenzjahr, auf dessen Mittel je Land skaliert wird
+REFERENCE_YEAR = 2020
+
 
 def align_yearly_sales(df: pd.DataFrame) -> pd.DataFrame:
     """Skaliert num_sold pro (country, year) auf das 2020-Mittel.
@@ -30,14 +34,14 @@ def align_yearly_sales(df: pd.DataFrame) -> pd.DataFrame:
 
     # 2020-Referenz je Land
     ref2020 = (
-        means[means["year"] == 2020][["country", "mean_year"]]
+        means[means["year"] == REFERENCE_YEAR][["country", "mean_year"]]
         .rename(columns={"mean_year": "mean_2020"})
     )
 
     # Faktor = mean_2020 / mean_year  (2020 selbst → 1.0; unbekannt → 1.0)
     means = means.merge(ref2020, on="country", how="left", validate="many_to_one")
     means["factor"] = np.where(
-        means["year"] == 2020,
+        means["year"] == REFERENCE_YEAR,
         1.0,
         means["mean_2020"] / means["mean_year"],
     )
@@ -102,6 +106,10 @@ def main() -> None:
     df_aligned.to_parquet(OUT, index=False)
     print(f"\n✓ Gespeichert: {OUT}  (Zeilen: {len(df_aligned):,})")
 
+    # Rollups für die Diagnose-Plots (raw + aligned)
+    write_rollups(df_raw, "raw")
+    write_rollups(df_aligned, "aligned")
+
 
 if __name__ == "__main__":
     main()
@@ -6,6 +6,14 @@ import pandas as pd
 import numpy as np
 
 from src.config import INTERIM_DIR, TARGET_COL
+from src.data.rollups import write_rollups
+
+# Booksales-spezifische Eingriffe (auch von der DuckDB-Engine in lazy_engine.py genutzt)
+OUTLIER_DATE = "2020-01-01"          # Einzelausreißer
+LOCKDOWN_YEAR = 2020
+LOCKDOWN_MONTHS = (3, 4, 5)          # März–Mai
+FILL_PERIODS = 365                   # Verschiebung in Zeilen (≈ 1 Jahr bei Tagesdaten)
+FILL_REPEATS = 3                     # Mittel über 0, 1×, 2× FILL_PERIODS
 
 class DataCleaner:
     """Bereinigt offensichtliche Ausreißer und ersetzt Werte durch
@@ -65,12 +73,12 @@ class DataCleaner:
 
     def clean(self) -> pd.DataFrame:
         # 1) Outlier 01.01.2020 -> Jahreswerte
-        self.handle_single_day_outlier("2020-01-01")
-        self._fill_with_shifted_mean(periods=365, repeats=3)
+        self.handle_single_day_outlier(OUTLIER_DATE)
+        self._fill_with_shifted_mean(periods=FILL_PERIODS, repeats=FILL_REPEATS)
 
         # 2) Lockdown März–Mai 2020 -> ebenfalls Jahreswerte
-        self.handle_lockdown_period(year=2020, months=(3, 4, 5))
-        self._fill_with_shifted_mean(periods=365, repeats=3)
+        self.handle_lockdown_period(year=LOCKDOWN_YEAR, months=LOCKDOWN_MONTHS)
+        self._fill_with_shifted_mean(periods=FILL_PERIODS, repeats=FILL_REPEATS)
 
         return self.df.reset_index()
 
@@ -94,6 +102,9 @@ def main() -> None:
     df_cleaned.to_parquet(cleaned_path, index=False)
     print(f"✓ Bereinigte Datei gespeichert: {cleaned_path}  (Zeilen: {len(df_cleaned):,})")
 
+    # Rollups für die Diagnose-Plots
+    write_rollups(df_cleaned, "cleaned")
+
 
 if __name__ == "__main__":
     # python -m src.data.data_cleaning
@@ -0,0 +1,171 @@
+# src/data/engine_parity.py
+"""
+Paritätsprüfung pandas-Pfad vs. DuckDB-Engine (lazy_engine.py).
+
+1) Stufen: Referenz im Speicher über die pandas-Klassen/-Funktionen
+   (align_yearly_sales, DataCleaner, FeatureEngineer, CyclicalEncoder, add_lag_features)
+   gegen die DuckDB-Views derselben Stufe
+2) Splits: ModelDatasetBuilder auf der pandas-Feature-Tabelle gegen `write_splits`
+   auf der DuckDB-Feature-Tabelle (Dateien inkl. Zeilenreihenfolge, meta.json-Grenzen/Zeilen)
+
+Verglichen werden Spaltenreihenfolge, Typen und Werte: nicht-Float exakt,
+Float mit rtol/atol (Summationsreihenfolge, ln(1+x) statt log1p). NaN == NaN.
+Exit-Code 1 bei Abweichung. Alle Ausgaben landen in einem temporären Verzeichnis.
+
+Aufruf:
+    python -m src.data.engine_parity
+    python -m src engine-parity --scale-cols num_sold lag_1 --scale-mode robust --scale-log1p
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import GROUP_COLS, ID_COLS, LAZY_ENGINE, SPLIT_RATIOS, TARGET_COL, TEST_START, TIME_COL, VAL_START
+from src.data.cyclical_encoder import CyclicalEncoder
+from src.data.data_alignment import RAW, align_yearly_sales
+from src.data.data_cleaning import DataCleaner
+from src.data.feature_engineering import FeatureEngineer
+from src.data.lag_features import add_lag_features
+from src.data.lazy_engine import LazyPipeline, connect, write_splits
+from src.modeling.model_dataset import ModelDatasetBuilder
+from src.modeling.validation import SPLITS
+
+META_KEYS = ("val_start", "test_start", "rows", "scaled_cols")
+
+
+def pandas_stages(raw_path: Path) -> Dict[str, pd.DataFrame]:
+    """Referenz: dieselben Aufrufe wie die main() der Stufenmodule, ohne Dateien."""
+    raw = pd.read_csv(raw_path)
+    raw["date"] = pd.to_datetime(raw["date"], errors="coerce")
+    out = {"aligned": align_yearly_sales(raw)}
+    out["cleaned"] = DataCleaner(out["aligned"]).clean()
+    out["features"] = FeatureEngineer(date_col="date", include_holiday_name=False).transform(out["cleaned"])
+    out["cyclical"] = CyclicalEncoder().fit_transform(out["features"])
+    out["lags"] = add_lag_features(out["cyclical"])
+    return out
+
+
+def compare_frames(name: str, ref: pd.DataFrame, got: pd.DataFrame, sort_by: Optional[List[str]], rtol: float) -> List[str]:
+    """Abweichungen als Textliste (leer = identisch)."""
+    issues: List[str] = []
+    if list(ref.columns) != list(got.columns):
+        return [f"{name}: Spalten verschieden\n    pandas: {list(ref.columns)}\n    duckdb: {list(got.columns)}"]
+    if len(ref) != len(got):
+        return [f"{name}: Zeilen pandas={len(ref):,} duckdb={len(got):,}"]
+    if sort_by:
+        ref = ref.sort_values(sort_by, kind="stable").reset_index(drop=True)
+        got = got.sort_values(sort_by, kind="stable").reset_index(drop=True)
+    else:
+        ref, got = ref.reset_index(drop=True), got.reset_index(drop=True)
+
+    for col in ref.columns:
+        a, b = ref[col], got[col]
+        if pd.api.types.is_datetime64_any_dtype(a):
+            a, b = a.astype("datetime64[ns]"), b.astype("datetime64[ns]")
+        if a.dtype != b.dtype:
+            issues.append(f"{name}.{col}: Typ pandas={a.dtype} duckdb={b.dtype}")
+            continue
+        if pd.api.types.is_float_dtype(a):
+            x, y = a.to_numpy(), b.to_numpy()
+            bad = ~np.isclose(x, y, rtol=rtol, atol=rtol, equal_nan=True)
+            if bad.any():
+                i = int(np.flatnonzero(bad)[0])
+                issues.append(f"{name}.{col}: {int(bad.sum())} Werte abweichend (z. B. Zeile {i}: {x[i]!r} vs {y[i]!r})")
+        elif not a.equals(b):
+            diff = (a != b) & ~(a.isna() & b.isna())
+            issues.append(f"{name}.{col}: {int(diff.sum())} Werte abweichend")
+    return issues
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="pandas-Pfad und DuckDB-Engine auf Gleichheit prüfen.")
+    ap.add_argument("--raw", type=str, default=str(RAW))
+    ap.add_argument("--rtol", type=float, default=1e-9)
+    ap.add_argument("--scale-cols", nargs="*", default=[], help="Optional: Skalierung mitprüfen")
+    ap.add_argument("--scale-mode", type=str, default="standard", choices=["standard", "robust"])
+    ap.add_argument("--scale-log1p", action="store_true")
+    ap.add_argument("--threads", type=int, default=LAZY_ENGINE["threads"])
+    args = ap.parse_args()
+
+    raw_path = Path(args.raw)
+    keys = [*GROUP_COLS, TIME_COL]
+    issues: List[str] = []
+
+    t0 = time.perf_counter()
+    ref = pandas_stages(raw_path)
+    t_pandas = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory(prefix="engine_parity_") as tmp:
+        tmp_dir = Path(tmp)
+        con = connect(args.threads, LAZY_ENGINE["memory_limit"], tmp_dir / "spill")
+        try:
+            t0 = time.perf_counter()
+            pipe = LazyPipeline(con, raw_path=raw_path).build()
+            duck_input = tmp_dir / "duckdb" / "features.parquet"
+            pipe.write_stage("lags", duck_input)
+            split_kwargs = dict(scale_cols=args.scale_cols, scale_mode=args.scale_mode, scale_log1p=args.scale_log1p)
+            duck_meta = write_splits(con, duck_input, tmp_dir / "duckdb", **split_kwargs)
+            t_duck = time.perf_counter() - t0
+
+            # 1) Stufen
+            for stage, frame in ref.items():
+                stage_issues = compare_frames(stage, frame, pipe.relation(stage).df(), keys, args.rtol)
+                print(f"[engine_parity] Stufe {stage:<9}: {'OK' if not stage_issues else 'ABWEICHUNG'}")
+                issues += stage_issues
+        finally:
+            con.close()
+
+        # 2) Splits (Reihenfolge der Dateien zählt)
+        pandas_input = tmp_dir / "pandas" / "features.parquet"
+        pandas_input.parent.mkdir(parents=True, exist_ok=True)
+        ref["lags"].to_parquet(pandas_input, index=False)
+        pandas_meta = ModelDatasetBuilder(
+            data_path=pandas_input,
+            output_dir=tmp_dir / "pandas",
+            time_col=TIME_COL,
+            id_cols=list(ID_COLS),
+            target_col=TARGET_COL,
+            val_start=VAL_START,
+            test_start=TEST_START,
+            split_ratios=SPLIT_RATIOS,
+            **split_kwargs,
+        ).run()
+
+        for split in SPLITS:
+            split_issues = compare_frames(
+                split,
+                pd.read_parquet(tmp_dir / "pandas" / f"{split}.parquet"),
+                pd.read_parquet(tmp_dir / "duckdb" / f"{split}.parquet"),
+                None,
+                args.rtol,
+            )
+            print(f"[engine_parity] Split {split:<5}: {'OK' if not split_issues else 'ABWEICHUNG'}")
+            issues += split_issues
+        for key in META_KEYS:
+            if pandas_meta[key] != duck_meta[key]:
+                issues.append(f"meta.{key}: pandas={pandas_meta[key]!r} duckdb={duck_meta[key]!r}")
+        if pandas_meta["validation"]["splits"] != duck_meta["validation"]["splits"]:
+            issues.append("meta.validation.splits: Panel-Statistik verschieden\n"
+                          f"    pandas: {json.dumps(pandas_meta['validation']['splits'])}\n"
+                          f"    duckdb: {json.dumps(duck_meta['validation']['splits'])}")
+
+    print(f"[engine_parity] Laufzeit pandas (nur Stufen): {t_pandas:.1f}s | duckdb (Stufen + Splits): {t_duck:.1f}s")
+    if issues:
+        print("[engine_parity] Abweichungen:\n  - " + "\n  - ".join(issues))
+        sys.exit(1)
+    print("[engine_parity] ✓ Ergebnisse identisch.")
+
+
+if __name__ == "__main__":
+    # python -m src.data.engine_parity
+    main()
@@ -2,22 +2,33 @@
 # Zweck: Feature Engineering für TFT – Kalender- & Feiertagsfeatures, Zeitindex
 
 from pathlib import Path
+from typing import Optional
+
 import pandas as pd
 import holidays
 
-from src.config import INTERIM_DIR, PROCESSED_DIR
+from src.config import HOLIDAY_CONF, INTERIM_DIR, PROCESSED_DIR
+from src.data.holiday_calendar import calendar_for, calendar_key, local_keys
 
 
 class FeatureEngineer:
     """Erzeugt zeitliche Features für TFT:
     - Kalendermerkmale (Jahr, Monat, Wochentag, KW, Wochenende)
     - Zeitindex (time_idx)
-    - gesamtdeutsches Feiertagsflag (is_holiday_de) + optional holiday_name
+    - Feiertage je Land über den Kalender-Cache (holiday_calendar.py) + optional holiday_name
     """
 
-    def __init__(self, date_col: str = "date", include_holiday_name: bool = False):
+    def __init__(
+        self,
+        date_col: str = "date",
+        include_holiday_name: bool = False,
+        country_col: str = "country",
+        holiday_conf: Optional[dict] = None,
+    ):
         self.date_col = date_col
         self.include_holiday_name = include_holiday_name
+        self.country_col = country_col
+        self.holiday_conf = holiday_conf or HOLIDAY_CONF
 
     def _ensure_datetime(self, df: pd.DataFrame) -> pd.DataFrame:
         out = df.copy()
@@ -45,23 +56,33 @@ class FeatureEngineer:
         out["time_idx"] = (out[self.date_col] - first_date).dt.days.astype("int64")
         return out
 
-    def add_holiday_features_de(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Gesamtdeutsche Feiertage (bundesweit). Keine Länderspezifika.
-        Hinweis: Einmalige bundesweite Ausnahmen (z. B. Reformationstag 2017) werden korrekt markiert.
+    def add_holiday_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Feiertagsmerkmale per Gather aus dem vorberechneten Kalender (Land × Tag):
+        - is_holiday_<cc>: landesweite Feiertage der festen Flag-Länder (z. B. is_holiday_de, für alle Zeilen gleich)
+        - is_holiday_local, days_to_holiday, days_since_holiday, is_bridge_day: im Land der Zeile
+        Hinweis: Einmalige Ausnahmen (z. B. Reformationstag 2017 bundesweit) werden korrekt markiert.
         """
         out = self._ensure_datetime(df)
+        conf = self.holiday_conf
+        dates = out[self.date_col]
+        cal = calendar_for(conf, int(dates.dt.year.min()), int(dates.dt.year.max()))
+        day_idx = cal.day_index(dates)
 
-        years = out[self.date_col].dt.year.unique().tolist()
-        # subdivisions=None → nur bundesweite Feiertage
-        de_holidays = holidays.Germany(years=years, subdiv=None)  # observed: Default
+        for code in conf["flag_countries"]:
+            flag = cal.is_holiday[cal.row(calendar_key(code))][day_idx]
+            out[f"is_holiday_{code.lower()}"] = flag.astype("int8")
 
-        # Schnelles Lookup: Bool-Flag pro Datum
-        is_holiday = out[self.date_col].dt.date.map(lambda d: d in de_holidays)
-        out["is_holiday_de"] = is_holiday.astype("int8")
+        rows = cal.rows(out[self.country_col], local_keys(conf))
+        out["is_holiday_local"] = cal.gather("is_holiday", rows, day_idx).astype("int8")
+        out["days_to_holiday"] = cal.gather("days_to", rows, day_idx)
+        out["days_since_holiday"] = cal.gather("days_since", rows, day_idx)
+        out["is_bridge_day"] = cal.gather("is_bridge", rows, day_idx).astype("int8")
 
         if self.include_holiday_name:
-            # Namen für Debug/Erklärung (NaN, wenn kein Feiertag)
-            out["holiday_name"] = out[self.date_col].dt.date.map(de_holidays.get)
+            # Namen für Debug/Erklärung (bundesweit DE; NaN, wenn kein Feiertag)
+            years = dates.dt.year.unique().tolist()
+            de_holidays = holidays.country_holidays("DE", years=years)
+            out["holiday_name"] = dates.dt.date.map(de_holidays.get)
 
         return out
 
@@ -69,7 +90,7 @@ class FeatureEngineer:
         out = df.copy()
         out = self.add_calendar_features(out)
         out = self.add_time_index(out)
-        out = self.add_holiday_features_de(out)
+        out = self.add_holiday_features(out)
         return out
 
 
@@ -0,0 +1,541 @@
+# src/data/feature_store.py
+"""
+Lokaler Feature-Store: dieselben Feature-Definitionen für Training und Serving.
+
+Registrierte Feature-Gruppen (einmal definiert, Quelle ist jeweils die bestehende Konfiguration):
+    calendar   FeatureEngineer.add_calendar_features + time_idx (Ursprung = erster Tag der Materialisierung)
+    holiday    FeatureEngineer.add_holiday_features (HOLIDAY_CONF, holidays-Version)
+    cyclical   CyclicalEncoder (CyclicalEncoderConfig)
+    lag        add_lag_features (LAG_CONF)
+Berechnet wird ausschließlich über diese Funktionen (`compute_features`) – Batch-Pipeline,
+Materialisierung und Online-Berechnung teilen sich also eine Definition.
+
+Ablage unter FEATURE_STORE["root"]:
+    registry.json       Definitionen, Definitions-Hash, Spalten je Gruppe, Zeitraum, Partitionen
+    offline/<JJJJ-MM>.parquet
+                        Feature-Zeilen je Monat (ID_COLS, Datum, Features – ohne Zielspalte)
+    online.sqlite       letzter Zustand je Reihe: letzter Tag + Zielwerte der letzten
+                        `history_days` Tage (so viele, wie Lags/Rolling-Fenster brauchen)
+
+Point-in-Time-Lookup für (Reihe, Zeitpunkt)-Paare (Zeitpunkt wird auf den Tag normiert):
+    Tag <= letzter Tag der Reihe   Offline-Partitionen, gelesen werden nur die betroffenen Monate
+    Tag >  letzter Tag der Reihe   online: Historie aus online.sqlite + Tage bis zum Zielzeitpunkt,
+                                   Zielwerte nach dem letzten Tag unbekannt (NaN) -> Lags, die
+                                   darauf zeigen, sind NaN; Kalender/Feiertage/Zyklen sind bekannt
+Jede Feature-Zeile für Tag t nutzt nur Zielwerte vor t (Lags ab 1, Rolling über shift(1)).
+Lags und Rolling-Fenster zählen Zeilen; durch das Alignment ist jede Reihe lückenlos täglich,
+Zeilen und Tage fallen also zusammen.
+
+Aufrufbeispiele:
+    python -m src feature-store materialize
+    python -m src feature-store lookup --dates 2020-12-30 2021-01-03 --where country=Germany
+    python -m src feature-store lookup --pairs pairs.csv --out features.parquet
+    python -m src feature-store verify --samples 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import shutil
+import sqlite3
+import time
+from array import array
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import holidays
+import numpy as np
+import pandas as pd
+
+from src.config import FEATURE_STORE, HOLIDAY_CONF, ID_COLS, LAG_CONF, MODEL_INPUT_PATH, TARGET_COL, TIME_COL
+from src.data.cyclical_encoder import CyclicalEncoder, CyclicalEncoderConfig
+from src.data.feature_engineering import FeatureEngineer
+from src.data.lag_features import add_lag_features
+
+STORE_VERSION = 1
+FEATURE_GROUPS = ("calendar", "holiday", "cyclical", "lag")
+SERIES_SEP = "|"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS series_state (
+    series_id  TEXT PRIMARY KEY,
+    keys       TEXT NOT NULL,
+    last_date  TEXT NOT NULL,
+    history    BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+# ------------------------- Definitionen -------------------------
+
+def feature_definitions() -> Dict[str, Any]:
+    """Registrierte Definitionen aus der aktuellen Konfiguration (JSON-fähig)."""
+    holiday = {k: v for k, v in HOLIDAY_CONF.items() if k != "cache_dir"}
+    return json.loads(json.dumps({
+        "calendar": {"date_col": TIME_COL, "time_idx": "Tage seit Ursprung"},
+        "holiday": {**holiday, "holidays_version": holidays.__version__},
+        "cyclical": asdict(CyclicalEncoderConfig()),
+        "lag": {**LAG_CONF, "group_cols": list(ID_COLS), "time_col": TIME_COL},
+        "version": STORE_VERSION,
+    }, sort_keys=True))
+
+
+def definition_hash(definitions: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(definitions, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def history_days(definitions: Dict[str, Any]) -> int:
+    """Zielwerte, die je Reihe für die Online-Berechnung vorgehalten werden."""
+    lag = definitions["lag"]
+    return int(max([*lag["lags"], *lag.get("roll_windows", []), 1]))
+
+
+def compute_features(base: pd.DataFrame, origin: pd.Timestamp) -> Tuple[pd.DataFrame, Dict[str, List[str]]]:
+    """
+    Alle registrierten Gruppen auf Basisdaten (ID_COLS, Datum, Zielspalte) – dieselben Funktionen
+    wie feature_engineering.py, cyclical_encoder.py und lag_features.py.
+    Rückgabe: Frame (sortiert nach Reihe und Tag) und neue Spalten je Gruppe.
+    """
+    fe = FeatureEngineer(date_col=TIME_COL)
+
+    def calendar(df: pd.DataFrame) -> pd.DataFrame:
+        out = fe.add_calendar_features(df)
+        out["time_idx"] = (out[TIME_COL] - origin).dt.days.astype("int64")
+        return out
+
+    steps = (
+        ("calendar", calendar),
+        ("holiday", fe.add_holiday_features),
+        ("cyclical", CyclicalEncoder(CyclicalEncoderConfig()).transform),
+        ("lag", add_lag_features),
+    )
+    out, groups = base, {}
+    for name, step in steps:
+        before = set(out.columns)
+        out = step(out)
+        groups[name] = [c for c in out.columns if c not in before]
+    return out.reset_index(drop=True), groups
+
+
+def series_ids(df: pd.DataFrame) -> pd.Series:
+    return df[list(ID_COLS)].astype(str).agg(SERIES_SEP.join, axis=1)
+
+
+def _base_frame(df: pd.DataFrame) -> pd.DataFrame:
+    missing = [c for c in (*ID_COLS, TIME_COL, TARGET_COL) if c not in df.columns]
+    if missing:
+        raise KeyError(f"Spalten fehlen in der Quelle: {missing}")
+    base = df[[*ID_COLS, TIME_COL, TARGET_COL]].copy()
+    base[TIME_COL] = pd.to_datetime(base[TIME_COL], errors="raise").dt.normalize()
+    if base.duplicated([*ID_COLS, TIME_COL]).any():
+        raise ValueError("Quelle enthält doppelte (Reihe, Tag)-Zeilen.")
+    return base
+
+
+# ------------------------- Online-Zustand -------------------------
+
+@dataclass
+class SeriesState:
+    series_id: str
+    keys: List[str]
+    last_date: pd.Timestamp
+    history: np.ndarray              # Zielwerte der letzten history_days Tage bis last_date (NaN = fehlt)
+
+
+def _series_states(frame: pd.DataFrame, n_days: int) -> List[SeriesState]:
+    """Letzter Zustand je Reihe; Tage ohne Zeile in der Historie bleiben NaN."""
+    last = frame.groupby(list(ID_COLS), sort=True)[TIME_COL].transform("max")
+    tail = frame[frame[TIME_COL] > last - pd.Timedelta(days=n_days)]
+    states = []
+    for keys, g in tail.groupby(list(ID_COLS), sort=True):
+        keys = [str(k) for k in keys]
+        last_date = g[TIME_COL].max()
+        days = pd.date_range(end=last_date, periods=n_days, freq="D")
+        values = g.set_index(TIME_COL)[TARGET_COL].reindex(days).to_numpy(dtype="float64")
+        states.append(SeriesState(SERIES_SEP.join(keys), keys, last_date, values))
+    return states
+
+
+def _open_online(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _write_online(path: Path, states: List[SeriesState], def_hash: str) -> None:
+    conn = _open_online(path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM series_state")
+            conn.executemany(
+                "INSERT INTO series_state (series_id, keys, last_date, history) VALUES (?, ?, ?, ?)",
+                [(s.series_id, json.dumps(s.keys), str(s.last_date.date()), array("d", s.history).tobytes())
+                 for s in states],
+            )
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('definition_hash', ?)", (def_hash,))
+    finally:
+        conn.close()
+
+
+# ------------------------- Materialisierung -------------------------
+
+def materialize(source: Path, root: Path = FEATURE_STORE["root"]) -> Dict[str, Any]:
+    """Features aus der Quelle berechnen, Offline-Partitionen + Online-Zustand + registry.json schreiben."""
+    if not source.exists():
+        raise FileNotFoundError(f"Quelle fehlt: {source} (vorher align und clean ausführen)")
+    base = _base_frame(pd.read_parquet(source))
+    origin = base[TIME_COL].min()
+    definitions = feature_definitions()
+    def_hash = definition_hash(definitions)
+
+    frame, groups = compute_features(base, origin)
+    feature_cols = [c for g in FEATURE_GROUPS for c in groups[g]]
+
+    offline = root / "offline"
+    tmp = root / "offline.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    month = frame[TIME_COL].dt.strftime("%Y-%m")
+    partitions: Dict[str, int] = {}
+    for key, part in frame[[*ID_COLS, TIME_COL, *feature_cols]].groupby(month, sort=True):
+        part.sort_values([TIME_COL, *ID_COLS]).to_parquet(tmp / f"{key}.parquet", index=False)
+        partitions[key] = len(part)
+    shutil.rmtree(offline, ignore_errors=True)
+    tmp.replace(offline)
+
+    n_days = history_days(definitions)
+    states = _series_states(frame, n_days)
+    _write_online(root / "online.sqlite", states, def_hash)
+
+    registry = {
+        "definitions": definitions,
+        "definition_hash": def_hash,
+        "columns": groups,
+        "origin": str(origin.date()),
+        "first_date": str(frame[TIME_COL].min().date()),
+        "last_date": str(frame[TIME_COL].max().date()),
+        "history_days": n_days,
+        "n_series": len(states),
+        "n_rows": len(frame),
+        "partitions": partitions,
+        "source": str(source),
+        "materialized_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    tmp_path = root / "registry.json.tmp"
+    tmp_path.write_text(json.dumps(registry, indent=2), encoding="utf-8")
+    tmp_path.replace(root / "registry.json")
+    return registry
+
+
+# ------------------------- Lookup -------------------------
+
+class FeatureStore:
+    """Lesender Zugriff: Point-in-Time-Lookups über Offline-Partitionen und Online-Zustand."""
+
+    def __init__(self, root: Path = FEATURE_STORE["root"], max_future_days: int = FEATURE_STORE["max_future_days"]):
+        self.root = Path(root)
+        registry_path = self.root / "registry.json"
+        if not registry_path.exists():
+            raise FileNotFoundError(
+                f"Feature-Store fehlt: {registry_path} (python -m src feature-store materialize)"
+            )
+        self.registry = json.loads(registry_path.read_text(encoding="utf-8"))
+        current = definition_hash(feature_definitions())
+        if self.registry["definition_hash"] != current:
+            raise ValueError(
+                f"Feature-Definitionen geändert (Store {self.registry['definition_hash']}, Config {current}) – "
+                "neu materialisieren, sonst weichen Serving-Features vom Training ab."
+            )
+        self.conn = sqlite3.connect(str(self.root / "online.sqlite"))
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'definition_hash'").fetchone()
+        if row is None or row[0] != current:
+            raise ValueError("Online-Zustand passt nicht zur registry.json – neu materialisieren.")
+        self.origin = pd.Timestamp(self.registry["origin"])
+        self.max_future_days = int(max_future_days)
+        self.feature_cols = [c for g in FEATURE_GROUPS for c in self.registry["columns"][g]]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "FeatureStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---- Online-Zustand ----
+
+    def states(self, ids: List[str]) -> Dict[str, SeriesState]:
+        """Zustand je Reihe über den Primärschlüssel; unbekannte Reihen -> KeyError."""
+        out: Dict[str, SeriesState] = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT series_id, keys, last_date, history FROM series_state "
+                f"WHERE series_id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for sid, keys, last_date, blob in rows:
+                history = np.frombuffer(blob, dtype="float64")
+                out[sid] = SeriesState(sid, json.loads(keys), pd.Timestamp(last_date), history)
+        unknown = sorted(set(ids) - set(out))
+        if unknown:
+            raise KeyError(f"Reihen nicht im Feature-Store: {unknown[:5]}{' …' if len(unknown) > 5 else ''}")
+        return out
+
+    def all_series(self) -> pd.DataFrame:
+        rows = self.conn.execute("SELECT keys FROM series_state ORDER BY series_id").fetchall()
+        return pd.DataFrame([json.loads(k) for (k,) in rows], columns=list(ID_COLS))
+
+    # ---- Lookup ----
+
+    def lookup(self, pairs: pd.DataFrame) -> pd.DataFrame:
+        """
+        Features je (Reihe, Zeitpunkt) in Eingabereihenfolge; Spalte `source` = offline | online.
+        Die Zielspalte wird nie zurückgegeben.
+        """
+        missing = [c for c in (*ID_COLS, TIME_COL) if c not in pairs.columns]
+        if missing:
+            raise KeyError(f"Lookup-Paare ohne Spalten: {missing}")
+        req = pairs[[*ID_COLS, TIME_COL]].copy()
+        for c in ID_COLS:
+            req[c] = req[c].astype(str)
+        req[TIME_COL] = pd.to_datetime(req[TIME_COL], format="mixed", errors="coerce").dt.normalize()
+        if req[TIME_COL].isna().any():
+            raise ValueError("Lookup-Paare enthalten ungültige Zeitpunkte.")
+        if (req[TIME_COL] < self.origin).any():
+            raise ValueError(f"Zeitpunkte vor dem Ursprung des Feature-Stores ({self.origin.date()}).")
+        req["_pos"] = np.arange(len(req))
+        req["_sid"] = series_ids(req)
+
+        states = self.states(sorted(req["_sid"].unique()))
+        last = req["_sid"].map({sid: s.last_date for sid, s in states.items()})
+        ahead = (req[TIME_COL] - last).dt.days
+        if (ahead > self.max_future_days).any():
+            raise ValueError(f"Zeitpunkte mehr als {self.max_future_days} Tage nach dem letzten Stand einer Reihe.")
+
+        parts = []
+        offline = req[ahead <= 0]
+        if len(offline):
+            parts.append(self._offline(offline).assign(source="offline"))
+        online = req[ahead > 0]
+        if len(online):
+            parts.append(self._online(online, states).assign(source="online"))
+        out = pd.concat(parts, ignore_index=True).sort_values("_pos")
+        return out[[*ID_COLS, TIME_COL, *self.feature_cols, "source"]].reset_index(drop=True)
+
+    def _offline(self, req: pd.DataFrame) -> pd.DataFrame:
+        """Nur die Monats-Partitionen der angefragten Tage; Filter-Pushdown auf die Tage."""
+        frames = []
+        for month, days in req.groupby(req[TIME_COL].dt.strftime("%Y-%m"))[TIME_COL]:
+            path = self.root / "offline" / f"{month}.parquet"
+            if not path.exists():
+                raise FileNotFoundError(f"Partition fehlt: {path}")
+            frames.append(pd.read_parquet(path, filters=[(TIME_COL, "in", list(days.unique()))]))
+        rows = pd.concat(frames, ignore_index=True)
+        for c in ID_COLS:
+            rows[c] = rows[c].astype(str)
+        out = req.merge(rows, on=[*ID_COLS, TIME_COL], how="left", indicator=True)
+        if (out["_merge"] != "both").any():
+            gaps = out.loc[out["_merge"] != "both", ["_sid", TIME_COL]].head(3).values.tolist()
+            raise ValueError(f"Keine Feature-Zeile für (Reihe, Tag), z. B. {gaps} – Lücke in der Quelle?")
+        return out.drop(columns="_merge")
+
+    def _online(self, req: pd.DataFrame, states: Dict[str, SeriesState]) -> pd.DataFrame:
+        """Historie + Tage bis zum spätesten Zielzeitpunkt je Reihe, dann compute_features."""
+        until = req.groupby("_sid")[TIME_COL].max()
+        base = _future_frame([states[sid] for sid in until.index], list(until))
+        feats, _ = compute_features(base, self.origin)
+        feats = feats[[*ID_COLS, TIME_COL, *self.feature_cols]]
+        return req.merge(feats, on=[*ID_COLS, TIME_COL], how="left")
+
+
+def _future_frame(states: List[SeriesState], until: List[pd.Timestamp]) -> pd.DataFrame:
+    """
+    Basisdaten je Reihe: bekannte Historie, danach Zielwert unbekannt (NaN) bis `until`.
+    Ein Frame für alle Reihen (np.repeat statt eines Frames je Reihe).
+    """
+    n_hist = len(states[0].history)
+    starts = np.array([s.last_date for s in states], dtype="datetime64[D]") - (n_hist - 1)
+    lengths = (np.array(until, dtype="datetime64[D]") - starts).astype("int64") + 1
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+    y = np.full(len(offsets), np.nan)
+    known = offsets < n_hist
+    y[known] = np.concatenate([s.history for s in states])
+    frame = {col: np.repeat([s.keys[i] for s in states], lengths) for i, col in enumerate(ID_COLS)}
+    frame[TIME_COL] = (np.repeat(starts, lengths) + offsets).astype("datetime64[ns]")
+    frame[TARGET_COL] = y
+    return pd.DataFrame(frame)
+
+
+# ------------------------- Prüfung -------------------------
+
+def _compare(left: pd.DataFrame, right: pd.DataFrame, cols: List[str]) -> Dict[str, float]:
+    """Maximale Abweichung je Spalte (NaN an derselben Stelle gilt als gleich, NaN vs. Wert als inf)."""
+    diffs = {}
+    for c in cols:
+        a = left[c].to_numpy(dtype="float64")
+        b = right[c].to_numpy(dtype="float64")
+        nan_a, nan_b = np.isnan(a), np.isnan(b)
+        if (nan_a != nan_b).any():
+            diffs[c] = float("inf")
+            continue
+        both = ~nan_a
+        diffs[c] = float(np.abs(a[both] - b[both]).max()) if both.any() else 0.0
+    return diffs
+
+
+def verify(store: FeatureStore, samples: int, seed: int, tol: float = 1e-9) -> Dict[str, Any]:
+    """
+    1. Parität: Offline-Store vs. Trainingstabelle (MODEL_INPUT_PATH), alle registrierten Spalten
+    2. Point-in-Time: für zufällige (Reihe, Tag) die Features nur aus Zielwerten *vor* dem Tag
+       berechnen (Online-Pfad mit abgeschnittener Historie) und mit dem Offline-Wert vergleichen
+    """
+    report: Dict[str, Any] = {}
+    offline = pd.concat(
+        [pd.read_parquet(p) for p in sorted((store.root / "offline").glob("*.parquet"))], ignore_index=True
+    )
+    keys = [*ID_COLS, TIME_COL]
+    if MODEL_INPUT_PATH.exists():
+        train = pd.read_parquet(MODEL_INPUT_PATH, columns=[*keys, *store.feature_cols])
+        train[TIME_COL] = pd.to_datetime(train[TIME_COL])
+        merged = offline.merge(train, on=keys, how="outer", suffixes=("", "_train"), indicator=True)
+        unmatched = int((merged["_merge"] != "both").sum())
+        merged = merged[merged["_merge"] == "both"]
+        train_side = merged[[f"{c}_train" for c in store.feature_cols]].set_axis(store.feature_cols, axis=1)
+        diffs = _compare(merged, train_side, store.feature_cols)
+        report["training_parity"] = {"rows": len(merged), "unmatched_rows": unmatched,
+                                     "max_abs_diff": {c: d for c, d in diffs.items() if d > tol}}
+    else:
+        report["training_parity"] = None
+
+    source = _base_frame(pd.read_parquet(Path(store.registry["source"])))
+    n_days = int(store.registry["history_days"])
+    rng = np.random.default_rng(seed)
+    eligible = offline[offline[TIME_COL] >= store.origin + pd.Timedelta(days=n_days)]
+    picks = eligible.iloc[rng.choice(len(eligible), size=min(samples, len(eligible)), replace=False)]
+    source_ids = series_ids(source)
+    pit_rows = []
+    for _, row in picks.iterrows():
+        sid = SERIES_SEP.join(str(row[c]) for c in ID_COLS)
+        hist = source[(source_ids == sid) & (source[TIME_COL] < row[TIME_COL])]
+        state = _series_states(hist, n_days)[0]
+        feats, _ = compute_features(_future_frame([state], [row[TIME_COL]]), store.origin)
+        pit_rows.append(feats[feats[TIME_COL] == row[TIME_COL]][store.feature_cols].iloc[0])
+    pit = pd.DataFrame(pit_rows).reset_index(drop=True)
+    diffs = _compare(picks.reset_index(drop=True), pit, store.feature_cols)
+    report["point_in_time"] = {"samples": len(picks), "max_abs_diff": {c: d for c, d in diffs.items() if d > tol}}
+    return report
+
+
+# ------------------------- CLI -------------------------
+
+def _parse_where(items: List[str]) -> Dict[str, str]:
+    where = {}
+    for item in items:
+        key, sep, value = item.partition("=")
+        if not sep or key not in ID_COLS:
+            raise ValueError(f"Filter als <spalte>=<wert> mit spalte in {list(ID_COLS)} erwartet: {item}")
+        where[key] = value
+    return where
+
+
+def _read_pairs(path: Path) -> pd.DataFrame:
+    if not path.exists():
+        raise FileNotFoundError(f"Paar-Datei fehlt: {path}")
+    return pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_csv(path)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Feature-Store: materialisieren, Point-in-Time-Lookup, Prüfung.")
+    ap.add_argument("--root", type=str, default=str(FEATURE_STORE["root"]))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_mat = sub.add_parser("materialize", help="Features berechnen, Partitionen + Online-Zustand schreiben")
+    p_mat.add_argument("--source", type=str, default=str(FEATURE_STORE["source"]))
+    p_look = sub.add_parser("lookup", help="Features für (Reihe, Zeitpunkt)-Paare")
+    p_look.add_argument("--pairs", type=str, default=None, help="CSV/Parquet mit ID_COLS und Datumsspalte")
+    p_look.add_argument("--dates", type=str, nargs="+", default=None, help="Tage für alle (gefilterten) Reihen")
+    p_look.add_argument("--where", type=str, nargs="*", default=[], help="z. B. country=Germany")
+    p_look.add_argument("--out", type=str, default=None, help="Ergebnis als .csv oder .parquet")
+    p_ver = sub.add_parser("verify", help="Parität zur Trainingstabelle und Point-in-Time-Korrektheit")
+    p_ver.add_argument("--samples", type=int, default=50)
+    p_ver.add_argument("--seed", type=int, default=42)
+    sub.add_parser("info", help="Registrierte Definitionen und Stand")
+    args = ap.parse_args()
+    root = Path(args.root)
+
+    if args.cmd == "materialize":
+        t0 = time.perf_counter()
+        reg = materialize(Path(args.source), root)
+        print(f"[feature_store] {reg['n_rows']:,} Zeilen | {reg['n_series']} Reihen | "
+              f"{len(reg['partitions'])} Partitionen | {reg['first_date']} – {reg['last_date']} "
+              f"({time.perf_counter() - t0:.1f}s)")
+        print(f"[feature_store] Definitionen {reg['definition_hash']} | Historie online: {reg['history_days']} Tage")
+        return
+
+    with FeatureStore(root) as store:
+        if args.cmd == "info":
+            reg = store.registry
+            print(f"[feature_store] Definitionen {reg['definition_hash']} | materialisiert {reg['materialized_at']}")
+            print(f"[feature_store] {reg['first_date']} – {reg['last_date']} | {reg['n_series']} Reihen | "
+                  f"Ursprung time_idx {reg['origin']}")
+            for group in FEATURE_GROUPS:
+                print(f"  - {group:<9}: {', '.join(reg['columns'][group])}")
+            return
+
+        if args.cmd == "verify":
+            report = verify(store, args.samples, args.seed)
+            parity, pit = report["training_parity"], report["point_in_time"]
+            ok = not pit["max_abs_diff"]
+            if parity is None:
+                print(f"[feature_store] Trainingstabelle fehlt ({MODEL_INPUT_PATH}) – Parität übersprungen")
+            else:
+                ok = ok and not parity["max_abs_diff"] and not parity["unmatched_rows"]
+                print(f"[feature_store] Parität Training: {parity['rows']:,} Zeilen | "
+                      f"ohne Partner {parity['unmatched_rows']} | Abweichungen {parity['max_abs_diff'] or 'keine'}")
+            print(f"[feature_store] Point-in-Time: {pit['samples']} Stichproben | "
+                  f"Abweichungen {pit['max_abs_diff'] or 'keine'}")
+            if not ok:
+                raise SystemExit(1)
+            return
+
+        if (args.pairs is None) == (args.dates is None):
+            raise ValueError("lookup braucht genau eines von --pairs oder --dates.")
+        if args.pairs is not None:
+            pairs = _read_pairs(Path(args.pairs))
+        else:
+            series = store.all_series()
+            for col, value in _parse_where(args.where).items():
+                series = series[series[col] == value]
+            if series.empty:
+                raise ValueError(f"Keine Reihe passt zum Filter {args.where}.")
+            pairs = series.merge(pd.DataFrame({TIME_COL: pd.to_datetime(args.dates)}), how="cross")
+
+        t0 = time.perf_counter()
+        out = store.lookup(pairs)
+        ms = 1000 * (time.perf_counter() - t0)
+        counts = out["source"].value_counts().to_dict()
+        print(f"[feature_store] {len(out):,} Paare in {ms:.1f} ms | "
+              + " | ".join(f"{k}: {v}" for k, v in sorted(counts.items())))
+        if args.out:
+            out_path = Path(args.out)
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            if out_path.suffix == ".parquet":
+                out.to_parquet(out_path, index=False)
+            else:
+                out.to_csv(out_path, index=False)
+            print(f"[feature_store] Geschrieben: {out_path}")
+        else:
+            print(out.head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    # python -m src.data.feature_store materialize
+    main()
@@ -0,0 +1,241 @@
+# src/data/holiday_calendar.py
+"""
+Feiertagskalender je Land (optional inkl. Region) mit vektorisiertem Lookup.
+
+- Kalender werden einmal für den benötigten Jahresbereich gebaut
+  (`holidays.country_holidays`, ±1 Jahr Rand für korrekte Abstände an den Enden)
+  und als .npz in HOLIDAY_CONF["cache_dir"] abgelegt
+- Pro Kalender-Schlüssel ("DE", "DE-NW", …) eine Zeile in vorberechneten Matrizen
+  (Schlüssel × Tag): Feiertag, Tage bis zum nächsten / seit dem letzten Feiertag, Brückentag
+- Lookup je Datensatz = ein Gather `matrix[zeile, tag_index]`; die Zuordnung
+  Land -> Zeile läuft nur über die eindeutigen Länder
+
+Brückentag: Werktag (Mo–Fr, kein Feiertag), dessen Vor- und Folgetag frei sind
+(Wochenende oder Feiertag) und von denen mindestens einer ein Feiertag ist.
+
+Aufruf (Cache vorab füllen und Übersicht ausgeben):
+    python -m src.data.holiday_calendar --years 2017 2021
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import holidays
+import numpy as np
+import pandas as pd
+
+from src.config import HOLIDAY_CONF
+
+CACHE_VERSION = 1
+FIELDS = ("is_holiday", "days_to", "days_since", "is_bridge")
+
+
+def calendar_key(code: str, subdiv: Optional[str] = None) -> str:
+    return code if subdiv is None else f"{code}-{subdiv}"
+
+
+def _split_key(key: str) -> Tuple[str, Optional[str]]:
+    code, _, subdiv = key.partition("-")
+    return code, (subdiv or None)
+
+
+# ------------------------- Kalender -------------------------
+
+@dataclass
+class HolidayCalendar:
+    keys: List[str]
+    start: np.datetime64          # erster Tag (datetime64[D])
+    is_holiday: np.ndarray        # (n_keys, n_days) bool
+    days_to: np.ndarray           # (n_keys, n_days) int16, 0 am Feiertag, gekappt bei max_distance
+    days_since: np.ndarray        # (n_keys, n_days) int16
+    is_bridge: np.ndarray         # (n_keys, n_days) bool
+    max_distance: int
+
+    @property
+    def n_days(self) -> int:
+        return self.is_holiday.shape[1]
+
+    @classmethod
+    def build(cls, keys: List[str], first_year: int, last_year: int, max_distance: int) -> "HolidayCalendar":
+        if first_year > last_year:
+            raise ValueError(f"Ungültiger Jahresbereich: {first_year}–{last_year}")
+        years = list(range(first_year - 1, last_year + 2))
+        start = np.datetime64(f"{years[0]}-01-01", "D")
+        days = np.arange(start, np.datetime64(f"{years[-1] + 1}-01-01", "D"))
+        n_days = len(days)
+        weekend = ((days.astype("int64") + 3) % 7) >= 5   # 1970-01-01 war ein Donnerstag
+
+        is_holiday = np.zeros((len(keys), n_days), dtype=bool)
+        for i, key in enumerate(keys):
+            code, subdiv = _split_key(key)
+            cal = holidays.country_holidays(code, subdiv=subdiv, years=years)
+            hol_idx = (np.array(sorted(cal), dtype="datetime64[D]") - start).astype("int64")
+            is_holiday[i, hol_idx[(hol_idx >= 0) & (hol_idx < n_days)]] = True
+
+        idx = np.arange(n_days)
+        days_to = np.full(is_holiday.shape, max_distance, dtype="int16")
+        days_since = np.full(is_holiday.shape, max_distance, dtype="int16")
+        for i in range(len(keys)):
+            hol = np.flatnonzero(is_holiday[i])
+            if not len(hol):
+                continue
+            nxt = np.searchsorted(hol, idx, side="left")
+            prv = np.searchsorted(hol, idx, side="right") - 1
+            has_next, has_prev = nxt < len(hol), prv >= 0
+            days_to[i, has_next] = np.minimum(hol[nxt[has_next]] - idx[has_next], max_distance)
+            days_since[i, has_prev] = np.minimum(idx[has_prev] - hol[prv[has_prev]], max_distance)
+
+        off = is_holiday | weekend[None, :]
+        prev_off, next_off = np.roll(off, 1, axis=1), np.roll(off, -1, axis=1)
+        prev_hol, next_hol = np.roll(is_holiday, 1, axis=1), np.roll(is_holiday, -1, axis=1)
+        is_bridge = ~off & prev_off & next_off & (prev_hol | next_hol)
+        is_bridge[:, [0, -1]] = False   # Randtage ohne Nachbarn (liegen im Randjahr)
+
+        return cls(list(keys), start, is_holiday, days_to, days_since, is_bridge, max_distance)
+
+    # ------------------------- Lookup -------------------------
+
+    def day_index(self, dates: pd.Series) -> np.ndarray:
+        """Tag relativ zum Kalenderstart; Fehler bei NaT oder Datum außerhalb des Kalenders."""
+        if dates.isna().any():
+            raise ValueError("Feiertags-Lookup: Datumsspalte enthält NaT.")
+        idx = (dates.to_numpy().astype("datetime64[D]") - self.start).astype("int64")
+        if len(idx) and (idx.min() < 0 or idx.max() >= self.n_days):
+            raise ValueError(
+                f"Feiertags-Lookup: Datum außerhalb des Kalenders "
+                f"({self.start} + {self.n_days} Tage)."
+            )
+        return idx
+
+    def rows(self, values: pd.Series, mapping: Dict[str, str]) -> np.ndarray:
+        """
+        Kalenderzeile je Datensatz; `mapping` übersetzt Werte (z. B. Ländernamen) in Schlüssel.
+        Zuordnung nur über die eindeutigen Werte, danach ein Gather über die Codes.
+        """
+        codes, uniques = pd.factorize(values)
+        if (codes < 0).any():
+            raise ValueError("Feiertags-Lookup: Länderspalte enthält fehlende Werte.")
+        position = {k: i for i, k in enumerate(self.keys)}
+        missing = [v for v in uniques if mapping.get(v) not in position]
+        if missing:
+            raise KeyError(f"Kein Feiertagskalender für: {missing} (HOLIDAY_CONF['countries'] ergänzen)")
+        return np.array([position[mapping[v]] for v in uniques], dtype="int64")[codes]
+
+    def row(self, key: str) -> int:
+        if key not in self.keys:
+            raise KeyError(f"Kein Feiertagskalender für '{key}'.")
+        return self.keys.index(key)
+
+    def gather(self, field: str, rows: np.ndarray, day_idx: np.ndarray) -> np.ndarray:
+        if field not in FIELDS:
+            raise KeyError(f"Unbekanntes Kalenderfeld '{field}'. Erlaubt: {FIELDS}")
+        return getattr(self, field)[rows, day_idx]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Lange Tabelle (key, date, Felder) – z. B. als Join-Tabelle für lazy_engine.py."""
+        n_keys = len(self.keys)
+        out = pd.DataFrame({
+            "key": np.repeat(self.keys, self.n_days),
+            "date": np.tile(np.arange(self.start, self.start + self.n_days), n_keys),
+        })
+        for name in FIELDS:
+            out[name] = getattr(self, name).reshape(-1)
+        return out
+
+    # ------------------------- Persistenz -------------------------
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            keys=np.array(self.keys),
+            start=np.array(self.start),
+            max_distance=np.array(self.max_distance),
+            **{name: getattr(self, name) for name in FIELDS},
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "HolidayCalendar":
+        with np.load(path, allow_pickle=False) as z:
+            return cls(
+                keys=[str(k) for k in z["keys"]],
+                start=z["start"][()],
+                max_distance=int(z["max_distance"]),
+                **{name: z[name] for name in FIELDS},
+            )
+
+
+# ------------------------- Cache -------------------------
+
+_MEMO: Dict[Path, HolidayCalendar] = {}
+
+
+def cache_path(cache_dir: Path, keys: List[str], first_year: int, last_year: int, max_distance: int) -> Path:
+    """Dateiname aus Schlüsseln, Jahren, Abstandsgrenze und holidays-Version."""
+    spec = {
+        "keys": sorted(keys),
+        "years": [first_year, last_year],
+        "max_distance": max_distance,
+        "holidays": holidays.__version__,
+        "version": CACHE_VERSION,
+    }
+    digest = hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"holidays_{digest}.npz"
+
+
+def load_calendar(
+    keys: List[str],
+    first_year: int,
+    last_year: int,
+    max_distance: int = HOLIDAY_CONF["max_distance"],
+    cache_dir: Path = HOLIDAY_CONF["cache_dir"],
+) -> HolidayCalendar:
+    """Kalender aus Prozess-Cache, Datei-Cache oder neu gebaut (und gespeichert)."""
+    keys = sorted(set(keys))
+    path = cache_path(cache_dir, keys, first_year, last_year, max_distance)
+    if path in _MEMO:
+        return _MEMO[path]
+    if path.exists():
+        cal = HolidayCalendar.load(path)
+    else:
+        cal = HolidayCalendar.build(keys, first_year, last_year, max_distance)
+        cal.save(path)
+    _MEMO[path] = cal
+    return cal
+
+
+def local_keys(conf: dict) -> Dict[str, str]:
+    """Wert der Spalte "country" -> Kalender-Schlüssel (inkl. optionaler Region)."""
+    subdivisions = conf.get("subdivisions", {})
+    return {country: calendar_key(code, subdivisions.get(country)) for country, code in conf["countries"].items()}
+
+
+def calendar_for(conf: dict, first_year: int, last_year: int) -> HolidayCalendar:
+    """Kalender mit allen Schlüsseln, die HOLIDAY_CONF braucht (Länder + feste Flags)."""
+    keys = [*local_keys(conf).values(), *(calendar_key(c) for c in conf["flag_countries"])]
+    return load_calendar(keys, first_year, last_year, int(conf["max_distance"]), Path(conf["cache_dir"]))
+
+
+# ------------------------- CLI -------------------------
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Feiertagskalender bauen/cachen und zusammenfassen.")
+    ap.add_argument("--years", type=int, nargs=2, required=True, metavar=("VON", "BIS"))
+    args = ap.parse_args()
+
+    cal = calendar_for(HOLIDAY_CONF, *args.years)
+    path = cache_path(Path(HOLIDAY_CONF["cache_dir"]), sorted(set(cal.keys)), *args.years, cal.max_distance)
+    print(f"[holiday_calendar] {len(cal.keys)} Kalender | {cal.n_days} Tage ab {cal.start} | Cache: {path}")
+    for i, key in enumerate(cal.keys):
+        print(f"  - {key:<6}: {int(cal.is_holiday[i].sum()):>3} Feiertage | {int(cal.is_bridge[i].sum()):>3} Brückentage")
+
+
+if __name__ == "__main__":
+    # python -m src.data.holiday_calendar --years 2017 2021
+    main()
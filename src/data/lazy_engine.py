@@ -0,0 +1,617 @@
+# src/data/lazy_engine.py
+"""
+DuckDB-Engine für die Datenstufen: ein lazy Query-Plan statt eager pandas-Frames.
+
+Die Stufen align -> clean -> features -> cyclical -> lags werden als Kette von
+SQL-Views über den Rohdaten angelegt; erst `COPY … TO` führt den gesamten Plan aus.
+DuckDB optimiert den Plan (Projektion/Filter-Pushdown), rechnet mehrthreadig und
+lagert Joins/Fenster/Sortierung bei Überschreiten von `memory_limit` nach `temp_dir` aus
+-> Panels größer als der Arbeitsspeicher auf einem Rechner.
+
+Semantik und Ausgabeschema (Spaltenreihenfolge, Typen) entsprechen dem pandas-Pfad:
+    data_alignment.py, data_cleaning.py, feature_engineering.py,
+    cyclical_encoder.py, lag_features.py, modeling/model_dataset.py
+Die Booksales-Parameter (Referenzjahr, Ausreißer, Lockdown, Lags) kommen aus
+denselben Konstanten. Gleichheit prüft `python -m src engine-parity`.
+
+Ausgaben:
+    MODEL_INPUT_PATH                      Feature-Tabelle (wie lag_features.py)
+    PROCESSED_DIR/{train,val,test}.parquet + meta.json (+ Skalierungs-Statistik)
+    optional: train_aligned/train_cleaned/train_features/train_features_cyc (--write-intermediate)
+
+Nicht erzeugt werden die Rollups für die Diagnose-Plots (dafür: --write-intermediate
+und danach `python -m src rollups`).
+
+Aufruf:
+    python -m src.data.lazy_engine
+    python -m src data-pipeline --engine duckdb
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import duckdb
+import pandas as pd
+
+from src.config import (
+    GROUP_COLS,
+    HOLIDAY_CONF,
+    ID_COLS,
+    INTERIM_DIR,
+    LAG_CONF,
+    LAZY_ENGINE,
+    MODEL_INPUT_PATH,
+    PROCESSED_DIR,
+    SCALE_COLS,
+    SCALE_LOG1P,
+    SCALE_MODE,
+    SPLIT_RATIOS,
+    SUBSAMPLE,
+    TARGET_COL,
+    TEST_START,
+    TIME_COL,
+    VAL_START,
+)
+from src.data.cyclical_encoder import CyclicalEncoderConfig
+from src.data.data_alignment import RAW, REFERENCE_YEAR
+from src.data.data_cleaning import FILL_PERIODS, FILL_REPEATS, LOCKDOWN_MONTHS, LOCKDOWN_YEAR, OUTLIER_DATE
+from src.data.holiday_calendar import calendar_for, calendar_key, local_keys
+from src.modeling.model_dataset import TimeSplitPlan
+from src.modeling.scaling import SCALE_MODES, GroupScaler
+from src.modeling.validation import (
+    SPLITS,
+    SeriesStats,
+    ValidationReport,
+    inputs_fingerprint,
+    raise_on_errors,
+)
+
+# Stufen in Ausführungsreihenfolge -> Datei des pandas-Pfads (für --write-intermediate)
+STAGES: Dict[str, Optional[Path]] = {
+    "raw": None,
+    "aligned": INTERIM_DIR / "train_aligned.parquet",
+    "cleaned": INTERIM_DIR / "train_cleaned.parquet",
+    "features": PROCESSED_DIR / "train_features.parquet",
+    "cyclical": PROCESSED_DIR / "train_features_cyc.parquet",
+    "lags": MODEL_INPUT_PATH,
+}
+
+# Rolling-Statistik (Name wie pandas .rolling().<stat>()) -> SQL-Aggregat
+ROLL_STATS: Dict[str, str] = {
+    "mean": "avg",
+    "sum": "sum",
+    "min": "min",
+    "max": "max",
+    "std": "stddev_samp",
+    "var": "var_samp",
+    "median": "median",
+}
+
+# Extraktor des CyclicalEncoders -> SQL über die lokale Zeit `_local`
+CYC_EXTRACTORS: Dict[str, str] = {
+    "dow": "isodow(_local) - 1",
+    "month": "month(_local) - 1",
+    "doy": "dayofyear(_local) - 1",
+    "week": "weekofyear(_local) - 1",
+    "hour": "hour(_local)",
+}
+
+
+def _q(name: str) -> str:
+    """Bezeichner quoten (Spaltennamen wie "date" sind SQL-Schlüsselwörter)."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _cols(names: List[str]) -> str:
+    return ", ".join(_q(c) for c in names)
+
+
+def _lit(path: Path) -> str:
+    return "'" + str(path).replace("'", "''") + "'"
+
+
+def _reader(path: Path) -> str:
+    suffix = path.suffix.lower()
+    if suffix in {".parquet", ".pq"}:
+        return f"read_parquet({_lit(path)})"
+    if suffix == ".csv":
+        return f"read_csv({_lit(path)}, header = true)"
+    raise ValueError(f"Nicht unterstütztes Format: {path.suffix}")
+
+
+def connect(threads: int, memory_limit: str, temp_dir: Path) -> duckdb.DuckDBPyConnection:
+    """In-Memory-Datenbank mit Thread-/Speicherbudget und Spill-Verzeichnis."""
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(config={
+        "threads": threads or os.cpu_count() or 1,
+        "memory_limit": memory_limit,
+        "temp_directory": str(temp_dir),
+        "preserve_insertion_order": False,   # Reihenfolge wird beim Schreiben explizit gesetzt
+    })
+    return con
+
+
+# ------------------------- Query-Plan -------------------------
+
+@dataclass
+class LazyPipeline:
+    """Legt die Stufen als Views an; ausgeführt wird erst beim Schreiben."""
+
+    con: duckdb.DuckDBPyConnection
+    raw_path: Path = RAW
+    time_col: str = TIME_COL
+    group_cols: List[str] = field(default_factory=lambda: list(GROUP_COLS))
+    target_col: str = TARGET_COL
+    lag_conf: Dict[str, Any] = field(default_factory=lambda: dict(LAG_CONF))
+    cyc: CyclicalEncoderConfig = field(default_factory=CyclicalEncoderConfig)
+    holiday_conf: Dict[str, Any] = field(default_factory=lambda: dict(HOLIDAY_CONF))
+
+    def __post_init__(self) -> None:
+        if not self.raw_path.exists():
+            raise FileNotFoundError(f"Rohdaten nicht gefunden: {self.raw_path}")
+        self._window = f"PARTITION BY {_cols(self.group_cols)} ORDER BY {_q(self.time_col)}"
+
+    def build(self) -> "LazyPipeline":
+        self._raw()
+        self._aligned()
+        self._cleaned()
+        self._features()
+        self._cyclical()
+        self._lags()
+        return self
+
+    def relation(self, stage: str) -> duckdb.DuckDBPyRelation:
+        if stage not in STAGES:
+            raise KeyError(f"Unbekannte Stufe '{stage}'. Erlaubt: {list(STAGES)}")
+        return self.con.table(stage)
+
+    # ------------------------- Stufen -------------------------
+
+    def _raw(self) -> None:
+        t = _q(self.time_col)
+        self.con.execute(
+            f"CREATE OR REPLACE VIEW raw AS "
+            f"SELECT * REPLACE (CAST({t} AS TIMESTAMP) AS {t}) FROM {_reader(self.raw_path)}"
+        )
+
+    def _aligned(self) -> None:
+        """data_alignment.align_yearly_sales: num_sold je (country, year) auf das Referenzjahr skalieren."""
+        t, y = _q(self.time_col), _q(self.target_col)
+        self.con.execute(f"""
+            CREATE OR REPLACE VIEW aligned AS
+            WITH means AS (
+                SELECT country, CAST(year({t}) AS INTEGER) AS year, avg({y}) AS mean_year
+                FROM raw GROUP BY ALL
+            ),
+            factors AS (
+                SELECT m.country, m.year,
+                       CASE WHEN m.year = {REFERENCE_YEAR} THEN 1.0::DOUBLE
+                            ELSE r.mean_year / m.mean_year END AS factor
+                FROM means m
+                LEFT JOIN means r ON r.country = m.country AND r.year = {REFERENCE_YEAR}
+            )
+            SELECT raw.* REPLACE (CAST(raw.{y} AS DOUBLE) * coalesce(f.factor, 1.0::DOUBLE) AS {y}),
+                   CAST(year(raw.{t}) AS INTEGER) AS year
+            FROM raw
+            LEFT JOIN factors f ON f.country = raw.country AND f.year = year(raw.{t})
+        """)
+
+    def _fill_sql(self, source: str) -> str:
+        """
+        DataCleaner._fill_with_shifted_mean: NULL-Werte durch das Mittel der
+        Werte FILL_PERIODS, 2×FILL_PERIODS … Zeilen zuvor (je Reihe, fehlende ignoriert).
+        Verschiebung 0 entfällt – sie ist genau dort leer, wo gefüllt wird.
+        """
+        y = _q(self.target_col)
+        shifts = [FILL_PERIODS * k for k in range(1, FILL_REPEATS)]
+        lags = ", ".join(f"lag({y}, {s}) OVER ({self._window}) AS _fill_{s}" for s in shifts)
+        total = " + ".join(f"coalesce(_fill_{s}, 0)" for s in shifts)
+        count = " + ".join(f"CAST(_fill_{s} IS NOT NULL AS INTEGER)" for s in shifts)
+        helper = ", ".join(f"_fill_{s}" for s in shifts)
+        return f"""
+            SELECT * EXCLUDE ({helper}) REPLACE (coalesce({y}, ({total}) / nullif({count}, 0)) AS {y})
+            FROM (SELECT *, {lags} FROM {source})
+        """
+
+    def _cleaned(self) -> None:
+        """DataCleaner.clean: Einzelausreißer und Lockdown-Monate über Vorjahreswerte füllen."""
+        t, y = _q(self.time_col), _q(self.target_col)
+        months = ", ".join(str(m) for m in LOCKDOWN_MONTHS)
+        self.con.execute(f"""
+            CREATE OR REPLACE VIEW cleaned_outlier AS
+            {self._fill_sql(
+                f"(SELECT * REPLACE (CASE WHEN {t} = TIMESTAMP '{OUTLIER_DATE}' THEN NULL ELSE {y} END AS {y}) "
+                f"FROM aligned)"
+            )}
+        """)
+        self.con.execute(f"""
+            CREATE OR REPLACE VIEW cleaned_lockdown AS
+            WITH flagged AS (
+                SELECT *, CAST(year({t}) = {LOCKDOWN_YEAR} AND month({t}) IN ({months}) AS BIGINT)
+                          AS is_lockdown_period
+                FROM cleaned_outlier
+            )
+            {self._fill_sql(
+                f"(SELECT * REPLACE (CASE WHEN is_lockdown_period = 1 THEN NULL ELSE {y} END AS {y}) "
+                f"FROM flagged)"
+            )}
+        """)
+        # wie reset_index() nach set_index("date"): Datum als erste Spalte
+        self.con.execute(f"CREATE OR REPLACE VIEW cleaned AS SELECT {t}, * EXCLUDE ({t}) FROM cleaned_lockdown")
+
+    def _holiday_tables(self) -> None:
+        """Feiertagskalender (holiday_calendar.py) als kleine Join-Tabellen: Land -> Schlüssel, Schlüssel × Tag."""
+        t = _q(self.time_col)
+        countries, first_year, last_year = self.con.execute(
+            f"SELECT list(DISTINCT country), min(year({t})), max(year({t})) FROM raw"
+        ).fetchone()
+        mapping = local_keys(self.holiday_conf)
+        missing = sorted(c for c in countries if c not in mapping)
+        if missing:
+            raise KeyError(f"Kein Feiertagskalender für: {missing} (HOLIDAY_CONF['countries'] ergänzen)")
+
+        cal = calendar_for(self.holiday_conf, int(first_year), int(last_year))
+        calendar = cal.to_frame()
+        keys = pd.DataFrame({"country": list(mapping), "key": list(mapping.values())})
+        self.con.execute(
+            "CREATE OR REPLACE TABLE holiday_calendar AS "
+            "SELECT key, CAST(date AS DATE) AS day, is_holiday, days_to, days_since, is_bridge FROM calendar"
+        )
+        self.con.execute("CREATE OR REPLACE TABLE holiday_keys AS SELECT * FROM keys")
+
+    def _features(self) -> None:
+        """FeatureEngineer.transform: Kalender, time_idx (Tage seit erstem Datum), Feiertage je Land."""
+        t = _q(self.time_col)
+        self._holiday_tables()
+        flags, joins = [], []
+        for i, code in enumerate(self.holiday_conf["flag_countries"]):
+            flags.append(f"CAST(f{i}.is_holiday AS TINYINT) AS {_q(f'is_holiday_{code.lower()}')}")
+            joins.append(
+                f"LEFT JOIN holiday_calendar f{i} "
+                f"ON f{i}.key = '{calendar_key(code)}' AND f{i}.day = CAST(c.{t} AS DATE)"
+            )
+        self.con.execute(f"""
+            CREATE OR REPLACE VIEW features AS
+            SELECT c.* REPLACE (CAST(year(c.{t}) AS INTEGER) AS year),
+                   CAST(month(c.{t}) AS INTEGER) AS month,
+                   CAST(day(c.{t}) AS INTEGER) AS day,
+                   CAST(isodow(c.{t}) - 1 AS INTEGER) AS dayofweek,
+                   CAST(weekofyear(c.{t}) AS BIGINT) AS weekofyear,
+                   CAST(isodow(c.{t}) >= 6 AS TINYINT) AS is_weekend,
+                   CAST(date_diff('day', (SELECT min({t}) FROM raw), c.{t}) AS BIGINT) AS time_idx,
+                   {"".join(f + ", " for f in flags)}
+                   CAST(h.is_holiday AS TINYINT) AS is_holiday_local,
+                   CAST(h.days_to AS SMALLINT) AS days_to_holiday,
+                   CAST(h.days_since AS SMALLINT) AS days_since_holiday,
+                   CAST(h.is_bridge AS TINYINT) AS is_bridge_day
+            FROM cleaned c
+            {" ".join(joins)}
+            JOIN holiday_keys k ON k.country = c.country
+            LEFT JOIN holiday_calendar h ON h.key = k.key AND h.day = CAST(c.{t} AS DATE)
+        """)
+
+    def _cyclical(self) -> None:
+        """CyclicalEncoder: Sin/Cos je Periodizität über die lokale Zeit (naiv = UTC)."""
+        cfg = self.cyc
+        src = _q(cfg.datetime_col)
+        local = f"timezone('{cfg.tz}', timezone('UTC', {src}))" if cfg.tz is not None else src
+        exprs = []
+        for name, (kind, period) in cfg.periodicities.items():
+            if kind not in CYC_EXTRACTORS:
+                raise ValueError(f"Unbekannter extractor: {kind}")
+            angle = f"2.0::DOUBLE * pi() * (CAST({CYC_EXTRACTORS[kind]} AS DOUBLE) / {float(period)!r}::DOUBLE)"
+            exprs += [
+                f"sin({angle}) AS {_q(f'{cfg.prefix}_{name}_sin')}",
+                f"cos({angle}) AS {_q(f'{cfg.prefix}_{name}_cos')}",
+            ]
+        self.con.execute(f"""
+            CREATE OR REPLACE VIEW cyclical AS
+            SELECT * EXCLUDE (_local), {", ".join(exprs)}
+            FROM (SELECT *, {local} AS _local FROM features)
+        """)
+
+    def _lags(self) -> None:
+        """add_lag_features: Lags und Rolling-Statistiken über die Vortage (Fenster ohne aktuellen Tag)."""
+        conf = self.lag_conf
+        y = _q(conf["target_col"])
+        prefix = conf.get("prefix", "lag_")
+        exprs = [f"lag({y}, {k}) OVER ({self._window}) AS {_q(f'{prefix}{k}')}" for k in conf["lags"]]
+        for window in conf.get("roll_windows", []):
+            for stat in conf.get("roll_stats", []):
+                if stat not in ROLL_STATS:
+                    raise ValueError(f"Unbekannte Rolling-Statistik '{stat}'. Erlaubt: {list(ROLL_STATS)}")
+                frame = f"{self._window} ROWS BETWEEN {int(window)} PRECEDING AND 1 PRECEDING"
+                exprs.append(f"{ROLL_STATS[stat]}({y}) OVER ({frame}) AS {_q(f'{prefix}{window}_{stat}')}")
+        self.con.execute(f"CREATE OR REPLACE VIEW lags AS SELECT *, {', '.join(exprs)} FROM cyclical")
+
+    # ------------------------- Ausführung -------------------------
+
+    def write_stage(self, stage: str, path: Path) -> int:
+        """Führt den Plan bis `stage` aus und schreibt Parquet (nach Reihe und Zeit sortiert)."""
+        self.relation(stage)  # prüft den Namen
+        t = _q(self.time_col)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.con.execute(f"""
+            COPY (
+                SELECT * REPLACE (CAST({t} AS TIMESTAMP_NS) AS {t}) FROM {stage}
+                ORDER BY {_cols(self.group_cols)}, {t}
+            ) TO {_lit(path)} (FORMAT parquet)
+        """)
+        return self.con.execute(f"SELECT count(*) FROM read_parquet({_lit(path)})").fetchone()[0]
+
+
+# ------------------------- Split + Skalierung -------------------------
+
+def _split_bounds(con, source: str, time_col: str, plan: TimeSplitPlan) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    """Wie TimeSplitPlan.compute_boundaries; die Sortierung übernimmt DuckDB."""
+    if plan.val_start is not None and plan.test_start is not None:
+        return plan.compute_boundaries(pd.DataFrame({time_col: []}), time_col)
+    t = _q(time_col)
+    n = con.execute(f"SELECT count(*) FROM {source}").fetchone()[0]
+    value_at = lambda i: con.execute(  # noqa: E731
+        f"SELECT {t} FROM {source} ORDER BY {t} LIMIT 1 OFFSET {int(i)}"
+    ).fetchone()[0]
+    return plan.boundaries_from_sorted(n, value_at)
+
+
+def _fit_scaler_sql(con, id_cols: List[str], cols: List[str], mode: str, log1p: bool) -> GroupScaler:
+    """GroupScaler-Statistik per GROUP BY über train (klein: eine Zeile je Gruppe)."""
+    if mode not in SCALE_MODES:
+        raise ValueError(f"Unbekannter Skalierungsmodus '{mode}'. Erlaubt: {SCALE_MODES}")
+    exprs = []
+    for c in cols:
+        # np.log1p -> ln(1 + x) (DuckDB kennt kein log1p; Abweichung im Bereich der Rundung)
+        x = f"ln(1 + CAST({_q(c)} AS DOUBLE))" if log1p else f"CAST({_q(c)} AS DOUBLE)"
+        if mode == "standard":
+            center, spread = f"avg({x})", f"stddev_samp({x})"
+        else:
+            center = f"quantile_cont({x}, 0.5)"
+            spread = f"quantile_cont({x}, 0.75) - quantile_cont({x}, 0.25)"
+        exprs += [
+            f"{center} AS {_q(c + '__center')}",
+            f"CASE WHEN {spread} > 0 AND isfinite({spread}) THEN {spread} END AS {_q(c + '__scale')}",
+        ]
+    stats = con.execute(
+        f"SELECT {_cols(id_cols)}, {', '.join(exprs)} FROM train_raw GROUP BY ALL ORDER BY {_cols(id_cols)}"
+    ).df()
+    scaler = GroupScaler(list(id_cols), list(cols), mode, log1p)
+    scaler.groups = pd.MultiIndex.from_frame(stats[id_cols])
+    scaler.center = stats[[f"{c}__center" for c in cols]].to_numpy(dtype="float64", na_value=float("nan"))
+    scaler.scale = stats[[f"{c}__scale" for c in cols]].to_numpy(dtype="float64", na_value=float("nan"))
+    return scaler
+
+
+def _scaled_select(split: str, id_cols: List[str], scaler: Optional[GroupScaler]) -> str:
+    if scaler is None:
+        return f"SELECT * FROM {split}_raw"
+    on = " AND ".join(f"st.{_q(c)} IS NOT DISTINCT FROM s.{_q(c)}" for c in id_cols)
+    repl = []
+    for c in scaler.cols:
+        x = f"ln(1 + CAST(s.{_q(c)} AS DOUBLE))" if scaler.log1p else f"CAST(s.{_q(c)} AS DOUBLE)"
+        repl.append(f"({x} - st.{_q(c + '__center')}) / st.{_q(c + '__scale')} AS {_q(c)}")
+    return f"SELECT s.* REPLACE ({', '.join(repl)}) FROM {split}_raw s LEFT JOIN scaler_stats st ON {on}"
+
+
+def _sql_series_stats(con, source: str, time_col: str, id_cols: List[str]) -> SeriesStats:
+    """validation.series_stats in SQL (Reihenfolge in der Datei über file_row_number)."""
+    t, ids = _q(time_col), _cols(id_cols)
+    con.execute(f"""
+        CREATE OR REPLACE TEMP VIEW _steps AS
+        SELECT {ids},
+               epoch_ns({t}) - lag(epoch_ns({t})) OVER (PARTITION BY {ids} ORDER BY file_row_number) AS d_file,
+               epoch_ns({t}) - lag(epoch_ns({t})) OVER (PARTITION BY {ids} ORDER BY {t}) AS d_sorted
+        FROM {source}
+    """)
+    n_rows, n_series, duplicates, non_mono = con.execute(f"""
+        SELECT count(*),
+               count(DISTINCT ({ids})),
+               count(*) FILTER (WHERE d_sorted = 0),
+               count(DISTINCT ({ids})) FILTER (WHERE d_file <= 0)
+        FROM _steps
+    """).fetchone()
+    if n_rows == 0:
+        return SeriesStats(0, 0, 0, 0, 0, 0, None)
+
+    # häufigste Schrittweite; bei Gleichstand die kleinste (wie np.unique + argmax)
+    row = con.execute(
+        "SELECT d_sorted FROM _steps WHERE d_sorted > 0 GROUP BY 1 ORDER BY count(*) DESC, 1 LIMIT 1"
+    ).fetchone()
+    step_ns = None if row is None else int(row[0])
+    gap_series = missing_steps = 0
+    if step_ns is not None:
+        gap_series, missing_steps = con.execute(f"""
+            SELECT count(DISTINCT ({ids})), coalesce(sum(d_sorted // {step_ns} - 1), 0)
+            FROM _steps WHERE d_sorted > {step_ns}
+        """).fetchone()
+    return SeriesStats(
+        n_rows=int(n_rows),
+        n_series=int(n_series),
+        duplicates=int(duplicates),
+        non_monotonic_series=int(non_mono),
+        gap_series=int(gap_series),
+        missing_steps=int(missing_steps),
+        step=str(pd.Timedelta(step_ns, unit="ns")) if step_ns is not None else None,
+    )
+
+
+def _validate_splits(con, paths: Dict[str, Path], time_col: str, id_cols: List[str], fingerprint: str) -> ValidationReport:
+    """Gleiche Prüfungen/Meldungen wie validation.validate_panel, ohne die Splits zu laden."""
+    t0 = time.perf_counter()
+    report = ValidationReport(fingerprint=fingerprint)
+    ids = _cols(id_cols)
+    for name in SPLITS:
+        source = f"read_parquet({_lit(paths[name])}, file_row_number = true)"
+        stats = _sql_series_stats(con, source, time_col, id_cols)
+        report.splits[name] = stats
+        if stats.duplicates:
+            report.errors.append(f"{name}: {stats.duplicates} doppelte (Reihe, {time_col})-Zeilen")
+        if stats.non_monotonic_series:
+            report.errors.append(f"{name}: {stats.non_monotonic_series} Reihen mit nicht monotoner Zeit")
+        if stats.gap_series:
+            report.warnings.append(
+                f"{name}: {stats.gap_series} Reihen mit Lücken ({stats.missing_steps} fehlende Schritte à {stats.step})"
+            )
+        if name != "train":
+            report.unseen[name] = con.execute(f"""
+                SELECT count(*) FROM (
+                    SELECT DISTINCT {ids} FROM read_parquet({_lit(paths[name])})
+                    EXCEPT SELECT DISTINCT {ids} FROM read_parquet({_lit(paths['train'])})
+                )
+            """).fetchone()[0]
+            if report.unseen[name]:
+                report.warnings.append(f"{name}: {report.unseen[name]} Gruppen nicht in TRAIN")
+    report.seconds = round(time.perf_counter() - t0, 3)
+    return report
+
+
+def write_splits(
+    con: duckdb.DuckDBPyConnection,
+    data_path: Path,
+    output_dir: Path,
+    time_col: str = TIME_COL,
+    id_cols: Optional[List[str]] = None,
+    target_col: str = TARGET_COL,
+    val_start: Optional[str] = VAL_START,
+    test_start: Optional[str] = TEST_START,
+    split_ratios: Optional[Tuple[float, float, float]] = SPLIT_RATIOS,
+    scale_cols: Optional[List[str]] = None,
+    scale_mode: str = SCALE_MODE,
+    scale_log1p: bool = SCALE_LOG1P,
+) -> Dict[str, Any]:
+    """Gegenstück zu ModelDatasetBuilder.run: gleiche Dateien, gleiche meta.json (+ "engine")."""
+    id_cols = list(ID_COLS) if id_cols is None else list(id_cols)
+    source = _reader(data_path)
+    columns = [r[0] for r in con.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()]
+    if time_col not in columns:
+        raise KeyError(f"TIME_COL '{time_col}' nicht in DataFrame.")
+    if target_col not in columns:
+        raise KeyError(f"TARGET_COL '{target_col}' nicht in DataFrame.")
+    for c in id_cols:
+        if c not in columns:
+            raise KeyError(f"ID_COL '{c}' nicht in DataFrame.")
+
+    t = _q(time_col)
+    con.execute(f"CREATE OR REPLACE VIEW model_input AS SELECT * REPLACE (CAST({t} AS TIMESTAMP_NS) AS {t}) FROM {source}")
+
+    plan = TimeSplitPlan.from_config(val_start, test_start, split_ratios)
+    val_start_ts, test_start_ts = _split_bounds(con, "model_input", time_col, plan)
+    vs, ts = f"TIMESTAMP_NS '{val_start_ts}'", f"TIMESTAMP_NS '{test_start_ts}'"
+    predicates = {"train": f"{t} < {vs}", "val": f"{t} >= {vs} AND {t} < {ts}", "test": f"{t} >= {ts}"}
+    for name, pred in predicates.items():
+        con.execute(f"CREATE OR REPLACE VIEW {name}_raw AS SELECT * FROM model_input WHERE {pred}")
+
+    rows = {name: con.execute(f"SELECT count(*) FROM {name}_raw").fetchone()[0] for name in SPLITS}
+    if not all(rows.values()):
+        raise ValueError("Mindestens eine Split-Teilmenge ist leer – prüfe Grenzen/Datenbasis.")
+
+    scaler = None
+    if scale_cols:
+        scaler = _fit_scaler_sql(con, id_cols, list(scale_cols), scale_mode, scale_log1p)
+        con.register("scaler_stats", scaler.stats_frame())
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = {name: output_dir / f"{name}.parquet" for name in SPLITS}
+    for name in SPLITS:
+        con.execute(f"""
+            COPY ({_scaled_select(name, id_cols, scaler)} ORDER BY {t}, {_cols(id_cols)})
+            TO {_lit(paths[name])} (FORMAT parquet)
+        """)
+    scaler_files = scaler.save(output_dir) if scaler is not None else {}
+
+    fingerprint = inputs_fingerprint(
+        [data_path],
+        {"time_col": time_col, "id_cols": id_cols, "val_start": str(val_start_ts), "test_start": str(test_start_ts)},
+    )
+    report = _validate_splits(con, paths, time_col, id_cols, fingerprint)
+    raise_on_errors(report)
+
+    manifest = {
+        "time_col": time_col,
+        "id_cols": id_cols,
+        "target_col": target_col,
+        "val_start": str(val_start_ts.date()),
+        "test_start": str(test_start_ts.date()),
+        "rows": rows,
+        "output_dir": str(output_dir),
+        "source": str(data_path),
+        "scaled_cols": list(scale_cols or []),
+        "validation": report.to_dict(),
+        "scaling": (
+            {"mode": scale_mode, "log1p": scale_log1p, "files": scaler_files}
+            if scaler is not None else None
+        ),
+        "engine": "duckdb",
+    }
+    with (output_dir / "meta.json").open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
+
+
+# ------------------------- Lauf -------------------------
+
+def run(
+    raw_path: Path = RAW,
+    model_input_path: Path = MODEL_INPUT_PATH,
+    output_dir: Path = PROCESSED_DIR,
+    write_intermediate: bool = False,
+    threads: int = LAZY_ENGINE["threads"],
+    memory_limit: str = LAZY_ENGINE["memory_limit"],
+    temp_dir: Path = LAZY_ENGINE["temp_dir"],
+) -> Dict[str, Any]:
+    if SUBSAMPLE["fraction"] is not None:
+        raise ValueError("SUBSAMPLE gibt es nur im pandas-Split: SUBSAMPLE['fraction'] = None setzen und "
+                         "nach dem Lauf `python -m src subsample-dataset --fraction …` ausführen.")
+    t_start = time.perf_counter()
+    con = connect(threads, memory_limit, temp_dir)
+    try:
+        pipe = LazyPipeline(con, raw_path=raw_path).build()
+        if write_intermediate:
+            for stage, path in STAGES.items():
+                if path is not None and stage != "lags":
+                    n = pipe.write_stage(stage, path)
+                    print(f"[lazy_engine] {stage:<9} -> {path} ({n:,} Zeilen)")
+
+        n = pipe.write_stage("lags", model_input_path)
+        print(f"[lazy_engine] Features -> {model_input_path} ({n:,} Zeilen)")
+
+        manifest = write_splits(con, model_input_path, output_dir, scale_cols=list(SCALE_COLS))
+    finally:
+        con.close()
+
+    rows = manifest["rows"]
+    print("[lazy_engine] Fertig.")
+    print(f"- Train: {rows['train']} | Val: {rows['val']} | Test: {rows['test']}")
+    print(f"- Grenzen: VAL_START={manifest['val_start']}  TEST_START={manifest['test_start']}")
+    print(f"- Threads: {threads or os.cpu_count()} | memory_limit: {memory_limit} | "
+          f"Laufzeit: {time.perf_counter() - t_start:.1f}s")
+    return manifest
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Datenstufen align … Split als ein DuckDB-Query-Plan ausführen.")
+    ap.add_argument("--raw", type=str, default=str(RAW))
+    ap.add_argument("--write-intermediate", action="store_true",
+                    help="Zwischenstände wie der pandas-Pfad schreiben (train_aligned … train_features_cyc)")
+    ap.add_argument("--threads", type=int, default=LAZY_ENGINE["threads"], help="0 = alle Kerne")
+    ap.add_argument("--memory-limit", type=str, default=LAZY_ENGINE["memory_limit"], help="z. B. 4GB")
+    ap.add_argument("--temp-dir", type=str, default=str(LAZY_ENGINE["temp_dir"]))
+    args = ap.parse_args()
+    run(
+        raw_path=Path(args.raw),
+        write_intermediate=args.write_intermediate,
+        threads=args.threads,
+        memory_limit=args.memory_limit,
+        temp_dir=Path(args.temp_dir),
+    )
+
+
+if __name__ == "__main__":
+    # python -m src.data.lazy_engine
+    main()
@@ -0,0 +1,63 @@
+# src/data/pipeline.py
+"""
+Datenstufen align -> clean -> features -> cyclical -> lags -> model-dataset in einem Aufruf.
+
+Engine je Lauf wählbar (Standard: DATA_ENGINE aus config.py):
+    pandas  Einzelschritte nacheinander (main() der Stufenmodule), alle Zwischenstände + Rollups
+    duckdb  ein lazy Query-Plan (lazy_engine.py), mehrthreadig und out-of-core
+
+Aufruf:
+    python -m src.data.pipeline --engine duckdb
+    python -m src data-pipeline --engine pandas
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import time
+
+from src.config import DATA_ENGINE, LAZY_ENGINE
+
+ENGINES = ("pandas", "duckdb")
+
+# pandas-Pfad: Module mit main() in Reihenfolge wie PipelineOrder.md
+PANDAS_STAGES = (
+    "src.data.data_alignment",
+    "src.data.data_cleaning",
+    "src.data.feature_engineering",
+    "src.data.cyclical_encoder",
+    "src.data.lag_features",
+    "src.modeling.model_dataset",
+)
+
+
+def run_pandas() -> None:
+    for module_name in PANDAS_STAGES:
+        print(f"[pipeline] {module_name}")
+        importlib.import_module(module_name).main()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Alle Datenstufen bis zu den Splits ausführen.")
+    ap.add_argument("--engine", type=str, default=DATA_ENGINE, choices=ENGINES)
+    ap.add_argument("--write-intermediate", action="store_true",
+                    help="nur duckdb: Zwischenstände wie der pandas-Pfad schreiben")
+    ap.add_argument("--threads", type=int, default=LAZY_ENGINE["threads"], help="nur duckdb: 0 = alle Kerne")
+    ap.add_argument("--memory-limit", type=str, default=LAZY_ENGINE["memory_limit"], help="nur duckdb: z. B. 4GB")
+    args = ap.parse_args()
+
+    t_start = time.perf_counter()
+    print(f"[pipeline] Engine: {args.engine}")
+    if args.engine == "pandas":
+        run_pandas()
+    else:
+        from src.data.lazy_engine import run
+
+        run(write_intermediate=args.write_intermediate, threads=args.threads, memory_limit=args.memory_limit)
+    print(f"[pipeline] Gesamtlaufzeit: {time.perf_counter() - t_start:.1f}s")
+
+
+if __name__ == "__main__":
+    # python -m src.data.pipeline --engine duckdb
+    main()
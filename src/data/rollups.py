@@ -0,0 +1,159 @@
+# src/data/rollups.py
+"""
+Voraggregierte Rollup-Tabellen für die Diagnose-Plots.
+
+Statt dass jedes Plot-Skript die vollständigen Faktendaten liest und selbst
+`groupby(["date", "country"]).sum()` rechnet, werden hier einmalig – direkt in
+den Stufen data_alignment / data_cleaning – kleine Tabellen erzeugt:
+
+    Frequenz: daily | weekly | monthly
+    Ebene   : total | country | store | product | series (country/store/product)
+    Variante: raw | aligned | cleaned   -> data/interim/rollups/<variante>.parquet
+
+Layout (long): freq, level, country, store, product, date, num_sold, n_obs
+(nicht zur Ebene gehörende Schlüssel sind leer).
+Die Datei ist nach (freq, level, date) sortiert; `load_rollup` liest per
+Filter-Pushdown nur die benötigte Frequenz/Ebene.
+
+Aufruf (Backfill aus vorhandenen Dateien):
+    python -m src.data.rollups
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+from src.config import GROUP_COLS, INTERIM_DIR, RAW_DIR, ROLLUP_DIR, TARGET_COL, TIME_COL
+
+ROLLUP_VARIANTS = ("raw", "aligned", "cleaned")
+ROLLUP_FREQS = ("daily", "weekly", "monthly")
+
+# Ebene -> Schlüsselspalten (leere Liste = Gesamtsumme)
+ROLLUP_LEVELS: Dict[str, List[str]] = {
+    "total": [],
+    "country": ["country"],
+    "store": ["store"],
+    "product": ["product"],
+    "series": list(GROUP_COLS),
+}
+
+# Quelldateien je Variante (für den Backfill über main())
+ROLLUP_SOURCES: Dict[str, Path] = {
+    "raw": RAW_DIR / "tabular-playground-series-sep-2022" / "train.csv",
+    "aligned": INTERIM_DIR / "train_aligned.parquet",
+    "cleaned": INTERIM_DIR / "train_cleaned.parquet",
+}
+
+
+def _period_start(dates: pd.Series, freq: str) -> pd.Series:
+    """Normiert Datumswerte auf den Periodenbeginn (Tag, Montag der Woche, Monatserster)."""
+    if freq == "daily":
+        return dates
+    if freq == "weekly":
+        return dates - pd.to_timedelta(dates.dt.dayofweek, unit="D")
+    if freq == "monthly":
+        return dates.dt.to_period("M").dt.to_timestamp()
+    raise ValueError(f"Unbekannte Frequenz: {freq} (erlaubt: {ROLLUP_FREQS})")
+
+
+def build_rollups(df: pd.DataFrame, target_col: str = TARGET_COL) -> pd.DataFrame:
+    """
+    Erzeugt alle Frequenz-/Ebenen-Kombinationen einer Variante.
+
+    Die Faktendaten werden nur einmal gruppiert (Zeitreihe × Tag); alle
+    gröberen Tabellen entstehen aus diesem bereits kleinen Zwischenstand.
+    """
+    base = df[[TIME_COL, *GROUP_COLS, target_col]].copy()
+    base[TIME_COL] = pd.to_datetime(base[TIME_COL], errors="coerce").dt.normalize()
+
+    daily_series = (
+        base.groupby([TIME_COL, *GROUP_COLS], as_index=False, sort=False)
+        .agg(num_sold=(target_col, "sum"), n_obs=(target_col, "count"))
+    )
+
+    frames = []
+    for freq in ROLLUP_FREQS:
+        series = daily_series
+        if freq != "daily":
+            series = (
+                daily_series.assign(**{TIME_COL: _period_start(daily_series[TIME_COL], freq)})
+                .groupby([TIME_COL, *GROUP_COLS], as_index=False, sort=False)
+                .agg(num_sold=("num_sold", "sum"), n_obs=("n_obs", "sum"))
+            )
+        for level, keys in ROLLUP_LEVELS.items():
+            agg = series if keys == list(GROUP_COLS) else (
+                series.groupby([TIME_COL, *keys], as_index=False, sort=False)
+                .agg(num_sold=("num_sold", "sum"), n_obs=("n_obs", "sum"))
+            )
+            frames.append(agg.assign(freq=freq, level=level))
+
+    out = pd.concat(frames, ignore_index=True)
+    out = out[["freq", "level", *GROUP_COLS, TIME_COL, "num_sold", "n_obs"]]
+    out = out.rename(columns={"num_sold": target_col})
+    return out.sort_values(["freq", "level", TIME_COL], kind="stable").reset_index(drop=True)
+
+
+def write_rollups(df: pd.DataFrame, variant: str, out_dir: Path = ROLLUP_DIR) -> Path:
+    """Baut und speichert die Rollups einer Variante (raw/aligned/cleaned)."""
+    if variant not in ROLLUP_VARIANTS:
+        raise ValueError(f"Unbekannte Variante: {variant} (erlaubt: {ROLLUP_VARIANTS})")
+
+    rollups = build_rollups(df)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / f"{variant}.parquet"
+    # kleine Row-Groups -> Filter auf freq/level/date überspringen den Rest der Datei
+    rollups.to_parquet(path, index=False, row_group_size=16_384)
+    print(f"[rollups] {variant}: {len(rollups):,} Zeilen -> {path}")
+    return path
+
+
+def load_rollup(
+    variant: str,
+    freq: str = "daily",
+    level: str = "country",
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    rollup_dir: Path = ROLLUP_DIR,
+) -> pd.DataFrame:
+    """
+    Liest eine Rollup-Tabelle im gewohnten Plot-Format: date, <Schlüssel der Ebene>, num_sold.
+    `start`/`end` (inklusive) werden als Parquet-Filter angewendet.
+    """
+    path = rollup_dir / f"{variant}.parquet"
+    if not path.exists():
+        raise FileNotFoundError(
+            f"Rollup nicht gefunden: {path}\n"
+            "Bitte data_alignment.py/data_cleaning.py ausführen oder: python -m src.data.rollups"
+        )
+    if level not in ROLLUP_LEVELS:
+        raise ValueError(f"Unbekannte Ebene: {level} (erlaubt: {list(ROLLUP_LEVELS)})")
+
+    filters = [("freq", "==", freq), ("level", "==", level)]
+    if start is not None:
+        filters.append((TIME_COL, ">=", pd.Timestamp(start)))
+    if end is not None:
+        filters.append((TIME_COL, "<=", pd.Timestamp(end)))
+
+    keys = ROLLUP_LEVELS[level]
+    df = pd.read_parquet(path, columns=[TIME_COL, *keys, TARGET_COL], filters=filters)
+    return df.sort_values([*keys, TIME_COL], kind="stable").reset_index(drop=True)
+
+
+# ------------------------- CLI -------------------------
+
+def main() -> None:
+    """Backfill: erzeugt die Rollups aller vorhandenen Varianten."""
+    for variant, src in ROLLUP_SOURCES.items():
+        if not src.exists():
+            print(f"[rollups] {variant}: Quelle fehlt ({src}) – übersprungen.")
+            continue
+        df = pd.read_csv(src) if src.suffix == ".csv" else pd.read_parquet(src)
+        write_rollups(df, variant)
+
+
+if __name__ == "__main__":
+    # python -m src.data.rollups
+    main()
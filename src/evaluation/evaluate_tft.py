@@ -0,0 +1,267 @@
+# src/evaluation/evaluate_tft.py
+"""
+Bewertet einen trainierten TFT-Run auf dem Test-Split (oder Validation-Split).
+
+- Lädt das beste Checkpoint eines Runs über `load_trained_model`
+- Baut das Prognose-Dataset aus den im Modell gespeicherten Dataset-Parametern
+  (gleiche Encoder/Normalizer wie im Training, kein erneutes Fitten)
+- Führt eine gebatchte Vorhersage über alle Fenster des Splits aus
+- Berechnet MAE/RMSE/SMAPE/Quantile-Loss je Zeitreihe und je Aggregationsebene
+  (country, store, product, total) vektorisiert über `src.evaluation.metrics`
+
+Ausgabe unter results/tft/<run_id>/evaluation/:
+    predictions_<split>.parquet
+    metrics_series_<split>.parquet
+    metrics_levels_<split>.parquet
+    summary_<split>.json
+
+Aufrufbeispiel:
+    python -m src.evaluation.evaluate_tft --run results/tft/run_20251109_221602_baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    PROCESSED_DIR,
+    TARGET_COL,
+    ID_COLS,
+    TIME_COL,
+)
+from src.evaluation.metrics import (
+    QUANTILE_PREFIX,
+    level_metrics,
+    overall_metrics,
+    series_metrics,
+)
+
+
+# ------------------------- Checkpoint / Daten -------------------------
+
+def resolve_best_checkpoint(run_dir: Path) -> Path:
+    """Bestes Checkpoint aus summary.json, sonst jüngste .ckpt-Datei im Run-Ordner."""
+    summary_path = run_dir / "summary.json"
+    if summary_path.exists():
+        summary = json.loads(summary_path.read_text(encoding="utf-8"))
+        best = (summary.get("meta") or {}).get("best_checkpoint_path")
+        if best and Path(best).exists():
+            return Path(best)
+
+    checkpoints = sorted(
+        (run_dir / "checkpoints").glob("*.ckpt"),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    if not checkpoints:
+        raise FileNotFoundError(f"Kein Checkpoint gefunden in: {run_dir / 'checkpoints'}")
+    return checkpoints[0]
+
+
+def _read_split_with_history(processed_dir: Path, split: str) -> Tuple[pd.DataFrame, int]:
+    """
+    Liest den Ziel-Split plus den vorangehenden Split als Encoder-Historie.
+    Rückgabe: (DataFrame, erster time_idx des Ziel-Splits).
+    """
+    spec_path = processed_dir / "dataset_spec.json"
+    if not spec_path.exists():
+        raise FileNotFoundError(f"dataset_spec.json nicht gefunden: {spec_path}")
+    spec = json.loads(spec_path.read_text(encoding="utf-8"))
+
+    history_of = {"val": "train", "test": "val"}
+    if split not in history_of:
+        raise ValueError(f"Unbekannter Split: {split} (erlaubt: {sorted(history_of)})")
+
+    target_pq = Path(spec["paths"][split])
+    history_pq = Path(spec["paths"][history_of[split]])
+    for p in (target_pq, history_pq):
+        if not p.exists():
+            raise FileNotFoundError(f"Parquet-Datei nicht gefunden: {p}")
+
+    df_target = pd.read_parquet(target_pq)
+    df_history = pd.read_parquet(history_pq)
+
+    time_idx_col = "time_idx" if "time_idx" in df_target.columns else TIME_COL
+    first_idx = int(df_target[time_idx_col].min())
+
+    df = pd.concat([df_history, df_target], ignore_index=True)
+    if TARGET_COL in df.columns:
+        df[TARGET_COL] = pd.to_numeric(df[TARGET_COL], errors="coerce").astype("float32")
+    return df, first_idx
+
+
+def _longest_encoder(windows: pd.DataFrame) -> pd.Series:
+    """Je (Zeitreihe, Decoder-Start) nur das Fenster mit dem längsten Encoder."""
+    enc_len = windows["time_idx_first_prediction"] - windows["time_idx_first"]
+    keys = [windows[c] for c in (*ID_COLS, "time_idx_first_prediction")]
+    return enc_len == enc_len.groupby(keys).transform("max")
+
+
+def build_eval_dataset(model, df: pd.DataFrame, min_prediction_idx: int):
+    """
+    TimeSeriesDataSet mit den Parametern aus dem Checkpoint (Encoder/Normalizer wie im Training).
+    Mit min_encoder_length < max_encoder_length entstehen am Reihenende zusätzliche Fenster mit
+    kürzerem Encoder, aber gleichem Decoder – für Evaluation/Prognose bleibt je Decoder-Start nur
+    das längste (kurze Encoder also nur bei Reihen mit kurzer Historie).
+    """
+    from pytorch_forecasting import TimeSeriesDataSet
+
+    ds = TimeSeriesDataSet.from_parameters(
+        model.dataset_parameters,
+        df,
+        predict=False,
+        stop_randomization=True,
+        min_prediction_idx=min_prediction_idx,
+    )
+    keep = _longest_encoder(ds.decoded_index)
+    return ds if keep.all() else ds.filter(lambda _: keep.to_numpy(), copy=True)
+
+
+# ------------------------- Vorhersage -------------------------
+
+def predict_long(model, df: pd.DataFrame, min_prediction_idx: int, batch_size: int, num_workers: int) -> pd.DataFrame:
+    """
+    Gebatchte Vorhersage über alle Fenster ab `min_prediction_idx`.
+    Liefert eine Long-Tabelle mit einer Zeile je (Zeitreihe, Fenster, Horizont).
+    """
+    ds = build_eval_dataset(model, df, min_prediction_idx)
+    loader = ds.to_dataloader(train=False, batch_size=batch_size, num_workers=num_workers)
+
+    pred = model.predict(
+        loader,
+        mode="quantiles",
+        return_index=True,
+        return_y=True,
+        trainer_kwargs=dict(accelerator="cpu", logger=False, enable_progress_bar=False),
+    )
+
+    q_out = pred.output.detach().cpu().numpy()
+    if q_out.ndim == 2:  # Punktprognose ohne Quantil-Achse
+        q_out = q_out[..., None]
+    y_true = pred.y[0].detach().cpu().numpy()
+    n_windows, horizon, n_q = q_out.shape
+
+    # Quantil-Niveaus nur aus dem Loss des Modells; Punktprognose (ohne Quantile) zählt als Median
+    quantiles = list(getattr(model.loss, "quantiles", [0.5]))
+    if len(quantiles) != n_q:
+        raise ValueError(
+            f"Modell liefert {n_q} Quantile, der Loss ({type(model.loss).__name__}) nennt "
+            f"{len(quantiles)}: {quantiles} – Intervalle wären falsch beschriftet."
+        )
+    median_pos = int(np.argmin(np.abs(np.asarray(quantiles) - 0.5)))
+
+    index = pred.index.reset_index(drop=True)
+    time_idx_col = ds.time_idx
+    rep = np.repeat(np.arange(n_windows), horizon)
+    steps = np.tile(np.arange(horizon), n_windows)
+
+    out = index.loc[rep, ID_COLS].reset_index(drop=True)
+    out["time_idx"] = index[time_idx_col].to_numpy()[rep] + steps
+    out["horizon"] = (steps + 1).astype("int16")
+    out["y_true"] = y_true.reshape(-1)
+    out["y_pred"] = q_out[:, :, median_pos].reshape(-1)
+    flat_q = q_out.reshape(-1, n_q)
+    for j, q in enumerate(quantiles):
+        out[f"{QUANTILE_PREFIX}{q:.2f}"] = flat_q[:, j]
+
+    # Datum zu time_idx nachschlagen (für spätere Auswertungen/Plots)
+    if TIME_COL in df.columns and time_idx_col != TIME_COL:
+        date_map = df[[time_idx_col, TIME_COL]].drop_duplicates(time_idx_col).set_index(time_idx_col)[TIME_COL]
+        out.insert(len(ID_COLS), TIME_COL, out["time_idx"].map(date_map).to_numpy())
+
+    return out
+
+
+# ------------------------- Export -------------------------
+
+def write_evaluation(
+    pred: pd.DataFrame,
+    out_dir: Path,
+    split: str,
+    meta: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Schreibt Prognosen, Kennzahlen (Parquet) und eine kompakte JSON-Zusammenfassung."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    per_series = series_metrics(pred, list(ID_COLS))
+    per_level = level_metrics(pred)
+
+    paths = {
+        "predictions": out_dir / f"predictions_{split}.parquet",
+        "metrics_series": out_dir / f"metrics_series_{split}.parquet",
+        "metrics_levels": out_dir / f"metrics_levels_{split}.parquet",
+        "summary": out_dir / f"summary_{split}.json",
+    }
+    pred.to_parquet(paths["predictions"], index=False)
+    per_series.to_parquet(paths["metrics_series"], index=False)
+    per_level.to_parquet(paths["metrics_levels"], index=False)
+
+    level_cols = [c for c in ("mae", "rmse", "smape", "quantile_loss") if c in per_level.columns]
+    summary = {
+        "split": split,
+        "n_series": int(len(per_series)),
+        "n_rows": int(len(pred)),
+        "metrics": overall_metrics(pred),
+        "levels": (
+            per_level.groupby("level")[level_cols].mean().round(6).to_dict(orient="index")
+        ),
+        "files": {k: str(v) for k, v in paths.items() if k != "summary"},
+        "meta": meta,
+    }
+    with paths["summary"].open("w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
+
+
+# ------------------------- CLI -------------------------
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--run", type=str, required=True, help="Run-Ordner, z. B. results/tft/run_...")
+    ap.add_argument("--split", type=str, default="test", choices=["val", "test"])
+    ap.add_argument("--checkpoint", type=str, default=None, help="Optional: explizites .ckpt")
+    ap.add_argument("--batch-size", type=int, default=512)
+    ap.add_argument("--num-workers", type=int, default=0)
+    args = ap.parse_args()
+
+    from src.utils.load_trained_tft import load_trained_model
+
+    run_dir = Path(args.run)
+    ckpt_path = Path(args.checkpoint) if args.checkpoint else resolve_best_checkpoint(run_dir)
+
+    t_start = time.perf_counter()
+    model = load_trained_model(ckpt_path)
+    df, first_idx = _read_split_with_history(PROCESSED_DIR, args.split)
+    pred = predict_long(model, df, first_idx, args.batch_size, args.num_workers)
+    predict_time_sec = round(time.perf_counter() - t_start, 2)
+
+    t_metrics = time.perf_counter()
+    summary = write_evaluation(
+        pred,
+        run_dir / "evaluation",
+        args.split,
+        meta={
+            "run_id": run_dir.name,
+            "checkpoint": str(ckpt_path),
+            "predict_time_sec": predict_time_sec,
+        },
+    )
+    metrics_time_sec = round(time.perf_counter() - t_metrics, 2)
+
+    print(f"[evaluate_tft] Split: {args.split} | Reihen: {summary['n_series']} | Zeilen: {summary['n_rows']:,}")
+    for k, v in summary["metrics"].items():
+        print(f"  - {k}: {v}")
+    print(f"[evaluate_tft] Vorhersage: {predict_time_sec}s | Kennzahlen: {metrics_time_sec}s")
+    print(f"[evaluate_tft] Ausgabe: {run_dir / 'evaluation'}")
+
+
+if __name__ == "__main__":
+    # python -m src.evaluation.evaluate_tft --run results/tft/<run_id>
+    main()
@@ -0,0 +1,269 @@
+# src/evaluation/forecast.py
+"""
+Prognosen je Zeitreihe ab einem Cutoff – mit Prognose-Cache vor dem Modell.
+
+- Schlüssel je Reihe: (Checkpoint-Hash, dataset_spec-Hash, Reihen-ID, Cutoff), siehe
+  src/utils/forecast_cache.py
+- Treffer kommen direkt aus dem Cache; nur für Fehlschläge wird das Modell über
+  `load_inference_model` (Inferenz-Artefakt neben dem Checkpoint) geladen und genau ein Fenster je Reihe vorhergesagt
+  (Encoder bis Cutoff, Decoder = die nächsten max_prediction_length Tage)
+- Die neuen Prognosen werden anschließend in den Cache geschrieben
+
+Ausgabe (Long-Format wie evaluate_tft.py, ohne y_true):
+    <ID_COLS>, date, time_idx, horizon, y_pred, q_<quantil>…
+
+Aufrufbeispiele:
+    python -m src.evaluation.forecast --run results/tft/run_… --cutoff 2020-09-30
+    python -m src forecast --best --cutoff 2020-09-30 --where country=Germany
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import FORECAST_CACHE, ID_COLS, PROCESSED_DIR, TARGET_COL, TIME_COL
+from src.evaluation.evaluate_tft import predict_long, resolve_best_checkpoint
+from src.evaluation.metrics import QUANTILE_PREFIX
+from src.modeling.validation import SPLITS
+from src.utils.forecast_cache import CachedForecast, ForecastCache, file_hash, series_id
+
+TIME_IDX_COL = "time_idx"
+
+
+# ------------------------- Daten -------------------------
+
+def _split_paths(processed_dir: Path) -> Tuple[Path, List[Path]]:
+    spec_path = processed_dir / "dataset_spec.json"
+    if not spec_path.exists():
+        raise FileNotFoundError(f"dataset_spec.json nicht gefunden: {spec_path}")
+    spec = json.loads(spec_path.read_text(encoding="utf-8"))
+    paths = [Path(spec["paths"][s]) for s in SPLITS]
+    for p in paths:
+        if not p.exists():
+            raise FileNotFoundError(f"Parquet-Datei nicht gefunden: {p}")
+    return spec_path, paths
+
+
+def _read_panel(paths: List[Path], columns: Optional[List[str]] = None, filters=None) -> pd.DataFrame:
+    return pd.concat(
+        [pd.read_parquet(p, columns=columns, filters=filters) for p in paths], ignore_index=True
+    )
+
+
+def _series_ids(df: pd.DataFrame) -> pd.Series:
+    return df[list(ID_COLS)].astype(str).agg("|".join, axis=1)
+
+
+def requested_series(index: pd.DataFrame, where: Dict[str, str]) -> List[str]:
+    """Alle Reihen des Panels, optional gefiltert (z. B. {"country": "Germany"})."""
+    unknown = [k for k in where if k not in ID_COLS]
+    if unknown:
+        raise KeyError(f"Filter nur über ID_COLS {list(ID_COLS)} möglich, nicht: {unknown}")
+    keys = index[list(ID_COLS)].drop_duplicates()
+    for col, value in where.items():
+        keys = keys[keys[col].astype(str) == value]
+    if keys.empty:
+        raise ValueError(f"Keine Zeitreihe passt zum Filter {where}.")
+    return sorted(_series_ids(keys).tolist())
+
+
+def cutoff_time_idx(index: pd.DataFrame, cutoff: str) -> int:
+    ts = pd.Timestamp(cutoff)
+    hit = index.loc[index[TIME_COL] == ts, TIME_IDX_COL]
+    if hit.empty:
+        raise ValueError(f"Cutoff {ts.date()} liegt nicht im Datensatz "
+                         f"({index[TIME_COL].min().date()} – {index[TIME_COL].max().date()}).")
+    return int(hit.iloc[0])
+
+
+# ------------------------- Modell (nur bei Fehlschlägen) -------------------------
+
+def predict_at_cutoff(
+    model,
+    paths: List[Path],
+    series: List[str],
+    cutoff_idx: int,
+    batch_size: int,
+    num_workers: int,
+) -> List[CachedForecast]:
+    """Genau ein Fenster je Reihe: Encoder endet am Cutoff, Decoder deckt den vollen Horizont."""
+    params = model.dataset_parameters
+    horizon = int(params["max_prediction_length"])
+    lo, hi = cutoff_idx - int(params["max_encoder_length"]) + 1, cutoff_idx + horizon
+    df = _read_panel(paths, filters=[(TIME_IDX_COL, ">=", lo), (TIME_IDX_COL, "<=", hi)])
+    df = df[_series_ids(df).isin(set(series))].reset_index(drop=True)
+    if df.empty or df[TIME_IDX_COL].max() < hi:
+        raise ValueError(f"Für den Cutoff fehlen Decoder-Tage (benötigt bis time_idx {hi}).")
+    df[TARGET_COL] = pd.to_numeric(df[TARGET_COL], errors="coerce").astype("float32")
+
+    pred = predict_long(model, df, cutoff_idx + 1, batch_size, num_workers)
+    start = pred[TIME_IDX_COL] - (pred["horizon"].astype("int64") - 1)
+    pred = pred[start == cutoff_idx + 1].sort_values([*ID_COLS, "horizon"])
+
+    q_cols = [c for c in pred.columns if c.startswith(QUANTILE_PREFIX)]
+    quantiles = [float(c[len(QUANTILE_PREFIX):]) for c in q_cols]
+    expected_idx = np.arange(cutoff_idx + 1, cutoff_idx + 1 + horizon)
+    out: List[CachedForecast] = []
+    for key, part in pred.groupby(list(ID_COLS), sort=False):
+        # genau ein Fenster je Reihe: Horizonte 1..H, aufeinanderfolgende Tage ab Cutoff + 1
+        dates = pd.to_datetime(part[TIME_COL])
+        if (
+            part["horizon"].tolist() != list(range(1, horizon + 1))
+            or not np.array_equal(part[TIME_IDX_COL].to_numpy(), expected_idx)
+            or not (dates.diff().iloc[1:] == pd.Timedelta(days=1)).all()
+        ):
+            raise RuntimeError(
+                f"{series_id(key)}: erwartet ein Fenster mit Horizont 1..{horizon} ab time_idx "
+                f"{cutoff_idx + 1}, erhalten {len(part)} Zeilen (Horizonte {sorted(set(part['horizon']))})."
+            )
+        out.append(CachedForecast(
+            series_id=series_id(key),
+            quantiles=quantiles,
+            first_time_idx=int(part[TIME_IDX_COL].iloc[0]),
+            dates=[str(d.date()) for d in dates],
+            values=part[q_cols].to_numpy(dtype="float32").reshape(-1).tolist(),
+        ))
+    return out
+
+
+# ------------------------- Ausgabe -------------------------
+
+def forecasts_frame(forecasts: List[CachedForecast]) -> pd.DataFrame:
+    parts = []
+    for fc in forecasts:
+        q = np.asarray(fc.values, dtype="float32").reshape(fc.horizon, len(fc.quantiles))
+        part = pd.DataFrame({
+            **dict(zip(ID_COLS, fc.series_id.split("|"))),
+            TIME_COL: pd.to_datetime(fc.dates),
+            TIME_IDX_COL: np.arange(fc.first_time_idx, fc.first_time_idx + fc.horizon),
+            "horizon": np.arange(1, fc.horizon + 1, dtype="int16"),
+            "y_pred": q[:, int(np.argmin(np.abs(np.asarray(fc.quantiles) - 0.5)))],
+        })
+        for j, qv in enumerate(fc.quantiles):
+            part[f"{QUANTILE_PREFIX}{qv:.2f}"] = q[:, j]
+        parts.append(part)
+    if not parts:
+        raise ValueError("Keine Prognosen erzeugt.")
+    return pd.concat(parts, ignore_index=True).sort_values([*ID_COLS, "horizon"], ignore_index=True)
+
+
+def forecast(
+    ckpt_path: Path,
+    cutoff: str,
+    where: Dict[str, str],
+    processed_dir: Path = PROCESSED_DIR,
+    cache: Optional[ForecastCache] = None,
+    batch_size: int = 512,
+    num_workers: int = 0,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Prognosen für alle angefragten Reihen; `cache=None` rechnet alles mit dem Modell."""
+    t_start = time.perf_counter()
+    spec_path, paths = _split_paths(processed_dir)
+    index = _read_panel(paths, columns=[*ID_COLS, TIME_COL, TIME_IDX_COL])
+    cutoff_idx = cutoff_time_idx(index, cutoff)
+    cutoff_key = str(pd.Timestamp(cutoff).date())
+    series = requested_series(index, where)
+    del index
+
+    ckpt_hash, spec_hash = file_hash(ckpt_path), file_hash(spec_path)
+    hits = cache.get_many(ckpt_hash, spec_hash, cutoff_key, series) if cache is not None else {}
+    misses = [s for s in series if s not in hits]
+
+    computed: List[CachedForecast] = []
+    if misses:
+        from src.utils.load_trained_tft import load_inference_model
+
+        model = load_inference_model(ckpt_path)
+        computed = predict_at_cutoff(model, paths, misses, cutoff_idx, batch_size, num_workers)
+        if cache is not None:
+            cache.put_many(ckpt_hash, spec_hash, cutoff_key, computed, checkpoint_path=ckpt_path)
+
+    got = {fc.series_id for fc in computed} | set(hits)
+    info = {
+        "cutoff": cutoff_key,
+        "checkpoint": str(ckpt_path),
+        "checkpoint_hash": ckpt_hash,
+        "spec_hash": spec_hash,
+        "n_series": len(series),
+        "cache_hits": len(hits),
+        "model_series": len(computed),
+        "missing_series": [s for s in series if s not in got],
+        "seconds": round(time.perf_counter() - t_start, 3),
+    }
+    return forecasts_frame([*hits.values(), *computed]), info
+
+
+# ------------------------- CLI -------------------------
+
+def _parse_where(items: List[str]) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    for item in items:
+        if "=" not in item:
+            raise ValueError(f"Filter erwartet Form spalte=wert: {item}")
+        key, value = item.split("=", 1)
+        out[key.strip()] = value.strip()
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Prognosen ab einem Cutoff (mit Prognose-Cache).")
+    src_group = ap.add_mutually_exclusive_group(required=True)
+    src_group.add_argument("--run", type=str, help="Run-Ordner, z. B. results/tft/run_...")
+    src_group.add_argument("--best", action="store_true", help="Bester Run aus der Run-Registry")
+    src_group.add_argument("--checkpoint", type=str, help="Explizites .ckpt")
+    ap.add_argument("--cutoff", type=str, required=True, help="Letzter beobachteter Tag, z. B. 2020-09-30")
+    ap.add_argument("--where", action="append", default=[], help="Reihenfilter, z. B. country=Germany")
+    ap.add_argument("--out", type=str, default=None, help="Optional: Parquet-Ausgabe")
+    ap.add_argument("--no-cache", action="store_true", help="Cache umgehen (immer das Modell rechnen)")
+    ap.add_argument("--batch-size", type=int, default=512)
+    ap.add_argument("--num-workers", type=int, default=0)
+    args = ap.parse_args()
+
+    if args.checkpoint:
+        ckpt_path = Path(args.checkpoint)
+    elif args.run:
+        ckpt_path = resolve_best_checkpoint(Path(args.run))
+    else:
+        from src.utils.run_registry import RunRegistry
+
+        with RunRegistry() as registry:
+            run = registry.best("best_val_loss", model_type="tft")
+        if not run or not run.get("best_checkpoint_path"):
+            raise FileNotFoundError("Kein bester Run mit Checkpoint in der Run-Registry.")
+        ckpt_path = Path(run["best_checkpoint_path"])
+
+    cache = None if args.no_cache else ForecastCache()
+    try:
+        pred, info = forecast(ckpt_path, args.cutoff, _parse_where(args.where), cache=cache,
+                              batch_size=args.batch_size, num_workers=args.num_workers)
+        stats = cache.stats() if cache is not None else None
+    finally:
+        if cache is not None:
+            cache.close()
+
+    print(f"[forecast] Cutoff {info['cutoff']} | Reihen: {info['n_series']} | "
+          f"Cache-Treffer: {info['cache_hits']} | Modell: {info['model_series']} | {info['seconds']}s")
+    if info["missing_series"]:
+        print(f"[Warnung] {len(info['missing_series'])} Reihen ohne Prognose (zu kurze Historie/Horizont).")
+    if stats is not None:
+        print(f"[forecast] Cache gesamt: Trefferquote {stats['hit_rate']:.1%} | "
+              f"{stats['entries']} Einträge | {stats['size_mb']} MB ({FORECAST_CACHE['path']})")
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        pred.to_parquet(out, index=False)
+        print(f"[forecast] Ausgabe: {out}")
+    else:
+        print(pred.head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    # python -m src.evaluation.forecast --run results/tft/<run_id> --cutoff 2020-09-30
+    main()
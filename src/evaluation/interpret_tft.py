@@ -0,0 +1,243 @@
+# src/evaluation/interpret_tft.py
+"""
+Interpretation eines trainierten TFT-Runs: Variablen-Wichtigkeiten und Attention-Profile.
+
+- Lädt das beste Checkpoint eines Runs über `load_trained_model`
+- Läuft gebatcht über alle Fenster des Splits (val/test) und ruft je Batch
+  `interpret_output(reduction="none")` auf
+- Aggregiert sofort je Zeitreihe (laufende Summen + Zähler) – Roh-Ausgaben eines
+  Batches werden danach verworfen, der Speicherbedarf hängt nur von
+  Anzahl Reihen × Variablen ab, nicht von der Anzahl Fenster
+
+Ausgabe unter results/tft/<run_id>/interpretation/:
+    importance_<split>.parquet   <ID_COLS>, kind (static/encoder/decoder), variable, importance, n_windows
+    attention_<split>.parquet    <ID_COLS>, lag (-max_encoder_length … -1), attention, n_windows
+                                 (Mittel nur über Fenster, die diesen Lag enthalten -> bei kurzen
+                                 Encodern summiert das Profil nicht exakt auf 1)
+    summary_<split>.json         Gesamt-Ranking der Variablen, mittleres Attention-Profil
+
+Aufrufbeispiel:
+    python -m src.evaluation.interpret_tft --run results/tft/run_20251109_221602_baseline --split val
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import ID_COLS, PROCESSED_DIR
+from src.evaluation.evaluate_tft import (
+    _read_split_with_history,
+    build_eval_dataset,
+    resolve_best_checkpoint,
+)
+
+IMPORTANCE_KINDS = ("static", "encoder", "decoder")
+
+
+# ------------------------- Akkumulator -------------------------
+
+@dataclass
+class InterpretationAccumulator:
+    """Laufende Summen je Zeitreihe; Zeilen werden beim ersten Auftreten einer Reihe angelegt."""
+
+    variables: Dict[str, List[str]]
+    max_encoder_length: int
+    keys: Dict[Tuple, int] = field(default_factory=dict)
+    n_windows: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype="int64"))
+    importance: Dict[str, np.ndarray] = field(default_factory=dict)
+    attention_sum: np.ndarray = field(default_factory=lambda: np.zeros((0, 0)))
+    attention_n: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype="int64"))
+
+    def __post_init__(self) -> None:
+        self.importance = {k: np.zeros((0, len(v))) for k, v in self.variables.items()}
+        self.attention_sum = np.zeros((0, self.max_encoder_length))
+        self.attention_n = np.zeros((0, self.max_encoder_length), dtype="int64")
+
+    def _rows_for(self, index: pd.DataFrame) -> np.ndarray:
+        """Zeilennummer je Fenster; neue Reihen vergrößern die Arrays (amortisiert verdoppelnd)."""
+        inv, uniq = pd.MultiIndex.from_frame(index[list(ID_COLS)]).factorize()
+        rows = np.fromiter((self.keys.setdefault(k, len(self.keys)) for k in uniq), dtype="int64", count=len(uniq))
+
+        need = len(self.keys)
+        if need > len(self.n_windows):
+            cap = max(need, 2 * len(self.n_windows), 64)
+            grow = lambda a: np.concatenate([a, np.zeros((cap - len(a), *a.shape[1:]), dtype=a.dtype)])  # noqa: E731
+            self.n_windows = grow(self.n_windows)
+            self.importance = {k: grow(v) for k, v in self.importance.items()}
+            self.attention_sum = grow(self.attention_sum)
+            self.attention_n = grow(self.attention_n)
+        return rows[inv]
+
+    def add(self, index: pd.DataFrame, interp: Dict[str, np.ndarray], encoder_lengths: np.ndarray) -> None:
+        rows = self._rows_for(index)
+        np.add.at(self.n_windows, rows, 1)
+        for kind in IMPORTANCE_KINDS:
+            np.add.at(self.importance[kind], rows, interp[f"{kind}_variables"])
+
+        # Attention ist rechtsbündig (letzter Encoder-Schritt rechts); nur belegte Lags zählen
+        positions = np.arange(self.max_encoder_length)
+        valid = positions[None, :] >= (self.max_encoder_length - encoder_lengths[:, None])
+        np.add.at(self.attention_sum, rows, np.where(valid, interp["attention"], 0.0))
+        np.add.at(self.attention_n, rows, valid.astype("int64"))
+
+    # ------------------------- Export -------------------------
+
+    def _id_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(list(self.keys), columns=list(ID_COLS))
+
+    def importance_frame(self) -> pd.DataFrame:
+        n = len(self.keys)
+        ids = self._id_frame()
+        parts = []
+        for kind in IMPORTANCE_KINDS:
+            names = self.variables[kind]
+            if not names:
+                continue
+            mean = self.importance[kind][:n] / np.maximum(self.n_windows[:n, None], 1)
+            part = ids.loc[np.repeat(np.arange(n), len(names))].reset_index(drop=True)
+            part["kind"] = kind
+            part["variable"] = np.tile(names, n)
+            part["importance"] = mean.reshape(-1).astype("float32")
+            part["n_windows"] = np.repeat(self.n_windows[:n], len(names))
+            parts.append(part)
+        return pd.concat(parts, ignore_index=True)
+
+    def attention_frame(self) -> pd.DataFrame:
+        n = len(self.keys)
+        L = self.max_encoder_length
+        counts = self.attention_n[:n]
+        mean = np.divide(self.attention_sum[:n], counts, out=np.full((n, L), np.nan), where=counts > 0)
+        out = self._id_frame().loc[np.repeat(np.arange(n), L)].reset_index(drop=True)
+        out["lag"] = np.tile(np.arange(-L, 0), n).astype("int16")
+        out["attention"] = mean.reshape(-1).astype("float32")
+        out["n_windows"] = counts.reshape(-1)
+        return out
+
+    def overall(self) -> Dict[str, Any]:
+        """Über alle Fenster gewichtete Mittel (Reihen mit vielen Fenstern zählen stärker)."""
+        n = len(self.keys)
+        total = max(int(self.n_windows[:n].sum()), 1)
+        ranking = {}
+        for kind in IMPORTANCE_KINDS:
+            mean = self.importance[kind][:n].sum(axis=0) / total
+            order = np.argsort(-mean)
+            ranking[kind] = {self.variables[kind][i]: round(float(mean[i]), 6) for i in order}
+        att_n = self.attention_n[:n].sum(axis=0)
+        att = np.divide(self.attention_sum[:n].sum(axis=0), att_n, out=np.zeros(self.max_encoder_length), where=att_n > 0)
+        return {
+            "n_series": n,
+            "n_windows": int(self.n_windows[:n].sum()),
+            "importance": ranking,
+            "attention_by_lag": {int(lag): round(float(a), 6) for lag, a in zip(range(-len(att), 0), att)},
+        }
+
+
+# ------------------------- Interpretation -------------------------
+
+def interpret_dataset(model, ds, batch_size: int, num_workers: int, max_batches: int | None = None) -> InterpretationAccumulator:
+    """Gebatchte Interpretation über alle Fenster von `ds` (ohne Roh-Ausgaben zu sammeln)."""
+    import torch
+
+    acc = InterpretationAccumulator(
+        variables={
+            "static": list(model.static_variables),
+            "encoder": list(model.encoder_variables),
+            "decoder": list(model.decoder_variables),
+        },
+        max_encoder_length=int(model.hparams.max_encoder_length),
+    )
+    loader = ds.to_dataloader(train=False, batch_size=batch_size, num_workers=num_workers)
+
+    model.eval()
+    with torch.inference_mode():
+        for i, (x, _) in enumerate(loader):
+            if max_batches is not None and i >= max_batches:
+                break
+            out = model(x)
+            interp = model.interpret_output(out, reduction="none")
+            acc.add(
+                ds.x_to_index(x),
+                {k: v.detach().cpu().numpy() for k, v in interp.items() if not k.endswith("histogram")},
+                x["encoder_lengths"].cpu().numpy(),
+            )
+    return acc
+
+
+def write_interpretation(acc: InterpretationAccumulator, out_dir: Path, split: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "importance": out_dir / f"importance_{split}.parquet",
+        "attention": out_dir / f"attention_{split}.parquet",
+        "summary": out_dir / f"summary_{split}.json",
+    }
+    acc.importance_frame().to_parquet(paths["importance"], index=False)
+    acc.attention_frame().to_parquet(paths["attention"], index=False)
+
+    summary = {
+        "split": split,
+        **acc.overall(),
+        "files": {k: str(v) for k, v in paths.items() if k != "summary"},
+        "meta": meta,
+    }
+    with paths["summary"].open("w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
+
+
+# ------------------------- CLI -------------------------
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Variablen-Wichtigkeiten und Attention eines TFT-Runs extrahieren.")
+    ap.add_argument("--run", type=str, required=True, help="Run-Ordner, z. B. results/tft/run_...")
+    ap.add_argument("--split", type=str, default="val", choices=["val", "test"])
+    ap.add_argument("--checkpoint", type=str, default=None, help="Optional: explizites .ckpt")
+    ap.add_argument("--batch-size", type=int, default=512)
+    ap.add_argument("--num-workers", type=int, default=0)
+    ap.add_argument("--max-batches", type=int, default=None, help="Optional: nur die ersten n Batches (Stichprobe)")
+    args = ap.parse_args()
+
+    from src.utils.load_trained_tft import load_trained_model
+
+    run_dir = Path(args.run)
+    ckpt_path = Path(args.checkpoint) if args.checkpoint else resolve_best_checkpoint(run_dir)
+
+    t_start = time.perf_counter()
+    model = load_trained_model(ckpt_path)
+    df, first_idx = _read_split_with_history(PROCESSED_DIR, args.split)
+    ds = build_eval_dataset(model, df, first_idx)
+    del df  # Dataset hält eigene Tensoren
+    acc = interpret_dataset(model, ds, args.batch_size, args.num_workers, args.max_batches)
+    interpret_time_sec = round(time.perf_counter() - t_start, 2)
+
+    summary = write_interpretation(
+        acc,
+        run_dir / "interpretation",
+        args.split,
+        meta={
+            "run_id": run_dir.name,
+            "checkpoint": str(ckpt_path),
+            "interpret_time_sec": interpret_time_sec,
+            "max_batches": args.max_batches,
+        },
+    )
+
+    print(f"[interpret_tft] Split: {args.split} | Reihen: {summary['n_series']} | Fenster: {summary['n_windows']:,}")
+    for kind, ranking in summary["importance"].items():
+        top = list(ranking.items())[:5]
+        if top:
+            print(f"  - {kind:<8}: " + ", ".join(f"{k}={v:.3f}" for k, v in top))
+    print(f"[interpret_tft] Laufzeit: {interpret_time_sec}s")
+    print(f"[interpret_tft] Ausgabe: {run_dir / 'interpretation'}")
+
+
+if __name__ == "__main__":
+    # python -m src.evaluation.interpret_tft --run results/tft/<run_id> --split val
+    main()
@@ -0,0 +1,190 @@
+# src/evaluation/metrics.py
+"""
+Vektorisierte Fehlermaße für Prognosetabellen im Long-Format.
+
+Alle Kennzahlen werden über ganzzahlige Gruppencodes mit `np.bincount`
+aggregiert – keine Python-Schleife über Gruppen. Dadurch bleibt die
+Auswertung auch bei zehntausenden Zeitreihen im Sekundenbereich.
+
+Erwartetes Layout einer Prognosetabelle (siehe evaluate_tft.py):
+    <ID_COLS>, time_idx, horizon, y_true, y_pred, [q_0.10, q_0.50, ...]
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+QUANTILE_PREFIX = "q_"
+
+# Aggregationsebenen für die hierarchische Auswertung (leere Liste = Gesamtsumme)
+DEFAULT_LEVELS: Dict[str, List[str]] = {
+    "total": [],
+    "country": ["country"],
+    "store": ["country", "store"],
+    "product": ["product"],
+}
+
+
+# ------------------------- Hilfsfunktionen -------------------------
+
+def quantile_columns(df: pd.DataFrame) -> List[str]:
+    """Liefert die Quantilspalten (q_<wert>) in aufsteigender Reihenfolge."""
+    cols = [c for c in df.columns if c.startswith(QUANTILE_PREFIX)]
+    return sorted(cols, key=lambda c: float(c[len(QUANTILE_PREFIX):]))
+
+
+def quantile_levels(cols: Sequence[str]) -> np.ndarray:
+    return np.array([float(c[len(QUANTILE_PREFIX):]) for c in cols], dtype="float64")
+
+
+def group_codes(df: pd.DataFrame, keys: List[str]) -> Tuple[np.ndarray, pd.DataFrame]:
+    """
+    Kodiert die Schlüsselspalten einmalig zu Integer-Codes.
+    Rückgabe: (codes je Zeile, eindeutige Schlüssel in Code-Reihenfolge).
+    """
+    if not keys:
+        return np.zeros(len(df), dtype="int64"), pd.DataFrame(index=[0])
+    # groupby().ngroup() kodiert spaltenweise – deutlich schneller als ein Tupel-MultiIndex
+    codes = df.groupby(keys, sort=False, observed=True, dropna=False).ngroup().to_numpy(dtype="int64")
+    # Codes sind in Reihenfolge des ersten Auftretens -> erste Zeile je Code = eindeutiger Schlüssel
+    first = np.flatnonzero(~pd.Series(codes).duplicated().to_numpy())
+    uniques = df[keys].iloc[first].reset_index(drop=True)
+    return codes, uniques
+
+
+# ------------------------- Kennzahlen -------------------------
+
+def grouped_metrics(
+    codes: np.ndarray,
+    n_groups: int,
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    q_pred: np.ndarray | None = None,
+    quantiles: np.ndarray | None = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Berechnet MAE, RMSE, SMAPE (in %) und optional den Quantile-Loss je Gruppe.
+
+    Der Quantile-Loss ist der über alle Quantile gemittelte Pinball-Loss.
+    Zeilen mit fehlendem Ist- oder Prognosewert werden ignoriert.
+    """
+    y_true = np.asarray(y_true, dtype="float64")
+    y_pred = np.asarray(y_pred, dtype="float64")
+    valid = np.isfinite(y_true) & np.isfinite(y_pred)
+    w = valid.astype("float64")
+
+    err = np.where(valid, y_true - y_pred, 0.0)
+    abs_err = np.abs(err)
+    denom = np.abs(y_true) + np.abs(y_pred)
+    smape_terms = np.divide(
+        2.0 * abs_err, denom, out=np.zeros_like(abs_err), where=valid & (denom > 0)
+    )
+
+    n = np.bincount(codes, weights=w, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out: Dict[str, np.ndarray] = {
+            "n_obs": n.astype("int64"),
+            "mae": np.bincount(codes, weights=abs_err, minlength=n_groups) / n,
+            "rmse": np.sqrt(np.bincount(codes, weights=err ** 2, minlength=n_groups) / n),
+            "smape": 100.0 * np.bincount(codes, weights=smape_terms, minlength=n_groups) / n,
+        }
+
+        if q_pred is not None and quantiles is not None and len(quantiles):
+            diff = y_true[:, None] - np.asarray(q_pred, dtype="float64")
+            pinball = np.maximum(quantiles * diff, (quantiles - 1.0) * diff)
+            pinball = np.where(valid[:, None] & np.isfinite(pinball), pinball, 0.0).mean(axis=1)
+            out["quantile_loss"] = np.bincount(codes, weights=pinball, minlength=n_groups) / n
+
+    return out
+
+
+def series_metrics(pred: pd.DataFrame, id_cols: List[str]) -> pd.DataFrame:
+    """Kennzahlen je einzelner Zeitreihe (Kombination aus id_cols)."""
+    q_cols = quantile_columns(pred)
+    codes, keys = group_codes(pred, id_cols)
+    metrics = grouped_metrics(
+        codes,
+        len(keys),
+        pred["y_true"].to_numpy(),
+        pred["y_pred"].to_numpy(),
+        pred[q_cols].to_numpy() if q_cols else None,
+        quantile_levels(q_cols) if q_cols else None,
+    )
+    return pd.concat([keys, pd.DataFrame(metrics)], axis=1)
+
+
+def aggregate_forecasts(
+    pred: pd.DataFrame,
+    keys: List[str],
+    value_cols: List[str],
+) -> pd.DataFrame:
+    """
+    Summiert Ist- und Prognosewerte auf eine Aggregationsebene.
+
+    Ein Aggregat entsteht je (keys, time_idx, horizon), d. h. pro Prognosefenster
+    und Horizont. Die Summation erfolgt per `np.bincount` auf Integer-Codes.
+    Hinweis: Summierte Quantile sind nur eine Näherung (naive Bottom-up-Summe).
+    """
+    frame_keys = keys + ["time_idx", "horizon"]
+    codes, uniques = group_codes(pred, frame_keys)
+    n = len(uniques)
+    out = uniques.copy()
+    for col in value_cols:
+        vals = pred[col].to_numpy(dtype="float64")
+        out[col] = np.bincount(codes, weights=np.nan_to_num(vals), minlength=n)
+    return out
+
+
+def level_metrics(
+    pred: pd.DataFrame,
+    levels: Dict[str, List[str]] | None = None,
+) -> pd.DataFrame:
+    """
+    Kennzahlen je Aggregationsebene (total, country, store, product).
+
+    Für jede Ebene werden die Prognosen zunächst auf die Ebene summiert
+    und anschließend die Fehlermaße je Knoten berechnet.
+    """
+    levels = levels or DEFAULT_LEVELS
+    q_cols = quantile_columns(pred)
+    value_cols = ["y_true", "y_pred"] + q_cols
+
+    # Zeilen mit fehlendem Istwert nicht in die Summen einfließen lassen
+    pred = pred[np.isfinite(pred["y_true"].to_numpy(dtype="float64"))]
+
+    frames = []
+    for level, keys in levels.items():
+        agg = aggregate_forecasts(pred, keys, value_cols)
+        codes, nodes = group_codes(agg, keys)
+        metrics = grouped_metrics(
+            codes,
+            len(nodes),
+            agg["y_true"].to_numpy(),
+            agg["y_pred"].to_numpy(),
+            agg[q_cols].to_numpy() if q_cols else None,
+            quantile_levels(q_cols) if q_cols else None,
+        )
+        node_names = (
+            nodes.astype(str).agg("/".join, axis=1)
+            if keys else pd.Series(["total"] * len(nodes))
+        )
+        frames.append(pd.DataFrame({"level": level, "node": node_names.to_numpy(), **metrics}))
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def overall_metrics(pred: pd.DataFrame) -> Dict[str, float]:
+    """Über alle Zeilen gemittelte Kennzahlen (bottom level)."""
+    q_cols = quantile_columns(pred)
+    metrics = grouped_metrics(
+        np.zeros(len(pred), dtype="int64"),
+        1,
+        pred["y_true"].to_numpy(),
+        pred["y_pred"].to_numpy(),
+        pred[q_cols].to_numpy() if q_cols else None,
+        quantile_levels(q_cols) if q_cols else None,
+    )
+    return {k: (int(v[0]) if k == "n_obs" else float(v[0])) for k, v in metrics.items()}
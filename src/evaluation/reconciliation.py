@@ -0,0 +1,391 @@
+# src/evaluation/reconciliation.py
+"""
+Hierarchische Reconciliation der TFT-Prognosen über country/store/product.
+
+Die Prognosen entstehen je (country, store, product). Für Länder-/Store-Summen
+ist die naive Summe der Quantile falsch (sie unterstellt perfekt korrelierte Fehler).
+Dieses Modul macht die Prognosen über alle Ebenen kohärent:
+
+- Summationsmatrix S (dünn, scipy.sparse) aus GROUP_COLS bzw. den Aggregationsebenen
+  aus metrics.DEFAULT_LEVELS; Zeilen = Knoten (Aggregate zuerst, dann Zeitreihen)
+- Methoden für die Punktprognose:
+    bottom_up     Summen der Zeitreihen-Prognosen
+    top_down      Gesamtprognose nach historischen Anteilen (train.parquet) verteilen
+    mint_shrink   MinT mit Shrinkage-Kovarianz (Schäfer-Strimmer) der Residuen.
+                  Gelöst in der Constraint-Form  ỹ = ŷ − W C'(C W C')⁻¹ C ŷ  mit
+                  C = [I | −A]; W = λ·diag + (1−λ)·R'R/T wird nie dicht aufgebaut,
+                  zu lösen ist nur ein System der Größe (Anzahl Aggregat-Knoten)
+- Quantile: Abstände zum Median werden je Aggregat mit der mittleren (geschrumpften)
+  Residuen-Korrelation ρ der enthaltenen Reihen kombiniert,
+  δ_k = sqrt((1−ρ)·Σδ_i² + ρ·(Σ|δ_i|)²), und um die reconcilierte Punktprognose gelegt
+
+Ohne eigene Basisprognosen für Aggregate (`--upper`) sind die Aggregate die Summen der
+Reihen – dann stimmen bottom_up und mint_shrink für die Punktprognose überein, die
+Quantile der Aggregate werden trotzdem korrelationsbasiert bestimmt.
+
+Ausgabe unter results/tft/<run_id>/evaluation/:
+    reconciled_<method>_<split>.parquet     level, node, time_idx, horizon, y_true, y_pred, q_*
+    reconciliation_<method>_<split>.json    Kennzahlen je Ebene: naive Summe vs. reconciliert
+
+Aufrufbeispiel:
+    python -m src.evaluation.reconciliation --run results/tft/<run_id> --split test --method mint_shrink
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.config import GROUP_COLS, PROCESSED_DIR, TARGET_COL
+from src.evaluation.metrics import (
+    DEFAULT_LEVELS,
+    group_codes,
+    grouped_metrics,
+    quantile_columns,
+    quantile_levels,
+)
+
+METHODS = ("bottom_up", "top_down", "mint_shrink")
+BOTTOM_LEVEL = "series"
+SLICE_COLS = ["time_idx", "horizon"]
+
+
+# ------------------------- Hierarchie -------------------------
+
+@dataclass
+class Hierarchy:
+    """Summationsmatrix S = [A; I] und Knoten-Tabelle (level, node) in Zeilenreihenfolge."""
+
+    S: sp.csr_matrix
+    A: sp.csr_matrix            # Aggregat-Zeilen (n_agg × n_bottom)
+    nodes: pd.DataFrame         # level, node
+    bottom: pd.DataFrame        # GROUP_COLS je Zeitreihe (Spaltenreihenfolge von S)
+
+    @property
+    def n_agg(self) -> int:
+        return self.A.shape[0]
+
+    @property
+    def n_bottom(self) -> int:
+        return self.A.shape[1]
+
+
+def _node_names(keys_frame: pd.DataFrame, keys: List[str]) -> np.ndarray:
+    if not keys:
+        return np.array(["total"] * len(keys_frame), dtype=object)
+    return keys_frame[keys].astype(str).agg("/".join, axis=1).to_numpy()
+
+
+def build_hierarchy(bottom: pd.DataFrame, levels: Dict[str, List[str]] | None = None) -> Hierarchy:
+    """
+    Baut S aus den eindeutigen Zeitreihen (`bottom`, Spalten GROUP_COLS).
+    Je Ebene ein Block aus Integer-Codes -> eine COO-Konstruktion, keine Schleife über Knoten.
+    """
+    levels = levels or DEFAULT_LEVELS
+    bottom = bottom[list(GROUP_COLS)].reset_index(drop=True)
+    n_bottom = len(bottom)
+    cols = np.arange(n_bottom)
+
+    rows, names, offset = [], [], 0
+    for level, keys in levels.items():
+        codes, uniques = group_codes(bottom, list(keys))
+        rows.append(codes + offset)
+        names.append(pd.DataFrame({"level": level, "node": _node_names(uniques, list(keys))}))
+        offset += len(uniques)
+
+    A = sp.csr_matrix(
+        (np.ones(n_bottom * len(rows)), (np.concatenate(rows), np.tile(cols, len(rows)))),
+        shape=(offset, n_bottom),
+    )
+    S = sp.vstack([A, sp.identity(n_bottom, format="csr")], format="csr")
+    nodes = pd.concat(
+        [*names, pd.DataFrame({"level": BOTTOM_LEVEL, "node": _node_names(bottom, list(GROUP_COLS))})],
+        ignore_index=True,
+    )
+    return Hierarchy(S=S, A=A, nodes=nodes, bottom=bottom)
+
+
+# ------------------------- Tabellen <-> Matrizen -------------------------
+
+def to_matrix(
+    pred: pd.DataFrame, rows: np.ndarray, cols: np.ndarray, shape: Tuple[int, int], value_cols: List[str]
+) -> Dict[str, np.ndarray]:
+    """
+    Long-Tabelle -> je Spalte eine Matrix n_bottom × n_slices (rows/cols: Codes je Zeile, −1 = ignorieren).
+    Fehlende Kombinationen werden mit 0 gefüllt (tragen nichts zu den Summen bei).
+    """
+    keep = (rows >= 0) & (cols >= 0)
+    out = {}
+    for c in value_cols:
+        m = np.zeros(shape)
+        m[rows[keep], cols[keep]] = np.nan_to_num(pred[c].to_numpy(dtype="float64")[keep])
+        out[c] = m
+    return out
+
+
+def to_long(hier: Hierarchy, slices: pd.DataFrame, mats: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Matrizen n_nodes × n_slices -> Long-Tabelle level, node, time_idx, horizon, <Spalten>."""
+    n_nodes, n_slices = len(hier.nodes), len(slices)
+    out = pd.DataFrame({c: np.repeat(hier.nodes[c].to_numpy(), n_slices) for c in ("level", "node")})
+    for c in SLICE_COLS:
+        out[c] = np.tile(slices[c].to_numpy(), n_nodes)
+    for c, m in mats.items():
+        out[c] = m.reshape(-1)
+    return out
+
+
+# ------------------------- Kovarianz -------------------------
+
+def shrinkage_lambda(R: np.ndarray) -> float:
+    """
+    Schäfer-Strimmer-Intensität für die Schrumpfung der Korrelationen gegen 0.
+    Alle Summen über Paare (i≠j) laufen über die T×T-Gram-Matrix statt über n×n.
+    """
+    T = R.shape[0]
+    if T < 2:
+        return 1.0
+    sd = np.sqrt((R ** 2).mean(axis=0))
+    Xs = np.divide(R, sd, out=np.zeros_like(R), where=sd > 0)
+    sq = Xs ** 2
+    col_ss = sq.sum(axis=0)                        # Σ_t xs_ti² je Reihe
+    gram_f2 = float(np.square(Xs @ Xs.T).sum())    # ||Xs Xs'||_F² = ||Xs' Xs||_F²
+    off_cross = gram_f2 - float((col_ss ** 2).sum())
+    off_sq = float((sq.sum(axis=1) ** 2).sum() - (sq ** 2).sum())
+    var_sum = T / (T - 1) ** 3 * (off_sq - off_cross / T)
+    corr_sum = off_cross / T ** 2
+    if corr_sum <= 0:
+        return 1.0
+    return float(np.clip(var_sum / corr_sum, 0.0, 1.0))
+
+
+def node_correlation(A: sp.csr_matrix, R_bottom: np.ndarray, lam: float) -> np.ndarray:
+    """Mittlere paarweise Residuen-Korrelation je Aggregat, mit (1−λ) geschrumpft."""
+    T = R_bottom.shape[0]
+    sd = np.sqrt((R_bottom ** 2).mean(axis=0))
+    Z = np.divide(R_bottom, sd, out=np.zeros_like(R_bottom), where=sd > 0)
+    summed = A @ Z.T                                         # n_agg × T
+    diag = A @ (Z ** 2).sum(axis=0)                          # Σ_{i∈k} Σ_t z²
+    n_k = np.asarray(A.sum(axis=1)).ravel()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rho = ((summed ** 2).sum(axis=1) - diag) / (T * n_k * (n_k - 1))
+    rho = np.where(n_k > 1, np.nan_to_num(rho), 1.0)
+    return np.clip(rho, 0.0, 1.0) * np.where(n_k > 1, 1.0 - lam, 1.0)
+
+
+# ------------------------- Methoden -------------------------
+
+def reconcile_bottom_up(hier: Hierarchy, base_all: np.ndarray, **_: Any) -> np.ndarray:
+    return base_all[hier.n_agg:]
+
+
+def reconcile_top_down(hier: Hierarchy, base_all: np.ndarray, proportions: np.ndarray, **_: Any) -> np.ndarray:
+    total_row = int(np.flatnonzero(hier.nodes["level"].to_numpy() == "total")[0])
+    return proportions[:, None] * base_all[total_row][None, :]
+
+
+def reconcile_mint_shrink(hier: Hierarchy, base_all: np.ndarray, residuals: np.ndarray, lam: float, **_: Any) -> np.ndarray:
+    """
+    MinT in Constraint-Form mit W = λ·D + (1−λ)·R'R/T (D = Diagonale von R'R/T).
+    Kosten: dünne Produkte mit C plus ein dichtes System der Größe n_agg.
+    """
+    T = residuals.shape[0]
+    C = sp.hstack([sp.identity(hier.n_agg, format="csr"), -hier.A], format="csr")
+    D = (residuals ** 2).mean(axis=0)
+    D = np.maximum(D, 1e-9 * max(float(D.mean()), 1e-12))  # Knoten ohne Streuung nicht singulär machen
+
+    CR = C @ residuals.T                                   # n_agg × T
+    CWC = lam * (C @ sp.diags(D) @ C.T).toarray() + (1.0 - lam) / T * (CR @ CR.T)
+    X = np.linalg.solve(CWC, C @ base_all)                 # n_agg × n_slices
+    CtX = C.T @ X                                          # n_nodes × n_slices
+    WCtX = lam * D[:, None] * CtX + (1.0 - lam) / T * (residuals.T @ (residuals @ CtX))
+    return (base_all - WCtX)[hier.n_agg:]
+
+
+RECONCILERS = {
+    "bottom_up": reconcile_bottom_up,
+    "top_down": reconcile_top_down,
+    "mint_shrink": reconcile_mint_shrink,
+}
+
+
+def aggregate_spreads(A: sp.csr_matrix, delta: np.ndarray, rho: np.ndarray, sign: float) -> np.ndarray:
+    """Abstand Quantil–Median je Aggregat aus den Abständen der Reihen (sign: −1 unter, +1 über dem Median)."""
+    var = (1.0 - rho)[:, None] * (A @ delta ** 2) + rho[:, None] * (A @ np.abs(delta)) ** 2
+    return sign * np.sqrt(var)
+
+
+def reconcile_forecasts(
+    pred: pd.DataFrame,
+    method: str,
+    residual_pred: pd.DataFrame,
+    proportions: Optional[pd.DataFrame] = None,
+    upper: Optional[pd.DataFrame] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Any]]:
+    """
+    Reconciliert eine Prognosetabelle (Layout wie predictions_<split>.parquet).
+    Rückgabe: (reconciliert, naive Summen, Info) – beide Tabellen über alle Knoten.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unbekannte Methode '{method}'. Erlaubt: {METHODS}")
+    q_cols = quantile_columns(pred)
+    value_cols = ["y_true", "y_pred", *q_cols]
+
+    # Zeitreihen und (time_idx, horizon) einmalig zu Codes -> Matrix-Indizes
+    rows, series = group_codes(pred, list(GROUP_COLS))
+    cols, slices = group_codes(pred, SLICE_COLS)
+    hier = build_hierarchy(series)
+    bottom = to_matrix(pred, rows, cols, (hier.n_bottom, len(slices)), value_cols)
+    naive = {c: hier.S @ m for c, m in bottom.items()}
+
+    # Basisprognosen aller Knoten: Summen, optional durch eigene Aggregat-Prognosen ersetzt
+    base_all = naive["y_pred"].copy()
+    n_upper = 0
+    if upper is not None:
+        node_idx = pd.MultiIndex.from_frame(hier.nodes).get_indexer(pd.MultiIndex.from_frame(upper[["level", "node"]]))
+        col_idx = pd.MultiIndex.from_frame(slices).get_indexer(pd.MultiIndex.from_frame(upper[SLICE_COLS]))
+        keep = (node_idx >= 0) & (node_idx < hier.n_agg) & (col_idx >= 0)
+        base_all[node_idx[keep], col_idx[keep]] = upper["y_pred"].to_numpy(dtype="float64")[keep]
+        n_upper = int(keep.sum())
+
+    # Residuen aller Knoten (Zeilen = Fenster/Horizont der Residuen-Tabelle)
+    if residual_pred is pred:
+        res_rows, res_cols, n_res = rows, cols, len(slices)
+    else:
+        res_rows = pd.MultiIndex.from_frame(hier.bottom).get_indexer(
+            pd.MultiIndex.from_frame(residual_pred[list(GROUP_COLS)])
+        )
+        res_cols, res_slices = group_codes(residual_pred, SLICE_COLS)
+        n_res = len(res_slices)
+    res = to_matrix(residual_pred, res_rows, res_cols, (hier.n_bottom, n_res), ["y_true", "y_pred"])
+    R_bottom = (res["y_true"] - res["y_pred"]).T               # T × n_bottom
+    R_all = (hier.S @ R_bottom.T).T                            # T × n_nodes
+    lam = shrinkage_lambda(R_all)
+
+    props = None
+    if method == "top_down":
+        if proportions is None:
+            raise ValueError("top_down benötigt historische Anteile (train.parquet).")
+        idx = pd.MultiIndex.from_frame(proportions[list(GROUP_COLS)]).get_indexer(pd.MultiIndex.from_frame(hier.bottom))
+        props = np.where(idx >= 0, proportions["share"].to_numpy()[idx], 0.0)
+
+    rec_bottom = RECONCILERS[method](hier, base_all, residuals=R_all, lam=lam, proportions=props)
+    rec = {"y_true": naive["y_true"], "y_pred": hier.S @ rec_bottom}
+
+    # Quantile: Abstände zum Median der Reihen, für Aggregate korrelationsbasiert kombiniert
+    rho = node_correlation(hier.A, R_bottom, lam)
+    for c, q in zip(q_cols, quantile_levels(q_cols)):
+        delta = bottom[c] - bottom["y_pred"]
+        rec[c] = rec["y_pred"] + np.vstack([aggregate_spreads(hier.A, delta, rho, np.sign(q - 0.5)), delta])
+
+    info = {
+        "method": method,
+        "n_series": hier.n_bottom,
+        "n_aggregates": hier.n_agg,
+        "n_slices": len(slices),
+        "residual_slices": n_res,
+        "shrinkage_lambda": round(lam, 6),
+        "upper_base_values": n_upper,
+        "mean_node_correlation": {
+            lvl: round(float(rho[(hier.nodes["level"].to_numpy()[:hier.n_agg] == lvl)].mean()), 4)
+            for lvl in hier.nodes["level"].unique() if lvl != BOTTOM_LEVEL
+        },
+    }
+    return to_long(hier, slices, rec), to_long(hier, slices, naive), info
+
+
+def historical_proportions(train: pd.DataFrame) -> pd.DataFrame:
+    """Anteil jeder Zeitreihe an der historischen Gesamtsumme (Summe der Reihe / Summe aller Reihen auf TRAIN)."""
+    totals = train.groupby(list(GROUP_COLS), observed=True, sort=False)[TARGET_COL].sum().reset_index()
+    totals["share"] = totals[TARGET_COL] / totals[TARGET_COL].sum()
+    return totals[[*GROUP_COLS, "share"]]
+
+
+# ------------------------- Kennzahlen -------------------------
+
+def compare_levels(rec: pd.DataFrame, naive: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Mittlere Kennzahlen je Ebene (über die Knoten) für naive Summen und Reconciliation."""
+    q_cols = quantile_columns(rec)
+    out: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for name, frame in (("naive", naive), ("reconciled", rec)):
+        codes, nodes = group_codes(frame, ["level", "node"])
+        m = grouped_metrics(
+            codes,
+            len(nodes),
+            frame["y_true"].to_numpy(),
+            frame["y_pred"].to_numpy(),
+            frame[q_cols].to_numpy() if q_cols else None,
+            quantile_levels(q_cols) if q_cols else None,
+        )
+        per_node = pd.concat([nodes, pd.DataFrame({k: v for k, v in m.items() if k != "n_obs"})], axis=1)
+        out[name] = per_node.groupby("level").mean(numeric_only=True).round(6).to_dict(orient="index")
+    return out
+
+
+# ------------------------- CLI -------------------------
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Prognosen über country/store/product kohärent machen.")
+    ap.add_argument("--run", type=str, required=True, help="Run-Ordner, z. B. results/tft/run_...")
+    ap.add_argument("--split", type=str, default="test", choices=["val", "test"])
+    ap.add_argument("--method", type=str, default="mint_shrink", choices=METHODS)
+    ap.add_argument("--residuals", type=str, default=None,
+                    help="Prognosetabelle für die Residuen (Default: predictions_val.parquet, sonst der Split selbst)")
+    ap.add_argument("--upper", type=str, default=None,
+                    help="Optional: eigene Basisprognosen der Aggregate (level, node, time_idx, horizon, y_pred)")
+    args = ap.parse_args()
+
+    eval_dir = Path(args.run) / "evaluation"
+    pred_path = eval_dir / f"predictions_{args.split}.parquet"
+    if not pred_path.exists():
+        raise FileNotFoundError(f"{pred_path} fehlt – zuerst `python -m src evaluate --split {args.split}` ausführen.")
+    pred = pd.read_parquet(pred_path)
+
+    res_path = Path(args.residuals) if args.residuals else eval_dir / "predictions_val.parquet"
+    if args.split == "val" or not res_path.exists():
+        print(f"[reconciliation] Hinweis: Residuen aus {pred_path.name} (in-sample).")
+        res_path = pred_path
+    residual_pred = pred if res_path == pred_path else pd.read_parquet(res_path)
+
+    proportions = None
+    if args.method == "top_down":
+        proportions = historical_proportions(pd.read_parquet(PROCESSED_DIR / "train.parquet", columns=[*GROUP_COLS, TARGET_COL]))
+    upper = pd.read_parquet(args.upper) if args.upper else None
+
+    t0 = time.perf_counter()
+    rec, naive, info = reconcile_forecasts(pred, args.method, residual_pred, proportions, upper)
+    info["reconcile_time_sec"] = round(time.perf_counter() - t0, 3)
+    levels = compare_levels(rec, naive)
+
+    out_path = eval_dir / f"reconciled_{args.method}_{args.split}.parquet"
+    rec.to_parquet(out_path, index=False)
+    summary = {
+        "split": args.split,
+        **info,
+        "residuals": str(res_path),
+        "levels": levels,
+        "files": {"reconciled": str(out_path)},
+    }
+    summary_path = eval_dir / f"reconciliation_{args.method}_{args.split}.json"
+    with summary_path.open("w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    print(f"[reconciliation] {args.method} | Reihen: {info['n_series']} | Aggregate: {info['n_aggregates']} | "
+          f"λ={info['shrinkage_lambda']} | {info['reconcile_time_sec']}s")
+    metric = "quantile_loss" if "quantile_loss" in next(iter(levels["naive"].values())) else "mae"
+    for lvl in levels["naive"]:
+        print(f"  - {lvl:<8} {metric}: naiv {levels['naive'][lvl][metric]:.4f} -> "
+              f"reconciliert {levels['reconciled'][lvl][metric]:.4f}")
+    print(f"[reconciliation] Ausgabe: {out_path}")
+
+
+if __name__ == "__main__":
+    # python -m src.evaluation.reconciliation --run results/tft/<run_id> --split test
+    main()
@@ -0,0 +1,185 @@
+# src/evaluation/subset_transfer.py
+"""
+Übertragbarkeit von Config-Ranglisten: Teilmenge (subsample.py) vs. volles Panel.
+
+Grundlage ist die Run-Registry: Jeder Run trägt in summary.json `meta.subsample`
+(None = volles Panel, sonst Auswahl-Hash der Teilmenge). Configs werden über
+`config_hash` (gleiche YAML-Werte) bzw. `config_file` gepaart; je Seite zählt der
+beste Run einer Config.
+
+Kennzahlen:
+    spearman      Rangkorrelation der Metrik (1 = identische Reihenfolge)
+    kendall_tau   Kendalls tau-b: übereinstimmende minus gegenläufige Paare, Gleichstände korrigiert
+    top1_match    bester Config auf der Teilmenge ist auch auf dem Panel der beste
+    top_k_overlap Anteil gemeinsamer Configs unter den k besten
+    regret        Panel-Metrik der Teilmengen-Wahl minus bestes Panel-Ergebnis
+    speedup       Summe Fit-Zeit Panel / Summe Fit-Zeit Teilmenge
+
+Beim Import nur Standardbibliothek (wie run_registry.py); scipy.stats erst für die Korrelationen.
+
+Aufrufbeispiele:
+    python -m src.evaluation.subset_transfer
+    python -m src subset-transfer --selection 1a2b3c4d5e6f7a8b --metric best_val_loss --top-k 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import RESULTS_DIR, RUN_REGISTRY_PATH
+from src.utils.run_registry import RunRegistry
+
+LOSS_METRICS = ("best_val_loss", "final_val_loss", "final_train_loss")
+PAIR_KEYS = ("config_hash", "config_file")
+FULL = "full"
+
+
+@dataclass
+class PairedConfig:
+    key: str
+    subset_value: float
+    full_value: float
+    subset_fit_sec: float
+    full_fit_sec: float
+
+
+# ------------------------- Runs -------------------------
+
+def _selection(run: Dict[str, Any]) -> Optional[str]:
+    """Auswahl-Hash aus summary.json; FULL für das volle Panel, None ohne lesbare summary."""
+    path = Path(run.get("summary_path") or "")
+    if not path.exists():
+        return None
+    meta = json.loads(path.read_text(encoding="utf-8")).get("meta") or {}
+    sub = meta.get("subsample")
+    return sub["selection_hash"] if sub else FULL
+
+
+def _best_per_key(runs: List[Dict[str, Any]], metric: str, pair_by: str) -> Dict[str, Dict[str, Any]]:
+    best: Dict[str, Dict[str, Any]] = {}
+    for r in runs:
+        key, value = r.get(pair_by), r.get(metric)
+        if key is None or value is None:
+            continue
+        if key not in best or value < best[key][metric]:
+            best[key] = r
+    return best
+
+
+def paired_configs(
+    runs: List[Dict[str, Any]], selection: Optional[str], metric: str, pair_by: str
+) -> Tuple[str, List[PairedConfig]]:
+    """Configs mit Runs auf Teilmenge *und* Panel; `selection=None` = zuletzt genutzte Teilmenge."""
+    if metric not in LOSS_METRICS:
+        raise ValueError(f"Unbekannte Metrik: {metric} (erlaubt: {LOSS_METRICS})")
+    if pair_by not in PAIR_KEYS:
+        raise ValueError(f"Unbekannter Paarungsschlüssel: {pair_by} (erlaubt: {PAIR_KEYS})")
+
+    tagged = [(r, _selection(r)) for r in runs]
+    if selection is None:
+        subset_runs = [(r, s) for r, s in tagged if s not in (None, FULL)]
+        if not subset_runs:
+            raise ValueError("Keine Runs auf einer Teilmenge in der Run-Registry (meta.subsample).")
+        selection = max(subset_runs, key=lambda rs: rs[0]["created_at"])[1]
+
+    subset = _best_per_key([r for r, s in tagged if s == selection], metric, pair_by)
+    full = _best_per_key([r for r, s in tagged if s == FULL], metric, pair_by)
+    pairs = [
+        PairedConfig(
+            key=k,
+            subset_value=float(subset[k][metric]),
+            full_value=float(full[k][metric]),
+            subset_fit_sec=float(subset[k].get("fit_time_sec") or 0.0),
+            full_fit_sec=float(full[k].get("fit_time_sec") or 0.0),
+        )
+        for k in sorted(set(subset) & set(full))
+    ]
+    return selection, pairs
+
+
+# ------------------------- Kennzahlen -------------------------
+
+def _constant(a: List[float], b: List[float]) -> bool:
+    """Konstante Rangfolge -> Korrelation undefiniert (scipy: NaN + Warnung); im Bericht 0."""
+    return len(set(a)) < 2 or len(set(b)) < 2
+
+
+def spearman(a: List[float], b: List[float]) -> float:
+    from scipy.stats import spearmanr
+
+    return 0.0 if _constant(a, b) else float(spearmanr(a, b).statistic)
+
+
+def kendall_tau(a: List[float], b: List[float]) -> float:
+    """Kendalls tau-b (Gleichstände in einer der Rangfolgen werden korrigiert)."""
+    from scipy.stats import kendalltau
+
+    return 0.0 if _constant(a, b) else float(kendalltau(a, b).statistic)
+
+
+def transfer_report(pairs: List[PairedConfig], top_k: int) -> Dict[str, Any]:
+    if len(pairs) < 3:
+        raise ValueError(f"Mindestens 3 Configs mit Runs auf Teilmenge und Panel nötig, gefunden: {len(pairs)}")
+    if top_k < 1:
+        raise ValueError(f"top_k muss >= 1 sein: {top_k}")
+    sub = [p.subset_value for p in pairs]
+    full = [p.full_value for p in pairs]
+    k = min(top_k, len(pairs))
+    top_sub = {p.key for p in sorted(pairs, key=lambda p: p.subset_value)[:k]}
+    top_full = {p.key for p in sorted(pairs, key=lambda p: p.full_value)[:k]}
+    pick = min(pairs, key=lambda p: p.subset_value)
+    best_full = min(full)
+    fit_sub = sum(p.subset_fit_sec for p in pairs)
+    fit_full = sum(p.full_fit_sec for p in pairs)
+    return {
+        "n_configs": len(pairs),
+        "spearman": round(spearman(sub, full), 4),
+        "kendall_tau": round(kendall_tau(sub, full), 4),
+        "top1_match": pick.full_value == best_full,
+        "top_k": k,
+        "top_k_overlap": round(len(top_sub & top_full) / k, 4),
+        "regret": round(pick.full_value - best_full, 6),
+        "regret_rel": round((pick.full_value - best_full) / abs(best_full), 4) if best_full else None,
+        "speedup": round(fit_full / fit_sub, 2) if fit_sub else None,
+        "pairs": [asdict(p) for p in pairs],
+    }
+
+
+# ------------------------- CLI -------------------------
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Übertragbarkeit Teilmengen-Rangliste -> volles Panel.")
+    ap.add_argument("--db", type=str, default=str(RUN_REGISTRY_PATH))
+    ap.add_argument("--selection", type=str, default=None, help="Auswahl-Hash (Standard: zuletzt genutzte Teilmenge)")
+    ap.add_argument("--metric", type=str, default="best_val_loss", choices=LOSS_METRICS)
+    ap.add_argument("--pair-by", type=str, default="config_hash", choices=PAIR_KEYS)
+    ap.add_argument("--top-k", type=int, default=3)
+    ap.add_argument("--out", type=str, default=str(RESULTS_DIR / "subset_transfer.json"))
+    args = ap.parse_args()
+
+    with RunRegistry(Path(args.db)) as registry:
+        runs = registry.query(model_type="tft")
+    selection, pairs = paired_configs(runs, args.selection, args.metric, args.pair_by)
+    report = {"selection_hash": selection, "metric": args.metric, "pair_by": args.pair_by,
+              **transfer_report(pairs, args.top_k)}
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print(f"[subset_transfer] Teilmenge {selection} | {report['n_configs']} Configs | {args.metric}")
+    print(f"[subset_transfer] Spearman {report['spearman']:+.3f} | Kendall {report['kendall_tau']:+.3f} | "
+          f"Top-1 {'ja' if report['top1_match'] else 'nein'} | "
+          f"Top-{report['top_k']} {report['top_k_overlap']:.0%} | Regret {report['regret']:.4g}")
+    if report["speedup"] is not None:
+        print(f"[subset_transfer] Fit-Zeit Panel/Teilmenge: {report['speedup']}×")
+    print(f"[subset_transfer] Bericht: {out}")
+
+
+if __name__ == "__main__":
+    # python -m src.evaluation.subset_transfer --top-k 3
+    main()
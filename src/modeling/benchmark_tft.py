@@ -0,0 +1,136 @@
+# src/modeling/benchmark_tft.py
+"""
+Benchmark der Trainingsoptionen (bf16, torch.compile, nicht deterministische Kernels)
+gegen eine Referenz-Config.
+
+Für jede Variante wird aus der Ausgangs-YAML eine abgeleitete YAML erzeugt und ein
+vollständiger Trainingslauf in einem eigenen Prozess gestartet (saubere Zeiten ohne
+warme Caches des Vorgängers). Verglichen werden Epochenzeit und val_loss aus summary.json.
+
+Aufrufbeispiele:
+    python -m src.modeling.benchmark_tft --config configs/trainer_tft_baseline.yaml
+    python -m src benchmark-tft --config configs/trainer_tft_baseline.yaml --variants bf16 fast --max-epochs 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+from src.config import RESULTS_DIR
+from src.utils.config_loader import load_trainer_cfg
+
+# Variante -> Overrides auf die Ausgangs-YAML ("model.compile" adressiert verschachtelte Keys)
+VARIANTS: Dict[str, Dict[str, Any]] = {
+    "baseline": {},
+    "bf16": {"precision": "bf16-mixed"},
+    "compile": {"model.compile": True},
+    "fast": {"deterministic": False},
+    "all": {"precision": "bf16-mixed", "model.compile": True, "deterministic": False},
+}
+
+
+def _apply_overrides(cfg_dict: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    out = json.loads(json.dumps(cfg_dict))  # tiefe Kopie (nur YAML-Primitive)
+    for dotted, value in overrides.items():
+        *parents, key = dotted.split(".")
+        node = out
+        for p in parents:
+            node = node[p]
+        node[key] = value
+    return out
+
+
+def _run_variant(config_path: Path, suffix: str) -> Dict[str, Any]:
+    """Startet trainer_tft in einem Unterprozess und liest die entstandene summary.json."""
+    subprocess.run(
+        [sys.executable, "-m", "src.modeling.trainer_tft", "--config", str(config_path)],
+        check=True,
+    )
+    # Run-ID endet auf den Config-Suffix -> jüngste passende summary.json
+    # (trainer_tft schreibt relativ zum Arbeitsverzeichnis nach results/tft/)
+    candidates = sorted(
+        (Path("results") / "tft").glob(f"run_*_{suffix}/summary.json"),
+        key=lambda p: p.stat().st_mtime,
+    )
+    if not candidates:
+        raise FileNotFoundError(f"Keine summary.json für Variante '{suffix}' gefunden.")
+    return json.loads(candidates[-1].read_text(encoding="utf-8")) | {"summary_path": str(candidates[-1])}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Trainingsoptionen gegen die Referenz-Config benchmarken.")
+    ap.add_argument("--config", type=str, default="configs/trainer_tft_baseline.yaml")
+    ap.add_argument("--variants", nargs="+", default=["bf16", "compile", "fast"],
+                    choices=[v for v in VARIANTS if v != "baseline"],
+                    help="zu vergleichende Varianten (baseline läuft immer mit)")
+    ap.add_argument("--max-epochs", type=int, default=None,
+                    help="überschreibt max_epochs für alle Varianten (kürzere Benchmarks)")
+    args = ap.parse_args()
+
+    config_path = Path(args.config)
+    load_trainer_cfg(config_path)  # Ausgangs-Config früh prüfen
+    base_dict = yaml.safe_load(config_path.read_text(encoding="utf-8"))
+    if args.max_epochs is not None:
+        base_dict["max_epochs"] = args.max_epochs
+
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    bench_dir = RESULTS_DIR / "benchmarks" / f"tft_{stamp}"
+    cfg_dir = bench_dir / "configs"
+    cfg_dir.mkdir(parents=True, exist_ok=True)
+
+    base_suffix = config_path.stem.replace("trainer_tft_", "") or config_path.stem
+    rows: List[Dict[str, Any]] = []
+    for variant in ["baseline", *args.variants]:
+        variant_dict = _apply_overrides(base_dict, VARIANTS[variant])
+        suffix = f"{base_suffix}_{variant}"
+        variant_path = cfg_dir / f"trainer_tft_{suffix}.yaml"
+        variant_path.write_text(yaml.safe_dump(variant_dict, sort_keys=False, allow_unicode=True), encoding="utf-8")
+        load_trainer_cfg(variant_path)
+
+        print(f"[benchmark_tft] Variante '{variant}' -> {variant_path}")
+        summary = _run_variant(variant_path, suffix)
+        rows.append({
+            "variant": variant,
+            "overrides": VARIANTS[variant],
+            "run_id": summary["run_id"],
+            "epochs_trained": summary["meta"]["epochs_trained"],
+            "avg_epoch_time_sec": summary["meta"]["avg_epoch_time_sec"],
+            "fit_time_sec": summary["meta"]["fit_time_sec"],
+            "final_val_loss": summary["metrics"].get("final_val_loss"),
+            "best_val_loss": summary["metrics"].get("best_val_loss"),
+            "summary_path": summary["summary_path"],
+        })
+
+    # Relativ zur Referenz
+    base = rows[0]
+    for r in rows:
+        r["speedup"] = round(base["avg_epoch_time_sec"] / r["avg_epoch_time_sec"], 3) if r["avg_epoch_time_sec"] else None
+        if r["final_val_loss"] is not None and base["final_val_loss"] is not None:
+            r["val_loss_delta"] = round(r["final_val_loss"] - base["final_val_loss"], 6)
+
+    print(f"\n[benchmark_tft] {'Variante':<10} {'s/Epoche':>9} {'Speedup':>8} {'val_loss':>10} {'Δ val_loss':>11}")
+    for r in rows:
+        val = f"{r['final_val_loss']:.4f}" if r["final_val_loss"] is not None else "-"
+        delta = f"{r['val_loss_delta']:+.4f}" if "val_loss_delta" in r else "-"
+        print(f"[benchmark_tft] {r['variant']:<10} {r['avg_epoch_time_sec']:>9.2f} {r['speedup']:>8.2f} {val:>10} {delta:>11}")
+
+    out_path = bench_dir / "benchmark.json"
+    out_path.write_text(
+        json.dumps({"config": str(config_path), "max_epochs": base_dict["max_epochs"], "results": rows},
+                   indent=2, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    print(f"[benchmark_tft] Ergebnis: {out_path}")
+
+
+if __name__ == "__main__":
+    # python -m src.modeling.benchmark_tft --config configs/trainer_tft_baseline.yaml
+    main()
@@ -0,0 +1,61 @@
+# src/modeling/checkpoint_io.py
+"""
+Checkpoint-IO für trainer_tft.py (Lightning-Plugin).
+
+`InferenceExportIO` schreibt die .ckpt-Datei wie `TorchCheckpointIO` und legt neben jedem
+Nicht-last-Checkpoint das Inferenz-Artefakt `<checkpoint>.infer.pt` ab (nur Gewichte +
+Hyperparameter + dataset_parameters, siehe load_trained_tft.py). Beim Verdrängen eines
+Checkpoints durch `save_top_k` wird das Artefakt mit entfernt.
+
+`OrderedAsyncCheckpointIO` schreibt in einem Hintergrund-Thread, damit die Epoche nicht
+auf die Platte wartet. Die Tensoren werden vorher im Trainings-Thread kopiert (Lightning
+`AsyncCheckpointIO`). Anders als dort läuft auch das Löschen über denselben Thread –
+so kann ein verdrängtes Checkpoint nicht gelöscht werden, bevor es fertig geschrieben ist.
+Lightning wartet beim Teardown auf alle ausstehenden Schreibvorgänge; Fehler im
+Hintergrund-Thread werden beim nächsten Speichern bzw. spätestens dann ausgelöst.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from lightning.pytorch.callbacks import ModelCheckpoint
+from lightning.pytorch.plugins.io import AsyncCheckpointIO, CheckpointIO, TorchCheckpointIO
+
+from src.utils.config_loader import CheckpointCfg
+from src.utils.load_trained_tft import export_inference_artifact, inference_path
+
+
+class InferenceExportIO(TorchCheckpointIO):
+    def save_checkpoint(self, checkpoint: Dict[str, Any], path: str | Path, storage_options: Optional[Any] = None) -> None:
+        super().save_checkpoint(checkpoint, path, storage_options=storage_options)
+        if Path(path).stem != ModelCheckpoint.CHECKPOINT_NAME_LAST:   # last.ckpt dient nur dem Resume
+            export_inference_artifact(checkpoint, inference_path(path))
+
+    def remove_checkpoint(self, path: str | Path) -> None:
+        super().remove_checkpoint(path)
+        inference_path(path).unlink(missing_ok=True)
+
+
+class OrderedAsyncCheckpointIO(AsyncCheckpointIO):
+    def remove_checkpoint(self, path: str | Path) -> None:
+        self._ensure_setup()
+
+        def _remove() -> None:
+            try:
+                self.checkpoint_io.remove_checkpoint(path)
+            except BaseException as ex:
+                self._error = ex
+
+        self._executor.submit(_remove)
+        if self._error:
+            raise self._error
+
+
+def build_checkpoint_io(cfg: CheckpointCfg) -> Optional[CheckpointIO]:
+    """Plugin gemäß YAML-Block `checkpoint:`; None = Lightning-Standard (synchron, nur .ckpt)."""
+    base: CheckpointIO | None = InferenceExportIO() if cfg.export_inference else None
+    if cfg.async_write:
+        return OrderedAsyncCheckpointIO(base or TorchCheckpointIO())
+    return base
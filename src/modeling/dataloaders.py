@@ -0,0 +1,120 @@
+# src/modeling/dataloaders.py
+"""
+Dataloader-Aufbau für den TFT aus `TrainerCfg.dataloader`.
+
+- Thread-Budget: Hauptprozess (intra/inter-op) und je Worker (worker_threads),
+  damit `num_workers: 4` nicht jeder Worker alle Kerne belegt
+- Asynchrones Vorladen über persistente Worker + prefetch_factor
+- Optional pin_memory für schnellere Host->GPU-Kopien
+- Batch-Zusammenstellung: "random", "synchronized" oder "bucketed"
+  (nach Fensterlänge gruppiert -> minimales Padding bei min_encoder_length < max)
+- Trainings-Loader ist fortsetzbar: Reihenfolge je (seed, epoch), Position im Checkpoint
+
+Genutzt von trainer_tft.py und tune_dataloader.py.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+
+from src.utils.config_loader import DataLoaderCfg
+
+if TYPE_CHECKING:
+    from torch.utils.data import DataLoader
+
+
+def _worker_init(worker_id: int, n_threads: int) -> None:
+    """
+    Seedet numpy/random/torch je Worker und begrenzt dessen torch-Threads (läuft im Worker-Prozess).
+    Lightning setzt `pl_worker_init_function` nur ohne eigene worker_init_fn – daher hier explizit,
+    sonst wirkt `seed_everything(..., workers=True)` nicht in den Workern.
+    """
+    import torch
+    from lightning.fabric.utilities.seed import pl_worker_init_function
+
+    pl_worker_init_function(worker_id)
+    torch.set_num_threads(n_threads)
+
+
+def apply_torch_threads(dl_cfg: DataLoaderCfg) -> None:
+    """
+    Setzt das Thread-Budget des Hauptprozesses.
+    Muss vor der ersten parallelen torch-Operation aufgerufen werden
+    (set_num_interop_threads ist danach nicht mehr änderbar).
+    """
+    import torch
+
+    torch.set_num_threads(dl_cfg.torch_intra_op_threads)
+    try:
+        torch.set_num_interop_threads(dl_cfg.torch_inter_op_threads)
+    except RuntimeError:
+        # bereits initialisiert (z. B. zweiter Aufruf im selben Prozess) -> bestehenden Wert behalten
+        pass
+
+
+def dataloader_kwargs(dl_cfg: DataLoaderCfg, num_workers: int) -> Dict[str, Any]:
+    """
+    Worker-/Speicher-Argumente für den DataLoader.
+    Der batch_sampler braucht den Datensatz und wird erst in `make_dataloader` gebaut.
+    """
+    kwargs: Dict[str, Any] = {
+        "num_workers": num_workers,
+        "pin_memory": dl_cfg.pin_memory,
+    }
+    if num_workers > 0:
+        # prefetch/persistent sind nur mit Worker-Prozessen zulässig
+        kwargs.update(
+            persistent_workers=dl_cfg.persistent_workers,
+            prefetch_factor=dl_cfg.prefetch_factor,
+            worker_init_fn=partial(_worker_init, n_threads=dl_cfg.worker_threads),
+        )
+    return kwargs
+
+
+def _train_batch_sampler(ds, batch_size: int, name: str):
+    """Gemischter Batch-Sampler fürs Training (Defaults wie `to_dataloader(train=True)`)."""
+    from torch.utils.data import BatchSampler, RandomSampler, SequentialSampler
+    from pytorch_forecasting.data.samplers import TimeSynchronizedBatchSampler
+
+    from src.modeling.samplers import BucketedBatchSampler
+
+    drop_last = len(ds) > batch_size
+    if name == "bucketed":
+        return BucketedBatchSampler.from_dataset(ds, batch_size, shuffle=True)
+    if name == "synchronized":
+        return TimeSynchronizedBatchSampler(
+            SequentialSampler(ds), batch_size=batch_size, shuffle=True, drop_last=drop_last
+        )
+    return BatchSampler(RandomSampler(ds), batch_size, drop_last=drop_last)
+
+
+def make_dataloader(
+    ds, train: bool, batch_size: int, num_workers: int, dl_cfg: DataLoaderCfg, seed: int
+) -> "DataLoader":
+    from src.modeling.samplers import BucketedBatchSampler, ResumableBatchSampler, ResumableDataLoader
+
+    kwargs = dataloader_kwargs(dl_cfg, num_workers)
+    if train:
+        batch_sampler = ResumableBatchSampler(_train_batch_sampler(ds, batch_size, dl_cfg.batch_sampler), seed)
+        return ResumableDataLoader(ds, batch_sampler=batch_sampler, collate_fn=ds._collate_fn, **kwargs)
+
+    # Validierung in fester Reihenfolge; "bucketed" auch hier (weniger Padding), ohne Mischen
+    batch_sampler = (
+        BucketedBatchSampler.from_dataset(ds, batch_size, shuffle=False)
+        if dl_cfg.batch_sampler == "bucketed" else None
+    )
+    return ds.to_dataloader(train=False, batch_size=batch_size, batch_sampler=batch_sampler, **kwargs)
+
+
+def build_dataloaders(
+    train_ds,
+    val_ds,
+    batch_size: int,
+    num_workers: int,
+    dl_cfg: DataLoaderCfg,
+    seed: int,
+) -> Tuple["DataLoader", "DataLoader"]:
+    train_loader = make_dataloader(train_ds, True, batch_size, num_workers, dl_cfg, seed)
+    val_loader = make_dataloader(val_ds, False, batch_size, num_workers, dl_cfg, seed)
+    return train_loader, val_loader
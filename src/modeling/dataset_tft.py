@@ -7,6 +7,8 @@ Erzeugt eine Datensatz-Spezifikation für den Temporal Fusion Transformer (TFT).
 - Schreibt dataset_spec.json für den nachgelagerten Trainer
 
 Kein Training, keine PyTorch-Abhängigkeit – reine Datenspezifikation.
+Es wird nur das Parquet-Schema gelesen (keine Daten, kein pandas), damit die
+Spezifikation auch aus Schedulern heraus in Sekundenbruchteilen entsteht.
 """
 
 from __future__ import annotations
@@ -16,7 +18,6 @@ from pathlib import Path
 from typing import Any, Dict, List
 
 import json
-import pandas as pd
 
 from src.config import (
     PROCESSED_DIR,
@@ -25,11 +26,13 @@ from src.config import (
     TARGET_COL,
     TFT_DATASET,
 )
+from src.modeling.validation import check_required_columns, read_schema
 
 # ------------------------- Heuristiken -------------------------
 
 CALENDAR_COLS = {"year", "month", "day", "dayofweek", "weekofyear", "is_weekend"}
-HOLIDAY_PREFIXES = ("is_holiday",)  # z. B. is_holiday_de, is_holiday_*
+# Feiertagsmerkmale aus holiday_calendar.py (im Voraus bekannt)
+HOLIDAY_PREFIXES = ("is_holiday", "days_to_holiday", "days_since_holiday", "is_bridge_day")
 # Hinweis: weitere Präfixe/Flags werden ausschließlich über TFT_DATASET gesteuert.
 
 
@@ -54,13 +57,9 @@ class TFTDatasetSpecBuilder:
             if not p.exists():
                 raise FileNotFoundError(f"{name}.parquet nicht gefunden: {p}")
 
-        # 2) Trainingssatz einlesen und prüfen
-        train = pd.read_parquet(paths["train"])
-        self._basic_checks(train)
-
-        all_cols = list(train.columns)
-        # numerisch + bool zulassen (0/1-Flags können als bool gespeichert sein)
-        numeric_cols = train.select_dtypes(include=["number", "bool"]).columns.tolist()
+        # 2) Schema des Trainingssatzes lesen und prüfen (nur Parquet-Footer)
+        all_cols, numeric_cols = self._read_schema(paths["train"])
+        self._basic_checks(all_cols)
 
         # 3) Static categoricals: ID-Spalten
         static_categoricals = [c for c in self.id_cols if c in all_cols]
@@ -80,9 +79,9 @@ class TFTDatasetSpecBuilder:
 
         # Kalender und Feiertage
         if treat_calendar:
-            # einfache Kalenderfeatures
-            for c in CALENDAR_COLS:
-                if c in numeric_cols:
+            # einfache Kalenderfeatures (in Schema-Reihenfolge -> deterministische Spec)
+            for c in all_cols:
+                if c in CALENDAR_COLS and c in numeric_cols:
                     known_reals.append(c)
             # Feiertage per Präfix
             for c in all_cols:
@@ -127,7 +126,12 @@ class TFTDatasetSpecBuilder:
 
         # 6) Sequenzlängen (müssen in TFT_DATASET konfiguriert sein)
         max_encoder_length = int(self.tft_cfg["max_encoder_length"])
+        min_encoder_length = int(self.tft_cfg["min_encoder_length"])
         max_prediction_length = int(self.tft_cfg["max_prediction_length"])
+        if not 1 <= min_encoder_length <= max_encoder_length:
+            raise ValueError(
+                f"min_encoder_length ({min_encoder_length}) muss in [1, max_encoder_length={max_encoder_length}] liegen."
+            )
 
         # 7) Spezifikation schreiben
         spec_path = self.datasets_dir / "dataset_spec.json"
@@ -145,6 +149,7 @@ class TFTDatasetSpecBuilder:
             },
             "lengths": {
                 "max_encoder_length": max_encoder_length,
+                "min_encoder_length": min_encoder_length,
                 "max_prediction_length": max_prediction_length,
             },
             "notes": {
@@ -165,17 +170,50 @@ class TFTDatasetSpecBuilder:
         print(f"- static_categoricals: {static_categoricals}")
         print(f"- known_reals       : {len(known_reals)} Spalten")
         print(f"- unknown_reals     : {len(unknown_reals)} Spalten (inkl. Lags)")
-        print(f"- Längen enc/pred   : {max_encoder_length}/{max_prediction_length}")
+        print(f"- Längen enc/pred   : {min_encoder_length}-{max_encoder_length}/{max_prediction_length}")
         print(f"- Ausgabe           : {spec_path}")
 
         return spec
 
     # ------------------------- intern -------------------------
 
-    def _basic_checks(self, df: pd.DataFrame) -> None:
-        for c in self.id_cols + [self.time_col, self.target_col]:
-            if c not in df.columns:
-                raise KeyError(f"Erwartete Spalte fehlt: {c}")
+    @staticmethod
+    def _read_schema(path: Path) -> tuple[List[str], List[str]]:
+        """Spaltennamen und numerische Spalten (inkl. bool) aus dem Parquet-Schema."""
+        return read_schema(path)
+
+    def _basic_checks(self, columns: List[str]) -> None:
+        check_required_columns(columns, self.id_cols + [self.time_col, self.target_col], "train.parquet")
+
+
+# ------------------------- Kompatibilität -------------------------
+
+# Teile der Spec, die Modellarchitektur und Eingaben festlegen; Pfade/Notizen dürfen abweichen
+SPEC_COMPAT_KEYS = ("time_col", "id_cols", "target_col", "feature_lists", "lengths")
+
+
+def spec_differences(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Liste der Unterschiede zwischen zwei Spezifikationen (leer = kompatibel)."""
+    diffs: List[str] = []
+    for key in SPEC_COMPAT_KEYS:
+        a, b = old.get(key), new.get(key)
+        if isinstance(a, dict) and isinstance(b, dict):
+            for sub in sorted(set(a) | set(b)):
+                if a.get(sub) != b.get(sub):
+                    diffs.append(f"{key}.{sub}: {a.get(sub)!r} -> {b.get(sub)!r}")
+        elif a != b:
+            diffs.append(f"{key}: {a!r} -> {b!r}")
+    return diffs
+
+
+def check_spec_compatible(old: Dict[str, Any], new: Dict[str, Any], ctx: str) -> None:
+    """Bricht ab, wenn ein Checkpoint nicht zur aktuellen Datensatz-Spezifikation passt."""
+    diffs = spec_differences(old, new)
+    if diffs:
+        raise ValueError(
+            f"{ctx}: dataset_spec.json ist nicht kompatibel mit dem Checkpoint-Run:\n  - "
+            + "\n  - ".join(diffs)
+        )
 
 
 # ------------------------- CLI -------------------------
@@ -0,0 +1,208 @@
+# src/modeling/distill_tft.py
+"""
+Wissensdestillation: kompakter TFT-Schüler lernt die Quantil-Prognosen eines trainierten Lehrers.
+
+Training (über trainer_tft.py, Schüler-Config mit Block `distill:`):
+- Lehrer = bestes Checkpoint aus `distill.teacher_run` (gleiche dataset_spec.json Pflicht)
+- Je Trainings-Batch rechnet der Lehrer (eval, ohne Gradienten) auf denselben Fenstern
+- Loss = (1 - alpha)·QuantileLoss(Schüler, y) + alpha·QuantileLoss(Schüler, Lehrer-Quantile)
+  (Quantil i des Schülers gegen Quantil i des Lehrers, gleiche Skala wie QuantileLoss)
+- val_loss bleibt der normale Loss gegen y -> Checkpoint-Auswahl/Early Stopping unverändert
+- Der Schüler ist ein gewöhnlicher TemporalFusionTransformer (Lehrer nicht im state_dict):
+  evaluate, forecast, Inferenz-Artefakt und Run-Registry funktionieren ohne Anpassung
+
+Bericht (CPU): Genauigkeit Lehrer vs. Schüler auf val/test, Latenz je Fenster (batch_size 1),
+Durchsatz (Fenster/s bei großem Batch), Parameter und Artefaktgröße.
+
+Aufrufbeispiele:
+    python -m src train-tft --config configs/trainer_tft_student.yaml
+    python -m src.modeling.distill_tft --student results/tft/<run_id> --split test
+    python -m src distill-report --student results/tft/<run_id> --threads 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import torch
+from pytorch_forecasting.models import TemporalFusionTransformer
+from pytorch_forecasting.utils import detach
+
+from src.config import PROCESSED_DIR
+
+
+# ------------------------- Training -------------------------
+
+def distillation_loss(
+    student: torch.Tensor, teacher: torch.Tensor, quantiles: Sequence[float], decoder_lengths: torch.Tensor
+) -> torch.Tensor:
+    """Pinball-Loss je Quantil gegen die Lehrer-Quantile; Skalierung wie QuantileLoss (Summe über Quantile)."""
+    q = torch.tensor(list(quantiles), dtype=student.dtype, device=student.device)
+    errors = teacher.to(student.dtype) - student
+    losses = 2 * torch.maximum((q - 1) * errors, q * errors)
+    steps = torch.arange(student.size(1), device=student.device)
+    mask = (steps[None, :] < decoder_lengths[:, None]).to(student.dtype)
+    return (losses * mask[..., None]).sum() / mask.sum()
+
+
+class DistilledTFT(TemporalFusionTransformer):
+    """TFT mit zusätzlichem Lehrer-Term im Trainingsschritt; Checkpoints bleiben reine TFT-Checkpoints."""
+
+    def attach_teacher(self, teacher: TemporalFusionTransformer, alpha: float) -> None:
+        teacher.eval()
+        for p in teacher.parameters():
+            p.requires_grad_(False)
+        # object.__setattr__: kein Submodul -> nicht im state_dict, nicht in den Optimizer-Parametern
+        object.__setattr__(self, "_teacher", teacher)
+        object.__setattr__(self, "_alpha", float(alpha))
+
+    def training_step(self, batch, batch_idx):
+        x, y = batch
+        log, out = self.step(x, y, batch_idx)
+
+        teacher = self._teacher
+        if next(teacher.parameters()).device != self.device:
+            teacher.to(self.device)
+        with torch.no_grad():
+            teacher_q = teacher(x)["prediction"]
+        kd = distillation_loss(out["prediction"], teacher_q, self.loss.quantiles, x["decoder_lengths"])
+        self.log("train_distill_loss", kd, on_step=False, on_epoch=True, batch_size=len(x["decoder_lengths"]))
+
+        log["loss"] = (1.0 - self._alpha) * log["loss"] + self._alpha * kd
+        self.training_step_outputs.append(detach(log))
+        return log
+
+
+def load_teacher(teacher_ckpt: Path, student_quantiles: Sequence[float]) -> TemporalFusionTransformer:
+    """Lehrer laden und prüfen, dass er dieselben Quantile ausgibt wie der Schüler."""
+    teacher = TemporalFusionTransformer.load_from_checkpoint(teacher_ckpt, map_location="cpu")
+    teacher_quantiles = list(getattr(teacher.loss, "quantiles", []))
+    if [round(q, 6) for q in teacher_quantiles] != [round(q, 6) for q in student_quantiles]:
+        raise ValueError(
+            f"distill: Lehrer-Quantile {teacher_quantiles} passen nicht zum Schüler {list(student_quantiles)} "
+            "(Lehrer mit model.loss: quantile und gleichem output_size trainieren)."
+        )
+    return teacher
+
+
+def n_params(model: torch.nn.Module) -> int:
+    return sum(p.numel() for p in model.parameters())
+
+
+# ------------------------- Bericht -------------------------
+
+def _timed_forward(model, loader, max_batches: int | None = None) -> List[float]:
+    """Sekunden je Batch für den reinen Forward (ohne Dataloader-Zeit)."""
+    times: List[float] = []
+    with torch.inference_mode():
+        for i, (x, _) in enumerate(loader):
+            if max_batches is not None and i >= max_batches:
+                break
+            t0 = time.perf_counter()
+            model(x)
+            times.append(time.perf_counter() - t0)
+    return times
+
+
+def speed_profile(model, df, first_idx: int, batch_size: int, latency_windows: int) -> Dict[str, float]:
+    """Latenz (batch_size 1, Median/p95) und Durchsatz (Fenster/s bei batch_size) auf der CPU."""
+    from src.evaluation.evaluate_tft import build_eval_dataset
+
+    ds = build_eval_dataset(model, df, first_idx)
+    single = ds.to_dataloader(train=False, batch_size=1, num_workers=0)
+    _timed_forward(model, single, max_batches=5)                     # Aufwärmen
+    lat = sorted(_timed_forward(model, single, max_batches=latency_windows))
+
+    batched = ds.to_dataloader(train=False, batch_size=batch_size, num_workers=0)
+    total = sum(_timed_forward(model, batched))
+    return {
+        "latency_ms_p50": round(1000 * lat[len(lat) // 2], 3),
+        "latency_ms_p95": round(1000 * lat[min(len(lat) - 1, int(0.95 * len(lat)))], 3),
+        "throughput_windows_per_s": round(len(ds) / total, 1),
+        "n_windows": len(ds),
+    }
+
+
+def _relative(student: float, teacher: float) -> float | None:
+    return round((student - teacher) / abs(teacher), 4) if teacher else None
+
+
+def distillation_report(
+    student_run: Path, split: str, batch_size: int, latency_windows: int, threads: int
+) -> Dict[str, Any]:
+    from src.evaluation.evaluate_tft import _read_split_with_history, predict_long, resolve_best_checkpoint
+    from src.evaluation.metrics import overall_metrics
+
+    summary_path = student_run / "summary.json"
+    if not summary_path.exists():
+        raise FileNotFoundError(f"summary.json nicht gefunden: {summary_path}")
+    distill = (json.loads(summary_path.read_text(encoding="utf-8")).get("meta") or {}).get("distill")
+    if not distill:
+        raise ValueError(f"{student_run.name} ist kein Schüler-Run (meta.distill fehlt in summary.json).")
+
+    if threads > 0:
+        torch.set_num_threads(threads)
+    df, first_idx = _read_split_with_history(PROCESSED_DIR, split)
+
+    ckpts = {"teacher": Path(distill["teacher_checkpoint"]), "student": resolve_best_checkpoint(student_run)}
+    report: Dict[str, Any] = {"split": split, "threads": torch.get_num_threads(), "batch_size": batch_size}
+    for role, ckpt in ckpts.items():
+        model = TemporalFusionTransformer.load_from_checkpoint(ckpt, map_location="cpu").eval()
+        pred = predict_long(model, df, first_idx, batch_size, num_workers=0)
+        report[role] = {
+            "checkpoint": str(ckpt),
+            "params": n_params(model),
+            "checkpoint_mb": round(ckpt.stat().st_size / 1024 ** 2, 3),
+            "metrics": overall_metrics(pred),
+            **speed_profile(model, df, first_idx, batch_size, latency_windows),
+        }
+
+    t, s = report["teacher"], report["student"]
+    report["comparison"] = {
+        **{f"{k}_rel_change": _relative(s["metrics"][k], t["metrics"][k])
+           for k in ("mae", "rmse", "smape", "quantile_loss") if k in t["metrics"]},
+        "latency_speedup": round(t["latency_ms_p50"] / s["latency_ms_p50"], 2),
+        "throughput_speedup": round(s["throughput_windows_per_s"] / t["throughput_windows_per_s"], 2),
+        "param_ratio": round(s["params"] / t["params"], 4),
+    }
+    return report
+
+
+# ------------------------- CLI -------------------------
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Destillations-Bericht: Genauigkeit vs. Latenz/Durchsatz (CPU).")
+    ap.add_argument("--student", type=str, required=True, help="Schüler-Run, z. B. results/tft/run_..._student")
+    ap.add_argument("--split", type=str, default="val", choices=["val", "test"])
+    ap.add_argument("--batch-size", type=int, default=512)
+    ap.add_argument("--latency-windows", type=int, default=200, help="Fenster für die Latenzmessung")
+    ap.add_argument("--threads", type=int, default=0, help="torch-Threads (0 = unverändert)")
+    args = ap.parse_args()
+
+    student_run = Path(args.student)
+    report = distillation_report(student_run, args.split, args.batch_size, args.latency_windows, args.threads)
+
+    out_dir = student_run / "distillation"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / f"report_{args.split}.json"
+    out_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    t, s, c = report["teacher"], report["student"], report["comparison"]
+    print(f"[distill_tft] Split {args.split} | Threads {report['threads']}")
+    print(f"{'':<10}{'Params':>10}{'MAE':>10}{'QLoss':>10}{'p50 ms':>10}{'Fenster/s':>12}")
+    for role, r in (("Lehrer", t), ("Schüler", s)):
+        m = r["metrics"]
+        print(f"{role:<10}{r['params']:>10,}{m['mae']:>10.3f}{m.get('quantile_loss', float('nan')):>10.3f}"
+              f"{r['latency_ms_p50']:>10.2f}{r['throughput_windows_per_s']:>12,.0f}")
+    print(f"[distill_tft] MAE {c['mae_rel_change']:+.1%} | Latenz ×{c['latency_speedup']} | "
+          f"Durchsatz ×{c['throughput_speedup']} | Parameter ×{c['param_ratio']}")
+    print(f"[distill_tft] Bericht: {out_path}")
+
+
+if __name__ == "__main__":
+    # python -m src.modeling.distill_tft --student results/tft/<run_id> --split val
+    main()
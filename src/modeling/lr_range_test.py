@@ -0,0 +1,254 @@
+# src/modeling/lr_range_test.py
+"""
+Lernraten-Suchlauf (LR range test) für eine Trainer-YAML – statt mehrerer kompletter Trainings.
+
+Ablauf:
+1. TimeSeriesDataSet-Objekte aus dem Cache (je Dataset-Fingerprint, siehe
+   load_datasets_cached); gebaut wird nur beim ersten Lauf bzw. nach Datenänderung
+2. Modell wie im Training (trainer_tft.build_model, gleiche YAML-Werte)
+3. Lightning `lr_find`: `steps` Trainings-Batches mit exponentiell steigender LR
+   (min_lr -> max_lr), Abbruch bei Divergenz; Gewichte werden danach zurückgesetzt
+4. Empfehlung aus dem geglätteten Loss (Lightning glättet exponentiell mit β = 0.98):
+   steilster Abfall über log10(LR), nur links vom Loss-Minimum (danach wird es instabil);
+   zum Vergleich: LR am Minimum / 10
+
+Ausgabe unter results/lr_find/<lauf>/:
+    lr_curve.csv      lr, loss (geglättet)
+    lr_curve.png      Kurve mit Empfehlung
+    suggestion.json   Empfehlung, Kennwerte des Laufs, Config, Dataset-Fingerprint
+
+Aufrufbeispiele:
+    python -m src.modeling.lr_range_test --config configs/trainer_tft_baseline.yaml
+    python -m src lr-find --config configs/trainer_tft_lr0007.yaml --steps 60 --write-config
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from src.config import LR_RANGE_TEST, PROCESSED_DIR
+from src.utils.config_loader import load_trainer_cfg
+
+
+# ------------------------- Empfehlung -------------------------
+
+def suggest_lr(lrs: List[float], losses: List[float], skip_begin: int) -> Dict[str, Optional[float]]:
+    """
+    Steilster Abfall des geglätteten Loss über log10(LR) links vom Minimum.
+    Rückgabe: {"steepest": …, "min_loss": …, "min_div10": …}; None, wenn zu wenige Punkte.
+    """
+    import numpy as np
+
+    lr = np.asarray(lrs, dtype=float)
+    loss = np.asarray(losses, dtype=float)
+    ok = np.isfinite(loss) & (lr > 0)
+    ok[:skip_begin] = False
+    lr, loss = lr[ok], loss[ok]
+    if len(loss) < 3:
+        return {"steepest": None, "min_loss": None, "min_div10": None}
+
+    i_min = int(np.argmin(loss))
+    lr_min = float(lr[i_min])
+    if i_min < 2:
+        # Loss fällt nie – Minimum am Anfang: kein Abfall, untere Grenze empfehlen
+        return {"steepest": float(lr[0]), "min_loss": lr_min, "min_div10": lr_min / 10}
+    grad = np.gradient(loss[: i_min + 1], np.log10(lr[: i_min + 1]))
+    return {"steepest": float(lr[int(np.argmin(grad))]), "min_loss": lr_min, "min_div10": lr_min / 10}
+
+
+# ------------------------- Suchlauf -------------------------
+
+def load_datasets_cached(processed_dir: Path, strategy: str, cache_dir: Path):
+    """
+    Wie trainer_tft._load_dataset_from_spec, aber die gebauten TimeSeriesDataSet-Objekte werden je
+    Dataset-Fingerprint (dataset_spec.json, meta.json, Split-Dateien) abgelegt und beim
+    nächsten Aufruf nur geladen. Ändern sich die Daten, wird neu gebaut und der alte Cache ersetzt.
+    Rückgabe: (train_ds, val_ds, Cache-Treffer).
+    """
+    import torch
+    import pytorch_forecasting
+
+    from src.modeling.trainer_tft import _load_dataset_from_spec
+    from src.utils.run_registry import dataset_fingerprint
+
+    key = f"{dataset_fingerprint(processed_dir)}_{strategy}_pf{pytorch_forecasting.__version__}"
+    cache_path = Path(cache_dir) / f"tsds_{key}.pt"
+    if cache_path.exists():
+        cached = torch.load(cache_path, weights_only=False)
+        return cached["train"], cached["val"], True
+
+    train_ds, val_ds = _load_dataset_from_spec(processed_dir, strategy=strategy)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    for stale in cache_path.parent.glob("tsds_*.pt"):
+        stale.unlink()
+    tmp = cache_path.with_suffix(".tmp")
+    torch.save({"train": train_ds, "val": val_ds}, tmp)
+    tmp.replace(cache_path)
+    return train_ds, val_ds, False
+
+
+def run_range_test(
+    config_path: Path,
+    steps: int,
+    min_lr: float,
+    max_lr: float,
+    out_root: Path = LR_RANGE_TEST["out_dir"],
+) -> Dict[str, Any]:
+    if steps < 5:
+        raise ValueError(f"--steps muss >= 5 sein: {steps}")
+    if not 0 < min_lr < max_lr:
+        raise ValueError(f"Erwartet 0 < min_lr < max_lr, erhalten: {min_lr}, {max_lr}")
+    cfg = load_trainer_cfg(config_path)
+
+    import lightning.pytorch as pl
+    import torch
+    from lightning.pytorch.tuner import Tuner
+
+    from src.modeling.dataloaders import apply_torch_threads, build_dataloaders
+    from src.modeling.memory_planner import plan_dataset_memory
+    from src.modeling.trainer_tft import build_model
+    from src.utils.run_registry import dataset_fingerprint
+
+    pl.seed_everything(cfg.seed, workers=True)
+    torch.use_deterministic_algorithms(cfg.deterministic)
+    apply_torch_threads(cfg.dataloader)
+
+    t_start = time.perf_counter()
+    plan = plan_dataset_memory(PROCESSED_DIR, cfg.batch_size, cfg.model.hidden_size, cfg.model.attention_head_size)
+    train_ds, val_ds, cache_hit = load_datasets_cached(PROCESSED_DIR, plan.strategy, LR_RANGE_TEST["cache_dir"])
+    t_data = time.perf_counter() - t_start
+    print(f"[lr_range_test] Datensatz {'aus Cache' if cache_hit else 'gebaut und gecacht'} ({t_data:.1f}s)")
+
+    train_loader, _ = build_dataloaders(train_ds, val_ds, cfg.batch_size, cfg.num_workers, cfg.dataloader, cfg.seed)
+    model, _ = build_model(cfg, train_ds)   # Destillations-Block wird ignoriert: Suchlauf auf Loss(y)
+
+    run_dir = Path(out_root) / f"lr_{datetime.now():%Y%m%d_%H%M%S}_{config_path.stem}"
+    run_dir.mkdir(parents=True, exist_ok=True)
+    trainer = pl.Trainer(
+        accelerator=cfg.accelerator,
+        devices=cfg.devices,
+        gradient_clip_val=cfg.gradient_clip_val,
+        precision=cfg.precision,
+        deterministic=cfg.deterministic,
+        logger=False,
+        enable_checkpointing=False,
+        enable_progress_bar=False,
+        enable_model_summary=False,
+        default_root_dir=str(run_dir),   # temporäres Checkpoint von lr_find
+    )
+    t_sweep = time.perf_counter()
+    finder = Tuner(trainer).lr_find(
+        model,
+        train_dataloaders=train_loader,
+        min_lr=min_lr,
+        max_lr=max_lr,
+        num_training=steps,
+        mode="exponential",
+        early_stop_threshold=LR_RANGE_TEST["divergence_factor"],
+        update_attr=False,
+    )
+    t_sweep = time.perf_counter() - t_sweep
+    if finder is None:
+        raise RuntimeError("lr_find lieferte kein Ergebnis.")
+
+    lrs, losses = list(finder.results["lr"]), list(finder.results["loss"])
+    suggestion = suggest_lr(lrs, losses, LR_RANGE_TEST["skip_begin"])
+    if suggestion["steepest"] is None:
+        raise ValueError(f"Zu wenige gültige Punkte ({len(losses)}) für eine Empfehlung – --steps erhöhen.")
+
+    result = {
+        "config": str(config_path),
+        "configured_lr": cfg.learning_rate,
+        "suggested_lr": suggestion["steepest"],
+        "method": "steepest_log_slope_before_min",
+        "alternatives": {"min_loss": suggestion["min_loss"], "min_div10": suggestion["min_div10"]},
+        "min_lr": min_lr,
+        "max_lr": max_lr,
+        "steps_requested": steps,
+        "steps_run": len(losses),
+        "diverged": len(losses) < steps,
+        "batch_size": cfg.batch_size,
+        "dataset_fingerprint": dataset_fingerprint(PROCESSED_DIR),
+        "dataset_cache_hit": cache_hit,
+        "seconds_data": round(t_data, 2),
+        "seconds_sweep": round(t_sweep, 2),
+        "run_dir": str(run_dir),
+    }
+    _write_outputs(run_dir, lrs, losses, result)
+    return result
+
+
+def _write_outputs(run_dir: Path, lrs: List[float], losses: List[float], result: Dict[str, Any]) -> None:
+    import pandas as pd
+
+    pd.DataFrame({"lr": lrs, "loss": losses}).to_csv(run_dir / "lr_curve.csv", index=False)
+    (run_dir / "suggestion.json").write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    from src.visualization.plot_io import apply_style, finish_figure
+
+    apply_style()
+    fig, ax = plt.subplots(figsize=(8, 4.5))
+    ax.plot(lrs, losses, color="tab:blue", label="Loss (geglättet)")
+    ax.axvline(result["suggested_lr"], color="tab:red", linestyle="--",
+               label=f"Empfehlung {result['suggested_lr']:.2e}")
+    ax.axvline(result["configured_lr"], color="tab:gray", linestyle=":",
+               label=f"YAML {result['configured_lr']:.2e}")
+    ax.set_xscale("log")
+    ax.set_xlabel("Lernrate")
+    ax.set_ylabel("Loss")
+    ax.set_title(f"LR-Suchlauf: {Path(result['config']).name}")
+    ax.legend(loc="best")
+    finish_figure(fig, run_dir / "lr_curve.png")
+
+
+def write_config(config_path: Path, lr: float, out_path: Optional[Path] = None) -> Path:
+    """Config-Kopie mit der empfohlenen Lernrate (wie tune_dataloader.py, YAML-Kommentare gehen verloren)."""
+    cfg_dict = yaml.safe_load(config_path.read_text(encoding="utf-8"))
+    cfg_dict["learning_rate"] = float(f"{lr:.3g}")
+    out_path = out_path or config_path.with_name(f"{config_path.stem}_lrfind.yaml")
+    header = (
+        f"# Automatisch erzeugt von lr_range_test.py am {datetime.now():%Y-%m-%d %H:%M}\n"
+        f"# Ausgangs-Config: {config_path}  |  empfohlene LR {lr:.3g}\n"
+    )
+    out_path.write_text(header + yaml.safe_dump(cfg_dict, sort_keys=False, allow_unicode=True), encoding="utf-8")
+    load_trainer_cfg(out_path)  # geschriebene Config muss wieder valide sein
+    return out_path
+
+
+# ------------------------- CLI -------------------------
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Lernraten-Suchlauf (exponentiell) mit Empfehlung.")
+    ap.add_argument("--config", type=str, default="configs/trainer_tft_baseline.yaml")
+    ap.add_argument("--steps", type=int, default=LR_RANGE_TEST["steps"], help="Trainings-Batches des Suchlaufs")
+    ap.add_argument("--min-lr", type=float, default=LR_RANGE_TEST["min_lr"])
+    ap.add_argument("--max-lr", type=float, default=LR_RANGE_TEST["max_lr"])
+    ap.add_argument("--write-config", action="store_true", help="configs/<name>_lrfind.yaml mit der Empfehlung schreiben")
+    args = ap.parse_args()
+
+    config_path = Path(args.config)
+    result = run_range_test(config_path, args.steps, args.min_lr, args.max_lr)
+    alt = result["alternatives"]
+    print(f"[lr_range_test] {result['steps_run']}/{result['steps_requested']} Schritte "
+          f"{'(Divergenz-Abbruch) ' if result['diverged'] else ''}in {result['seconds_sweep']}s")
+    print(f"[lr_range_test] Empfehlung: {result['suggested_lr']:.3g} "
+          f"(YAML: {result['configured_lr']:.3g} | Minimum: {alt['min_loss']:.3g} | Minimum/10: {alt['min_div10']:.3g})")
+    print(f"[lr_range_test] Kurve und Empfehlung: {result['run_dir']}")
+    if args.write_config:
+        print(f"[lr_range_test] Config geschrieben: {write_config(config_path, result['suggested_lr'])}")
+
+
+if __name__ == "__main__":
+    # python -m src.modeling.lr_range_test --config configs/trainer_tft_baseline.yaml
+    main()
@@ -0,0 +1,262 @@
+# src/modeling/memory_planner.py
+"""
+Speicherplanung für den Aufbau der TimeSeriesDataSet-Objekte (trainer_tft.py).
+
+Schätzt vor dem Laden – nur aus Parquet-Metadaten und dataset_spec.json:
+- Spitzenbedarf beim Datensatz-Aufbau (train + val), je Strategie
+- Bedarf eines Trainings-Batches (Eingaben + Aktivierungen inkl. Backward, grob)
+
+Strategien:
+    eager    pd.read_parquet aller Spalten (bisheriges Verhalten)
+    chunked  Row-Group-weises Lesen nur der vom Datensatz genutzten Spalten,
+             Floats sofort als float32, Strings als Dictionary (-> pandas category),
+             Umwandlung nach pandas mit self_destruct (Arrow-Puffer werden dabei frei)
+
+Auswahl: eager, wenn die Schätzung ins Budget passt, sonst chunked; passt auch chunked
+nicht, bricht der Plan vor dem Laden mit MemoryError ab (statt tief in pytorch_forecasting).
+Budget: MEMORY_PLANNER in config.py (fester Wert oder Anteil des verfügbaren Speichers).
+
+Die Faktoren sind bewusst grobe obere Schranken; Plan und Strategie landen in
+summary.json (meta.memory_plan), damit Schätzung und Praxis vergleichbar bleiben.
+
+Aufruf (nur Plan ausgeben):
+    python -m src.modeling.memory_planner --config configs/trainer_tft_baseline.yaml
+    python -m src memory-plan --config configs/trainer_tft_baseline.yaml --budget-gb 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config import ID_COLS, MEMORY_PLANNER, PROCESSED_DIR, TARGET_COL, TIME_COL
+
+STRATEGIES = ("eager", "chunked")
+MB = 1024 ** 2
+
+PY_OBJECT_BYTES = 57          # Zeiger + Python-str-Kopf je Wert in einer object-Spalte
+ARROW_READ_FACTOR = 1.0       # Arrow-Tabelle lebt beim eager-Lesen parallel zum DataFrame
+TSDS_COPY_FACTOR = 2.0        # pytorch_forecasting kopiert/ergänzt die genutzten Spalten vor den Tensoren
+TSDS_INDEX_BYTES = 5 * 4      # Fenster-Index: 5 int32-Spalten je Fenster
+ACTIVATION_FACTOR = 12        # GRN-/Variable-Selection-Zwischenstände je Variable und Zeitschritt
+LSTM_GATE_FACTOR = 8          # Gates + Zustände von Encoder/Decoder-LSTM
+BACKWARD_FACTOR = 2           # Aktivierungen + Gradienten
+
+
+@dataclass
+class MemoryPlan:
+    strategy: str
+    budget_mb: float
+    rows: Dict[str, int]
+    columns_eager: int
+    columns_chunked: int
+    dataset_eager_mb: float
+    dataset_chunked_mb: float
+    batch_mb: float
+    batch_size: int
+    notes: List[str]
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+    def summary(self) -> str:
+        return (f"Strategie {self.strategy} | Budget {self.budget_mb:,.0f} MB | "
+                f"Datensatz eager {self.dataset_eager_mb:,.1f} MB / chunked {self.dataset_chunked_mb:,.1f} MB | "
+                f"Batch ({self.batch_size}) {self.batch_mb:,.1f} MB")
+
+
+# ------------------------- Budget -------------------------
+
+def available_memory_bytes() -> int:
+    """MemAvailable (Linux), sonst physischer Speicher."""
+    meminfo = Path("/proc/meminfo")
+    if meminfo.exists():
+        for line in meminfo.read_text().splitlines():
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) * 1024
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+
+def memory_budget_bytes(budget_gb: Optional[float] = None) -> int:
+    gb = MEMORY_PLANNER["budget_gb"] if budget_gb is None else budget_gb
+    if gb < 0:
+        raise ValueError(f"Speicherbudget muss >= 0 sein (0 = Anteil des verfügbaren Speichers): {gb}")
+    if gb > 0:
+        return int(gb * 1024 ** 3)
+    return int(available_memory_bytes() * float(MEMORY_PLANNER["budget_fraction"]))
+
+
+# ------------------------- Schätzung -------------------------
+
+def dataset_columns(schema_names: List[str]) -> List[str]:
+    """Spalten, die _load_dataset_from_spec an TimeSeriesDataSet übergibt."""
+    time_idx_col = "time_idx" if "time_idx" in schema_names else TIME_COL
+    return [time_idx_col, TARGET_COL, *ID_COLS]
+
+
+def _column_bytes(path: Path, compact: bool) -> Dict[str, float]:
+    """Speicher je Spalte als pandas-Spalte; compact = float32 und category wie im chunked-Pfad."""
+    pf = pq.ParquetFile(path)
+    md, schema = pf.metadata, pf.schema_arrow
+    n = md.num_rows
+    uncompressed = {name: 0 for name in schema.names}
+    for rg in range(md.num_row_groups):
+        group = md.row_group(rg)
+        for i in range(group.num_columns):
+            col = group.column(i)
+            uncompressed[col.path_in_schema] += col.total_uncompressed_size
+
+    out: Dict[str, float] = {}
+    for field in schema:
+        t = field.type
+        if pa.types.is_string(t) or pa.types.is_large_string(t) or pa.types.is_dictionary(t):
+            # compact: int8/int16-Codes; sonst Python-Objekte je Wert
+            out[field.name] = n * (2 if compact else PY_OBJECT_BYTES + uncompressed[field.name] / max(n, 1))
+        elif pa.types.is_floating(t):
+            out[field.name] = n * (4 if compact else t.bit_width // 8)
+        elif pa.types.is_boolean(t):
+            out[field.name] = n
+        elif pa.types.is_timestamp(t) or pa.types.is_date(t):
+            out[field.name] = n * 8
+        else:
+            out[field.name] = n * max(1, getattr(t, "bit_width", 64) // 8)
+    return out
+
+
+def _dataset_bytes(path: Path, strategy: str, n_groups: int) -> float:
+    """Spitze für einen Split: gelesener Frame + Kopie in TimeSeriesDataSet + Tensoren + Index."""
+    names = pq.ParquetFile(path).schema_arrow.names
+    n = pq.ParquetFile(path).metadata.num_rows
+    used = dataset_columns(names)
+
+    full = _column_bytes(path, compact=False)
+    if strategy == "eager":
+        frame = sum(full.values()) * (1 + ARROW_READ_FACTOR)
+        used_frame = sum(full[c] for c in used)
+    else:
+        compact = _column_bytes(path, compact=True)
+        frame = used_frame = sum(compact[c] for c in used)
+    tensors = n * (4 + 8 + 4 + 8 * n_groups + 8)     # reals (encoder_length), time, target, groups, Puffer
+    return frame + TSDS_COPY_FACTOR * used_frame + tensors + n * TSDS_INDEX_BYTES
+
+
+def batch_bytes(spec: Dict[str, object], batch_size: int, hidden_size: int, attention_heads: int) -> float:
+    """Ein Trainings-Batch: Eingabetensoren + TFT-Aktivierungen (Feature-Anzahl aus dataset_spec.json)."""
+    lists = spec["feature_lists"]
+    lengths = spec["lengths"]
+    enc, dec = int(lengths["max_encoder_length"]), int(lengths["max_prediction_length"])
+    steps = enc + dec
+    n_reals = len(lists["time_varying_known_reals"]) + len(lists["time_varying_unknown_reals"])
+    n_cats = len(lists["static_categoricals"]) + len(lists["time_varying_known_categoricals"])
+
+    inputs = batch_size * steps * (4 * n_reals + 8 * n_cats) + batch_size * dec * 4 * 2
+    variables = batch_size * steps * (n_reals + n_cats) * hidden_size * 4 * ACTIVATION_FACTOR
+    lstm = batch_size * steps * hidden_size * 4 * LSTM_GATE_FACTOR
+    attention = batch_size * attention_heads * dec * steps * 4
+    return inputs + BACKWARD_FACTOR * (variables + lstm + attention)
+
+
+def plan_dataset_memory(
+    processed_dir: Path,
+    batch_size: int,
+    hidden_size: int,
+    attention_heads: int,
+    budget_bytes: Optional[int] = None,
+) -> MemoryPlan:
+    """Strategie wählen; MemoryError, wenn selbst der chunked-Pfad das Budget übersteigt."""
+    spec_path = processed_dir / "dataset_spec.json"
+    if not spec_path.exists():
+        raise FileNotFoundError(f"dataset_spec.json nicht gefunden: {spec_path}")
+    spec = json.loads(spec_path.read_text(encoding="utf-8"))
+    paths = {s: Path(spec["paths"][s]) for s in ("train", "val")}
+    for p in paths.values():
+        if not p.exists():
+            raise FileNotFoundError(f"Parquet-Datei nicht gefunden: {p}")
+
+    budget = memory_budget_bytes() if budget_bytes is None else budget_bytes
+    n_groups = len(ID_COLS)
+    est = {s: sum(_dataset_bytes(p, s, n_groups) for p in paths.values()) for s in STRATEGIES}
+    batch = batch_bytes(spec, batch_size, hidden_size, attention_heads)
+    names = pq.ParquetFile(paths["train"]).schema_arrow.names
+
+    notes: List[str] = []
+    if est["eager"] + batch <= budget:
+        strategy = "eager"
+    elif est["chunked"] + batch <= budget:
+        strategy = "chunked"
+        notes.append("eager-Schätzung über Budget -> chunked")
+    else:
+        raise MemoryError(
+            f"Datensatz passt nicht ins Speicherbudget ({budget / MB:,.0f} MB): "
+            f"chunked {est['chunked'] / MB:,.1f} MB + Batch {batch / MB:,.1f} MB. "
+            f"Budget erhöhen (MEMORY_PLANNER) oder batch_size verkleinern."
+        )
+
+    return MemoryPlan(
+        strategy=strategy,
+        budget_mb=round(budget / MB, 1),
+        rows={s: pq.ParquetFile(p).metadata.num_rows for s, p in paths.items()},
+        columns_eager=len(names),
+        columns_chunked=len(dataset_columns(names)),
+        dataset_eager_mb=round(est["eager"] / MB, 1),
+        dataset_chunked_mb=round(est["chunked"] / MB, 1),
+        batch_mb=round(batch / MB, 1),
+        batch_size=batch_size,
+        notes=notes,
+    )
+
+
+# ------------------------- chunked-Pfad -------------------------
+
+def _compact_column(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    import pyarrow.compute as pc
+
+    if pa.types.is_floating(column.type):
+        return pc.cast(column, pa.float32())
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        return pc.dictionary_encode(column)
+    return column
+
+
+def read_parquet_chunked(path: Path, columns: List[str], chunk_rows: int = MEMORY_PLANNER["chunk_rows"]):
+    """Row-Group-weise, nur `columns`, kompakt (float32, category); Ergebnis als pandas.DataFrame."""
+    pf = pq.ParquetFile(path)
+    tables = []
+    for batch in pf.iter_batches(batch_size=chunk_rows, columns=columns):
+        table = pa.Table.from_batches([batch])
+        tables.append(pa.table([_compact_column(c) for c in table.columns], names=table.column_names))
+    if not tables:
+        raise ValueError(f"Keine Zeilen in {path}")
+    table = pa.concat_tables(tables).unify_dictionaries().combine_chunks()
+    del tables
+    return table.to_pandas(self_destruct=True, split_blocks=True)
+
+
+# ------------------------- CLI -------------------------
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Speicherplan für den TFT-Datensatz ausgeben.")
+    ap.add_argument("--config", type=str, required=True, help="Trainer-YAML (batch_size, hidden_size)")
+    ap.add_argument("--budget-gb", type=float, default=None, help="Überschreibt MEMORY_PLANNER['budget_gb']")
+    args = ap.parse_args()
+
+    from src.utils.config_loader import load_trainer_cfg
+
+    cfg = load_trainer_cfg(args.config)
+    budget = memory_budget_bytes(args.budget_gb)
+    plan = plan_dataset_memory(PROCESSED_DIR, cfg.batch_size, cfg.model.hidden_size,
+                               cfg.model.attention_head_size, budget)
+    print(f"[memory_planner] {plan.summary()}")
+    print(json.dumps(plan.to_dict(), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    # python -m src.modeling.memory_planner --config configs/trainer_tft_baseline.yaml
+    main()
@@ -7,13 +7,15 @@ cyclical_encoder und lag_features).
 Philosophie:
 - Einfacher, deterministischer Zeit-Split.
 - Sanity-Checks gegen Leckage.
+- Optional: geschichtete Reihen-Teilmenge für schnelle Experimente (subsample.py);
+  Zeitgrenzen kommen dann weiterhin aus dem vollen Panel.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import json
 import pandas as pd
@@ -30,7 +32,20 @@ from src.config import (
     TEST_START,
     SPLIT_RATIOS,
     SCALE_COLS,
+    SCALE_MODE,
+    SCALE_LOG1P,
+    SUBSAMPLE,
 )
+from src.modeling.scaling import GroupScaler
+from src.modeling.subsample import (
+    SubsampleManifest,
+    build_manifest,
+    parquet_filters,
+    select_series,
+    series_profile,
+    validate_params,
+)
+from src.modeling.validation import inputs_fingerprint, raise_on_errors, validate_panel
 
 
 # ------------------------- I/O-Helfer -------------------------
@@ -79,6 +94,17 @@ class TimeSplitPlan:
                 raise ValueError("Erwartet: VAL_START < TEST_START.")
             return self.val_start, self.test_start
 
+        ts_sorted = df[time_col].sort_values().reset_index(drop=True)
+        return self.boundaries_from_sorted(len(ts_sorted), lambda i: ts_sorted.iloc[i])
+
+    def boundaries_from_sorted(
+        self, n: int, value_at: Callable[[int], Any]
+    ) -> Tuple[pd.Timestamp, pd.Timestamp]:
+        """
+        Ratio-Grenzen aus n aufsteigend sortierten Zeitstempeln.
+        `value_at(i)` liefert den i-ten Zeitstempel (0-basiert) – so kann die
+        Sortierung auch außerhalb von pandas erfolgen (z. B. lazy_engine.py).
+        """
         if not self.ratios:
             raise ValueError("Weder feste Startdaten noch SPLIT_RATIOS vorhanden.")
 
@@ -86,8 +112,6 @@ class TimeSplitPlan:
         if abs((r_train + r_val + r_test) - 1.0) > 1e-6:
             raise ValueError("SPLIT_RATIOS müssen zu 1.0 summieren, z. B. (0.7,0.15,0.15).")
 
-        ts_sorted = df[time_col].sort_values().reset_index(drop=True)
-        n = len(ts_sorted)
         if n < 10:
             raise ValueError("Zu wenige Zeilen für einen sinnvollen Split.")
 
@@ -95,8 +119,8 @@ class TimeSplitPlan:
         idx_test = max(idx_val + 1, int(n * (r_train + r_val)))
 
         # Grenzwerte auf echte Zeitstempel mappen (Anfang der jeweiligen Segmente)
-        val_start = pd.to_datetime(ts_sorted.iloc[idx_val])
-        test_start = pd.to_datetime(ts_sorted.iloc[idx_test])
+        val_start = pd.to_datetime(value_at(idx_val))
+        test_start = pd.to_datetime(value_at(idx_test))
         if not (val_start < test_start):
             raise ValueError("Berechnete Grenzen verletzen val_start < test_start.")
         return val_start, test_start
@@ -111,9 +135,10 @@ def time_split(
     df = df.copy()
     df[time_col] = pd.to_datetime(df[time_col])
 
-    train = df[df[time_col] < val_start]
-    val = df[(df[time_col] >= val_start) & (df[time_col] < test_start)]
-    test = df[df[time_col] >= test_start]
+    # .copy() je Teil: eigenständige Frames, die später in-place skaliert werden dürfen
+    train = df[df[time_col] < val_start].copy()
+    val = df[(df[time_col] >= val_start) & (df[time_col] < test_start)].copy()
+    test = df[df[time_col] >= test_start].copy()
     return train, val, test
 
 
@@ -130,10 +155,20 @@ class ModelDatasetBuilder:
     test_start: Optional[str] = None
     split_ratios: Optional[Tuple[float, float, float]] = None
     scale_cols: Optional[List[str]] = None  # leere Liste => keine Skalierung
+    scale_mode: str = "standard"            # "standard" (Mittelwert/Std) | "robust" (Median/IQR)
+    scale_log1p: bool = False               # log1p vor der Skalierung
+    subsample_fraction: Optional[float] = None  # None => alle Reihen
+    subsample_seed: int = 42
+    subsample_bins: int = 3
 
     def run(self) -> Dict[str, Any]:
-        # 1) Laden
-        df = _read_any_table(self.data_path)
+        # 1) Laden (bei Teilmenge: nur ausgewählte Reihen per Parquet-Filter)
+        subsample: Optional[SubsampleManifest] = None
+        if self.subsample_fraction is None:
+            df = _read_any_table(self.data_path)
+        else:
+            subsample, filters, bounds = self.select_subsample()
+            df = pd.read_parquet(self.data_path, filters=filters)
         if self.time_col not in df.columns:
             raise KeyError(f"TIME_COL '{self.time_col}' nicht in DataFrame.")
         if self.target_col not in df.columns:
@@ -147,46 +182,28 @@ class ModelDatasetBuilder:
         df[self.time_col] = pd.to_datetime(df[self.time_col])
         df.sort_values([self.time_col] + self.id_cols, inplace=True)
 
-        # 3) Split-Plan bestimmen
-        plan = TimeSplitPlan.from_config(self.val_start, self.test_start, self.split_ratios)
-        val_start_ts, test_start_ts = plan.compute_boundaries(df, self.time_col)
+        # 3) Split-Plan bestimmen (Teilmenge: Grenzen des vollen Panels)
+        if subsample is None:
+            plan = TimeSplitPlan.from_config(self.val_start, self.test_start, self.split_ratios)
+            val_start_ts, test_start_ts = plan.compute_boundaries(df, self.time_col)
+        else:
+            val_start_ts, test_start_ts = bounds
 
         # 4) Splitten
         train, val, test = time_split(df, self.time_col, val_start_ts, test_start_ts)
 
         # 5) Sanity-Checks
-        self._sanity_checks(train, val, test)
+        validation = self._sanity_checks(
+            train, val, test, val_start_ts, test_start_ts,
+            subsample.selection_hash if subsample is not None else None,
+        )
 
-        # 6) Optionale gruppenweise Z-Standardisierung auf ausgewählte Spalten
+        # 6) Optionale gruppenweise Skalierung ausgewählter Spalten (Fit nur auf TRAIN)
+        scaler = None
         if self.scale_cols:
-            # Fit nur auf TRAIN (group-wise)
-            stats = (
-                train.groupby(self.id_cols)[self.scale_cols]
-                .agg(["mean", "std"])
-                .reset_index()
-            )
-            # MultiIndex-Spalten → flachziehen
-            stats.columns = ["__".join([c for c in col if c]) for col in stats.columns.values]
-
-            def _apply_scale(part: pd.DataFrame) -> pd.DataFrame:
-                part = part.copy()
-                merged = part.merge(
-                    stats,
-                    on=self.id_cols,
-                    how="left",
-                    suffixes=("", ""),
-                )
-                for col in self.scale_cols:  # type: ignore
-                    mcol = f"{col}__mean"
-                    scol = f"{col}__std"
-                    mean = merged[mcol]
-                    std = merged[scol].replace(0, pd.NA)
-                    part[col] = (part[col] - mean).divide(std)
-                return part
-
-            train = _apply_scale(train)
-            val = _apply_scale(val)
-            test = _apply_scale(test)
+            scaler = GroupScaler(self.id_cols, list(self.scale_cols), self.scale_mode, self.scale_log1p).fit(train)
+            for part in (train, val, test):
+                scaler.transform(part)
 
         # 7) Speichern
         _ensure_dir(self.output_dir)
@@ -199,6 +216,7 @@ class ModelDatasetBuilder:
         train.to_parquet(paths["train"], index=False)
         val.to_parquet(paths["val"], index=False)
         test.to_parquet(paths["test"], index=False)
+        scaler_files = scaler.save(self.output_dir) if scaler is not None else {}
 
         manifest = {
             "time_col": self.time_col,
@@ -214,6 +232,13 @@ class ModelDatasetBuilder:
             "output_dir": str(self.output_dir),
             "source": str(self.data_path),
             "scaled_cols": self.scale_cols or [],
+            "validation": validation,
+            "scaling": (
+                {"mode": self.scale_mode, "log1p": self.scale_log1p, "files": scaler_files}
+                if scaler is not None else None
+            ),
+            "engine": "pandas",
+            "subsample": subsample.to_dict() if subsample is not None else None,
         }
         with paths["manifest"].open("w", encoding="utf-8") as f:
             json.dump(manifest, f, indent=2, ensure_ascii=False)
@@ -222,14 +247,49 @@ class ModelDatasetBuilder:
         print("[model_dataset] Fertig.")
         print(f"- Train: {len(train)} | Val: {len(val)} | Test: {len(test)}")
         print(f"- Grenzen: VAL_START={val_start_ts.date()}  TEST_START={test_start_ts.date()}")
+        if subsample is not None:
+            print(f"- Teilmenge: {subsample.n_series}/{subsample.n_series_total} Reihen "
+                  f"(Seed {subsample.seed}, Hash {subsample.selection_hash})")
         print(f"- Ausgabepfad: {self.output_dir}")
 
         return manifest
 
+    def select_subsample(
+        self,
+    ) -> Tuple[SubsampleManifest, List[List[Tuple[str, str, Any]]], Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Geschichtete Reihenauswahl aus ID-, Zeit- und Zielspalte (Spalten-Projektion).
+        Rückgabe: Manifest, Parquet-Filter, Split-Grenzen des vollen Panels.
+        """
+        validate_params(self.subsample_fraction, self.subsample_seed, self.subsample_bins)
+        if not self.data_path.exists():
+            raise FileNotFoundError(f"Datei nicht gefunden: {self.data_path}")
+        if self.data_path.suffix.lower() not in {".parquet", ".pq"}:
+            raise ValueError(f"Teilmenge nur für Parquet-Eingaben (Filter beim Lesen): {self.data_path}")
+
+        light = pd.read_parquet(self.data_path, columns=[self.time_col, *self.id_cols, self.target_col])
+        light[self.time_col] = pd.to_datetime(light[self.time_col])
+        plan = TimeSplitPlan.from_config(self.val_start, self.test_start, self.split_ratios)
+        bounds = plan.compute_boundaries(light, self.time_col)
+
+        profile = series_profile(light, self.time_col, self.id_cols, self.target_col, bounds[0])
+        keys, strata = select_series(profile, self.subsample_fraction, self.subsample_seed, self.subsample_bins)
+        manifest = build_manifest(keys, strata, len(profile), self.subsample_fraction,
+                                  self.subsample_seed, self.subsample_bins, bounds[0])
+        return manifest, parquet_filters(self.id_cols, keys), bounds
+
     # ------------------------- intern -------------------------
 
-    def _sanity_checks(self, train: pd.DataFrame, val: pd.DataFrame, test: pd.DataFrame) -> None:
-        """Leckage-Prüfungen und Basiskontrollen."""
+    def _sanity_checks(
+        self,
+        train: pd.DataFrame,
+        val: pd.DataFrame,
+        test: pd.DataFrame,
+        val_start_ts: pd.Timestamp,
+        test_start_ts: pd.Timestamp,
+        subsample_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Leckage-Prüfungen und Basiskontrollen; Rückgabe: Validierungsbericht für meta.json."""
         if train.empty or val.empty or test.empty:
             raise ValueError("Mindestens eine Split-Teilmenge ist leer – prüfe Grenzen/Datenbasis.")
 
@@ -241,22 +301,37 @@ class ModelDatasetBuilder:
         if not (t_max < v_min and t_max < s_min):
             raise ValueError("Zeitliche Trennung verletzt (Train überlappt mit Val/Test).")
 
-        # ID-Konsistenz (optional, pragmatisch)
-        train_ids = set(map(tuple, train[self.id_cols].drop_duplicates().values))
-        val_ids = set(map(tuple, val[self.id_cols].drop_duplicates().values))
-        test_ids = set(map(tuple, test[self.id_cols].drop_duplicates().values))
-        unseen_val = val_ids - train_ids
-        unseen_test = test_ids - train_ids
-        if unseen_val:
-            print(f"[Warnung] {len(unseen_val)} Gruppen nur in VAL (nicht in TRAIN).")
-        if unseen_test:
-            print(f"[Warnung] {len(unseen_test)} Gruppen nur in TEST (nicht in TRAIN).")
+        # Panel-Prüfungen (Duplikate, Monotonie, Lücken, unbekannte Gruppen) – übersprungen,
+        # wenn der letzte Lauf mit identischen Eingaben bereits bestanden hat
+        fingerprint = inputs_fingerprint(
+            [self.data_path],
+            {"time_col": self.time_col, "id_cols": self.id_cols,
+             "val_start": str(val_start_ts), "test_start": str(test_start_ts),
+             "subsample": subsample_hash},
+        )
+        cached = self._cached_validation(fingerprint)
+        if cached is not None:
+            print(f"[model_dataset] Eingaben unverändert (Fingerprint {fingerprint}) – Panel-Prüfung übersprungen.")
+            return cached
+
+        report = validate_panel({"train": train, "val": val, "test": test}, self.time_col, self.id_cols, fingerprint)
+        raise_on_errors(report)
+        return report.to_dict()
+
+    def _cached_validation(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Validierungsbericht aus der vorhandenen meta.json, falls Fingerprint passt und bestanden."""
+        meta_path = self.output_dir / "meta.json"
+        if not meta_path.exists():
+            return None
+        cached = json.loads(meta_path.read_text(encoding="utf-8")).get("validation") or {}
+        return cached if cached.get("fingerprint") == fingerprint and cached.get("ok") else None
 
 
 # ------------------------- CLI -------------------------
 
-def main() -> None:
-    builder = ModelDatasetBuilder(
+def default_builder(**overrides: Any) -> ModelDatasetBuilder:
+    """Builder mit den Projektkonstanten aus config.py; `overrides` ersetzt einzelne Felder."""
+    params: Dict[str, Any] = dict(
         data_path=MODEL_INPUT_PATH,
         output_dir=PROCESSED_DIR,
         time_col=TIME_COL,
@@ -266,8 +341,18 @@ def main() -> None:
         test_start=TEST_START,
         split_ratios=SPLIT_RATIOS,
         scale_cols=list(SCALE_COLS),
+        scale_mode=SCALE_MODE,
+        scale_log1p=SCALE_LOG1P,
+        subsample_fraction=SUBSAMPLE["fraction"],
+        subsample_seed=SUBSAMPLE["seed"],
+        subsample_bins=SUBSAMPLE["bins"],
     )
-    builder.run()
+    params.update(overrides)
+    return ModelDatasetBuilder(**params)
+
+
+def main() -> None:
+    default_builder().run()
 
 
 if __name__ == "__main__":
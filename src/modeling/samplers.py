@@ -0,0 +1,143 @@
+# src/modeling/samplers.py
+"""
+Batch-Sampler für TimeSeriesDataSet-Fenster unterschiedlicher Länge.
+
+Mit `min_encoder_length < max_encoder_length` entstehen kurze Fenster (Serienanfang,
+neue Produkte mit wenigen Wochen Historie). Der Collate von pytorch_forecasting
+paddet jeden Batch auf sein längstes Fenster – mischt man kurze und lange Fenster
+zufällig, rechnet das Modell überwiegend auf Padding.
+
+`BucketedBatchSampler` gruppiert die Fenster nach tatsächlicher Sequenzlänge:
+volle Batches entstehen je Länge, Reste werden längensortiert zusammengefasst.
+Damit ist das Padding je Batch minimal, ohne Fenster zu verwerfen.
+
+`ResumableBatchSampler` macht jeden Batch-Sampler fortsetzbar: die Batch-Reihenfolge
+einer Epoche hängt nur von (seed, epoch) ab, bereits verarbeitete Batches werden
+nach einem Resume übersprungen. `ResumableDataLoader` zählt die ausgelieferten
+Batches und stellt sie Lightning als Zustand bereit (landet im Checkpoint).
+"""
+
+from __future__ import annotations
+
+from typing import Iterator, List, Sequence
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, Sampler
+
+
+class BucketedBatchSampler(Sampler[List[int]]):
+    def __init__(self, lengths: Sequence[int], batch_size: int, shuffle: bool) -> None:
+        if batch_size < 1:
+            raise ValueError(f"batch_size muss >= 1 sein, erhalten: {batch_size}")
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.batch_size = int(batch_size)
+        self.shuffle = bool(shuffle)
+
+    @classmethod
+    def from_dataset(cls, dataset, batch_size: int, shuffle: bool) -> "BucketedBatchSampler":
+        """Längen aus dem Fenster-Index des TimeSeriesDataSet (Encoder + Decoder)."""
+        return cls(dataset.index["sequence_length"].to_numpy(), batch_size, shuffle)
+
+    def _batches(self) -> List[np.ndarray]:
+        n = len(self.lengths)
+        # zufällige Reihenfolge innerhalb gleicher Länge, danach stabil nach Länge sortieren
+        perm = torch.randperm(n).numpy() if self.shuffle else np.arange(n)
+        order = perm[np.argsort(self.lengths[perm], kind="stable")]
+
+        bounds = np.flatnonzero(np.diff(self.lengths[order])) + 1
+        batches: List[np.ndarray] = []
+        rest: List[np.ndarray] = []
+        for bucket in np.split(order, bounds):
+            n_full = len(bucket) // self.batch_size * self.batch_size
+            if n_full:
+                batches.extend(np.split(bucket[:n_full], n_full // self.batch_size))
+            rest.append(bucket[n_full:])
+
+        # Reste bleiben längensortiert -> gemischte Batches nur aus benachbarten Längen
+        leftover = np.concatenate(rest) if rest else np.empty(0, dtype=np.int64)
+        batches.extend(leftover[i:i + self.batch_size] for i in range(0, len(leftover), self.batch_size))
+
+        if self.shuffle:
+            batches = [batches[i] for i in torch.randperm(len(batches)).tolist()]
+        return batches
+
+    def __iter__(self) -> Iterator[List[int]]:
+        for batch in self._batches():
+            yield batch.tolist()
+
+    def __len__(self) -> int:
+        _, counts = np.unique(self.lengths, return_counts=True)
+        full = int((counts // self.batch_size).sum())
+        rest = int((counts % self.batch_size).sum())
+        return full + -(-rest // self.batch_size)
+
+    def padding_fraction(self) -> float:
+        """Anteil gepaddeter Zeitschritte über alle Batches (0 = kein Padding)."""
+        total = padded = 0
+        for batch in self._batches():
+            lens = self.lengths[batch]
+            total += int(lens.max()) * len(lens)
+            padded += int(lens.max()) * len(lens) - int(lens.sum())
+        return padded / total if total else 0.0
+
+
+class ResumableBatchSampler(Sampler[List[int]]):
+    """
+    Hülle um einen beliebigen Batch-Sampler (random/synchronized/bucketed).
+
+    Die Reihenfolge wird je Epoche aus `seed + epoch` erzeugt (torch- und numpy-RNG
+    werden dafür kurz abgezweigt, der globale Zustand bleibt unberührt). Lightning
+    setzt die Epoche über `set_epoch`; `skip_next` überspringt beim Resume die
+    bereits trainierten Batches der unterbrochenen Epoche.
+    """
+
+    def __init__(self, batch_sampler: Sampler, seed: int) -> None:
+        self.batch_sampler = batch_sampler
+        self.seed = int(seed)
+        self.epoch = 0
+        self.skip_next = 0
+
+    def set_epoch(self, epoch: int) -> None:
+        self.epoch = int(epoch)
+
+    def __iter__(self) -> Iterator[List[int]]:
+        with torch.random.fork_rng(devices=[]):
+            np_state = np.random.get_state()
+            torch.manual_seed(self.seed + self.epoch)
+            np.random.seed((self.seed + self.epoch) % 2**32)
+            try:
+                batches = [list(b) for b in self.batch_sampler]
+            finally:
+                np.random.set_state(np_state)
+
+        skip, self.skip_next = self.skip_next, 0
+        yield from batches[skip:]
+
+    def __len__(self) -> int:
+        # volle Länge: Lightning zählt die übersprungenen Batches bereits als erledigt
+        return len(self.batch_sampler)
+
+
+class ResumableDataLoader(DataLoader):
+    """
+    DataLoader mit `state_dict`/`load_state_dict` (von Lightning automatisch im
+    Checkpoint gesichert). Gezählt wird im Hauptprozess, also nur tatsächlich an
+    das Training ausgelieferte Batches – Worker-Prefetching verfälscht die Position nicht.
+    Erwartet einen `ResumableBatchSampler` als batch_sampler.
+    """
+
+    _position = 0
+
+    def __iter__(self):
+        self._position = self.batch_sampler.skip_next
+        for batch in super().__iter__():
+            self._position += 1
+            yield batch
+
+    def state_dict(self) -> dict:
+        return {"epoch": self.batch_sampler.epoch, "batches_done": self._position}
+
+    def load_state_dict(self, state: dict) -> None:
+        self.batch_sampler.set_epoch(state["epoch"])
+        self.batch_sampler.skip_next = int(state["batches_done"])
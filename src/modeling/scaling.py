@@ -0,0 +1,154 @@
+# src/modeling/scaling.py
+"""
+Gruppenweise Skalierung ausgewählter Spalten (Fit nur auf TRAIN).
+
+- Gruppen werden einmal in Integer-Codes übersetzt (MultiIndex-Faktorisierung)
+- Statistiken je Gruppe über eine gruppierte Reduktion (bincount bzw. groupby auf Codes)
+- Anwenden per indiziertem Gather: alle Skalierungsspalten in einer Matrix-Operation,
+  ohne den Statistik-Frame an jede Teilmenge zu mergen
+- Modi: "standard" (Mittelwert/Std) und "robust" (Median/IQR),
+  optional `log1p` vor der Statistik (für schiefe Mengen-Spalten)
+- Statistiken werden als Parquet + JSON gespeichert und können für die Inferenz
+  ohne Neuberechnung geladen werden (`GroupScaler.load`)
+
+Unbekannte Gruppen und Gruppen mit Streuung 0 ergeben NaN (wie bisher beim Merge).
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+SCALE_MODES = ("standard", "robust")
+
+STATS_FILE = "scaler_stats.parquet"
+META_FILE = "scaler.json"
+
+
+@dataclass
+class GroupScaler:
+    id_cols: List[str]
+    cols: List[str]
+    mode: str = "standard"
+    log1p: bool = False
+    groups: Optional[pd.MultiIndex] = field(default=None, repr=False)
+    center: Optional[np.ndarray] = field(default=None, repr=False)  # (n_groups, n_cols)
+    scale: Optional[np.ndarray] = field(default=None, repr=False)   # (n_groups, n_cols), 0 -> NaN
+
+    def __post_init__(self) -> None:
+        if self.mode not in SCALE_MODES:
+            raise ValueError(f"Unbekannter Skalierungsmodus '{self.mode}'. Erlaubt: {SCALE_MODES}")
+        if not self.cols:
+            raise ValueError("GroupScaler braucht mindestens eine Spalte.")
+
+    # ------------------------- intern -------------------------
+
+    def _values(self, df: pd.DataFrame) -> np.ndarray:
+        missing = [c for c in self.cols if c not in df.columns]
+        if missing:
+            raise KeyError(f"Skalierungsspalten fehlen im DataFrame: {missing}")
+        x = df[self.cols].to_numpy(dtype="float64", na_value=np.nan)
+        return np.log1p(x) if self.log1p else x
+
+    def _check_fitted(self) -> None:
+        if self.groups is None:
+            raise RuntimeError("GroupScaler ist nicht gefittet (fit oder load aufrufen).")
+
+    def _rows(self, df: pd.DataFrame) -> np.ndarray:
+        """Zeile der Statistik je Datensatz (-1 = Gruppe nicht im Fit)."""
+        return self.groups.get_indexer(pd.MultiIndex.from_frame(df[self.id_cols]))
+
+    def _gather(self, rows: np.ndarray):
+        """center/scale je Datensatz; unbekannte Gruppen -> NaN."""
+        known = rows >= 0
+        center = np.full((len(rows), len(self.cols)), np.nan)
+        scale = np.full_like(center, np.nan)
+        center[known] = self.center[rows[known]]
+        scale[known] = self.scale[rows[known]]
+        return center, scale
+
+    # ------------------------- Fit / Transform -------------------------
+
+    def fit(self, df: pd.DataFrame) -> "GroupScaler":
+        codes, uniques = pd.MultiIndex.from_frame(df[self.id_cols]).factorize()
+        self.groups = uniques.set_names(self.id_cols)
+        x = self._values(df)
+        n_groups = len(self.groups)
+
+        if self.mode == "standard":
+            valid = ~np.isnan(x)
+            xz = np.where(valid, x, 0.0)
+            n = np.stack([np.bincount(codes, valid[:, j], n_groups) for j in range(x.shape[1])], axis=1)
+            s1 = np.stack([np.bincount(codes, xz[:, j], n_groups) for j in range(x.shape[1])], axis=1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = s1 / n
+                dev = np.where(valid, x - mean[codes], 0.0)
+                ss = np.stack([np.bincount(codes, dev[:, j] ** 2, n_groups) for j in range(x.shape[1])], axis=1)
+                std = np.sqrt(ss / (n - 1))  # ddof=1 wie pandas .std()
+            self.center, spread = mean, std
+        else:
+            q = pd.DataFrame(x).groupby(codes, sort=True).quantile([0.25, 0.5, 0.75])
+            q = q.to_numpy().reshape(n_groups, 3, len(self.cols))
+            self.center, spread = q[:, 1], q[:, 2] - q[:, 0]
+
+        # Streuung 0 (oder < 2 Werte) -> NaN statt Division durch 0
+        self.scale = np.where((spread > 0) & np.isfinite(spread), spread, np.nan)
+        return self
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Skaliert `cols` direkt in `df` (keine Kopie des Frames) und gibt ihn zurück."""
+        self._check_fitted()
+        center, scale = self._gather(self._rows(df))
+        df[self.cols] = (self._values(df) - center) / scale
+        return df
+
+    def inverse_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rücktransformation in Originaleinheiten (z. B. für Vorhersagen), ebenfalls in-place."""
+        self._check_fitted()
+        center, scale = self._gather(self._rows(df))
+        x = df[self.cols].to_numpy(dtype="float64", na_value=np.nan) * scale + center
+        df[self.cols] = np.expm1(x) if self.log1p else x
+        return df
+
+    # ------------------------- Persistenz -------------------------
+
+    def stats_frame(self) -> pd.DataFrame:
+        self._check_fitted()
+        out = self.groups.to_frame(index=False)
+        for j, col in enumerate(self.cols):
+            out[f"{col}__center"] = self.center[:, j]
+            out[f"{col}__scale"] = self.scale[:, j]
+        return out
+
+    def save(self, out_dir: Path) -> Dict[str, str]:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        paths = {"stats": out_dir / STATS_FILE, "meta": out_dir / META_FILE}
+        self.stats_frame().to_parquet(paths["stats"], index=False)
+        meta: Dict[str, Any] = {
+            "id_cols": self.id_cols,
+            "cols": self.cols,
+            "mode": self.mode,
+            "log1p": self.log1p,
+            "n_groups": len(self.groups),
+        }
+        with paths["meta"].open("w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+        return {k: str(v) for k, v in paths.items()}
+
+    @classmethod
+    def load(cls, in_dir: Path) -> "GroupScaler":
+        meta_path, stats_path = in_dir / META_FILE, in_dir / STATS_FILE
+        if not meta_path.exists() or not stats_path.exists():
+            raise FileNotFoundError(f"Keine Skalierungs-Statistik in {in_dir} ({META_FILE}/{STATS_FILE}).")
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        stats = pd.read_parquet(stats_path)
+        scaler = cls(id_cols=list(meta["id_cols"]), cols=list(meta["cols"]), mode=meta["mode"], log1p=bool(meta["log1p"]))
+        scaler.groups = pd.MultiIndex.from_frame(stats[scaler.id_cols])
+        scaler.center = stats[[f"{c}__center" for c in scaler.cols]].to_numpy(dtype="float64")
+        scaler.scale = stats[[f"{c}__scale" for c in scaler.cols]].to_numpy(dtype="float64")
+        return scaler
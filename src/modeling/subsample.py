@@ -0,0 +1,195 @@
+# src/modeling/subsample.py
+"""
+Geschichtete Teilmenge von Zeitreihen für schnelle Experimente (Hyperparameter-Suche).
+
+Statt `limit_train_batches` (schneidet Batches in beliebiger Reihenfolge ab) wird eine
+feste Auswahl ganzer Reihen (ID_COLS) trainiert:
+
+1. Profil je Reihe – nur ID-, Zeit- und Zielspalte werden gelesen, nur Zeitraum vor VAL_START
+   (keine Information aus Val/Test in der Auswahl):
+       volume      Mittelwert des Ziels
+       volatility  Variationskoeffizient (Std / Mittelwert)
+       history     Anzahl beobachteter Tage
+2. Je Kennzahl Quantil-Klassen (`bins`), Schicht = Kombination der drei Klassen
+3. Zielanzahl = round(fraction × Reihen), proportional auf die Schichten verteilt
+   (Largest-Remainder), Ziehung je Schicht mit festem Seed
+4. Laden der Feature-Tabelle mit Parquet-Filtern (nur ausgewählte Reihen werden gelesen)
+
+Das Manifest (Seed, Anteil, Schichten, Reihen, Auswahl-Hash) landet in meta.json unter
+"subsample" und von dort in summary.json jedes Runs (meta.subsample).
+Übertragbarkeit der Ranglisten auf das volle Panel: src/evaluation/subset_transfer.py.
+
+Aufruf (schreibt die Splits nach PROCESSED_DIR wie model_dataset.py):
+    python -m src.modeling.subsample --fraction 0.25 --seed 42
+    python -m src subsample-dataset --fraction 0.25 --dry-run
+Zurück zum vollen Panel: python -m src model-dataset (SUBSAMPLE["fraction"] = None).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import SUBSAMPLE
+
+PROFILE_METRICS = ("volume", "volatility", "history")
+SERIES_SEP = "|"
+
+
+@dataclass
+class SubsampleManifest:
+    fraction: float
+    seed: int
+    bins: int
+    metrics: List[str]
+    profile_until: str
+    n_series_total: int
+    n_series: int
+    strata: Dict[str, List[int]]     # Schicht -> [Reihen gesamt, ausgewählt]
+    series: List[str]                # "country|store|product"
+    selection_hash: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def validate_params(fraction: float, seed: int, bins: int) -> None:
+    if not 0.0 < float(fraction) < 1.0:
+        raise ValueError(f"Subsample-Anteil muss in (0, 1) liegen: {fraction}")
+    if int(seed) < 0:
+        raise ValueError(f"Subsample-Seed muss >= 0 sein: {seed}")
+    if int(bins) < 1:
+        raise ValueError(f"Subsample-Klassen (bins) müssen >= 1 sein: {bins}")
+
+
+# ------------------------- Profil -------------------------
+
+def series_profile(
+    df: pd.DataFrame, time_col: str, id_cols: List[str], target_col: str, until: pd.Timestamp
+) -> pd.DataFrame:
+    """Kennzahlen je Reihe auf dem Zeitraum vor `until` (Index = ID_COLS)."""
+    past = df[pd.to_datetime(df[time_col]) < until]
+    if past.empty:
+        raise ValueError(f"Keine Zeilen vor {until.date()} für das Reihenprofil.")
+    y = pd.to_numeric(past[target_col], errors="coerce")
+    g = y.groupby([past[c] for c in id_cols], observed=True, sort=True)
+    mean, std = g.mean(), g.std(ddof=0)
+    return pd.DataFrame({
+        "volume": mean,
+        "volatility": (std / mean.where(mean != 0)).fillna(0.0),
+        "history": g.count(),
+    })
+
+
+def _classes(values: pd.Series, bins: int) -> pd.Series:
+    """Quantil-Klassen; zusammenfallende Grenzen (z. B. gleiche Historienlänge) ergeben weniger Klassen."""
+    if bins == 1 or values.nunique() <= 1:
+        return pd.Series(0, index=values.index)
+    return pd.qcut(values, q=min(bins, len(values)), labels=False, duplicates="drop").astype(int)
+
+
+def _allocate(sizes: pd.Series, n_target: int) -> pd.Series:
+    """Proportionale Verteilung von n_target auf Schichten (Largest-Remainder)."""
+    exact = sizes / sizes.sum() * n_target
+    alloc = np.floor(exact).astype(int)
+    rest = int(n_target - alloc.sum())
+    if rest > 0:
+        order = (exact - alloc).sort_values(ascending=False, kind="mergesort").index[:rest]
+        alloc.loc[order] += 1
+    return alloc.clip(upper=sizes)
+
+
+def select_series(profile: pd.DataFrame, fraction: float, seed: int, bins: int) -> Tuple[List[tuple], Dict[str, List[int]]]:
+    """Geschichtete Ziehung; Rückgabe: ausgewählte ID-Tupel (sortiert) und Schicht-Tabelle."""
+    validate_params(fraction, seed, bins)
+    n_target = max(1, int(round(fraction * len(profile))))
+    strata = pd.Series(
+        ["-".join(map(str, row)) for row in
+         zip(*(_classes(profile[m], bins) for m in PROFILE_METRICS))],
+        index=profile.index,
+    )
+    sizes = strata.value_counts().sort_index()
+    alloc = _allocate(sizes, n_target)
+
+    rng = np.random.default_rng(seed)
+    chosen: List[tuple] = []
+    table: Dict[str, List[int]] = {}
+    for stratum in sizes.index:
+        members = sorted(strata.index[strata == stratum])
+        k = int(alloc.loc[stratum])
+        picks = rng.choice(len(members), size=k, replace=False) if k else []
+        chosen.extend(members[i] for i in sorted(picks))
+        table[stratum] = [len(members), k]
+    return sorted(chosen), table
+
+
+def series_key(key: tuple) -> str:
+    return SERIES_SEP.join(map(str, key))
+
+
+def parquet_filters(id_cols: List[str], keys: List[tuple]) -> List[List[Tuple[str, str, Any]]]:
+    """DNF-Filter für pyarrow: eine Konjunktion je Reihe (Prädikat wird beim Scan angewendet)."""
+    return [[(c, "==", v) for c, v in zip(id_cols, key)] for key in keys]
+
+
+def build_manifest(
+    keys: List[tuple], strata: Dict[str, List[int]], n_total: int,
+    fraction: float, seed: int, bins: int, until: pd.Timestamp,
+) -> SubsampleManifest:
+    series = [series_key(k) for k in keys]
+    digest = hashlib.sha256("\n".join(series).encode("utf-8")).hexdigest()[:16]
+    return SubsampleManifest(
+        fraction=float(fraction), seed=int(seed), bins=int(bins), metrics=list(PROFILE_METRICS),
+        profile_until=str(until.date()), n_series_total=n_total, n_series=len(series),
+        strata=strata, series=series, selection_hash=digest,
+    )
+
+
+def processed_subsample(processed_dir: Path) -> Optional[Dict[str, Any]]:
+    """Kurzform des Manifests aus meta.json (ohne Reihenliste) für summary.json; None = volles Panel."""
+    meta_path = processed_dir / "meta.json"
+    if not meta_path.exists():
+        return None
+    manifest = json.loads(meta_path.read_text(encoding="utf-8")).get("subsample")
+    if not manifest:
+        return None
+    return {k: v for k, v in manifest.items() if k not in ("series", "strata")}
+
+
+# ------------------------- CLI -------------------------
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Splits auf einer geschichteten Reihen-Teilmenge erzeugen.")
+    ap.add_argument("--fraction", type=float, default=SUBSAMPLE["fraction"], help="Anteil der Reihen, z. B. 0.25")
+    ap.add_argument("--seed", type=int, default=SUBSAMPLE["seed"])
+    ap.add_argument("--bins", type=int, default=SUBSAMPLE["bins"], help="Quantil-Klassen je Kennzahl")
+    ap.add_argument("--dry-run", action="store_true", help="Nur Auswahl anzeigen, nichts schreiben")
+    args = ap.parse_args()
+    if args.fraction is None:
+        raise ValueError("--fraction fehlt (oder SUBSAMPLE['fraction'] in config.py setzen).")
+    validate_params(args.fraction, args.seed, args.bins)
+
+    from src.modeling.model_dataset import default_builder
+
+    builder = default_builder(subsample_fraction=args.fraction, subsample_seed=args.seed,
+                              subsample_bins=args.bins)
+    if args.dry_run:
+        manifest, _, _ = builder.select_subsample()
+        print(f"[subsample] {manifest.n_series}/{manifest.n_series_total} Reihen | "
+              f"Seed {manifest.seed} | Hash {manifest.selection_hash}")
+        for stratum, (n, k) in manifest.strata.items():
+            print(f"  Schicht {stratum} ({'/'.join(manifest.metrics)}): {k}/{n}")
+        return
+    builder.run()
+
+
+if __name__ == "__main__":
+    # python -m src.modeling.subsample --fraction 0.25 --seed 42
+    main()
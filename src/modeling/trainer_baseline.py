@@ -0,0 +1,491 @@
+# src/modeling/trainer_baseline.py
+"""
+Statistische Baselines für das gesamte Panel – gesteuert über eine YAML-Konfiguration.
+
+- Liest dieselben train/val/test.parquet wie der TFT-Trainer (Pfade aus dataset_spec.json)
+- Seasonal Naive, Moving Average, SES und Holt werden vektorisiert über alle
+  Zeitreihen gleichzeitig gerechnet (Matrix [Reihen x Zeit], Schleife nur über die Zeit)
+- ARIMA-artige Modelle (AR(p) auf d-fach differenzierter Reihe, OLS) laufen je Reihe
+  in Worker-Prozessen mit Timeout je Reihe; bei Timeout/Fehler Fallback auf Seasonal Naive
+- Prognosen im gleichen Long-Format wie evaluate_tft.py (rollierende Fenster über den Split)
+
+Ausgabe:
+    results/baseline/<run_id>/<methode>/evaluation/{predictions,metrics_*}_<split>.parquet
+    results/baseline/<run_id>/summary.json
+
+Aufrufbeispiel:
+    python -m src.modeling.trainer_baseline --config configs/trainer_baseline.yaml
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from multiprocessing.connection import wait as mp_wait
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    PROCESSED_DIR,
+    TARGET_COL,
+    ID_COLS,
+    TIME_COL,
+)
+from src.evaluation.evaluate_tft import write_evaluation
+from src.evaluation.metrics import group_codes
+from src.utils.config_loader import BaselineCfg, load_baseline_cfg
+
+
+# ------------------------- Panel -------------------------
+
+@dataclass
+class Panel:
+    """Dichte Matrix aller Zeitreihen: values[Reihe, Zeitindex]."""
+    values: np.ndarray          # float64 [S, T], NaN = fehlend
+    keys: pd.DataFrame          # ID_COLS je Reihe (Zeilenreihenfolge = Reihe)
+    dates: np.ndarray           # Datum je Zeitindex-Offset (NaT, falls unbekannt)
+    t0: int                     # kleinster time_idx (Offset 0)
+    train_end: int              # erster Offset nach TRAIN
+    split_start: int            # erster Offset des auszuwertenden Splits
+    split_end: int              # erster Offset nach dem Split (val: Start TEST, test: Panel-Ende)
+    horizon: int
+
+
+def load_panel(processed_dir: Path, split: str) -> Panel:
+    spec_path = processed_dir / "dataset_spec.json"
+    if not spec_path.exists():
+        raise FileNotFoundError(f"dataset_spec.json nicht gefunden: {spec_path}")
+    spec = json.loads(spec_path.read_text(encoding="utf-8"))
+
+    parts = []
+    for name in ("train", "val", "test"):
+        p = Path(spec["paths"][name])
+        if not p.exists():
+            raise FileNotFoundError(f"Parquet-Datei nicht gefunden: {p}")
+        part = pd.read_parquet(p)
+        cols = list(ID_COLS) + [TIME_COL, TARGET_COL] + (["time_idx"] if "time_idx" in part.columns else [])
+        parts.append(part[cols].assign(__split=name))
+
+    df = pd.concat(parts, ignore_index=True)
+    df[TIME_COL] = pd.to_datetime(df[TIME_COL])
+    if "time_idx" not in df.columns:
+        df["time_idx"] = (df[TIME_COL] - df[TIME_COL].min()).dt.days
+
+    t0 = int(df["time_idx"].min())
+    offsets = df["time_idx"].to_numpy(dtype="int64") - t0
+    n_time = int(offsets.max()) + 1
+
+    codes, keys = group_codes(df, list(ID_COLS))
+    values = np.full((len(keys), n_time), np.nan, dtype="float64")
+    values[codes, offsets] = pd.to_numeric(df[TARGET_COL], errors="coerce").to_numpy(dtype="float64")
+
+    dates = np.full(n_time, np.datetime64("NaT"), dtype="datetime64[ns]")
+    dates[offsets] = df[TIME_COL].to_numpy()
+
+    split_col = df["__split"].to_numpy()
+    first = {name: int(offsets[split_col == name].min()) for name in ("train", "val", "test")}
+
+    return Panel(
+        values=values,
+        keys=keys,
+        dates=dates,
+        t0=t0,
+        train_end=first["val"],
+        split_start=first[split],
+        split_end=first["test"] if split == "val" else n_time,
+        horizon=int(spec["lengths"]["max_prediction_length"]),
+    )
+
+
+def window_cutoffs(panel: Panel) -> np.ndarray:
+    """Letzter beobachteter Offset je Prognosefenster (Fenster vollständig im Split)."""
+    starts = np.arange(panel.split_start, panel.split_end - panel.horizon + 1)
+    return starts - 1
+
+
+# ------------------------- Vektorisierte Baselines -------------------------
+
+def seasonal_naive(y: np.ndarray, cutoffs: np.ndarray, horizon: int, m: int) -> np.ndarray:
+    """F[s, w, h] = y[s, c_w - m + 1 + (h mod m)]."""
+    h = np.arange(horizon)
+    idx = cutoffs[:, None] - m + 1 + (h[None, :] % m)
+    return y[:, idx]
+
+
+def moving_average(y: np.ndarray, cutoffs: np.ndarray, horizon: int, window: int) -> np.ndarray:
+    """Mittel der letzten `window` Beobachtungen (NaN-robust über kumulierte Summen)."""
+    finite = np.isfinite(y)
+    csum = np.concatenate([np.zeros((y.shape[0], 1)), np.cumsum(np.where(finite, y, 0.0), axis=1)], axis=1)
+    ccnt = np.concatenate([np.zeros((y.shape[0], 1)), np.cumsum(finite, axis=1)], axis=1)
+    hi = cutoffs + 1
+    lo = np.maximum(hi - window, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (csum[:, hi] - csum[:, lo]) / (ccnt[:, hi] - ccnt[:, lo])
+    return np.repeat(mean[:, :, None], horizon, axis=2)
+
+
+def _first_valid(y: np.ndarray) -> np.ndarray:
+    pos = np.argmax(np.isfinite(y), axis=1)
+    return np.nan_to_num(y[np.arange(y.shape[0]), pos])
+
+
+def _holt_filter(
+    y: np.ndarray,
+    alpha: np.ndarray,
+    beta: np.ndarray | None,
+    fit_end: int,
+    keep_states: bool,
+) -> Tuple[np.ndarray, np.ndarray | None, np.ndarray | None]:
+    """
+    Holt-/SES-Filter über die Zeit, vektorisiert über Reihen (und Parameter-Grid).
+
+    y: [S, T]; alpha/beta: [S, K] (K = Grid-Größe) – beta=None => SES.
+    Rückgabe: (SSE der Ein-Schritt-Fehler bis fit_end [S, K],
+               Level [S, K, T] und Trend [S, K, T] falls keep_states).
+    """
+    n_series, n_time = y.shape
+    level = np.repeat(_first_valid(y)[:, None], alpha.shape[1], axis=1)
+    trend = np.zeros_like(level)
+    sse = np.zeros_like(level)
+
+    levels = np.empty(level.shape + (n_time,)) if keep_states else None
+    trends = np.empty(level.shape + (n_time,)) if keep_states and beta is not None else None
+
+    for t in range(n_time):
+        yt = y[:, t][:, None]
+        obs = np.isfinite(yt)
+        forecast = level + trend
+        if t < fit_end:
+            sse += np.where(obs, (yt - forecast) ** 2, 0.0)
+        new_level = np.where(obs, alpha * yt + (1.0 - alpha) * forecast, forecast)
+        if beta is not None:
+            trend = beta * (new_level - level) + (1.0 - beta) * trend
+        level = new_level
+        if keep_states:
+            levels[..., t] = level
+            if trends is not None:
+                trends[..., t] = trend
+
+    return sse, levels, trends
+
+
+def exponential_smoothing(
+    y: np.ndarray,
+    cutoffs: np.ndarray,
+    horizon: int,
+    fit_end: int,
+    alpha_grid: Tuple[float, ...],
+    beta_grid: Tuple[float, ...] | None,
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    SES (beta_grid=None) bzw. Holt mit je Reihe per Grid-Suche gewählten Parametern.
+    Fit auf TRAIN (Ein-Schritt-SSE), Prognose über den gesamten Filterverlauf.
+    """
+    n_series = y.shape[0]
+    if beta_grid is None:
+        a_grid = np.asarray(alpha_grid)[None, :].repeat(n_series, axis=0)
+        b_grid = None
+    else:
+        aa, bb = np.meshgrid(alpha_grid, beta_grid, indexing="ij")
+        a_grid = aa.reshape(1, -1).repeat(n_series, axis=0)
+        b_grid = bb.reshape(1, -1).repeat(n_series, axis=0)
+
+    sse, _, _ = _holt_filter(y, a_grid, b_grid, fit_end, keep_states=False)
+    best = np.argmin(sse, axis=1)
+    rows = np.arange(n_series)
+    alpha = a_grid[rows, best][:, None]
+    beta = b_grid[rows, best][:, None] if b_grid is not None else None
+
+    _, levels, trends = _holt_filter(y, alpha, beta, fit_end, keep_states=True)
+    level_at_cut = levels[:, 0, cutoffs]                       # [S, W]
+    steps = np.arange(1, horizon + 1)[None, None, :]
+    forecast = np.repeat(level_at_cut[:, :, None], horizon, axis=2)
+    if trends is not None:
+        forecast = forecast + trends[:, 0, cutoffs][:, :, None] * steps
+
+    params = {"alpha": alpha[:, 0]}
+    if beta is not None:
+        params["beta"] = beta[:, 0]
+    return forecast, params
+
+
+# ------------------------- ARIMA-artig (Prozess-Pool) -------------------------
+
+def _history_at_cutoffs(y: np.ndarray, cutoffs: np.ndarray, width: int) -> np.ndarray:
+    """
+    Letzte `width` Werte bis einschließlich Cutoff je Fenster, Lücken nur aus y[:c + 1] gefüllt.
+    Entspricht pd.Series(y[:c + 1]).interpolate(limit_direction="both") je Cutoff c:
+    linear zwischen beobachteten Werten, am Rand konstant fortgeschrieben.
+    Rückgabe: [W, width]
+    """
+    t = np.arange(len(y))
+    obs = np.isfinite(y)
+    prev = np.maximum.accumulate(np.where(obs, t, -1))               # letzter Wert <= t
+    nxt = np.minimum.accumulate(np.where(obs, t, len(y))[::-1])[::-1]  # nächster Wert >= t
+
+    pos = cutoffs[:, None] - np.arange(width - 1, -1, -1)[None, :]   # [W, width], älteste zuerst
+    if pos.min() < 0:
+        raise ValueError("Zu kurze Historie vor dem ersten Cutoff.")
+    p_idx, n_idx = prev[pos], nxt[pos]
+    has_prev = p_idx >= 0
+    has_next = n_idx <= cutoffs[:, None]                             # nur bis zum Cutoff bekannt
+    y_prev = y[np.maximum(p_idx, 0)]
+    y_next = y[np.minimum(n_idx, len(y) - 1)]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        frac = (pos - p_idx) / (n_idx - p_idx)
+    hist = np.where(has_prev & has_next, y_prev + frac * (y_next - y_prev), np.nan)
+    hist = np.where(has_prev & ~has_next, y_prev, hist)
+    hist = np.where(~has_prev & has_next, y_next, hist)
+    hist = np.where(obs[pos], y[pos], hist)
+    if np.isnan(hist).any():
+        raise ValueError("Keine Beobachtung bis zum Cutoff.")
+    return hist
+
+
+def _fit_forecast_ari(y: np.ndarray, fit_end: int, cutoffs: np.ndarray, horizon: int, p: int, d: int) -> np.ndarray:
+    """
+    AR(p) mit Achsenabschnitt auf der d-fach differenzierten Reihe (OLS auf TRAIN).
+    Prognose je Fenster rekursiv aus den tatsächlich beobachteten Werten bis zum Cutoff.
+    Lücken werden nur aus der jeweils bekannten Historie interpoliert (TRAIN für den Fit,
+    y[:c + 1] je Cutoff), damit keine Werte aus VAL/TEST in Fit oder Startzustand gelangen.
+    Rückgabe: [W, H]
+    """
+    y_fit = pd.Series(y[:fit_end]).interpolate(limit_direction="both").to_numpy()
+    z_fit = np.diff(y_fit, n=d) if d else y_fit
+    if len(z_fit) <= 2 * p + 1 or np.isnan(z_fit).any():
+        raise ValueError("Zu kurze Historie für AR(p).")
+
+    lags = np.lib.stride_tricks.sliding_window_view(z_fit[:-1], p)[:, ::-1]
+    X = np.column_stack([np.ones(len(lags)), lags])
+    target = z_fit[p:]
+    coef, *_ = np.linalg.lstsq(X, target, rcond=None)
+
+    # Historie je Fenster: letzte p differenzierte Werte bis Cutoff, neueste zuerst
+    hist = _history_at_cutoffs(y, cutoffs, p + d)
+    state = (np.diff(hist, n=d, axis=1) if d else hist)[:, ::-1]
+    preds = np.empty((len(cutoffs), horizon))
+    for h in range(horizon):
+        nxt = coef[0] + state @ coef[1:]
+        preds[:, h] = nxt
+        state = np.column_stack([nxt, state[:, :-1]])
+
+    if d:
+        preds = hist[:, -1][:, None] + np.cumsum(preds, axis=1)
+    return preds
+
+
+def _ari_worker(conn, values: np.ndarray, fit_end: int, cutoffs: np.ndarray, horizon: int, p: int, d: int) -> None:
+    """Worker-Prozess: rechnet je empfangener Reihe und sendet (Reihe, Prognose | None) zurück."""
+    for s in iter(conn.recv, None):
+        try:
+            conn.send((s, _fit_forecast_ari(values[s], fit_end, cutoffs, horizon, p, d)))
+        except (ValueError, np.linalg.LinAlgError):
+            conn.send((s, None))
+
+
+def arima_panel(
+    panel: Panel,
+    cutoffs: np.ndarray,
+    fallback: np.ndarray,
+    p: int,
+    d: int,
+    n_jobs: int,
+    timeout_sec: float,
+) -> Tuple[np.ndarray, int]:
+    """
+    Fit/Prognose je Reihe in `n_jobs` Worker-Prozessen. Rückgabe: (Prognosen [S, W, H], Anzahl Fallbacks).
+
+    Jeder Worker bekommt eine Reihe nach der anderen; der Timeout zählt ab der Zuteilung
+    (Wartezeit anderer Reihen zählt nicht). Ein Worker, der ihn überschreitet oder abstürzt,
+    wird beendet und ersetzt; die Reihe bekommt den Fallback.
+    """
+    out = fallback.copy()
+    n_series = panel.values.shape[0]
+    ctx = mp.get_context()
+    queued = iter(range(n_series))
+    workers: Dict[object, list] = {}  # Verbindung -> [Prozess, Reihe | None, Zuteilungszeit]
+    procs: list = []
+
+    def assign(conn) -> None:
+        s = next(queued, None)
+        conn.send(s)  # None beendet den Worker
+        workers[conn][1:] = [s, time.monotonic()]
+
+    def spawn() -> None:
+        conn, child = ctx.Pipe()
+        proc = ctx.Process(
+            target=_ari_worker,
+            args=(child, panel.values, panel.train_end, cutoffs, panel.horizon, p, d),
+            daemon=True,
+        )
+        proc.start()
+        child.close()
+        procs.append(proc)
+        workers[conn] = [proc, None, 0.0]
+        assign(conn)
+
+    n_fallback = 0
+    try:
+        for _ in range(max(1, min(n_jobs, n_series))):
+            spawn()
+        while True:
+            busy = {conn: w for conn, w in workers.items() if w[1] is not None}
+            if not busy:
+                break
+            deadline = min(start for _, _, start in busy.values()) + timeout_sec
+            ready = mp_wait(
+                [*busy, *(proc.sentinel for proc, _, _ in busy.values())],
+                timeout=max(0.0, deadline - time.monotonic()),
+            )
+            for conn, (proc, s, start) in busy.items():
+                if conn in ready:
+                    try:
+                        _, pred = conn.recv()
+                    except EOFError:
+                        pred = None  # Absturz -> wie Timeout behandeln
+                    else:
+                        if pred is None:
+                            n_fallback += 1
+                        else:
+                            out[s] = pred
+                        assign(conn)
+                        continue
+                elif proc.is_alive() and time.monotonic() - start <= timeout_sec:
+                    continue
+                proc.terminate()
+                proc.join()
+                conn.close()
+                del workers[conn]
+                n_fallback += 1
+                spawn()
+    finally:
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+            proc.join()
+    return out, n_fallback
+
+
+# ------------------------- Long-Format -------------------------
+
+def to_long(panel: Panel, cutoffs: np.ndarray, forecast: np.ndarray) -> pd.DataFrame:
+    """[S, W, H]-Prognosen in das Long-Format von evaluate_tft.py überführen."""
+    n_series, n_windows, horizon = forecast.shape
+    s_idx = np.repeat(np.arange(n_series), n_windows * horizon)
+    t_off = (cutoffs[:, None] + np.arange(1, horizon + 1)[None, :]).reshape(-1)
+    t_off = np.tile(t_off, n_series)
+
+    out = panel.keys.iloc[s_idx].reset_index(drop=True)
+    out[TIME_COL] = panel.dates[t_off]
+    out["time_idx"] = t_off + panel.t0
+    out["horizon"] = np.tile(np.arange(1, horizon + 1), n_series * n_windows).astype("int16")
+    out["y_true"] = panel.values[s_idx, t_off].astype("float32")
+    out["y_pred"] = forecast.reshape(-1).astype("float32")
+    return out
+
+
+# ------------------------- CLI -------------------------
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "--config",
+        type=str,
+        default="configs/trainer_baseline.yaml",
+        help="Pfad zur YAML-Konfiguration (ohne Fallbacks).",
+    )
+    ap.add_argument("--split", type=str, default="test", choices=["val", "test"])
+    args = ap.parse_args()
+
+    cfg: BaselineCfg = load_baseline_cfg(args.config)
+    np.random.seed(cfg.seed)
+
+    config_path = Path(args.config)
+    suffix = config_path.stem.replace("trainer_baseline_", "").replace("trainer_", "") or config_path.stem
+    run_id = f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{suffix}"
+    run_dir = Path("results") / "baseline" / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    print(f"[trainer_baseline] Run-ID: {run_id}")
+
+    t_load = time.perf_counter()
+    panel = load_panel(PROCESSED_DIR, args.split)
+    cutoffs = window_cutoffs(panel)
+    y = panel.values
+    print(
+        f"[trainer_baseline] Panel: {y.shape[0]} Reihen x {y.shape[1]} Zeitpunkte | "
+        f"Fenster: {len(cutoffs)} | Horizont: {panel.horizon} | "
+        f"Laden: {time.perf_counter() - t_load:.2f}s"
+    )
+
+    summary: Dict[str, object] = {
+        "run_id": run_id,
+        "split": args.split,
+        "n_series": int(y.shape[0]),
+        "n_windows": int(len(cutoffs)),
+        "horizon": panel.horizon,
+        "config_file": str(config_path),
+        "methods": {},
+    }
+
+    snaive = seasonal_naive(y, cutoffs, panel.horizon, cfg.season_length)
+    for method in cfg.methods:
+        t_fit = time.perf_counter()
+        extra: Dict[str, object] = {}
+        if method == "seasonal_naive":
+            forecast = snaive
+        elif method == "moving_average":
+            forecast = moving_average(y, cutoffs, panel.horizon, cfg.ma_window)
+        elif method == "ses":
+            forecast, params = exponential_smoothing(
+                y, cutoffs, panel.horizon, panel.train_end, cfg.ets_alpha_grid, None
+            )
+            extra["alpha_mean"] = float(params["alpha"].mean())
+        elif method == "holt":
+            forecast, params = exponential_smoothing(
+                y, cutoffs, panel.horizon, panel.train_end, cfg.ets_alpha_grid, cfg.ets_beta_grid
+            )
+            extra["alpha_mean"] = float(params["alpha"].mean())
+            extra["beta_mean"] = float(params["beta"].mean())
+        elif method == "arima":
+            forecast, n_fallback = arima_panel(
+                panel, cutoffs, snaive, cfg.arima.p, cfg.arima.d, cfg.arima.n_jobs, cfg.arima.timeout_sec
+            )
+            extra["n_fallback_series"] = n_fallback
+        else:
+            raise ValueError(f"Unbekannte Methode: {method}")
+        fit_time_sec = round(time.perf_counter() - t_fit, 3)
+
+        pred = to_long(panel, cutoffs, forecast)
+        evaluation = write_evaluation(
+            pred,
+            run_dir / method / "evaluation",
+            args.split,
+            meta={"run_id": run_id, "method": method, "fit_time_sec": fit_time_sec},
+        )
+        summary["methods"][method] = {  # type: ignore[index]
+            "fit_time_sec": fit_time_sec,
+            "metrics": evaluation["metrics"],
+            **extra,
+        }
+        print(
+            f"[trainer_baseline] {method:<15} {fit_time_sec:>8.3f}s | "
+            f"MAE={evaluation['metrics']['mae']:.3f} | SMAPE={evaluation['metrics']['smape']:.2f}"
+        )
+
+    summary_path = run_dir / "summary.json"
+    with summary_path.open("w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    print(f"[trainer_baseline] Zusammenfassung: {summary_path}")
+
+
+if __name__ == "__main__":
+    # python -m src.modeling.trainer_baseline --config configs/trainer_baseline.yaml
+    main()
@@ -6,6 +6,9 @@ Keinerlei Hyperparameter-Fallbacks im Code – alles kommt aus der YAML.
 Aufrufbeispiele:
     python -m src.modeling.trainer_tft --config configs/trainer_tft_baseline.yaml
     python -m src.modeling.trainer_tft  # nutzt Default-Pfad unten
+    python -m src.modeling.trainer_tft --resume results/tft/run_...            # abgebrochenen Lauf fortsetzen
+    python -m src.modeling.trainer_tft --config configs/trainer_tft_finetune.yaml --warm-start results/tft/run_...
+    python -m src.modeling.trainer_tft --config configs/trainer_tft_student.yaml   # Destillation (Block distill:)
 """
 
 from __future__ import annotations
@@ -18,15 +21,9 @@ import json
 from pathlib import Path
 from datetime import datetime
 
-import torch
-import lightning.pytorch as pl
-from lightning.pytorch.callbacks import EarlyStopping, ModelCheckpoint, LearningRateMonitor
-from lightning.pytorch.loggers import CSVLogger
-
-import pandas as pd
-from pytorch_forecasting import TimeSeriesDataSet
-from pytorch_forecasting.data.encoders import GroupNormalizer
-from pytorch_forecasting.metrics import QuantileLoss, MAE, RMSE, MAPE, SMAPE
+# torch / lightning / pytorch_forecasting / pandas werden erst in den Funktionen
+# importiert, damit `--help` und Config-Fehler ohne mehrsekündigen Import-Overhead
+# sichtbar werden.
 
 # Projektweite, statische Konstanten (Pfade, Spalten) – NICHT Hyperparameter:
 from src.config import (
@@ -38,14 +35,25 @@ from src.config import (
 
 # Strikter YAML-Loader (liefert typisierte cfg ohne Fallbacks)
 from src.utils.config_loader import load_trainer_cfg
+from src.modeling.dataset_tft import check_spec_compatible
+from src.modeling.dataloaders import apply_torch_threads, build_dataloaders
 from src.utils.json_results import export_run_jsons_from_metrics
+from src.utils.run_registry import config_hash, dataset_fingerprint
 
 
-def _load_dataset_from_spec(processed_dir: Path):
+def _load_dataset_from_spec(processed_dir: Path, strategy: str = "eager"):
     """
     Lädt train/val Parquet anhand der dataset_spec.json und baut TimeSeriesDataSet-Objekte.
     Nutzt die Pfade aus der JSON-Spezifikation.
+
+    strategy (siehe memory_planner.py):
+        "eager"    alle Spalten per pd.read_parquet
+        "chunked"  nur die genutzten Spalten, Row-Group-weise und kompakt (float32, category)
     """
+    import pandas as pd
+    from pytorch_forecasting import TimeSeriesDataSet
+    from pytorch_forecasting.data.encoders import GroupNormalizer, NaNLabelEncoder
+
     spec_path = processed_dir / "dataset_spec.json"
 
     if not spec_path.exists():
@@ -59,10 +67,22 @@ def _load_dataset_from_spec(processed_dir: Path):
         raise FileNotFoundError(f"Parquet-Dateien nicht gefunden: {train_pq} oder {val_pq}")
 
     max_encoder_length = spec["lengths"]["max_encoder_length"]
+    min_encoder_length = spec["lengths"]["min_encoder_length"]
     max_prediction_length = spec["lengths"]["max_prediction_length"]
 
-    df_train = pd.read_parquet(train_pq)
-    df_val = pd.read_parquet(val_pq)
+    if strategy == "eager":
+        df_train = pd.read_parquet(train_pq)
+        df_val = pd.read_parquet(val_pq)
+    elif strategy == "chunked":
+        import pyarrow.parquet as pq
+
+        from src.modeling.memory_planner import dataset_columns, read_parquet_chunked
+
+        columns = dataset_columns(pq.read_schema(train_pq).names)
+        df_train = read_parquet_chunked(train_pq, columns)
+        df_val = read_parquet_chunked(val_pq, columns)
+    else:
+        raise ValueError(f"Unbekannte Lade-Strategie '{strategy}' (erlaubt: eager, chunked)")
 
     # Zielvariable auf float32 casten
     for df in (df_train, df_val):
@@ -76,97 +96,268 @@ def _load_dataset_from_spec(processed_dir: Path):
         target=TARGET_COL,
         group_ids=ID_COLS,
         max_encoder_length=max_encoder_length,
+        min_encoder_length=min_encoder_length,
         max_prediction_length=max_prediction_length,
         target_normalizer=GroupNormalizer(groups=ID_COLS, transformation="softplus"),
+        # neue Produkte/Serien erst in val/test -> unbekannte IDs zulassen statt Fehler
+        categorical_encoders={c: NaNLabelEncoder(add_nan=True) for c in ID_COLS},
     )
 
     val_ds = TimeSeriesDataSet.from_dataset(train_ds, df_val, predict=False)
     return train_ds, val_ds
 
 
-def main():
-    # -----------------------------
-    # CLI: Pfad zur YAML
-    # -----------------------------
-    ap = argparse.ArgumentParser()
-    ap.add_argument(
-        "--config",
-        type=str,
-        default="configs/trainer_tft_baseline.yaml",
-        help="Pfad zur YAML-Konfiguration (ohne Fallbacks).",
+def build_model(cfg, train_ds, model_cls=None):
+    """
+    TFT aus den YAML-Parametern (Loss, Größe, Dropout …); auch genutzt von lr_range_test.py.
+    Rückgabe: (Modell, Loss-Objekt).
+    """
+    import torch
+    from pytorch_forecasting.metrics import QuantileLoss, MAE, RMSE, MAPE, SMAPE
+    from pytorch_forecasting.models import TemporalFusionTransformer
+
+    # Loss bestimmen
+    if cfg.model.loss == "mse":
+        loss_fn = torch.nn.MSELoss()
+        output_size = 1
+    else:
+        loss_fn = QuantileLoss()  # Quantile werden intern am output_size festgelegt
+        output_size = cfg.model.output_size
+
+    logging_metrics = [MAE(), RMSE(), MAPE(), SMAPE()]
+
+    model = (model_cls or TemporalFusionTransformer).from_dataset(
+        train_ds,
+        learning_rate=cfg.learning_rate,
+        loss=loss_fn,
+        logging_metrics=logging_metrics,
+        hidden_size=cfg.model.hidden_size,
+        attention_head_size=cfg.model.attention_head_size,
+        dropout=cfg.model.dropout,
+        hidden_continuous_size=cfg.model.hidden_continuous_size,
+        output_size=output_size,
+        reduce_on_plateau_patience=cfg.model.reduce_on_plateau_patience,
     )
-    args = ap.parse_args()
+    return model, loss_fn
+
+
+def _warm_start_checkpoint(run_dir: Path) -> Path:
+    """Bestes Checkpoint eines abgeschlossenen Runs (aus dessen summary.json)."""
+    summary_path = run_dir / "summary.json"
+    if not summary_path.exists():
+        raise FileNotFoundError(
+            f"summary.json nicht gefunden: {summary_path} (Run nicht abgeschlossen? -> --resume verwenden)"
+        )
+    best = json.loads(summary_path.read_text(encoding="utf-8"))["meta"].get("best_checkpoint_path")
+    if not best or not Path(best).exists():
+        raise FileNotFoundError(f"Bestes Checkpoint von {run_dir.name} nicht gefunden: {best}")
+    return Path(best)
+
+
+PRE_RESUME_METRICS = "metrics_before_resume.csv"
+
+
+def _stash_metrics(logs_run_dir: Path) -> None:
+    """
+    Sichert metrics.csv vor dem Fortsetzen: CSVLogger löscht bei gleicher Version beim ersten
+    Schreiben alle vorhandenen Zeilen (und damit die Epochen vor dem Abbruch).
+    Eine Sicherung aus einer erneut abgebrochenen Fortsetzung wird vorher eingearbeitet.
+    """
+    _merge_stashed_metrics(logs_run_dir)
+    csv_path = logs_run_dir / "metrics.csv"
+    if csv_path.exists():
+        csv_path.replace(logs_run_dir / PRE_RESUME_METRICS)
+
+
+def _merge_stashed_metrics(logs_run_dir: Path) -> None:
+    """
+    Führt gesicherte und neue Zeilen in metrics.csv zusammen (Spalten-Vereinigung, nach step).
+    Alte Zeilen ab dem ersten neuen step entfallen – diese Schritte wurden nach dem Checkpoint
+    erneut trainiert.
+    """
+    import pandas as pd
+
+    stash_path = logs_run_dir / PRE_RESUME_METRICS
+    if not stash_path.exists():
+        return
+    csv_path = logs_run_dir / "metrics.csv"
+    old = pd.read_csv(stash_path)
+    new = pd.read_csv(csv_path) if csv_path.exists() else old.iloc[0:0]
+    if not new.empty:
+        old = old[old["step"] < new["step"].min()]
+    merged = pd.concat([old, new], ignore_index=True, sort=False)
+    merged = merged.sort_values("step", kind="stable")
+    # Zeilen ohne Epoche (z. B. LR-Monitor) machen die Spalte beim Einlesen zu float -> wieder ganzzahlig
+    for col in ("epoch", "step"):
+        if col in merged.columns:
+            merged[col] = merged[col].astype("Int64")
+    merged.to_csv(csv_path, index=False)
+    stash_path.unlink()
+    print(f"[trainer_tft] metrics.csv zusammengeführt: {len(old)} Zeilen vor dem Abbruch + {len(new)} neu")
+
+
+def train(
+    config_path: str | Path,
+    resume_dir: str | Path | None = None,
+    warm_start_dir: str | Path | None = None,
+) -> Path:
+    """
+    Führt einen kompletten Trainingslauf für eine YAML-Konfiguration aus.
+
+    resume_dir:     abgebrochenen Run fortsetzen (last.ckpt inkl. Optimizer, Scheduler,
+                    Epoche und Position im Trainings-Loader; Config aus dem Run-Ordner)
+    warm_start_dir: neuer Run, Gewichte aus dem besten Checkpoint eines früheren Runs
+
+    In beiden Fällen muss die aktuelle dataset_spec.json zur Spec des Runs passen.
+    Rückgabe: Pfad zur geschriebenen summary.json (genutzt von benchmark_tft.py).
+    """
+    resume_ckpt: Path | None = None
+    if resume_dir is not None:
+        resume_dir = Path(resume_dir)
+        config_path = resume_dir / "full_config.yaml"
+        resume_ckpt = resume_dir / "checkpoints" / "last.ckpt"
+        if not resume_ckpt.exists():
+            raise FileNotFoundError(f"last.ckpt nicht gefunden: {resume_ckpt} (checkpoint.save_last aktiv?)")
+
+    warm_ckpt: Path | None = None
+    if warm_start_dir is not None:
+        warm_start_dir = Path(warm_start_dir)
+        warm_ckpt = _warm_start_checkpoint(warm_start_dir)
 
     # -----------------------------
     # YAML laden (strikt, ohne Fallbacks)
     # -----------------------------
-    cfg = load_trainer_cfg(args.config)
+    cfg = load_trainer_cfg(config_path)
 
-    config_path = Path(args.config)
+    config_path = Path(config_path)
     with open(config_path, "r", encoding="utf-8") as f:
         cfg_dict = yaml.safe_load(f)
 
+    # Spec-Kompatibilität vor dem (teuren) Laden der Daten prüfen
+    spec_path = PROCESSED_DIR / "dataset_spec.json"
+    if not spec_path.exists():
+        raise FileNotFoundError(f"dataset_spec.json nicht gefunden: {spec_path}")
+    spec_text = spec_path.read_text(encoding="utf-8")
+    teacher_ckpt: Path | None = None
+    if cfg.distill is not None:
+        # Lehrer muss auf derselben Spec trainiert sein (gleiche Fenster, Encoder, Normalizer)
+        teacher_dir = Path(cfg.distill.teacher_run)
+        teacher_ckpt = _warm_start_checkpoint(teacher_dir)
+        teacher_spec = teacher_dir / "dataset_spec.json"
+        if not teacher_spec.exists():
+            raise FileNotFoundError(f"dataset_spec.json fehlt im Lehrer-Run: {teacher_spec}")
+        check_spec_compatible(
+            json.loads(teacher_spec.read_text(encoding="utf-8")), json.loads(spec_text), ctx="distill"
+        )
+
+    source_dir = resume_dir or warm_start_dir
+    if source_dir is not None:
+        source_spec = source_dir / "dataset_spec.json"
+        if not source_spec.exists():
+            raise FileNotFoundError(f"dataset_spec.json fehlt im Run-Ordner: {source_spec}")
+        check_spec_compatible(
+            json.loads(source_spec.read_text(encoding="utf-8")),
+            json.loads(spec_text),
+            ctx="resume" if resume_dir is not None else "warm-start",
+        )
+
+    # Schwere Abhängigkeiten erst nach erfolgreicher Config-Prüfung laden
+    import torch
+    import lightning.pytorch as pl
+    from lightning.pytorch.callbacks import EarlyStopping, ModelCheckpoint, LearningRateMonitor
+    from lightning.pytorch.loggers import CSVLogger
+    from pytorch_forecasting.models import TemporalFusionTransformer
+    from src.modeling.checkpoint_io import build_checkpoint_io
+    from src.modeling.memory_planner import plan_dataset_memory
+    from src.modeling.subsample import processed_subsample
+
     # -----------------------------
     # Determinismus / Reproduzierbarkeit
     # -----------------------------
     pl.seed_everything(cfg.seed, workers=True)
-    torch.use_deterministic_algorithms(True)
-    torch.backends.cudnn.benchmark = False
+    # deterministic: false -> schnellere, nicht reproduzierbare Kernels (z. B. cudnn-Autotuning)
+    torch.use_deterministic_algorithms(cfg.deterministic)
+    torch.backends.cudnn.benchmark = not cfg.deterministic
+    apply_torch_threads(cfg.dataloader)
 
     # -----------------------------
     # Datasets + Dataloader
     # -----------------------------
-    train_ds, val_ds = _load_dataset_from_spec(PROCESSED_DIR)
-
-    train_loader = train_ds.to_dataloader(
-        train=True, batch_size=cfg.batch_size, num_workers=cfg.num_workers
+    # Speicherplan vor dem Laden: Strategie wählen bzw. früh mit MemoryError abbrechen
+    memory_plan = plan_dataset_memory(
+        PROCESSED_DIR, cfg.batch_size, cfg.model.hidden_size, cfg.model.attention_head_size
     )
-    val_loader = val_ds.to_dataloader(
-        train=False, batch_size=cfg.batch_size, num_workers=cfg.num_workers
+    print(f"[trainer_tft] Speicherplan: {memory_plan.summary()}")
+    train_ds, val_ds = _load_dataset_from_spec(PROCESSED_DIR, strategy=memory_plan.strategy)
+
+    train_loader, val_loader = build_dataloaders(
+        train_ds, val_ds, cfg.batch_size, cfg.num_workers, cfg.dataloader, cfg.seed
     )
 
     # -----------------------------
     # Modell aus YAML-Parametern
     # -----------------------------
-    # Loss bestimmen
-    if cfg.model.loss == "mse":
-        loss_fn = torch.nn.MSELoss()
-        output_size = 1
-    else:
-        loss_fn = QuantileLoss()  # Quantile werden intern am output_size festgelegt
-        output_size = cfg.model.output_size
-
-    from pytorch_forecasting.models import TemporalFusionTransformer
-
-    logging_metrics = [MAE(), RMSE(), MAPE(), SMAPE()]
-
-    model = TemporalFusionTransformer.from_dataset(
-        train_ds,
-        learning_rate=cfg.learning_rate,
-        loss=loss_fn,
-        logging_metrics=logging_metrics,
-        hidden_size=cfg.model.hidden_size,
-        attention_head_size=cfg.model.attention_head_size,
-        dropout=cfg.model.dropout,
-        hidden_continuous_size=cfg.model.hidden_continuous_size,
-        output_size=output_size,
-        reduce_on_plateau_patience=cfg.model.reduce_on_plateau_patience,
-    )
+    model_cls = TemporalFusionTransformer
+    if cfg.distill is not None:
+        from src.modeling.distill_tft import DistilledTFT
+
+        model_cls = DistilledTFT
+
+    model, loss_fn = build_model(cfg, train_ds, model_cls)
+
+    distill_meta = None
+    if cfg.distill is not None:
+        from src.modeling.distill_tft import load_teacher, n_params
+
+        teacher = load_teacher(teacher_ckpt, loss_fn.quantiles)
+        model.attach_teacher(teacher, cfg.distill.alpha)
+        distill_meta = {
+            "teacher_run": cfg.distill.teacher_run,
+            "teacher_checkpoint": str(teacher_ckpt),
+            "alpha": cfg.distill.alpha,
+            "teacher_params": n_params(teacher),
+            "student_params": n_params(model),
+        }
+        print(f"[trainer_tft] Destillation: Lehrer {teacher_ckpt} ({distill_meta['teacher_params']:,} Parameter) "
+              f"-> Schüler {distill_meta['student_params']:,} Parameter, alpha={cfg.distill.alpha}")
+
+    if warm_ckpt is not None:
+        # nur Gewichte übernehmen; Optimizer, Scheduler und Epochen starten neu
+        state = torch.load(warm_ckpt, map_location="cpu", weights_only=False)["state_dict"]
+        try:
+            model.load_state_dict(state)
+        except RuntimeError as e:
+            raise ValueError(f"warm-start: Gewichte aus {warm_ckpt} passen nicht zum Modell: {e}") from e
+        print(f"[trainer_tft] Warm-Start aus: {warm_ckpt}")
+
+    if cfg.model.compile:
+        # Nur der Forward wird kompiliert; Checkpoints speichern weiterhin das normale Modul
+        model.forward = torch.compile(model.forward)
 
     # -----------------------------
     # Run-ID, Checkpoints und Logger
     # -----------------------------
-    ts_str = datetime.now().strftime("%Y%m%d_%H%M%S")
+    run_started = datetime.now()
+    ts_str = run_started.strftime("%Y%m%d_%H%M%S")
 
-    # Konfigurationsname als Suffix
-    cfg_stem = config_path.stem
-    suffix = cfg_stem.replace("trainer_tft_", "") or cfg_stem
+    if resume_dir is not None:
+        # Fortsetzung: gleicher Run-Ordner, gleiche Logger-Version (metrics.csv wird nach fit zusammengeführt)
+        run_id = resume_dir.name
+        run_dir = resume_dir
+    else:
+        # Konfigurationsname als Suffix
+        cfg_stem = config_path.stem
+        suffix = cfg_stem.replace("trainer_tft_", "") or cfg_stem
 
-    run_id = f"run_{ts_str}_{suffix}"
+        run_id = f"run_{ts_str}_{suffix}"
 
-    # NEU: ein gemeinsamer Run-Ordner
-    run_dir = Path("results") / "tft" / run_id  # <<< geändert
-    run_dir.mkdir(parents=True, exist_ok=True)
+        # NEU: ein gemeinsamer Run-Ordner
+        run_dir = Path("results") / "tft" / run_id  # <<< geändert
+        run_dir.mkdir(parents=True, exist_ok=True)
+
+        # Config + Spec sichern (Grundlage für --resume und die Kompatibilitätsprüfung)
+        (run_dir / "full_config.yaml").write_text(config_path.read_text(encoding="utf-8"), encoding="utf-8")
+        (run_dir / "dataset_spec.json").write_text(spec_text, encoding="utf-8")
 
     # NEU: Checkpoints im Run-Ordner
     ckpt_dir = run_dir / "checkpoints"  # <<< geändert
@@ -186,10 +377,29 @@ def main():
         mode="min",
         save_top_k=1,
         auto_insert_metric_name=False,
+        save_last=cfg.checkpoint.save_last,  # last.ckpt am Epochenende (für --resume)
+        enable_version_counter=False,        # last.ckpt überschreiben statt last-v1.ckpt
     )
+    callbacks = [early_stop, checkpoint]
+
+    if cfg.checkpoint.every_n_train_steps > 0:
+        # zusätzlich last.ckpt mitten in der Epoche (inkl. Loader-Position)
+        callbacks.append(ModelCheckpoint(
+            dirpath=str(ckpt_dir),
+            every_n_train_steps=cfg.checkpoint.every_n_train_steps,
+            save_top_k=0,
+            save_last=True,
+            enable_version_counter=False,  # jüngster Stand landet immer in last.ckpt
+        ))
 
     lr_monitor = LearningRateMonitor(logging_interval="step")
 
+    # Hintergrund-Schreiben und Inferenz-Artefakt (.infer.pt) gemäß YAML-Block checkpoint:
+    checkpoint_io = build_checkpoint_io(cfg.checkpoint)
+
+    if resume_dir is not None:
+        _stash_metrics(Path("logs") / "tft" / run_id)
+
     logger = CSVLogger(
         save_dir="logs",
         name="tft",
@@ -197,7 +407,9 @@ def main():
     )
 
     print(f"[trainer_tft] Run-ID: {run_id}")
-    print(f"[trainer_tft] Checkpoints: {ckpt_dir}")
+    print(f"[trainer_tft] Checkpoints: {ckpt_dir} "
+          f"({'asynchron' if cfg.checkpoint.async_write else 'synchron'}"
+          f"{', mit Inferenz-Artefakt' if cfg.checkpoint.export_inference else ''})")
     print(f"[trainer_tft] Logs: {(Path('logs') / 'tft' / run_id).resolve()}")
 
     # -----------------------------
@@ -206,14 +418,17 @@ def main():
     trainer = pl.Trainer(
         max_epochs=cfg.max_epochs,
         gradient_clip_val=cfg.gradient_clip_val,
-        callbacks=[early_stop, checkpoint, lr_monitor],
+        callbacks=[*callbacks, lr_monitor],
         accelerator=cfg.accelerator,   # "cpu" | "gpu" – explizit aus YAML
         devices=cfg.devices,
         limit_train_batches=cfg.limit_train_batches,
         limit_val_batches=cfg.limit_val_batches,
+        precision=cfg.precision,
+        deterministic=cfg.deterministic,
         log_every_n_steps=50,
         enable_progress_bar=True,
         logger=logger,
+        plugins=[checkpoint_io] if checkpoint_io is not None else None,
     )
 
     # Optionale Protokollierung der Hyperparameter im Logger
@@ -223,10 +438,13 @@ def main():
         "learning_rate": cfg.learning_rate,
         "gradient_clip_val": cfg.gradient_clip_val,
         "num_workers": cfg.num_workers,
+        **{f"dataloader.{k}": v for k, v in vars(cfg.dataloader).items()},
         "accelerator": cfg.accelerator,
         "devices": cfg.devices,
         "limit_train_batches": cfg.limit_train_batches,
         "limit_val_batches": cfg.limit_val_batches,
+        "precision": cfg.precision,
+        "deterministic": cfg.deterministic,
         **{f"model.{k}": v for k, v in vars(cfg.model).items()},
     })
 
@@ -238,7 +456,7 @@ def main():
     # -----------------------------
     # Training
     # -----------------------------
-    trainer.fit(model, train_loader, val_loader)
+    trainer.fit(model, train_loader, val_loader, ckpt_path=str(resume_ckpt) if resume_ckpt else None)
 
     # Fit-Zeit stoppen
     fit_time_sec = round(time.perf_counter() - tfit_start, 2)
@@ -247,8 +465,12 @@ def main():
     # Meta-Infos für summary.json zusammenstellen
     meta = {
         "seed": cfg_dict.get("seed"),
+        "created_at": run_started.isoformat(timespec="seconds"),
         "config_file": str(config_path),
         "config_values": cfg_dict,  # komplette YAML als normales Dict
+        "config_hash": config_hash(cfg_dict),
+        "dataset_fingerprint": dataset_fingerprint(PROCESSED_DIR),
+        "subsample": processed_subsample(PROCESSED_DIR),
         "fit_time_sec": fit_time_sec,
         "epochs_trained": epochs_trained,
         "avg_epoch_time_sec": round(fit_time_sec / max(1, epochs_trained), 2),
@@ -261,14 +483,29 @@ def main():
         "gradient_clip_val": cfg_dict.get("gradient_clip_val"),
         "accelerator": cfg_dict.get("accelerator"),
         "devices": cfg_dict.get("devices"),
+        "precision": cfg_dict.get("precision"),
+        "deterministic": cfg_dict.get("deterministic"),
+        "compile": cfg.model.compile,
+        "resumed_from": str(resume_ckpt) if resume_ckpt else None,
+        "warm_start_from": str(warm_ckpt) if warm_ckpt else None,
+        "checkpoint": cfg_dict.get("checkpoint"),
+        "dataloader": cfg_dict.get("dataloader"),
+        "memory_plan": memory_plan.to_dict(),
+        "distill": distill_meta,
         "model": cfg_dict.get("model"),  # <-- jetzt als Dict, nicht als ModelCfg-Objekt
     }
     try:
         meta["best_checkpoint_path"] = str(checkpoint.best_model_path)
     except NameError:
         pass
+    if cfg.checkpoint.export_inference and checkpoint.best_model_path:
+        from src.utils.load_trained_tft import inference_path
+
+        meta["best_inference_path"] = str(inference_path(checkpoint.best_model_path))
 
     logs_run_dir = Path(logger.log_dir)  # z. B. logs/tft/run_YYYYMMDD_HHMMSS
+    if resume_dir is not None:
+        _merge_stashed_metrics(logs_run_dir)
 
     # NEU: Evaluation + summary.json im selben Run-Ordner
     results_dir = run_dir
@@ -288,6 +525,36 @@ def main():
     if checkpoint.best_model_path:
         print(f"[trainer_tft] Bestes Checkpoint: {checkpoint.best_model_path}")
 
+    return summary_path
+
+
+def main():
+    # -----------------------------
+    # CLI: Pfad zur YAML
+    # -----------------------------
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "--config",
+        type=str,
+        default="configs/trainer_tft_baseline.yaml",
+        help="Pfad zur YAML-Konfiguration (ohne Fallbacks).",
+    )
+    mode = ap.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--resume",
+        type=str,
+        default=None,
+        help="Run-Ordner (results/tft/run_...) ab last.ckpt fortsetzen; Config kommt aus dem Run.",
+    )
+    mode.add_argument(
+        "--warm-start",
+        type=str,
+        default=None,
+        help="Run-Ordner, dessen bestes Checkpoint die Gewichte des neuen Runs initialisiert.",
+    )
+    args = ap.parse_args()
+    train(args.config, resume_dir=args.resume, warm_start_dir=args.warm_start)
+
 
 if __name__ == "__main__":
     # python -m src.modeling.trainer_tft --config configs/trainer_tft_baseline.yaml
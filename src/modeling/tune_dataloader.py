@@ -0,0 +1,160 @@
+# src/modeling/tune_dataloader.py
+"""
+Auto-Tuning der Dataloader-Einstellungen auf dem echten Trainingsdatensatz.
+
+Misst Samples/Sekunde (inkl. Collation, ohne Modell) für ein Raster aus
+num_workers × prefetch_factor und schreibt die schnellste Kombination als Kopie
+der Ausgangs-Config (Kommentare der YAML gehen dabei verloren).
+
+Der batch_sampler bleibt wie konfiguriert. Andere Sampler werden nur mit
+--allow-sampler-change mitgemessen: Sie ändern die Batch-Zusammensetzung und damit das
+Training, nicht nur den Durchsatz ("synchronized" liefert z. B. kleinere Batches).
+Verglichen wird deshalb in Samples/s, nicht in Batches/s.
+
+Aufrufbeispiele:
+    python -m src.modeling.tune_dataloader --config configs/trainer_tft_baseline.yaml
+    python -m src tune-dataloader --config configs/trainer_tft_baseline.yaml --workers 0 2 4 8 --batches 100
+    python -m src tune-dataloader --config configs/trainer_tft_baseline.yaml --allow-sampler-change --samplers random bucketed
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import time
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import yaml
+
+from src.config import PROCESSED_DIR, RESULTS_DIR
+from src.modeling.dataloaders import apply_torch_threads, make_dataloader
+from src.utils.config_loader import BATCH_SAMPLERS, DataLoaderCfg, load_trainer_cfg
+
+
+def measure_throughput(train_ds, batch_size: int, num_workers: int, dl_cfg: DataLoaderCfg,
+                       n_batches: int, warmup: int, seed: int) -> Tuple[float, float]:
+    """
+    (Batches/s, Samples/s) über `n_batches` nach `warmup` Batches (Worker-Start nicht mitgemessen).
+    Samples werden je Batch gezählt – nicht jeder Sampler füllt `batch_size` aus.
+    """
+    loader = make_dataloader(train_ds, True, batch_size, num_workers, dl_cfg, seed)
+    it = iter(loader)
+    n_done = 0
+    n_samples = 0
+    try:
+        for _ in range(warmup):
+            next(it)
+        t0 = time.perf_counter()
+        for _ in range(n_batches):
+            x, _ = next(it)
+            n_done += 1
+            n_samples += len(x["encoder_lengths"])
+    except StopIteration:
+        # Datensatz kleiner als gewünscht -> mit den gemessenen Batches rechnen
+        pass
+    elapsed = time.perf_counter() - t0 if n_done else float("inf")
+    del it, loader  # Worker beenden, bevor der nächste Kandidat startet
+    if not n_done:
+        return 0.0, 0.0
+    return n_done / elapsed, n_samples / elapsed
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Dataloader-Einstellungen benchmarken und beste übernehmen.")
+    ap.add_argument("--config", type=str, default="configs/trainer_tft_baseline.yaml")
+    ap.add_argument("--workers", type=int, nargs="+", default=None,
+                    help="Kandidaten für num_workers (Default: 0, 2, 4, …, bis CPU-Anzahl)")
+    ap.add_argument("--prefetch", type=int, nargs="+", default=[2, 4])
+    ap.add_argument("--samplers", type=str, nargs="+", default=None, choices=BATCH_SAMPLERS,
+                    help="Kandidaten für batch_sampler (nur mit --allow-sampler-change; "
+                         "Default dann: alle, sonst der konfigurierte)")
+    ap.add_argument("--allow-sampler-change", action="store_true",
+                    help="batch_sampler mitmessen und ggf. ändern (ändert die Batch-Zusammensetzung)")
+    ap.add_argument("--batches", type=int, default=50, help="gemessene Batches je Kandidat")
+    ap.add_argument("--warmup", type=int, default=5)
+    ap.add_argument("--out", type=str, default=None,
+                    help="Ziel-YAML (Default: configs/<name>_tuned.yaml neben der Ausgangs-Config)")
+    args = ap.parse_args()
+
+    cfg = load_trainer_cfg(args.config)
+    config_path = Path(args.config)
+    cfg_dict: Dict[str, Any] = yaml.safe_load(config_path.read_text(encoding="utf-8"))
+
+    if args.allow_sampler_change:
+        samplers = args.samplers or list(BATCH_SAMPLERS)
+    elif args.samplers and args.samplers != [cfg.dataloader.batch_sampler]:
+        raise ValueError(
+            f"--samplers {args.samplers} weicht vom konfigurierten batch_sampler "
+            f"'{cfg.dataloader.batch_sampler}' ab -> nur mit --allow-sampler-change"
+        )
+    else:
+        samplers = [cfg.dataloader.batch_sampler]
+
+    n_cpu = os.cpu_count() or 1
+    workers = args.workers or sorted({0, *range(2, n_cpu + 1, 2)})
+
+    from src.modeling.trainer_tft import _load_dataset_from_spec
+
+    apply_torch_threads(cfg.dataloader)
+    train_ds, _ = _load_dataset_from_spec(PROCESSED_DIR)
+
+    results: List[Dict[str, Any]] = []
+    for n_workers, prefetch, sampler in itertools.product(workers, args.prefetch, samplers):
+        if n_workers == 0 and prefetch != args.prefetch[0]:
+            continue  # prefetch wirkt nur mit Worker-Prozessen
+        dl_cfg = replace(
+            cfg.dataloader,
+            persistent_workers=n_workers > 0,
+            prefetch_factor=prefetch,
+            batch_sampler=sampler,
+            # Kerne gleichmäßig auf die Worker verteilen
+            worker_threads=max(1, n_cpu // max(1, n_workers + 1)),
+        )
+        bps, sps = measure_throughput(
+            train_ds, cfg.batch_size, n_workers, dl_cfg, args.batches, args.warmup, cfg.seed
+        )
+        results.append({"num_workers": n_workers, **vars(dl_cfg),
+                        "batches_per_sec": round(bps, 2), "samples_per_sec": round(sps, 1)})
+        print(f"[tune_dataloader] workers={n_workers:<2} prefetch={prefetch:<2} "
+              f"sampler={sampler:<12} -> {sps:9.1f} Samples/s ({bps:7.1f} Batches/s)")
+
+    best = max(results, key=lambda r: r["samples_per_sec"])
+    print(f"[tune_dataloader] Beste Einstellung: {best}")
+
+    # Beste Werte in eine Config-Kopie übernehmen
+    tuned = dict(cfg_dict)
+    tuned["num_workers"] = best["num_workers"]
+    tuned["dataloader"] = {
+        **cfg_dict["dataloader"],
+        **{k: best[k] for k in ("persistent_workers", "prefetch_factor", "worker_threads", "batch_sampler")},
+    }
+    out_path = Path(args.out) if args.out else config_path.with_name(f"{config_path.stem}_tuned.yaml")
+    header = (
+        f"# Automatisch erzeugt von tune_dataloader.py am {datetime.now():%Y-%m-%d %H:%M}\n"
+        f"# Ausgangs-Config: {config_path}  |  {best['samples_per_sec']} Samples/s\n"
+    )
+    out_path.write_text(header + yaml.safe_dump(tuned, sort_keys=False, allow_unicode=True), encoding="utf-8")
+    load_trainer_cfg(out_path)  # geschriebene Config muss wieder valide sein
+    print(f"[tune_dataloader] Config geschrieben: {out_path}")
+
+    # Messprotokoll
+    report_dir = RESULTS_DIR / "tuning"
+    report_dir.mkdir(parents=True, exist_ok=True)
+    report_path = report_dir / f"dataloader_{config_path.stem}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    report_path.write_text(
+        json.dumps({"config": str(config_path), "batch_size": cfg.batch_size, "cpu_count": n_cpu,
+                    "allow_sampler_change": args.allow_sampler_change,
+                    "results": results, "best": best}, indent=2, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    print(f"[tune_dataloader] Messprotokoll: {report_path}")
+
+
+if __name__ == "__main__":
+    # python -m src.modeling.tune_dataloader --config configs/trainer_tft_baseline.yaml
+    main()
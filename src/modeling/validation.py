@@ -0,0 +1,283 @@
+# src/modeling/validation.py
+"""
+Datenvalidierung für Panel-Daten (Zeitreihen je Gruppe) – skalierbar auf große Panels.
+
+- Schema-Prüfungen nur über den Parquet-Footer (Spalten, Typen, Zeilenzahl), ohne Daten zu lesen
+- Gruppen als gehashte 64-Bit-Schlüssel (`pd.util.hash_pandas_object`) statt Python-Tupel
+- Vektorisierte Prüfungen je Zeitreihe: monotone Zeit, doppelte (Reihe, Datum),
+  Lücken gegenüber der häufigsten Schrittweite, unbekannte Gruppen in val/test
+- Fingerprint-Cache: Ergebnis wird mit einem Fingerprint der Eingaben gespeichert;
+  unveränderte Daten werden nicht erneut geprüft
+
+Fehler (Duplikate, nicht monotone Zeit, Spalten fehlen) -> ValueError/KeyError,
+Lücken und unbekannte Gruppen -> Warnung.
+
+Genutzt von model_dataset.py (Splits im Speicher) und dataset_tft.py (Schema).
+Als CLI prüft das Modul die gespeicherten Splits in PROCESSED_DIR:
+
+    python -m src.modeling.validation
+    python -m src validate-data --force
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from src.config import ID_COLS, PROCESSED_DIR, TIME_COL
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+SPLITS = ("train", "val", "test")
+CACHE_FILE = "validation.json"
+
+
+# ------------------------- Schema (Parquet-Footer) -------------------------
+
+def read_schema(path: Path) -> Tuple[List[str], List[str]]:
+    """Spaltennamen und numerische Spalten (inkl. bool) aus dem Parquet-Schema."""
+    import pyarrow.parquet as pq
+    import pyarrow.types as pat
+
+    schema = pq.read_schema(path)
+    index_cols = set((schema.pandas_metadata or {}).get("index_columns", []) or []) - {None}
+    fields = [f for f in schema if f.name not in index_cols]
+
+    all_cols = [f.name for f in fields]
+    # numerisch + bool zulassen (0/1-Flags können als bool gespeichert sein)
+    numeric_cols = [
+        f.name for f in fields
+        if pat.is_integer(f.type) or pat.is_floating(f.type)
+        or pat.is_boolean(f.type) or pat.is_decimal(f.type)
+    ]
+    return all_cols, numeric_cols
+
+
+def check_required_columns(columns: Iterable[str], required: Iterable[str], ctx: str) -> None:
+    missing = [c for c in required if c not in set(columns)]
+    if missing:
+        raise KeyError(f"{ctx}: erwartete Spalten fehlen: {missing}")
+
+
+def parquet_num_rows(path: Path) -> int:
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+# ------------------------- Fingerprint -------------------------
+
+def inputs_fingerprint(paths: Iterable[Path], extra: Dict[str, Any]) -> str:
+    """Hash aus Größe/mtime der Dateien und den Prüfparametern (liest keine Daten)."""
+    h = hashlib.sha256(json.dumps(extra, sort_keys=True, default=str).encode("utf-8"))
+    for p in paths:
+        st = p.stat()
+        h.update(f"{p.name}:{st.st_size}:{st.st_mtime_ns}".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def load_cached(cache_path: Path, fingerprint: str) -> Optional[Dict[str, Any]]:
+    """Gespeicherter Bericht, falls der Fingerprint passt und die Prüfung bestanden wurde."""
+    if not cache_path.exists():
+        return None
+    cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    if cached.get("fingerprint") == fingerprint and cached.get("ok"):
+        return cached
+    return None
+
+
+# ------------------------- Panel-Prüfungen -------------------------
+
+def group_keys(df: "pd.DataFrame", id_cols: List[str]) -> "np.ndarray":
+    """64-Bit-Hash je Zeile über die Gruppenspalten (Kollisionen praktisch ausgeschlossen)."""
+    import pandas as pd
+
+    return pd.util.hash_pandas_object(df[id_cols], index=False).to_numpy()
+
+
+@dataclass
+class SeriesStats:
+    n_rows: int
+    n_series: int
+    duplicates: int                 # doppelte (Reihe, Datum)-Zeilen
+    non_monotonic_series: int       # Reihen, deren Zeit in Dateireihenfolge nicht streng steigt
+    gap_series: int                 # Reihen mit mindestens einer Lücke
+    missing_steps: int              # fehlende Zeitschritte über alle Reihen
+    step: Optional[str]             # häufigste Schrittweite (z. B. "1 days")
+
+
+def series_stats(keys: "np.ndarray", times: "np.ndarray") -> SeriesStats:
+    """
+    Vektorisierte Prüfung eines Panels aus (Schlüssel, Zeit).
+    `times` als datetime64; die Zeilenreihenfolge wird für die Monotonie-Prüfung genutzt.
+    """
+    import numpy as np
+    import pandas as pd
+
+    n = len(keys)
+    t = times.astype("datetime64[ns]").view("int64")
+    if n == 0:
+        return SeriesStats(0, 0, 0, 0, 0, 0, None)
+
+    # Reihenfolge innerhalb jeder Reihe wie in den Daten (stabil nach Schlüssel sortieren)
+    by_key = np.argsort(keys, kind="stable")
+    k_file, t_file = keys[by_key], t[by_key]
+    same = k_file[1:] == k_file[:-1]
+    n_series = int((~same).sum()) + 1
+    non_mono = same & (np.diff(t_file) <= 0)
+    non_monotonic_series = len(np.unique(k_file[1:][non_mono]))
+
+    # Sortiert nach (Schlüssel, Zeit) für Duplikate und Lücken
+    order = np.lexsort((t, keys))
+    k_sorted, dt = keys[order], np.diff(t[order])
+    same = k_sorted[1:] == k_sorted[:-1]
+    duplicates = int((same & (dt == 0)).sum())
+
+    step_ns = None
+    missing_steps = gap_series = 0
+    steps = dt[same & (dt > 0)]
+    if len(steps):
+        values, counts = np.unique(steps, return_counts=True)
+        step_ns = int(values[counts.argmax()])
+        gaps = same & (dt > step_ns)
+        missing_steps = int((dt[gaps] // step_ns - 1).sum())
+        gap_series = len(np.unique(k_sorted[1:][gaps]))
+
+    return SeriesStats(
+        n_rows=n,
+        n_series=n_series,
+        duplicates=duplicates,
+        non_monotonic_series=non_monotonic_series,
+        gap_series=gap_series,
+        missing_steps=missing_steps,
+        step=str(pd.Timedelta(step_ns, unit="ns")) if step_ns is not None else None,
+    )
+
+
+def unseen_groups(keys: "np.ndarray", reference: "np.ndarray") -> int:
+    """Anzahl Gruppen in `keys`, die in `reference` nicht vorkommen."""
+    import numpy as np
+
+    return int((~np.isin(np.unique(keys), reference, assume_unique=True)).sum())
+
+
+# ------------------------- Bericht -------------------------
+
+@dataclass
+class ValidationReport:
+    fingerprint: str
+    splits: Dict[str, SeriesStats] = field(default_factory=dict)
+    unseen: Dict[str, int] = field(default_factory=dict)    # Split -> Gruppen nicht in train
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "ok": self.ok}
+
+
+def validate_panel(
+    frames: Dict[str, "pd.DataFrame"],
+    time_col: str,
+    id_cols: List[str],
+    fingerprint: str,
+) -> ValidationReport:
+    """Prüft die Splits (train zuerst) und sammelt Fehler/Warnungen im Bericht."""
+    import numpy as np
+
+    t0 = time.perf_counter()
+    report = ValidationReport(fingerprint=fingerprint)
+    train_keys = None
+    for name, df in frames.items():
+        check_required_columns(df.columns, [*id_cols, time_col], name)
+        keys = group_keys(df, id_cols)
+        stats = series_stats(keys, df[time_col].to_numpy())
+        report.splits[name] = stats
+
+        if stats.duplicates:
+            report.errors.append(f"{name}: {stats.duplicates} doppelte (Reihe, {time_col})-Zeilen")
+        if stats.non_monotonic_series:
+            report.errors.append(f"{name}: {stats.non_monotonic_series} Reihen mit nicht monotoner Zeit")
+        if stats.gap_series:
+            report.warnings.append(
+                f"{name}: {stats.gap_series} Reihen mit Lücken ({stats.missing_steps} fehlende Schritte à {stats.step})"
+            )
+
+        if train_keys is None:
+            train_keys = np.unique(keys)
+        else:
+            report.unseen[name] = unseen_groups(keys, train_keys)
+            if report.unseen[name]:
+                report.warnings.append(f"{name}: {report.unseen[name]} Gruppen nicht in TRAIN")
+
+    report.seconds = round(time.perf_counter() - t0, 3)
+    return report
+
+
+def write_report(report: ValidationReport, cache_path: Path) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with cache_path.open("w", encoding="utf-8") as f:
+        json.dump(report.to_dict(), f, indent=2, ensure_ascii=False)
+
+
+def raise_on_errors(report: ValidationReport) -> None:
+    for w in report.warnings:
+        print(f"[Warnung] {w}")
+    if report.errors:
+        raise ValueError("Datenvalidierung fehlgeschlagen:\n  - " + "\n  - ".join(report.errors))
+
+
+# ------------------------- CLI -------------------------
+
+def validate_processed(processed_dir: Path, force: bool = False) -> Dict[str, Any]:
+    """Prüft train/val/test in `processed_dir`; liest nur ID- und Zeitspalten."""
+    paths = {s: processed_dir / f"{s}.parquet" for s in SPLITS}
+    for name, p in paths.items():
+        if not p.exists():
+            raise FileNotFoundError(f"{name}.parquet nicht gefunden: {p}")
+
+    fingerprint = inputs_fingerprint(paths.values(), {"time_col": TIME_COL, "id_cols": list(ID_COLS)})
+    cache_path = processed_dir / CACHE_FILE
+    cached = None if force else load_cached(cache_path, fingerprint)
+    if cached is not None:
+        print(f"[validation] Daten unverändert (Fingerprint {fingerprint}) – Prüfung übersprungen.")
+        return cached
+
+    for name, p in paths.items():
+        check_required_columns(read_schema(p)[0], [*ID_COLS, TIME_COL], name)
+
+    import pandas as pd
+
+    frames = {name: pd.read_parquet(p, columns=[*ID_COLS, TIME_COL]) for name, p in paths.items()}
+    report = validate_panel(frames, TIME_COL, list(ID_COLS), fingerprint)
+    write_report(report, cache_path)
+    for name, s in report.splits.items():
+        print(f"[validation] {name:<5}: {s.n_rows:,} Zeilen | {s.n_series} Reihen | "
+              f"Duplikate {s.duplicates} | Lücken-Reihen {s.gap_series}")
+    print(f"[validation] Dauer: {report.seconds}s | Bericht: {cache_path}")
+    raise_on_errors(report)
+    return report.to_dict()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Gespeicherte Splits (train/val/test) validieren.")
+    ap.add_argument("--dir", type=str, default=str(PROCESSED_DIR))
+    ap.add_argument("--force", action="store_true", help="Cache ignorieren und neu prüfen")
+    args = ap.parse_args()
+    validate_processed(Path(args.dir), force=args.force)
+
+
+if __name__ == "__main__":
+    # python -m src.modeling.validation
+    main()
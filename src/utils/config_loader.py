@@ -4,7 +4,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal, Dict, Any
+from typing import Literal, Dict, Any, Optional
 import yaml
 
 
@@ -17,6 +17,39 @@ class ModelCfg:
     hidden_continuous_size: int
     output_size: int
     reduce_on_plateau_patience: int
+    compile: bool                         # torch.compile auf den TFT-Forward
+
+
+BATCH_SAMPLERS = ("random", "synchronized", "bucketed")
+
+
+@dataclass(frozen=True)
+class DataLoaderCfg:
+    persistent_workers: bool              # Worker zwischen Epochen behalten (nur num_workers > 0)
+    prefetch_factor: int                  # vorab geladene Batches je Worker
+    pin_memory: bool                      # page-locked Speicher für schnellere Host->GPU-Kopien
+    worker_threads: int                   # torch-Threads je Dataloader-Worker (gegen Überbuchung)
+    torch_intra_op_threads: int           # torch.set_num_threads im Hauptprozess
+    torch_inter_op_threads: int           # torch.set_num_interop_threads im Hauptprozess
+    batch_sampler: Literal["random", "synchronized", "bucketed"]  # Zusammenstellung der Batches
+
+
+@dataclass(frozen=True)
+class CheckpointCfg:
+    save_last: bool                       # last.ckpt für --resume (inkl. Optimizer/Scheduler/Loop-Zustand)
+    every_n_train_steps: int              # 0 = nur am Epochenende; > 0 zusätzlich alle n Schritte (last.ckpt)
+    async_write: bool                     # Checkpoints im Hintergrund-Thread schreiben
+    export_inference: bool                # Inferenz-Artefakt (.infer.pt) neben jedem besten Checkpoint
+
+
+@dataclass(frozen=True)
+class DistillCfg:
+    teacher_run: str                      # results/tft/<run_id> des Lehrer-Modells (bestes Checkpoint)
+    alpha: float                          # Loss = (1 - alpha)·Loss(y) + alpha·Loss(Lehrer-Quantile)
+
+
+# Lightning-Präzisionen: fp32 (Referenz) oder bf16-Autocast (auch auf CPU)
+PRECISIONS = ("32-true", "bf16-mixed")
 
 
 @dataclass(frozen=True)
@@ -32,7 +65,12 @@ class TrainerCfg:
     devices: int
     limit_train_batches: float | int
     limit_val_batches: float | int
+    precision: Literal["32-true", "bf16-mixed"]
+    deterministic: bool                   # True: deterministische Kernels, False: schnellere Kernels
+    dataloader: DataLoaderCfg
+    checkpoint: CheckpointCfg
     model: ModelCfg
+    distill: Optional[DistillCfg] = None  # nur bei Schüler-Configs (Wissensdestillation)
 
 
 def _fail_if_extra_keys(loaded: Dict[str, Any], schema_keys: set[str], ctx: str) -> None:
@@ -55,18 +93,38 @@ def load_trainer_cfg(path: str | Path) -> TrainerCfg:
     allowed_top = {
         "seed", "max_epochs", "batch_size", "learning_rate", "gradient_clip_val",
         "early_stopping_patience", "num_workers", "accelerator", "devices",
-        "limit_train_batches", "limit_val_batches", "model"
+        "limit_train_batches", "limit_val_batches", "precision", "deterministic",
+        "dataloader", "checkpoint", "model", "distill"
     }
     _fail_if_extra_keys(cfg, allowed_top, "trainer-config")
 
+    if cfg["precision"] not in PRECISIONS:
+        raise ValueError(
+            f"trainer-config: unbekannte precision '{cfg['precision']}' (erlaubt: {PRECISIONS})"
+        )
+    if not isinstance(cfg["deterministic"], bool):
+        raise TypeError("trainer-config: 'deterministic' muss true/false sein.")
+
+    if "dataloader" not in cfg:
+        raise KeyError("trainer-config: Schlüssel 'dataloader' fehlt.")
+    dataloader = _load_dataloader_cfg(cfg["dataloader"], int(cfg["num_workers"]))
+
+    if "checkpoint" not in cfg:
+        raise KeyError("trainer-config: Schlüssel 'checkpoint' fehlt.")
+    checkpoint = _load_checkpoint_cfg(cfg["checkpoint"])
+
     if "model" not in cfg:
         raise KeyError("trainer-config: Schlüssel 'model' fehlt.")
     m = cfg["model"]
     allowed_model = {
         "loss", "hidden_size", "attention_head_size", "dropout",
-        "hidden_continuous_size", "output_size", "reduce_on_plateau_patience"
+        "hidden_continuous_size", "output_size", "reduce_on_plateau_patience", "compile"
     }
     _fail_if_extra_keys(m, allowed_model, "trainer-config.model")
+    if not isinstance(m["compile"], bool):
+        raise TypeError("trainer-config.model: 'compile' muss true/false sein.")
+
+    distill = _load_distill_cfg(cfg["distill"], str(m["loss"])) if "distill" in cfg else None
 
     # Typisiertes Objekt bauen
     return TrainerCfg(
@@ -81,6 +139,10 @@ def load_trainer_cfg(path: str | Path) -> TrainerCfg:
         devices=int(cfg["devices"]),
         limit_train_batches=cfg["limit_train_batches"],
         limit_val_batches=cfg["limit_val_batches"],
+        precision=str(cfg["precision"]),
+        deterministic=bool(cfg["deterministic"]),
+        dataloader=dataloader,
+        checkpoint=checkpoint,
         model=ModelCfg(
             loss=str(m["loss"]),
             hidden_size=int(m["hidden_size"]),
@@ -89,7 +151,184 @@ def load_trainer_cfg(path: str | Path) -> TrainerCfg:
             hidden_continuous_size=int(m["hidden_continuous_size"]),
             output_size=int(m["output_size"]),
             reduce_on_plateau_patience=int(m["reduce_on_plateau_patience"]),
+            compile=bool(m["compile"]),
         ),
+        distill=distill,
+    )
+
+
+def _load_dataloader_cfg(d: Dict[str, Any], num_workers: int) -> DataLoaderCfg:
+    allowed = {
+        "persistent_workers", "prefetch_factor", "pin_memory", "worker_threads",
+        "torch_intra_op_threads", "torch_inter_op_threads", "batch_sampler",
+    }
+    _fail_if_extra_keys(d, allowed, "trainer-config.dataloader")
+
+    for key in ("persistent_workers", "pin_memory"):
+        if not isinstance(d[key], bool):
+            raise TypeError(f"trainer-config.dataloader: '{key}' muss true/false sein.")
+    for key in ("prefetch_factor", "worker_threads", "torch_intra_op_threads", "torch_inter_op_threads"):
+        if int(d[key]) < 1:
+            raise ValueError(f"trainer-config.dataloader: '{key}' muss >= 1 sein.")
+    if d["batch_sampler"] not in BATCH_SAMPLERS:
+        raise ValueError(
+            f"trainer-config.dataloader: unbekannter batch_sampler '{d['batch_sampler']}' "
+            f"(erlaubt: {BATCH_SAMPLERS})"
+        )
+    if num_workers < 0:
+        raise ValueError("trainer-config: 'num_workers' muss >= 0 sein.")
+    if d["persistent_workers"] and num_workers == 0:
+        raise ValueError("trainer-config.dataloader: persistent_workers erfordert num_workers > 0.")
+
+    return DataLoaderCfg(
+        persistent_workers=bool(d["persistent_workers"]),
+        prefetch_factor=int(d["prefetch_factor"]),
+        pin_memory=bool(d["pin_memory"]),
+        worker_threads=int(d["worker_threads"]),
+        torch_intra_op_threads=int(d["torch_intra_op_threads"]),
+        torch_inter_op_threads=int(d["torch_inter_op_threads"]),
+        batch_sampler=str(d["batch_sampler"]),
+    )
+
+
+def _load_checkpoint_cfg(d: Dict[str, Any]) -> CheckpointCfg:
+    _fail_if_extra_keys(
+        d, {"save_last", "every_n_train_steps", "async_write", "export_inference"}, "trainer-config.checkpoint"
+    )
+
+    for key in ("save_last", "async_write", "export_inference"):
+        if not isinstance(d[key], bool):
+            raise TypeError(f"trainer-config.checkpoint: '{key}' muss true/false sein.")
+    if int(d["every_n_train_steps"]) < 0:
+        raise ValueError("trainer-config.checkpoint: 'every_n_train_steps' muss >= 0 sein.")
+    if int(d["every_n_train_steps"]) > 0 and not d["save_last"]:
+        raise ValueError("trainer-config.checkpoint: 'every_n_train_steps' > 0 erfordert save_last: true.")
+
+    return CheckpointCfg(
+        save_last=bool(d["save_last"]),
+        every_n_train_steps=int(d["every_n_train_steps"]),
+        async_write=bool(d["async_write"]),
+        export_inference=bool(d["export_inference"]),
     )
 
-# python -m src.modeling.trainer_tft --config configs/trainer_tft_baseline.yaml
\ No newline at end of file
+
+def _load_distill_cfg(d: Dict[str, Any], loss: str) -> DistillCfg:
+    _fail_if_extra_keys(d, {"teacher_run", "alpha"}, "trainer-config.distill")
+    for key in ("teacher_run", "alpha"):
+        if key not in d:
+            raise KeyError(f"trainer-config.distill: Schlüssel '{key}' fehlt.")
+    if not 0.0 <= float(d["alpha"]) <= 1.0:
+        raise ValueError("trainer-config.distill: 'alpha' muss in [0, 1] liegen.")
+    if loss != "quantile":
+        raise ValueError("trainer-config.distill: Destillation erfordert model.loss: quantile.")
+
+    return DistillCfg(teacher_run=str(d["teacher_run"]), alpha=float(d["alpha"]))
+
+
+# ------------------------- Baseline-Trainer -------------------------
+
+BASELINE_METHODS = ("seasonal_naive", "moving_average", "ses", "holt", "arima")
+
+
+@dataclass(frozen=True)
+class ArimaCfg:
+    p: int
+    d: Literal[0, 1]
+    n_jobs: int
+    timeout_sec: float
+
+
+@dataclass(frozen=True)
+class BaselineCfg:
+    seed: int
+    methods: tuple[str, ...]
+    season_length: int
+    ma_window: int
+    ets_alpha_grid: tuple[float, ...]
+    ets_beta_grid: tuple[float, ...]
+    arima: ArimaCfg
+
+
+def load_baseline_cfg(path: str | Path) -> BaselineCfg:
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"Konfigurationsdatei nicht gefunden: {p}")
+
+    try:
+        cfg: Dict[str, Any] = yaml.safe_load(p.read_text(encoding="utf-8"))
+    except Exception as e:
+        raise RuntimeError(f"Konfiguration konnte nicht geladen werden: {e}")
+
+    allowed_top = {
+        "seed", "methods", "season_length", "ma_window",
+        "ets_alpha_grid", "ets_beta_grid", "arima",
+    }
+    _fail_if_extra_keys(cfg, allowed_top, "baseline-config")
+
+    if "arima" not in cfg:
+        raise KeyError("baseline-config: Schlüssel 'arima' fehlt.")
+    a = cfg["arima"]
+    _fail_if_extra_keys(a, {"p", "d", "n_jobs", "timeout_sec"}, "baseline-config.arima")
+
+    methods = tuple(str(m) for m in cfg["methods"])
+    unknown = set(methods) - set(BASELINE_METHODS)
+    if unknown:
+        raise ValueError(f"baseline-config: unbekannte Methoden {sorted(unknown)}")
+    if int(a["d"]) not in (0, 1):
+        raise ValueError("baseline-config.arima: 'd' muss 0 oder 1 sein.")
+
+    return BaselineCfg(
+        seed=int(cfg["seed"]),
+        methods=methods,
+        season_length=int(cfg["season_length"]),
+        ma_window=int(cfg["ma_window"]),
+        ets_alpha_grid=tuple(float(x) for x in cfg["ets_alpha_grid"]),
+        ets_beta_grid=tuple(float(x) for x in cfg["ets_beta_grid"]),
+        arima=ArimaCfg(
+            p=int(a["p"]),
+            d=int(a["d"]),
+            n_jobs=int(a["n_jobs"]),
+            timeout_sec=float(a["timeout_sec"]),
+        ),
+    )
+
+
+# ------------------------- CLI: Config-Validierung -------------------------
+
+def _loader_for(path: Path):
+    """Wählt den Loader anhand des Dateinamens (trainer_baseline*.yaml vs. trainer_tft*.yaml)."""
+    return load_baseline_cfg if path.stem.startswith("trainer_baseline") else load_trainer_cfg
+
+
+def main() -> None:
+    """
+    Prüft eine oder mehrere YAML-Konfigurationen, ohne torch/pandas zu importieren.
+    Exit-Code 1, sobald eine Datei ungültig ist (für Scheduler/CI).
+    """
+    import argparse
+    import sys
+
+    ap = argparse.ArgumentParser(description="Validiert Trainer-Konfigurationen (strikt, ohne Fallbacks).")
+    ap.add_argument("configs", nargs="+", help="Pfad(e) zu YAML-Dateien, z. B. configs/*.yaml")
+    args = ap.parse_args()
+
+    n_failed = 0
+    for raw in args.configs:
+        path = Path(raw)
+        try:
+            _loader_for(path)(path)
+        except (FileNotFoundError, RuntimeError, KeyError, ValueError, TypeError) as e:
+            n_failed += 1
+            print(f"[config_loader] FEHLER {path}: {e}")
+        else:
+            print(f"[config_loader] OK     {path}")
+
+    if n_failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # python -m src.utils.config_loader configs/*.yaml
+    main()
+
+# python -m src.modeling.trainer_tft --config configs/trainer_tft_baseline.yaml
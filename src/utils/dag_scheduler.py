@@ -0,0 +1,418 @@
+# src/utils/dag_scheduler.py
+"""
+Lokaler DAG-Scheduler für die Pipeline-Schritte.
+
+- Jeder Schritt ist ein Task: ein CLI-Befehl (main() eines Moduls, siehe src/cli.py)
+  mit deklarierten Eingaben und Ausgaben
+- Abhängigkeiten ergeben sich aus den Dateien: B hängt von A ab, wenn eine Eingabe
+  von B eine Ausgabe von A ist
+- Bereite Tasks laufen parallel als eigene Prozesse (`python -m src <befehl>`), begrenzt
+  durch Worker-Anzahl und Ressourcen-Hinweise (CPU-Kerne, Speicher in GB)
+- Reihenfolge unter den bereiten Tasks: längster Restpfad zuerst (Dauern aus dem letzten Lauf)
+- Aktuelle Tasks werden übersprungen (wie make): alle Ausgaben vorhanden und neuer als
+  jede Eingabe inkl. Quelldatei des Moduls, gleiche Befehlszeile wie beim letzten Erfolg.
+  Tasks ohne feste Ausgaben (Training legt je Lauf einen neuen Run-Ordner an) vergleichen
+  stattdessen mit dem Zeitpunkt des letzten erfolgreichen Laufs
+- Am Ende: Zeitaufstellung je Task und kritischer Pfad (Wandzeit vs. Summe der Tasks)
+
+Zustand und Logs: DAG_CONF in config.py. Bewusst nur Standardbibliothek.
+
+Aufruf:
+    python -m src dag --dry-run
+    python -m src dag --workers 4 --evaluate results/tft/run_a results/tft/run_b
+    python -m src dag --targets dataset-spec plot-report
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from src.cli import COMMANDS
+from src.config import DAG_CONF, FEATURE_STORE, INTERIM_DIR, MODEL_INPUT_PATH, PROCESSED_DIR, RAW_DIR, ROLLUP_DIR
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_TFT_CONFIGS = ("configs/trainer_tft_baseline.yaml",)
+DEFAULT_BASELINE_CONFIG = "configs/trainer_baseline.yaml"
+DEFAULT_DURATION_SEC = 1.0   # Schätzung für Tasks ohne bisherigen Lauf
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    command: str                          # Befehl aus src/cli.py COMMANDS
+    args: Tuple[str, ...] = ()
+    inputs: Tuple[Path, ...] = ()
+    outputs: Tuple[Path, ...] = ()
+    cpu: int = 1                          # Kerne, die der Task typischerweise auslastet
+    mem_gb: float = 1.0                   # Spitzenbedarf Arbeitsspeicher (grob)
+
+    def argv(self) -> List[str]:
+        return [sys.executable, "-m", "src", self.command, *self.args]
+
+    def source(self) -> Path:
+        return SRC_DIR.parent / (COMMANDS[self.command][0].replace(".", "/") + ".py")
+
+    def signature(self) -> str:
+        spec = [self.command, list(self.args), sorted(str(p) for p in self.outputs)]
+        return hashlib.sha256(json.dumps(spec).encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class TaskResult:
+    status: str                           # "ok" | "skipped" | "failed" | "blocked"
+    start: float = 0.0                    # Sekunden seit Start des DAG-Laufs
+    duration: float = 0.0
+    log: Optional[Path] = None
+
+
+# ------------------------- Projekt-DAG -------------------------
+
+def project_tasks(
+    tft_configs: Sequence[str] = DEFAULT_TFT_CONFIGS,
+    baseline_config: Optional[str] = DEFAULT_BASELINE_CONFIG,
+    evaluate_runs: Sequence[str] = (),
+    split: str = "test",
+) -> List[Task]:
+    """Schritte aus PipelineOrder.md (pandas-Pfad, inkl. Rollups für die Diagnose-Plots)."""
+    raw = RAW_DIR / "tabular-playground-series-sep-2022" / "train.csv"
+    aligned, cleaned = INTERIM_DIR / "train_aligned.parquet", INTERIM_DIR / "train_cleaned.parquet"
+    features = PROCESSED_DIR / "train_features.parquet"
+    cyc = PROCESSED_DIR / "train_features_cyc.parquet"
+    splits = tuple(PROCESSED_DIR / f"{s}.parquet" for s in ("train", "val", "test"))
+    meta, spec = PROCESSED_DIR / "meta.json", PROCESSED_DIR / "dataset_spec.json"
+    rollups = tuple(ROLLUP_DIR / f"{v}.parquet" for v in ("raw", "aligned", "cleaned"))
+
+    tasks = [
+        Task("align", "align", inputs=(raw,), outputs=(aligned, rollups[0], rollups[1]), mem_gb=2),
+        Task("clean", "clean", inputs=(aligned,), outputs=(cleaned, rollups[2]), mem_gb=2),
+        Task("features", "features", inputs=(cleaned,), outputs=(features,), mem_gb=2),
+        Task("cyclical", "cyclical", inputs=(features,), outputs=(cyc,), mem_gb=2),
+        Task("lags", "lags", inputs=(cyc,), outputs=(MODEL_INPUT_PATH,), mem_gb=3),
+        Task("model-dataset", "model-dataset", inputs=(MODEL_INPUT_PATH,), outputs=(*splits, meta), mem_gb=3),
+        Task("dataset-spec", "dataset-spec", inputs=(*splits, meta), outputs=(spec,)),
+        Task("plot-report", "plot-report", inputs=rollups, cpu=2, mem_gb=2),
+        Task("feature-store", "feature-store", ("materialize",), inputs=(cleaned,),
+             outputs=(FEATURE_STORE["root"] / "registry.json",), mem_gb=2),
+    ]
+    if baseline_config:
+        tasks.append(Task("train-baseline", "train-baseline", ("--config", baseline_config, "--split", split),
+                          inputs=(*splits, Path(baseline_config)), mem_gb=2))
+    for cfg in tft_configs:
+        tasks.append(Task(f"train-tft:{Path(cfg).stem}", "train-tft", ("--config", cfg),
+                          inputs=(spec, *splits, Path(cfg)), cpu=4, mem_gb=4))
+    for run in evaluate_runs:
+        run_dir = Path(run)
+        tasks.append(Task(f"evaluate:{run_dir.name}", "evaluate", ("--run", str(run_dir), "--split", split),
+                          inputs=(spec, *splits, run_dir / "summary.json"),
+                          outputs=(run_dir / "evaluation" / f"metrics_series_{split}.parquet",),
+                          cpu=2, mem_gb=3))
+    return tasks
+
+
+# ------------------------- Graph -------------------------
+
+def build_graph(tasks: Sequence[Task]) -> Dict[str, Set[str]]:
+    """Abhängigkeiten je Task aus Ein-/Ausgaben; Fehler bei Namenskonflikten, Doppelproduzenten, Zyklen."""
+    names = [t.name for t in tasks]
+    dupes = sorted({n for n in names if names.count(n) > 1})
+    if dupes:
+        raise ValueError(f"DAG: doppelte Task-Namen: {dupes}")
+    unknown = [t.command for t in tasks if t.command not in COMMANDS]
+    if unknown:
+        raise KeyError(f"DAG: unbekannte Befehle: {unknown}")
+
+    producer: Dict[Path, str] = {}
+    for t in tasks:
+        for out in t.outputs:
+            if out in producer:
+                raise ValueError(f"DAG: {out} wird von '{producer[out]}' und '{t.name}' geschrieben.")
+            producer[out] = t.name
+
+    deps = {t.name: {producer[p] for p in t.inputs if p in producer} for t in tasks}
+    topo_order(deps)
+    return deps
+
+
+def topo_order(deps: Dict[str, Set[str]]) -> List[str]:
+    remaining = {k: set(v) for k, v in deps.items()}
+    order: List[str] = []
+    while remaining:
+        ready = sorted(k for k, v in remaining.items() if not v)
+        if not ready:
+            raise ValueError(f"DAG: Zyklus zwischen {sorted(remaining)}")
+        order += ready
+        for k in ready:
+            del remaining[k]
+        for v in remaining.values():
+            v.difference_update(ready)
+    return order
+
+
+def with_ancestors(deps: Dict[str, Set[str]], targets: Iterable[str]) -> Set[str]:
+    keep: Set[str] = set()
+    stack = list(targets)
+    while stack:
+        name = stack.pop()
+        if name not in deps:
+            raise KeyError(f"DAG: unbekannter Task '{name}'. Vorhanden: {sorted(deps)}")
+        if name not in keep:
+            keep.add(name)
+            stack += deps[name]
+    return keep
+
+
+def longest_path(deps: Dict[str, Set[str]], duration: Dict[str, float]) -> Tuple[float, List[str]]:
+    """Kritischer Pfad: längste Kette (Summe der Dauern) durch den DAG."""
+    finish: Dict[str, float] = {}
+    prev: Dict[str, Optional[str]] = {}
+    for name in topo_order(deps):
+        best = max(deps[name], key=lambda d: finish[d], default=None)
+        finish[name] = duration.get(name, 0.0) + (finish[best] if best else 0.0)
+        prev[name] = best
+    if not finish:
+        return 0.0, []
+    node: Optional[str] = max(finish, key=finish.get)
+    total, path = finish[node], []
+    while node is not None:
+        path.append(node)
+        node = prev[node]
+    return total, path[::-1]
+
+
+def remaining_path(deps: Dict[str, Set[str]], duration: Dict[str, float]) -> Dict[str, float]:
+    """Längster Restpfad ab jedem Task (inkl. eigener Dauer) – Priorität beim Einplanen."""
+    children: Dict[str, Set[str]] = {k: set() for k in deps}
+    for k, v in deps.items():
+        for d in v:
+            children[d].add(k)
+    rest: Dict[str, float] = {}
+    for name in reversed(topo_order(deps)):
+        rest[name] = duration.get(name, DEFAULT_DURATION_SEC) + max((rest[c] for c in children[name]), default=0.0)
+    return rest
+
+
+# ------------------------- Aktualität -------------------------
+
+def _mtime(path: Path) -> float:
+    return path.stat().st_mtime
+
+
+def is_up_to_date(task: Task, state: Dict[str, dict]) -> bool:
+    entry = state.get(task.name)
+    if entry is not None and entry.get("signature") != task.signature():
+        return False
+    if any(not p.exists() for p in task.outputs):
+        return False
+    newest_input = max((_mtime(p) for p in (*task.inputs, task.source()) if p.exists()), default=0.0)
+    if task.outputs:
+        return newest_input <= min(_mtime(p) for p in task.outputs)
+    return entry is not None and newest_input <= entry["finished_at"]
+
+
+def _load_state(path: Path) -> Dict[str, dict]:
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+
+# ------------------------- Ausführung -------------------------
+
+@dataclass
+class DagScheduler:
+    tasks: Sequence[Task]
+    workers: int
+    cpus: int
+    memory_gb: float
+    force: bool = False
+    state_path: Path = DAG_CONF["state_path"]
+    log_dir: Path = DAG_CONF["log_dir"]
+    deps: Dict[str, Set[str]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.workers < 1 or self.cpus < 1 or self.memory_gb <= 0:
+            raise ValueError("DAG: workers, cpus und memory_gb müssen > 0 sein.")
+        self.deps = build_graph(self.tasks)
+        self.by_name = {t.name: t for t in self.tasks}
+        produced = {p for t in self.tasks for p in t.outputs}
+        missing = sorted({str(p) for t in self.tasks for p in t.inputs if p not in produced and not p.exists()})
+        if missing:
+            raise FileNotFoundError(f"DAG: Eingaben fehlen und werden von keinem Task erzeugt: {missing}")
+        self.state = _load_state(self.state_path)
+
+    def _hint(self, task: Task) -> Tuple[int, float]:
+        # Hinweise über der Kapazität werden gekappt – der Task läuft dann allein
+        return min(task.cpu, self.cpus), min(task.mem_gb, self.memory_gb)
+
+    def plan(self) -> Dict[str, str]:
+        """Trockenlauf: "run" oder "skip" je Task (ein laufender Vorgänger erzwingt "run")."""
+        out: Dict[str, str] = {}
+        for name in topo_order(self.deps):
+            upstream_runs = any(out[d] == "run" for d in self.deps[name])
+            fresh = not self.force and not upstream_runs and is_up_to_date(self.by_name[name], self.state)
+            out[name] = "skip" if fresh else "run"
+        return out
+
+    def _execute(self, task: Task, t0: float) -> TaskResult:
+        log = self.log_dir / f"{task.name.replace(':', '_')}.log"
+        start = time.perf_counter()
+        with open(log, "w", encoding="utf-8") as fh:
+            proc = subprocess.run(task.argv(), stdout=fh, stderr=subprocess.STDOUT, env=os.environ.copy())
+        end = time.perf_counter()
+        status = "ok" if proc.returncode == 0 else "failed"
+        return TaskResult(status, round(start - t0, 3), round(end - start, 3), log)
+
+    def run(self) -> Dict[str, TaskResult]:
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        estimates = {k: float(v.get("duration", DEFAULT_DURATION_SEC)) for k, v in self.state.items()}
+        priority = remaining_path(self.deps, estimates)
+
+        results: Dict[str, TaskResult] = {}
+        pending = set(self.by_name)
+        running: Dict[Future, str] = {}
+        used_cpu, used_mem = 0, 0.0
+        t0 = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while pending or running:
+                # abhängige Tasks fehlgeschlagener Vorgänger blockieren
+                for name in sorted(pending):
+                    if any(results.get(d) and results[d].status in ("failed", "blocked") for d in self.deps[name]):
+                        results[name] = TaskResult("blocked")
+                        pending.discard(name)
+                        print(f"[dag] blockiert: {name}")
+
+                ready = sorted(
+                    (n for n in pending if all(d in results for d in self.deps[n])),
+                    key=lambda n: (-priority[n], n),
+                )
+                for name in ready:
+                    task = self.by_name[name]
+                    ran_upstream = any(results[d].status == "ok" for d in self.deps[name])
+                    if not self.force and not ran_upstream and is_up_to_date(task, self.state):
+                        results[name] = TaskResult("skipped", round(time.perf_counter() - t0, 3))
+                        pending.discard(name)
+                        print(f"[dag] aktuell, übersprungen: {name}")
+                        continue
+                    cpu, mem = self._hint(task)
+                    if len(running) >= self.workers or used_cpu + cpu > self.cpus or used_mem + mem > self.memory_gb:
+                        continue
+                    used_cpu, used_mem = used_cpu + cpu, used_mem + mem
+                    pending.discard(name)
+                    running[pool.submit(self._execute, task, t0)] = name
+                    print(f"[dag] start: {name} ({cpu} CPU, {mem:g} GB)")
+
+                if not running:
+                    if pending and not any(all(d in results for d in self.deps[n]) for n in pending):
+                        raise RuntimeError(f"DAG: keine ausführbaren Tasks mehr: {sorted(pending)}")
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    cpu, mem = self._hint(self.by_name[name])
+                    used_cpu, used_mem = used_cpu - cpu, used_mem - mem
+                    res = results[name] = fut.result()
+                    if res.status == "ok":
+                        self.state[name] = {
+                            "signature": self.by_name[name].signature(),
+                            "finished_at": time.time(),
+                            "duration": res.duration,
+                        }
+                        print(f"[dag] fertig: {name} ({res.duration:.1f}s)")
+                    else:
+                        print(f"[dag] FEHLER: {name} ({res.duration:.1f}s) – Log: {res.log}")
+                        print("    " + "\n    ".join(res.log.read_text(encoding="utf-8").splitlines()[-15:]))
+
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(json.dumps(self.state, indent=2), encoding="utf-8")
+        return results
+
+
+# ------------------------- Bericht -------------------------
+
+def report(deps: Dict[str, Set[str]], results: Dict[str, TaskResult], wall: float, out_path: Path) -> dict:
+    duration = {k: r.duration for k, r in results.items()}
+    cp_total, cp_path = longest_path(deps, duration)
+    busy = sum(duration.values())
+
+    print(f"\n[dag] {'Task':<36} {'Status':<8} {'Start':>8} {'Dauer':>8}  krit.")
+    for name in sorted(results, key=lambda n: (results[n].start, n)):
+        r = results[name]
+        mark = "*" if name in cp_path and r.duration > 0 else ""
+        print(f"[dag] {name:<36} {r.status:<8} {r.start:>7.1f}s {r.duration:>7.1f}s  {mark}")
+    print(f"[dag] Wandzeit: {wall:.1f}s | Summe der Tasks: {busy:.1f}s | "
+          f"kritischer Pfad: {cp_total:.1f}s ({' -> '.join(n for n in cp_path if duration[n] > 0) or '–'})")
+    if wall > 0:
+        print(f"[dag] Parallelität: {busy / wall:.2f} | Wandzeit / kritischer Pfad: "
+              f"{wall / cp_total if cp_total else float('nan'):.2f}")
+
+    payload = {
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "wall_sec": round(wall, 3),
+        "sum_task_sec": round(busy, 3),
+        "critical_path_sec": round(cp_total, 3),
+        "critical_path": cp_path,
+        "tasks": {k: {"status": r.status, "start": r.start, "duration": r.duration} for k, r in results.items()},
+    }
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return payload
+
+
+# ------------------------- CLI -------------------------
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Pipeline-Schritte als DAG parallel ausführen.")
+    ap.add_argument("--targets", nargs="*", default=None, help="Nur diese Tasks (plus Vorgänger)")
+    ap.add_argument("--tft-config", nargs="*", default=list(DEFAULT_TFT_CONFIGS), help="Je Config ein Trainings-Task")
+    ap.add_argument("--baseline-config", type=str, default=DEFAULT_BASELINE_CONFIG, help="'' = ohne Baselines")
+    ap.add_argument("--evaluate", nargs="*", default=[], help="Run-Ordner, je Run ein Evaluations-Task")
+    ap.add_argument("--split", type=str, default="test", choices=["val", "test"])
+    ap.add_argument("--workers", type=int, default=DAG_CONF["workers"], help="0 = Anzahl CPU-Kerne")
+    ap.add_argument("--cpus", type=int, default=0, help="CPU-Kapazität für die Hinweise, 0 = alle Kerne")
+    ap.add_argument("--memory-gb", type=float, default=DAG_CONF["memory_gb"])
+    ap.add_argument("--force", action="store_true", help="Alle Tasks ausführen, auch wenn aktuell")
+    ap.add_argument("--dry-run", action="store_true", help="Nur Plan ausgeben")
+    args = ap.parse_args()
+
+    cores = os.cpu_count() or 1
+    tasks = project_tasks(args.tft_config, args.baseline_config or None, args.evaluate, args.split)
+    if args.targets:
+        keep = with_ancestors(build_graph(tasks), args.targets)
+        tasks = [t for t in tasks if t.name in keep]
+
+    scheduler = DagScheduler(
+        tasks,
+        workers=args.workers or cores,
+        cpus=args.cpus or cores,
+        memory_gb=args.memory_gb,
+        force=args.force,
+    )
+    if args.dry_run:
+        plan = scheduler.plan()
+        for name in topo_order(scheduler.deps):
+            after = ", ".join(sorted(scheduler.deps[name])) or "–"
+            print(f"[dag] {plan[name]:<4} {name:<36} nach: {after}")
+        return
+
+    print(f"[dag] {len(tasks)} Tasks | Worker: {scheduler.workers} | CPU: {scheduler.cpus} | "
+          f"Speicher: {scheduler.memory_gb:g} GB")
+    t_start = time.perf_counter()
+    results = scheduler.run()
+    report(scheduler.deps, results, time.perf_counter() - t_start, DAG_CONF["report_path"])
+    if any(r.status in ("failed", "blocked") for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # python -m src.utils.dag_scheduler --dry-run
+    main()
@@ -0,0 +1,370 @@
+# src/utils/forecast_cache.py
+"""
+Prognose-Cache: fertige Quantil-Prognosen je (Checkpoint, dataset_spec, Zeitreihe, Cutoff).
+
+- Schlüssel: SHA-256 des Checkpoint-Inhalts, SHA-256 von dataset_spec.json,
+  Reihen-ID (ID_COLS mit "|" verbunden) und Cutoff (letzter beobachteter Tag)
+- Wert: Quantil-Matrix (Horizont × Quantile) als float32-BLOB plus Daten der Horizonttage
+- TTL: ältere Einträge zählen als Miss und werden gelöscht
+- Größengrenze: nach dem Schreiben werden die am längsten ungenutzten Einträge verdrängt (LRU)
+- Kennzahlen (hits, misses, expired, evicted, invalidated) in der Datenbank,
+  d. h. über Prozesse hinweg
+- Invalidierung: registriert die Run-Registry ein neues bestes Checkpoint, werden die
+  Einträge des bisherigen besten Checkpoints entfernt (`RunRegistry.register`); Pfade werden
+  aufgelöst gespeichert und verglichen, ein am selben Pfad überschriebenes Checkpoint
+  verdrängt beim Schreiben die Einträge des alten Inhalts
+
+Bewusst nur Standardbibliothek (sqlite3, array, hashlib) – wie run_registry.py.
+Die Inferenz davor steckt in src/evaluation/forecast.py.
+
+Aufruf:
+    python -m src.utils.forecast_cache stats
+    python -m src.utils.forecast_cache purge
+    python -m src.utils.forecast_cache invalidate --checkpoint results/tft/<run>/checkpoints/best.ckpt
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import time
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config import FORECAST_CACHE
+
+STAT_NAMES = ("hits", "misses", "expired", "puts", "evicted", "invalidated")
+
+# Erhöhen, wenn sich die Bedeutung gespeicherter Prognosen ändert (ältere Einträge werden verworfen).
+# 2: vorher enthielten Einträge bei min_encoder_length < max_encoder_length 7× den Horizont-1-Wert
+# 3: checkpoint_path wird aufgelöst (absolut) gespeichert, vorher wie übergeben
+CACHE_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS forecasts (
+    checkpoint_hash TEXT NOT NULL,
+    spec_hash       TEXT NOT NULL,
+    series_id       TEXT NOT NULL,
+    cutoff          TEXT NOT NULL,
+    checkpoint_path TEXT,
+    horizon         INTEGER NOT NULL,
+    quantiles       TEXT NOT NULL,
+    first_time_idx  INTEGER NOT NULL,
+    dates           TEXT NOT NULL,
+    payload         BLOB NOT NULL,
+    size_bytes      INTEGER NOT NULL,
+    created_at      REAL NOT NULL,
+    last_access     REAL NOT NULL,
+    hits            INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (checkpoint_hash, spec_hash, cutoff, series_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_forecasts_access ON forecasts (last_access);
+CREATE INDEX IF NOT EXISTS idx_forecasts_ckpt_path ON forecasts (checkpoint_path);
+CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+
+# ------------------------- Schlüssel -------------------------
+
+_HASH_MEMO: Dict[Tuple[str, int, int], str] = {}
+
+
+def file_hash(path: Path) -> str:
+    """Inhalts-Hash (gestreamt); je Prozess über (Pfad, Größe, mtime) gemerkt."""
+    path = Path(path)
+    st = path.stat()
+    memo_key = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+    if memo_key not in _HASH_MEMO:
+        h = hashlib.sha256()
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        _HASH_MEMO[memo_key] = h.hexdigest()[:16]
+    return _HASH_MEMO[memo_key]
+
+
+def path_key(path: Path) -> str:
+    """Aufgelöster Pfad – relativ/absolut/über Symlink erreichte Checkpoints fallen zusammen."""
+    return str(Path(path).resolve())
+
+
+def series_id(values: Iterable[object]) -> str:
+    return "|".join(str(v) for v in values)
+
+
+# ------------------------- Einträge -------------------------
+
+@dataclass
+class CachedForecast:
+    series_id: str
+    quantiles: List[float]
+    first_time_idx: int
+    dates: List[str]
+    values: List[float]          # Horizont × Quantile, zeilenweise
+
+    @property
+    def horizon(self) -> int:
+        return len(self.dates)
+
+    def to_blob(self) -> bytes:
+        if len(self.values) != self.horizon * len(self.quantiles):
+            raise ValueError(
+                f"{self.series_id}: {len(self.values)} Werte passen nicht zu "
+                f"Horizont {self.horizon} × {len(self.quantiles)} Quantile."
+            )
+        return array("f", self.values).tobytes()
+
+    @staticmethod
+    def values_from_blob(blob: bytes) -> List[float]:
+        values = array("f")
+        values.frombytes(blob)
+        return values.tolist()
+
+
+# ------------------------- Cache -------------------------
+
+class ForecastCache:
+    """SQLite-Datei mit einer Zeile je (Checkpoint, Spec, Cutoff, Reihe)."""
+
+    def __init__(
+        self,
+        db_path: Path = FORECAST_CACHE["path"],
+        ttl_hours: float = FORECAST_CACHE["ttl_hours"],
+        max_mb: float = FORECAST_CACHE["max_mb"],
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.ttl_sec = float(ttl_hours) * 3600.0
+        self.max_bytes = int(float(max_mb) * 1024 * 1024)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS _request (series_id TEXT PRIMARY KEY)")
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """Einträge einer älteren CACHE_VERSION verwerfen (PRAGMA user_version)."""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= CACHE_VERSION:
+            return
+        with self._conn:
+            cur = self._conn.execute("DELETE FROM forecasts")
+            self._count(invalidated=cur.rowcount)
+        self._conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+        if cur.rowcount:
+            print(f"[forecast_cache] Cache-Version {version} -> {CACHE_VERSION}: {cur.rowcount} Einträge verworfen")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ForecastCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---- Kennzahlen ----
+
+    def _count(self, **increments: int) -> None:
+        rows = [(name, n) for name, n in increments.items() if n]
+        if rows:
+            self._conn.executemany(
+                "INSERT INTO stats (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                rows,
+            )
+
+    def stats(self) -> Dict[str, float]:
+        counts = {name: 0 for name in STAT_NAMES}
+        counts.update({r["name"]: r["value"] for r in self._conn.execute("SELECT name, value FROM stats")})
+        n, size = self._conn.execute("SELECT count(*), coalesce(sum(size_bytes), 0) FROM forecasts").fetchone()
+        lookups = counts["hits"] + counts["misses"]
+        return {
+            **counts,
+            "hit_rate": round(counts["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": n,
+            "size_mb": round(size / (1024 * 1024), 3),
+        }
+
+    # ---- lesen ----
+
+    def get_many(
+        self, checkpoint_hash: str, spec_hash: str, cutoff: str, series_ids: List[str]
+    ) -> Dict[str, CachedForecast]:
+        """Treffer je Reihen-ID; abgelaufene Einträge werden gelöscht und als Miss gezählt."""
+        now = time.time()
+        with self._conn:
+            self._conn.execute("DELETE FROM _request")
+            self._conn.executemany("INSERT OR IGNORE INTO _request VALUES (?)", ((s,) for s in series_ids))
+            rows = self._conn.execute(
+                """
+                SELECT f.series_id, f.quantiles, f.first_time_idx, f.dates, f.payload, f.created_at
+                FROM forecasts f JOIN _request r ON r.series_id = f.series_id
+                WHERE f.checkpoint_hash = ? AND f.spec_hash = ? AND f.cutoff = ?
+                """,
+                (checkpoint_hash, spec_hash, cutoff),
+            ).fetchall()
+
+            key = (checkpoint_hash, spec_hash, cutoff)
+            fresh = [r for r in rows if now - r["created_at"] <= self.ttl_sec]
+            expired = [r["series_id"] for r in rows if now - r["created_at"] > self.ttl_sec]
+            if expired:
+                self._conn.executemany(
+                    "DELETE FROM forecasts WHERE checkpoint_hash = ? AND spec_hash = ? AND cutoff = ? AND series_id = ?",
+                    ((*key, s) for s in expired),
+                )
+            if fresh:
+                self._conn.executemany(
+                    "UPDATE forecasts SET last_access = ?, hits = hits + 1 "
+                    "WHERE checkpoint_hash = ? AND spec_hash = ? AND cutoff = ? AND series_id = ?",
+                    ((now, *key, r["series_id"]) for r in fresh),
+                )
+            n_requested = len(set(series_ids))
+            self._count(hits=len(fresh), misses=n_requested - len(fresh), expired=len(expired))
+
+        return {
+            r["series_id"]: CachedForecast(
+                series_id=r["series_id"],
+                quantiles=json.loads(r["quantiles"]),
+                first_time_idx=int(r["first_time_idx"]),
+                dates=json.loads(r["dates"]),
+                values=CachedForecast.values_from_blob(r["payload"]),
+            )
+            for r in fresh
+        }
+
+    # ---- schreiben ----
+
+    def put_many(
+        self,
+        checkpoint_hash: str,
+        spec_hash: str,
+        cutoff: str,
+        forecasts: List[CachedForecast],
+        checkpoint_path: Optional[Path] = None,
+    ) -> int:
+        """
+        Upsert der Prognosen, danach Verdrängung bis unter die Größengrenze.
+        Einträge mit gleichem Checkpoint-Pfad, aber anderem Inhalts-Hash (Datei überschrieben)
+        werden dabei entfernt.
+        """
+        now = time.time()
+        ckpt_key = path_key(checkpoint_path) if checkpoint_path is not None else None
+        rows = []
+        for fc in forecasts:
+            blob = fc.to_blob()
+            rows.append((
+                checkpoint_hash, spec_hash, fc.series_id, cutoff, ckpt_key,
+                fc.horizon, json.dumps(fc.quantiles), fc.first_time_idx, json.dumps(fc.dates),
+                blob, len(blob), now, now,
+            ))
+        with self._conn:
+            if ckpt_key is not None:
+                cur = self._conn.execute(
+                    "DELETE FROM forecasts WHERE checkpoint_path = ? AND checkpoint_hash != ?",
+                    (ckpt_key, checkpoint_hash),
+                )
+                self._count(invalidated=cur.rowcount)
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO forecasts (
+                    checkpoint_hash, spec_hash, series_id, cutoff, checkpoint_path,
+                    horizon, quantiles, first_time_idx, dates, payload, size_bytes, created_at, last_access
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            self._count(puts=len(rows))
+            evicted = self._evict()
+        return evicted
+
+    def _evict(self) -> int:
+        """LRU: behält die zuletzt genutzten Einträge, solange ihre Summe <= max_bytes ist."""
+        cur = self._conn.execute(
+            """
+            DELETE FROM forecasts WHERE (checkpoint_hash, spec_hash, cutoff, series_id) IN (
+                SELECT checkpoint_hash, spec_hash, cutoff, series_id FROM (
+                    SELECT checkpoint_hash, spec_hash, cutoff, series_id,
+                           sum(size_bytes) OVER (ORDER BY last_access DESC, created_at DESC) AS cum
+                    FROM forecasts
+                ) WHERE cum > ?
+            )
+            """,
+            (self.max_bytes,),
+        )
+        self._count(evicted=cur.rowcount)
+        return cur.rowcount
+
+    # ---- Wartung ----
+
+    def purge_expired(self) -> int:
+        with self._conn:
+            cur = self._conn.execute("DELETE FROM forecasts WHERE created_at < ?", (time.time() - self.ttl_sec,))
+            self._count(expired=cur.rowcount)
+        return cur.rowcount
+
+    def invalidate_checkpoint(self, checkpoint_path: Optional[Path] = None, checkpoint_hash: Optional[str] = None) -> int:
+        """Entfernt alle Einträge eines Checkpoints (über Pfad und/oder Inhalts-Hash)."""
+        if checkpoint_path is None and checkpoint_hash is None:
+            raise ValueError("invalidate_checkpoint braucht checkpoint_path oder checkpoint_hash.")
+        with self._conn:
+            cur = self._conn.execute(
+                "DELETE FROM forecasts WHERE checkpoint_path = ? OR checkpoint_hash = ?",
+                (path_key(checkpoint_path) if checkpoint_path is not None else None, checkpoint_hash),
+            )
+            self._count(invalidated=cur.rowcount)
+        return cur.rowcount
+
+    def clear(self) -> int:
+        with self._conn:
+            cur = self._conn.execute("DELETE FROM forecasts")
+            self._count(invalidated=cur.rowcount)
+        return cur.rowcount
+
+
+def on_new_best_checkpoint(previous_checkpoint: Optional[str], db_path: Path = FORECAST_CACHE["path"]) -> int:
+    """Hook für die Run-Registry: Einträge des abgelösten besten Checkpoints entfernen."""
+    if not previous_checkpoint or not Path(db_path).exists():
+        return 0
+    ckpt = Path(previous_checkpoint)
+    with ForecastCache(db_path) as cache:
+        n = cache.invalidate_checkpoint(ckpt, file_hash(ckpt) if ckpt.exists() else None)
+    if n:
+        print(f"[forecast_cache] Neues bestes Checkpoint – {n} Einträge von {previous_checkpoint} entfernt.")
+    return n
+
+
+# ------------------------- CLI -------------------------
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Prognose-Cache verwalten.")
+    ap.add_argument("--db", type=str, default=str(FORECAST_CACHE["path"]))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="Treffer/Fehlschläge, Einträge, Größe")
+    sub.add_parser("purge", help="Abgelaufene Einträge löschen")
+    sub.add_parser("clear", help="Alle Einträge löschen")
+    p_inv = sub.add_parser("invalidate", help="Einträge eines Checkpoints löschen")
+    p_inv.add_argument("--checkpoint", type=str, required=True)
+    args = ap.parse_args()
+
+    with ForecastCache(Path(args.db)) as cache:
+        if args.cmd == "stats":
+            print(json.dumps(cache.stats(), indent=2))
+        elif args.cmd == "purge":
+            print(f"[forecast_cache] {cache.purge_expired()} abgelaufene Einträge gelöscht.")
+        elif args.cmd == "clear":
+            print(f"[forecast_cache] {cache.clear()} Einträge gelöscht.")
+        elif args.cmd == "invalidate":
+            ckpt = Path(args.checkpoint)
+            n = cache.invalidate_checkpoint(ckpt, file_hash(ckpt) if ckpt.exists() else None)
+            print(f"[forecast_cache] {n} Einträge von {ckpt} gelöscht.")
+
+
+if __name__ == "__main__":
+    # python -m src.utils.forecast_cache stats
+    main()
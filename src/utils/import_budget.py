@@ -0,0 +1,110 @@
+# src/utils/import_budget.py
+"""
+Prüft Importzeit und Import-Abhängigkeiten der schnellen CLI-Module.
+
+Jedes Modul wird in einem frischen Interpreter mit `-X importtime` importiert.
+Geprüft wird:
+- kumulierte Importzeit des Moduls <= Budget (Minimum aus mehreren Läufen)
+- keine schweren Pakete (torch, lightning, pandas, ...) beim reinen Import
+
+Exit-Code 1 bei Verstoß – geeignet als CI-/Scheduler-Check.
+
+Aufruf:
+    python -m src.utils.import_budget
+    python -m src import-budget --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Set, Tuple
+
+# Modul -> Budget in Millisekunden (nur Import, ohne Ausführung von main())
+IMPORT_BUDGET_MS: Dict[str, float] = {
+    "src.cli": 50,
+    "src.utils.config_loader": 150,
+    "src.utils.run_registry": 200,
+    "src.utils.forecast_cache": 200,
+    "src.utils.dag_scheduler": 150,
+    "src.utils.json_results": 250,
+    "src.evaluation.subset_transfer": 200,
+    "src.utils.load_trained_tft": 250,
+    "src.modeling.dataset_tft": 250,
+    "src.modeling.validation": 250,
+    "src.modeling.trainer_tft": 300,
+}
+
+# Pakete, die beim Import der obigen Module NICHT geladen werden dürfen
+FORBIDDEN_PACKAGES: Tuple[str, ...] = (
+    "torch", "lightning", "pytorch_forecasting", "pandas", "matplotlib", "seaborn",
+)
+
+
+def measure_import(module: str) -> Tuple[float, Set[str]]:
+    """
+    Importiert `module` in einem frischen Prozess.
+    Rückgabe: (kumulierte Importzeit in ms, Menge der geladenen Top-Level-Pakete).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Import von {module} fehlgeschlagen:\n{proc.stderr}")
+
+    cumulative_us = None
+    loaded: Set[str] = set()
+    # Format: "import time: self [us] | cumulative | imported package"
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        loaded.add(name.split(".")[0])
+        if name == module:
+            cumulative_us = int(cum)
+
+    if cumulative_us is None:
+        raise RuntimeError(f"Keine Importzeit für {module} gefunden (bereits im Cache?).")
+    return cumulative_us / 1000.0, loaded
+
+
+def check_budgets(repeat: int = 3) -> List[str]:
+    """Prüft alle Module aus IMPORT_BUDGET_MS; liefert eine Liste der Verstöße."""
+    violations: List[str] = []
+    for module, budget in IMPORT_BUDGET_MS.items():
+        runs = [measure_import(module) for _ in range(max(1, repeat))]
+        best_ms = min(ms for ms, _ in runs)
+        heavy = sorted(set(FORBIDDEN_PACKAGES) & runs[0][1])
+
+        status = "OK"
+        if best_ms > budget:
+            status = "ZU LANGSAM"
+            violations.append(f"{module}: {best_ms:.0f} ms > Budget {budget:.0f} ms")
+        if heavy:
+            status = "SCHWERE IMPORTS"
+            violations.append(f"{module}: lädt beim Import {heavy}")
+
+        print(f"[import_budget] {module:<30} {best_ms:7.1f} ms / {budget:5.0f} ms  {status}")
+    return violations
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Importzeit-Budget der CLI-Module prüfen.")
+    ap.add_argument("--repeat", type=int, default=3, help="Läufe je Modul (gewertet wird das Minimum)")
+    args = ap.parse_args()
+
+    violations = check_budgets(args.repeat)
+    if violations:
+        print("[import_budget] Verstöße:")
+        for v in violations:
+            print(f"  - {v}")
+        sys.exit(1)
+    print("[import_budget] Alle Module innerhalb des Budgets.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,11 @@
 from __future__ import annotations
 from pathlib import Path
 import json
-import pandas as pd
+import math
 
-
-def _detect_lr_col(df: pd.DataFrame) -> str | None:
-    for c in df.columns:
-        lc = c.lower()
-        if "learning_rate" in lc or lc.startswith("lr") or "lr-" in lc:
-            return c
-    return None
+from src.config import RUN_REGISTRY_PATH
+from src.utils.metrics_reader import detect_lr_col, read_epoch_metrics
+from src.utils.run_registry import RunRegistry
 
 
 def export_run_jsons_from_metrics(
@@ -18,22 +14,16 @@ def export_run_jsons_from_metrics(
     logs_run_dir: Path,
     results_dir: Path,          # z. B. Path("results")/"evaluation"/run_id
     meta: dict | None = None,   # beliebige Zusatzinfos (cfg, fit_time, etc.)
+    registry_path: Path | None = RUN_REGISTRY_PATH,  # None => Run nicht registrieren
 ) -> tuple[Path, Path]:
     """
     Liest logs/<...>/<run_id>/metrics.csv und erzeugt:
       results/evaluation/<run_id>/results.json   (epocheweise)
       results/evaluation/<run_id>/summary.json   (aggregiert)
+    und trägt den Run in die lokale Run-Registry ein.
     """
-    metrics_csv = logs_run_dir / "metrics.csv"
-    if not metrics_csv.exists():
-        raise FileNotFoundError(f"metrics.csv nicht gefunden: {metrics_csv}")
-
-    df = pd.read_csv(metrics_csv).dropna(how="all", axis=0).reset_index(drop=True)
-    if "epoch" not in df.columns:
-        df["epoch"] = range(len(df))
-
-    # pro Epoche die letzte Zeile (robust ggü. Step-Logs)
-    df_epoch = df.groupby("epoch").last().reset_index()
+    # pro Epoche die letzte Zeile (gestreamt, mit Parquet-Sidecar-Cache)
+    df_epoch = read_epoch_metrics(logs_run_dir)
 
     # Spalten erkennen
     train_loss = None
@@ -44,22 +34,23 @@ def export_run_jsons_from_metrics(
 
     val_loss = "val_loss" if "val_loss" in df_epoch.columns else None
 
-    lr_col = _detect_lr_col(df)
-    if lr_col and lr_col not in df_epoch.columns and lr_col in df.columns:
-        df_lr = df.groupby("epoch")[[lr_col]].last().reset_index()
-        df_epoch = df_epoch.merge(df_lr, on="epoch", how="left")
+    lr_col = detect_lr_col(df_epoch.columns)
 
-    # results.json – epocheweise Liste
-    results = []
-    for _, row in df_epoch.iterrows():
-        item = {"epoch": int(row["epoch"])}
-        if train_loss:
-            item["train_loss"] = float(row[train_loss])
-        if val_loss:
-            item["val_loss"] = float(row[val_loss])
-        if lr_col and lr_col in df_epoch.columns and pd.notna(row[lr_col]):
-            item["learning_rate"] = float(row[lr_col])
-        results.append(item)
+    # results.json – epocheweise Liste (spaltenweise aufgebaut statt iterrows)
+    columns = {"epoch": df_epoch["epoch"].astype(int).tolist()}
+    if train_loss:
+        columns["train_loss"] = df_epoch[train_loss].astype(float).tolist()
+    if val_loss:
+        columns["val_loss"] = df_epoch[val_loss].astype(float).tolist()
+    if lr_col:
+        columns["learning_rate"] = df_epoch[lr_col].astype(float).tolist()
+
+    results = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    if lr_col:
+        # Lernrate nur ausgeben, wenn geloggt (wie bisher)
+        for item in results:
+            if math.isnan(item["learning_rate"]):
+                del item["learning_rate"]
 
     # summary.json – kompakt
     summary = {
@@ -99,4 +90,8 @@ def export_run_jsons_from_metrics(
     with open(summary_path, "w", encoding="utf-8") as f:
         json.dump(summary, f, ensure_ascii=False, indent=2)
 
+    if registry_path is not None:
+        with RunRegistry(registry_path) as registry:
+            registry.register(summary, summary_path)
+
     return results_path, summary_path
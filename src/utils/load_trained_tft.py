@@ -3,13 +3,35 @@
 Lädt ein bereits trainiertes Temporal Fusion Transformer (TFT) Modell aus einem
 Checkpoint (.ckpt) und prüft, ob es erfolgreich geladen wurde.
 
+Zusätzlich das Inferenz-Artefakt (<checkpoint>.infer.pt) für die Auslieferung:
+- nur Gewichte, Hyperparameter und dataset_parameters (Encoder/Normalizer) –
+  kein Optimizer-, Scheduler- oder Loop-Zustand
+- wird beim Training neben jedem besten Checkpoint geschrieben (checkpoint_io.py)
+  oder nachträglich mit --export aus einem .ckpt erzeugt
+- `load_inference_model` baut das Modell auf dem meta-Device und übernimmt die
+  per mmap gelesenen Tensoren direkt (`assign=True`) – keine Zufalls-Init, keine Kopie
+
 Beispiel-Aufruf:
     python -m src.modeling.load_trained_tft
+    python -m src load-model --best --export   # Inferenz-Artefakt nachträglich schreiben
 """
 
+from __future__ import annotations
+
+import argparse
+import time
 from pathlib import Path
-from pytorch_forecasting.models import TemporalFusionTransformer
-import torch
+from typing import TYPE_CHECKING, Any, Dict
+
+from src.utils.run_registry import RunRegistry
+
+if TYPE_CHECKING:  # nur für Typannotationen – torch/pytorch_forecasting werden lazy geladen
+    from pytorch_forecasting.models import TemporalFusionTransformer
+
+INFERENCE_SUFFIX = ".infer.pt"
+INFERENCE_FORMAT = 1
+# Was pytorch_forecasting in on_save_checkpoint ablegt und zum Neuaufbau braucht
+INFERENCE_KEYS = ("hyper_parameters", "dataset_parameters", "__special_save__")
 
 
 def load_trained_model(checkpoint_path: str | Path) -> TemporalFusionTransformer:
@@ -26,6 +48,9 @@ def load_trained_model(checkpoint_path: str | Path) -> TemporalFusionTransformer
     if not ckpt_path.exists():
         raise FileNotFoundError(f"Checkpoint-Datei nicht gefunden: {ckpt_path}")
 
+    import torch
+    from pytorch_forecasting.models import TemporalFusionTransformer
+
     print(f"Lade TFT-Modell aus Checkpoint:\n  {ckpt_path}")
 
     # Modell laden (Lightning kümmert sich um alle internen Objekte)
@@ -40,17 +65,129 @@ def load_trained_model(checkpoint_path: str | Path) -> TemporalFusionTransformer
     return model
 
 
-def main():
+# ------------------------- Inferenz-Artefakt -------------------------
+
+def inference_path(checkpoint_path: str | Path) -> Path:
+    """tft-03-0.1234.ckpt -> tft-03-0.1234.infer.pt (gleicher Ordner)."""
+    path = Path(checkpoint_path)
+    if path.name.endswith(INFERENCE_SUFFIX):
+        return path
+    return path.with_name(path.stem + INFERENCE_SUFFIX)
+
+
+def export_inference_artifact(checkpoint: Dict[str, Any], path: str | Path) -> Path:
+    """
+    Schreibt das Inferenz-Artefakt aus einem Lightning-Checkpoint-Dict.
+    Atomar über eine temporäre Datei – ein abgebrochener Schreibvorgang hinterlässt kein halbes Artefakt.
+    """
+    import torch
+
+    missing = [k for k in ("state_dict", *INFERENCE_KEYS) if k not in checkpoint]
+    if missing:
+        raise KeyError(f"Checkpoint ohne {missing} – kein pytorch_forecasting-Checkpoint?")
+
+    path = Path(path)
+    payload = {
+        "format": INFERENCE_FORMAT,
+        **{k: checkpoint[k] for k in INFERENCE_KEYS},
+        "state_dict": {k: v.detach().cpu().contiguous() for k, v in checkpoint["state_dict"].items()},
+    }
+    tmp = path.with_name(path.name + ".tmp")
+    torch.save(payload, tmp)
+    tmp.replace(path)
+    return path
+
+
+def load_inference_model(path: str | Path) -> TemporalFusionTransformer:
     """
-    Beispielhafte Nutzung: Lädt das zuletzt gespeicherte Checkpoint des TFT-Modells.
+    Lädt ein TFT-Modell aus dem Inferenz-Artefakt (Pfad zum Artefakt oder zum zugehörigen .ckpt).
+
+    Returns:
+        TemporalFusionTransformer: Modell im eval-Modus; Gewichte sind per mmap an die Datei gebunden.
     """
-    ckpt_dir = Path("data/processed/model_dataset/tft/checkpoints")
-    checkpoints = sorted(ckpt_dir.glob("*.ckpt"), key=lambda p: p.stat().st_mtime, reverse=True)
-    if not checkpoints:
-        raise FileNotFoundError(f"Keine Checkpoints gefunden in: {ckpt_dir}")
+    art_path = inference_path(path)
+    if not art_path.exists():
+        raise FileNotFoundError(
+            f"Inferenz-Artefakt nicht gefunden: {art_path}\n"
+            f"Nachträglich erzeugen: python -m src load-model --checkpoint {path} --export"
+        )
+
+    import torch
+    from pytorch_forecasting.models import TemporalFusionTransformer
+
+    payload = torch.load(art_path, map_location="cpu", mmap=True, weights_only=False)
+    if payload.get("format") != INFERENCE_FORMAT:
+        raise ValueError(f"Inferenz-Artefakt {art_path}: Format {payload.get('format')} != {INFERENCE_FORMAT}")
+
+    with torch.device("meta"):
+        model = TemporalFusionTransformer(**payload["hyper_parameters"])
+    model.on_load_checkpoint({k: payload[k] for k in INFERENCE_KEYS})
+    model.load_state_dict(payload["state_dict"], strict=True, assign=True)
+    leftover = [n for n, t in (*model.named_parameters(), *model.named_buffers()) if t.is_meta]
+    if leftover:
+        raise RuntimeError(f"Inferenz-Artefakt {art_path}: Tensoren ohne Werte: {leftover[:5]}")
+    model.eval()
+    return model
 
-    latest_ckpt = checkpoints[0]
-    model = load_trained_model(latest_ckpt)
+
+def _export(ckpt_path: Path) -> None:
+    """Artefakt aus einem vorhandenen .ckpt schreiben und Größe/Ladezeit gegenüberstellen."""
+    import torch
+
+    if not ckpt_path.exists():
+        raise FileNotFoundError(f"Checkpoint-Datei nicht gefunden: {ckpt_path}")
+    checkpoint = torch.load(ckpt_path, map_location="cpu", weights_only=False)
+    art_path = export_inference_artifact(checkpoint, inference_path(ckpt_path))
+
+    t0 = time.perf_counter()
+    full = load_trained_model(ckpt_path)
+    t_full = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    light = load_inference_model(art_path)
+    t_light = time.perf_counter() - t0
+
+    ref, got = full.state_dict(), light.state_dict()
+    if ref.keys() != got.keys() or not all(torch.equal(ref[k], got[k]) for k in ref):
+        raise RuntimeError(f"Inferenz-Artefakt {art_path} weicht vom Checkpoint ab.")
+    print(f"[load_trained_tft] Inferenz-Artefakt: {art_path}")
+    print(f"  - Größe: {ckpt_path.stat().st_size / 1e6:.2f} MB (.ckpt) -> {art_path.stat().st_size / 1e6:.2f} MB")
+    print(f"  - Laden: {t_full:.2f}s (.ckpt) -> {t_light:.2f}s (Artefakt) | Gewichte identisch")
+
+
+def main():
+    """
+    Beispielhafte Nutzung: Lädt das beste Checkpoint des jüngsten (oder besten) Runs.
+    Die Auswahl erfolgt über die Run-Registry – kein Globbing über Checkpoint-Ordner.
+    """
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--run-id", type=str, default=None, help="Bestimmter Run (Default: jüngster Run)")
+    ap.add_argument("--best", action="store_true", help="Run mit minimalem best_val_loss statt jüngstem Run")
+    ap.add_argument("--checkpoint", type=str, default=None, help="Explizites .ckpt statt Run-Registry")
+    ap.add_argument("--export", action="store_true", help="Inferenz-Artefakt (.infer.pt) neben das .ckpt schreiben")
+    args = ap.parse_args()
+
+    if args.checkpoint:
+        run = {"best_checkpoint_path": args.checkpoint}
+    else:
+        with RunRegistry() as registry:
+            if args.run_id:
+                run = registry.get(args.run_id)
+            elif args.best:
+                run = registry.best("best_val_loss", model_type="tft")
+            else:
+                run = registry.latest(model_type="tft")
+
+    if not run or not run.get("best_checkpoint_path"):
+        raise FileNotFoundError(
+            "Kein Checkpoint in der Run-Registry gefunden.\n"
+            "Ältere Runs ggf. nachtragen: python -m src.utils.run_registry rebuild"
+        )
+
+    if args.export:
+        _export(Path(run["best_checkpoint_path"]))
+        return
+
+    model = load_trained_model(run["best_checkpoint_path"])
 
     # Beispiel für spätere Nutzung:
     # predictions = model.predict(dataloader)
@@ -0,0 +1,112 @@
+# src/utils/metrics_reader.py
+"""
+Gemeinsamer Leser für Lightning-`metrics.csv` (CSVLogger).
+
+- Liest nur die benötigten Spalten (epoch, Losses, Lernrate)
+- Streamt die Datei in Chunks und hält nur ein laufendes
+  "letzter Wert je Epoche"-Aggregat im Speicher
+- Cacht die Epochentabelle als kompaktes Parquet-Sidecar neben der CSV;
+  gültig, solange Größe und mtime der CSV unverändert sind
+
+Genutzt von `json_results.export_run_jsons_from_metrics` und
+`visualization.plot_learning_rate`.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, List
+
+if TYPE_CHECKING:  # pandas/pyarrow erst beim Lesen laden (schneller Import für CLI-Tools)
+    import pandas as pd
+
+SIDECAR_NAME = "metrics.epoch.parquet"
+CHUNK_ROWS = 250_000
+
+# Spalten, die für Export und Plots benötigt werden (sofern vorhanden)
+METRIC_COLS = ("train_loss_epoch", "train_loss_step", "val_loss")
+
+
+def detect_lr_col(columns: Iterable[str]) -> str | None:
+    for c in columns:
+        lc = c.lower()
+        if "learning_rate" in lc or lc.startswith("lr") or "lr-" in lc:
+            return c
+    return None
+
+
+def _source_key(csv_path: Path) -> dict[bytes, bytes]:
+    st = csv_path.stat()
+    return {b"source_size": str(st.st_size).encode(), b"source_mtime_ns": str(st.st_mtime_ns).encode()}
+
+
+def _read_sidecar(csv_path: Path, sidecar: Path) -> pd.DataFrame | None:
+    import pyarrow.parquet as pq
+
+    if not sidecar.exists():
+        return None
+    meta = pq.read_schema(sidecar).metadata or {}
+    key = _source_key(csv_path)
+    if any(meta.get(k) != v for k, v in key.items()):
+        return None
+    return pq.read_table(sidecar).to_pandas()
+
+
+def _write_sidecar(csv_path: Path, sidecar: Path, df_epoch: pd.DataFrame) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df_epoch, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), **_source_key(csv_path)})
+    pq.write_table(table, sidecar)
+
+
+def read_epoch_metrics(
+    logs_run_dir: Path,
+    chunksize: int = CHUNK_ROWS,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """
+    Liefert je Epoche den letzten nicht-leeren Wert jeder benötigten Spalte
+    (entspricht `groupby("epoch").last()` über die gesamte CSV).
+    """
+    import pandas as pd
+
+    csv_path = Path(logs_run_dir) / "metrics.csv"
+    if not csv_path.exists():
+        raise FileNotFoundError(f"metrics.csv nicht gefunden: {csv_path}")
+
+    sidecar = csv_path.with_name(SIDECAR_NAME)
+    if use_cache:
+        cached = _read_sidecar(csv_path, sidecar)
+        if cached is not None:
+            return cached
+
+    header = pd.read_csv(csv_path, nrows=0).columns
+    lr_col = detect_lr_col(header)
+    usecols: List[str] = [c for c in header if c == "epoch" or c in METRIC_COLS or c == lr_col]
+    value_cols = [c for c in usecols if c != "epoch"]
+    has_epoch = "epoch" in usecols
+
+    acc: pd.DataFrame | None = None
+    row_offset = 0
+    for chunk in pd.read_csv(csv_path, usecols=usecols, chunksize=chunksize):
+        chunk = chunk.dropna(how="all", axis=0)
+        if not has_epoch:
+            # Fallback wie bisher: laufender Zeilenzähler als "Epoche"
+            chunk["epoch"] = range(row_offset, row_offset + len(chunk))
+            row_offset += len(chunk)
+        last = chunk.groupby("epoch", sort=False)[value_cols].last()
+        acc = last if acc is None else pd.concat([acc, last]).groupby(level=0, sort=False).last()
+
+    if acc is None:
+        df_epoch = pd.DataFrame(columns=["epoch"] + value_cols)
+    else:
+        df_epoch = acc.sort_index().reset_index()
+    df_epoch["epoch"] = df_epoch["epoch"].astype("int64")
+    for c in value_cols:
+        df_epoch[c] = df_epoch[c].astype("float64")
+
+    if use_cache:
+        _write_sidecar(csv_path, sidecar, df_epoch)
+    return df_epoch
@@ -0,0 +1,294 @@
+# src/utils/run_registry.py
+"""
+Lokale Run-Registry: ein SQLite-Index über alle Trainingsläufe.
+
+- Wird von `export_run_jsons_from_metrics` bei jedem Run aktualisiert
+- Speichert Config-Hash, Kennzahlen, Fit-Zeit, Dataset-Fingerprint und bestes Checkpoint
+- Abfragen (bester Run, Filter nach Config-Werten) ohne Verzeichnis-Scans
+  und ohne erneutes Parsen aller summary.json
+- Wechselt der beste Run, werden dessen Einträge im Prognose-Cache invalidiert (forecast_cache.py)
+
+Bewusst nur Standardbibliothek (sqlite3, json, hashlib) – startet ohne pandas/torch.
+
+Aufrufbeispiele:
+    python -m src.utils.run_registry best --metric best_val_loss
+    python -m src.utils.run_registry list --where model.hidden_size=16 --where batch_size=128
+    python -m src.utils.run_registry rebuild --root results/tft
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from src.config import PROCESSED_DIR, RESULTS_DIR, RUN_REGISTRY_PATH
+
+# Spalten, nach denen sortiert/gefiltert werden darf (Schutz vor SQL-Injection über CLI)
+METRIC_COLUMNS = (
+    "best_val_loss", "best_val_epoch", "final_val_loss", "final_train_loss",
+    "fit_time_sec", "epochs_trained", "created_at",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id               TEXT PRIMARY KEY,
+    model_type           TEXT NOT NULL,
+    run_dir              TEXT NOT NULL,
+    created_at           TEXT NOT NULL,
+    config_file          TEXT,
+    config_hash          TEXT,
+    config_json          TEXT,
+    dataset_fingerprint  TEXT,
+    fit_time_sec         REAL,
+    epochs_trained       INTEGER,
+    best_val_loss        REAL,
+    best_val_epoch       INTEGER,
+    final_val_loss       REAL,
+    final_train_loss     REAL,
+    best_checkpoint_path TEXT,
+    summary_path         TEXT,
+    metrics_json         TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_config_hash ON runs (config_hash);
+CREATE INDEX IF NOT EXISTS idx_runs_dataset_fp ON runs (dataset_fingerprint);
+CREATE INDEX IF NOT EXISTS idx_runs_best_val_loss ON runs (best_val_loss);
+"""
+
+
+# ------------------------- Fingerprints -------------------------
+
+def config_hash(cfg_dict: Dict[str, Any]) -> str:
+    """Stabiler Hash der (YAML-)Konfiguration, unabhängig von Key-Reihenfolge."""
+    canonical = json.dumps(cfg_dict, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def dataset_fingerprint(processed_dir: Path = PROCESSED_DIR) -> str:
+    """
+    Fingerprint des Trainingsdatensatzes ohne die Daten zu lesen:
+    Inhalt von dataset_spec.json/meta.json plus Größe und mtime der Split-Dateien.
+    """
+    h = hashlib.sha256()
+    for name in ("dataset_spec.json", "meta.json"):
+        p = processed_dir / name
+        if p.exists():
+            h.update(p.read_bytes())
+    for name in ("train.parquet", "val.parquet", "test.parquet"):
+        p = processed_dir / name
+        if p.exists():
+            st = p.stat()
+            h.update(f"{name}:{st.st_size}:{st.st_mtime_ns}".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+# ------------------------- Registry -------------------------
+
+class RunRegistry:
+    """Dünne Schicht über einer SQLite-Datei (eine Zeile je Run)."""
+
+    def __init__(self, db_path: Path = RUN_REGISTRY_PATH) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "RunRegistry":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---- schreiben ----
+
+    def register(self, summary: Dict[str, Any], summary_path: Path, model_type: str = "tft") -> None:
+        """Trägt einen Run aus seinem summary.json-Inhalt ein (Upsert über run_id)."""
+        meta = summary.get("meta") or {}
+        metrics = summary.get("metrics") or {}
+        cfg_values = meta.get("config_values")
+
+        row = {
+            "run_id": summary["run_id"],
+            "model_type": model_type,
+            "run_dir": str(Path(summary_path).parent),
+            "created_at": meta.get("created_at") or datetime.now().isoformat(timespec="seconds"),
+            "config_file": meta.get("config_file"),
+            "config_hash": meta.get("config_hash") or (config_hash(cfg_values) if cfg_values else None),
+            "config_json": json.dumps(cfg_values, sort_keys=True, default=str) if cfg_values else None,
+            "dataset_fingerprint": meta.get("dataset_fingerprint"),
+            "fit_time_sec": meta.get("fit_time_sec"),
+            "epochs_trained": meta.get("epochs_trained"),
+            "best_val_loss": metrics.get("best_val_loss"),
+            "best_val_epoch": metrics.get("best_val_epoch"),
+            "final_val_loss": metrics.get("final_val_loss"),
+            "final_train_loss": metrics.get("final_train_loss"),
+            "best_checkpoint_path": meta.get("best_checkpoint_path") or None,
+            "summary_path": str(summary_path),
+            "metrics_json": json.dumps(metrics, sort_keys=True),
+        }
+        cols = ", ".join(row)
+        placeholders = ", ".join(f":{k}" for k in row)
+        previous_best = self.best(model_type=model_type)
+        with self._conn:
+            self._conn.execute(f"INSERT OR REPLACE INTO runs ({cols}) VALUES ({placeholders})", row)
+
+        # Neues bestes Checkpoint -> zwischengespeicherte Prognosen des bisherigen besten verwerfen
+        new_best = self.best(model_type=model_type)
+        if previous_best and new_best and new_best["run_id"] != previous_best["run_id"]:
+            from src.utils.forecast_cache import on_new_best_checkpoint
+
+            on_new_best_checkpoint(previous_best.get("best_checkpoint_path"))
+
+    def rebuild(self, root: Path = RESULTS_DIR / "tft", model_type: str = "tft") -> int:
+        """Einmaliger Backfill aus vorhandenen summary.json-Dateien (z. B. ältere Runs)."""
+        n = 0
+        for summary_path in sorted(Path(root).glob("*/summary.json")):
+            try:
+                summary = json.loads(summary_path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                print(f"[run_registry] Übersprungen (kein gültiges JSON): {summary_path}")
+                continue
+            if "run_id" not in summary:
+                continue
+            summary.setdefault("meta", {}).setdefault(
+                "created_at",
+                datetime.fromtimestamp(summary_path.stat().st_mtime).isoformat(timespec="seconds"),
+            )
+            self.register(summary, summary_path, model_type=model_type)
+            n += 1
+        return n
+
+    # ---- lesen ----
+
+    def query(
+        self,
+        where: Optional[Dict[str, Any]] = None,
+        order_by: str = "created_at",
+        descending: bool = True,
+        limit: Optional[int] = None,
+        model_type: Optional[str] = None,
+        dataset_fp: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Filtert Runs nach Config-Werten (Punktnotation, z. B. {"model.hidden_size": 16}).
+        Die Filter werden per json_extract direkt in SQLite ausgewertet.
+        """
+        if order_by not in METRIC_COLUMNS:
+            raise ValueError(f"Unbekannte Sortierspalte: {order_by} (erlaubt: {METRIC_COLUMNS})")
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        for key, value in (where or {}).items():
+            clauses.append("json_extract(config_json, ?) = ?")
+            params.extend([f"$.{key}", value])
+        if model_type:
+            clauses.append("model_type = ?")
+            params.append(model_type)
+        if dataset_fp:
+            clauses.append("dataset_fingerprint = ?")
+            params.append(dataset_fp)
+
+        sql = "SELECT * FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        # NULL-Werte immer ans Ende sortieren
+        sql += f" ORDER BY {order_by} IS NULL, {order_by} {'DESC' if descending else 'ASC'}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [dict(r) for r in self._conn.execute(sql, params).fetchall()]
+
+    def best(self, metric: str = "best_val_loss", mode: str = "min", **kwargs) -> Optional[Dict[str, Any]]:
+        rows = self.query(order_by=metric, descending=(mode == "max"), limit=1, **kwargs)
+        return rows[0] if rows else None
+
+    def latest(self, **kwargs) -> Optional[Dict[str, Any]]:
+        rows = self.query(order_by="created_at", descending=True, limit=1, **kwargs)
+        return rows[0] if rows else None
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return dict(row) if row else None
+
+
+# ------------------------- CLI -------------------------
+
+def _parse_where(items: List[str]) -> Dict[str, Any]:
+    """'model.hidden_size=16' -> {"model.hidden_size": 16} (Werte YAML-typisiert)."""
+    out: Dict[str, Any] = {}
+    for item in items:
+        if "=" not in item:
+            raise ValueError(f"Filter erwartet Form key=value: {item}")
+        key, raw = item.split("=", 1)
+        value = yaml.safe_load(raw)
+        out[key.strip()] = int(value) if isinstance(value, bool) else value
+    return out
+
+
+def _print_rows(rows: List[Dict[str, Any]]) -> None:
+    if not rows:
+        print("[run_registry] Keine Runs gefunden.")
+        return
+    for r in rows:
+        print(
+            f"{r['run_id']:<40} best_val_loss={r['best_val_loss']!s:<10} "
+            f"epochs={r['epochs_trained']!s:<4} fit={r['fit_time_sec']!s:<8} "
+            f"cfg={r['config_hash']} data={r['dataset_fingerprint']}"
+        )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Abfragen der lokalen Run-Registry.")
+    ap.add_argument("--db", type=str, default=str(RUN_REGISTRY_PATH))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p_list = sub.add_parser("list", help="Runs auflisten/filtern")
+    p_list.add_argument("--where", action="append", default=[], help="Config-Filter, z. B. model.hidden_size=16")
+    p_list.add_argument("--order-by", default="created_at", choices=METRIC_COLUMNS)
+    p_list.add_argument("--asc", action="store_true")
+    p_list.add_argument("--limit", type=int, default=20)
+
+    p_best = sub.add_parser("best", help="Besten Run nach Kennzahl finden")
+    p_best.add_argument("--metric", default="best_val_loss", choices=METRIC_COLUMNS)
+    p_best.add_argument("--mode", default="min", choices=["min", "max"])
+    p_best.add_argument("--where", action="append", default=[])
+
+    p_show = sub.add_parser("show", help="Einen Run vollständig anzeigen")
+    p_show.add_argument("run_id")
+
+    p_rebuild = sub.add_parser("rebuild", help="Registry aus vorhandenen summary.json auffüllen")
+    p_rebuild.add_argument("--root", default=str(RESULTS_DIR / "tft"))
+
+    args = ap.parse_args()
+
+    with RunRegistry(Path(args.db)) as reg:
+        if args.cmd == "list":
+            _print_rows(reg.query(_parse_where(args.where), args.order_by, not args.asc, args.limit))
+        elif args.cmd == "best":
+            row = reg.best(args.metric, args.mode, where=_parse_where(args.where))
+            _print_rows([row] if row else [])
+            if row:
+                print(f"[run_registry] Bestes Checkpoint: {row['best_checkpoint_path']}")
+        elif args.cmd == "show":
+            row = reg.get(args.run_id)
+            if row is None:
+                raise KeyError(f"Run nicht in der Registry: {args.run_id}")
+            print(json.dumps(row, indent=2, ensure_ascii=False))
+        elif args.cmd == "rebuild":
+            n = reg.rebuild(Path(args.root))
+            print(f"[run_registry] {n} Runs eingetragen: {reg.db_path}")
+
+
+if __name__ == "__main__":
+    # python -m src.utils.run_registry best --metric best_val_loss
+    main()
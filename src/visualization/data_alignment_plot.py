@@ -1,54 +1,40 @@
 # src/visualization/data_alignment_plot.py
 # Zweck: Darstellung der angeglichenen Verkaufszahlen (auf 2020-Niveau)
-# Quelle: data/interim/train_aligned.parquet
+# Quelle: data/interim/rollups/aligned.parquet (tägliche Summe je Land, siehe src/data/rollups.py)
 
 from pathlib import Path
+from typing import List
+
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+
+from src.data.rollups import load_rollup
+from src.visualization.fast_lines import plot_lines
+from src.visualization.plot_io import REPORT_DIR, apply_style, finish_figure
 
 
-def plot_aligned_sales(df: pd.DataFrame) -> None:
-    """Erstellt einen Liniendiagramm-Plot der angeglichenen Verkaufszahlen."""
-    # Tagesweise Aggregation je Land
-    daily_country = (
-        df.groupby(["date", "country"], as_index=False)["num_sold"].sum()
-    )
+def plot_aligned_sales(daily_country: pd.DataFrame, save_path: Path | None = None) -> Path | None:
+    """Erstellt einen Liniendiagramm-Plot der angeglichenen Verkaufszahlen (täglich, je Land)."""
+    import matplotlib.pyplot as plt
 
-    sns.set(style="whitegrid")
+    apply_style()
     fig, ax = plt.subplots(figsize=(18, 6))
 
-    sns.lineplot(
-        data=daily_country,
-        x="date",
-        y="num_sold",
-        hue="country",
-        ax=ax
-    )
+    plot_lines(ax, daily_country, x="date", y="num_sold", hue="country")
 
     ax.set_title("Summe der Verkäufe pro Land (auf 2020-Niveau skaliert)", fontsize=14)
     ax.set_xlabel("Datum")
     ax.set_ylabel("Verkäufe (num_sold, skaliert)")
-    plt.tight_layout()
-    plt.show()
+    return finish_figure(fig, save_path)
 
 
-def main() -> None:
-    """Lädt die angeglichene Parquet-Datei und erstellt den Plot."""
-    base_dir = Path(__file__).resolve().parents[2]
-    parquet_path = base_dir / "data" / "interim" / "train_aligned.parquet"
+def render(out_dir: Path = REPORT_DIR) -> List[Path]:
+    """Headless: Plot als PNG speichern (für report.py)."""
+    return [plot_aligned_sales(load_rollup("aligned", "daily", "country"), out_dir / "alignment_country.png")]
 
-    if not parquet_path.exists():
-        raise FileNotFoundError(
-            f"Parquet-Datei nicht gefunden: {parquet_path}\n"
-            "Bitte zuerst data_alignment.py ausführen."
-        )
 
-    df = pd.read_parquet(parquet_path)
-    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
-
-    plot_aligned_sales(df)
+def main() -> None:
+    """Lädt das Rollup der angeglichenen Daten und erstellt den Plot."""
+    plot_aligned_sales(load_rollup("aligned", "daily", "country"))
 
 
 if __name__ == "__main__":
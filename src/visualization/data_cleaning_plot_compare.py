@@ -1,59 +1,43 @@
 # src/visualization/data_cleaning_plot_compare.py
 # Zweck: Visuelle Prüfung der bereinigten (cleaned) Verkaufsdaten
-# Quelle: data/interim/train_cleaned.parquet
+# Quelle: data/interim/rollups/cleaned.parquet (tägliche Summe je Land, siehe src/data/rollups.py)
 
 from pathlib import Path
+from typing import List
+
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+
+from src.data.rollups import load_rollup
+from src.visualization.fast_lines import plot_lines
+from src.visualization.plot_io import REPORT_DIR, apply_style, finish_figure
 
 
-def plot_cleaned_sales(df: pd.DataFrame) -> None:
+def plot_cleaned_sales(daily_country: pd.DataFrame, save_path: Path | None = None) -> Path | None:
     """Erstellt einen Liniendiagramm-Plot der bereinigten Verkaufszahlen (täglich, je Land)."""
-    # Tagesweise Aggregation je Land
-    daily_country = (
-        df.groupby(["date", "country"], as_index=False)["num_sold"].sum()
-    )
+    import matplotlib.pyplot as plt
 
-    sns.set(style="whitegrid")
+    apply_style()
     fig, ax = plt.subplots(figsize=(18, 6))
 
-    sns.lineplot(
-        data=daily_country,
-        x="date",
-        y="num_sold",
-        hue="country",
-        ax=ax
-    )
+    plot_lines(ax, daily_country, x="date", y="num_sold", hue="country")
 
     ax.set_title("Summe der Verkäufe pro Land (bereinigt)", fontsize=14)
     ax.set_xlabel("Datum")
     ax.set_ylabel("Verkäufe (num_sold, bereinigt)")
-    plt.tight_layout()
-    plt.show()
-
+    return finish_figure(fig, save_path)
 
-def main() -> None:
-    """Lädt die bereinigte Parquet-Datei und erstellt den Plot."""
-    base_dir = Path(__file__).resolve().parents[2]
-    parquet_path = base_dir / "data" / "interim" / "train_cleaned.parquet"
-
-    if not parquet_path.exists():
-        raise FileNotFoundError(
-            f"Parquet-Datei nicht gefunden: {parquet_path}\n"
-            "Bitte zuerst data_alignment.py und anschließend data_cleaning.py ausführen."
-        )
 
-    df = pd.read_parquet(parquet_path)
+def render(out_dir: Path = REPORT_DIR) -> List[Path]:
+    """Headless: Plot als PNG speichern (für report.py)."""
+    return [plot_cleaned_sales(load_rollup("cleaned", "daily", "country"), out_dir / "cleaned_country.png")]
 
-    # Defensive: Datums-Typ sicherstellen
-    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
 
-    plot_cleaned_sales(df)
+def main() -> None:
+    """Lädt das Rollup der bereinigten Daten und erstellt den Plot."""
+    plot_cleaned_sales(load_rollup("cleaned", "daily", "country"))
 
 
 if __name__ == "__main__":
     main()
 
-# python -m src.visualization.data_cleaning_plot_compare
\ No newline at end of file
+# python -m src.visualization.data_cleaning_plot_compare
@@ -1,30 +1,45 @@
 # src/visualization/data_cleaning_plot_diff.py
 # Visualisiert die Differenz (cleaned - aligned) für eine Serie mit sichtbarer Änderung
+# Quelle: data/interim/rollups/{aligned,cleaned}.parquet, Ebene "series" (siehe src/data/rollups.py)
+
+from pathlib import Path
+from typing import List
 
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 
-from src.config import INTERIM_DIR
+from src.data.rollups import load_rollup
+from src.visualization.fast_lines import plot_lines
+from src.visualization.plot_io import REPORT_DIR, finish_figure
 
+YEAR_START, YEAR_END = "2020-01-01", "2020-12-31"
 
-def main() -> None:
-    aligned_path = INTERIM_DIR / "train_aligned.parquet"
-    cleaned_path = INTERIM_DIR / "train_cleaned.parquet"
 
-    df_aligned = pd.read_parquet(aligned_path)
-    df_cleaned = pd.read_parquet(cleaned_path)
+def _largest_change(merged: pd.DataFrame) -> pd.DataFrame:
+    """Wählt die Serie mit der größten absoluten Änderung und gibt deren Verlauf zurück."""
+    grp_cols = ["country", "store", "product"]
+    grp_stats = (
+        merged.assign(abs_diff=merged["diff"].abs())
+        .groupby(grp_cols, as_index=False)["abs_diff"].sum()
+        .rename(columns={"abs_diff": "abs_change"})
+    )
+    top = grp_stats.sort_values("abs_change", ascending=False).iloc[0]
 
-    # Datum normalisieren und auf 2020 filtern
-    for df in (df_aligned, df_cleaned):
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df_aligned_2020 = df_aligned[df_aligned["date"].dt.year == 2020]
-    df_cleaned_2020 = df_cleaned[df_cleaned["date"].dt.year == 2020]
+    return merged[
+        (merged["country"] == top["country"])
+        & (merged["store"] == top["store"])
+        & (merged["product"] == top["product"])
+    ].sort_values("date")
+
+
+def load_diff() -> pd.DataFrame:
+    """Tägliche Werte je Serie (2020) aus beiden Rollups, inklusive Differenz."""
+    df_aligned = load_rollup("aligned", "daily", "series", start=YEAR_START, end=YEAR_END)
+    df_cleaned = load_rollup("cleaned", "daily", "series", start=YEAR_START, end=YEAR_END)
 
     # Innerer Merge auf Schlüsselspalten
     keys = ["date", "country", "store", "product"]
-    merged = df_aligned_2020.merge(
-        df_cleaned_2020,
+    merged = df_aligned.merge(
+        df_cleaned,
         on=keys,
         suffixes=("_aligned", "_cleaned"),
         how="inner",
@@ -33,42 +48,37 @@ def main() -> None:
     if merged.empty:
         raise RuntimeError("Keine gemeinsamen Datenpunkte für 2020 gefunden.")
 
-    # Differenz berechnen
     merged["diff"] = merged["num_sold_cleaned"] - merged["num_sold_aligned"]
+    return merged
 
-    # Gruppe mit größter absoluter Änderung finden
-    grp_cols = ["country", "store", "product"]
-    grp_stats = (
-        merged.groupby(grp_cols)["diff"]
-        .apply(lambda s: s.abs().sum())
-        .reset_index(name="abs_change")
-    )
-    top = grp_stats.sort_values("abs_change", ascending=False).iloc[0]
 
-    country = top["country"]
-    store = top["store"]
-    product = top["product"]
+def plot_diff(merged: pd.DataFrame, save_path: Path | None = None) -> Path | None:
+    import matplotlib.pyplot as plt
+
+    sel = _largest_change(merged)
+    country, store, product = sel.iloc[0][["country", "store", "product"]]
 
     print(f"[data_cleaning_diff] Zeige Serie mit größter Änderung: "
           f"{country}, store={store}, product={product}")
 
-    # Nur diese Serie plotten
-    sel = merged[
-        (merged["country"] == country)
-        & (merged["store"] == store)
-        & (merged["product"] == product)
-    ].sort_values("date")
-
-    plt.figure(figsize=(18, 6))
-    sns.lineplot(x=sel["date"], y=sel["diff"])
-    plt.axhline(0, color="black", linewidth=1)
-    plt.title(
+    fig, ax = plt.subplots(figsize=(18, 6))
+    plot_lines(ax, sel, x="date", y="diff")
+    ax.axhline(0, color="black", linewidth=1)
+    ax.set_title(
         f"Differenz (cleaned - aligned) für {country}, store {store}, product {product}"
     )
-    plt.ylabel("Differenz num_sold")
-    plt.xlabel("Datum (2020)")
-    plt.tight_layout()
-    plt.show()
+    ax.set_ylabel("Differenz num_sold")
+    ax.set_xlabel("Datum (2020)")
+    return finish_figure(fig, save_path)
+
+
+def render(out_dir: Path = REPORT_DIR) -> List[Path]:
+    """Headless: Plot als PNG speichern (für report.py)."""
+    return [plot_diff(load_diff(), out_dir / "cleaning_diff_top_series.png")]
+
+
+def main() -> None:
+    plot_diff(load_diff())
 
 
 if __name__ == "__main__":
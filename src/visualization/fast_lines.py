@@ -0,0 +1,180 @@
+# src/visualization/fast_lines.py
+"""
+Schneller Linien-Renderer für lange Zeitreihen mit vielen Serien.
+
+Ersetzt `sns.lineplot` in den Diagnose-Plots:
+- Formerhaltendes Downsampling je Serie auf die Ausgabeauflösung:
+    "minmax" (Standard): je Pixel-Bucket erster, minimaler, maximaler und letzter Punkt
+                         -> optisch verlustfrei bei Linienplots
+    "lttb"             : Largest-Triangle-Three-Buckets (glatter, etwas teurer)
+- Keine Konfidenzintervalle/Bootstraps: doppelte x-Werte je Serie werden
+  deterministisch gemittelt (entspricht `errorbar=None`)
+- Alle Serien werden als EINE LineCollection gezeichnet (ein Draw-Call)
+
+Die Laufzeit hängt damit von der Bildbreite in Pixeln ab, nicht von der Zeilenzahl.
+"""
+
+from __future__ import annotations
+
+from typing import List, Literal, Tuple
+
+import numpy as np
+import pandas as pd
+
+DownsampleMethod = Literal["minmax", "lttb", "none"]
+
+
+# ------------------------- Downsampling -------------------------
+
+def minmax_indices(x: np.ndarray, y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Indizes der Punkte, die je Bucket (gleich breite x-Intervalle) erhalten bleiben:
+    erster, Minimum, Maximum, letzter. `x` muss aufsteigend sortiert sein.
+    """
+    n = len(x)
+    span = x[-1] - x[0] if n else 0.0
+    if n <= 4 * n_buckets or span <= 0:
+        return np.arange(n)
+
+    bucket = np.minimum(((x - x[0]) / span * n_buckets).astype(np.int64), n_buckets - 1)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+
+    # NaN nicht als Extremwert wählen
+    y_min = np.where(np.isnan(y), np.inf, y)
+    y_max = np.where(np.isnan(y), -np.inf, y)
+    mins = np.minimum.reduceat(y_min, starts)
+    maxs = np.maximum.reduceat(y_max, starts)
+
+    # Position des (ersten) Minimums/Maximums je Bucket
+    bucket_of = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, n]))
+    pos = np.arange(n)
+    argmin = np.full(len(starts), n, dtype=np.int64)
+    argmax = np.full(len(starts), n, dtype=np.int64)
+    np.minimum.at(argmin, bucket_of, np.where(y_min == mins[bucket_of], pos, n))
+    np.minimum.at(argmax, bucket_of, np.where(y_max == maxs[bucket_of], pos, n))
+    argmin = np.where(argmin == n, starts, argmin)
+    argmax = np.where(argmax == n, starts, argmax)
+
+    return np.unique(np.concatenate([starts, argmin, argmax, ends]))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets; erster und letzter Punkt bleiben immer erhalten."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Mittelwert des nächsten Buckets als dritter Dreieckspunkt
+        nlo, nhi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        cx, cy = x[nlo:nhi].mean(), np.nanmean(y[nlo:nhi])
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.nanargmax(area)) if np.isfinite(area).any() else lo
+        out[i + 1] = a
+    return out
+
+
+def downsample(
+    x: np.ndarray,
+    y: np.ndarray,
+    n_pixels: int,
+    method: DownsampleMethod = "minmax",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduziert eine (nach x sortierte) Serie auf ungefähr die Ausgabeauflösung."""
+    if method == "none" or len(x) < 3:
+        return x, y
+    if method == "minmax":
+        idx = minmax_indices(x, y, n_pixels)
+    elif method == "lttb":
+        idx = lttb_indices(x, y, 2 * n_pixels)
+    else:
+        raise ValueError(f"Unbekannte Downsampling-Methode: {method}")
+    return x[idx], y[idx]
+
+
+# ------------------------- Zeichnen -------------------------
+
+def _axes_width_px(ax) -> int:
+    fig = ax.figure
+    return max(50, int(ax.get_position().width * fig.get_figwidth() * fig.dpi))
+
+
+def _to_float_x(values: pd.Series) -> Tuple[np.ndarray, bool]:
+    """Datumswerte -> Matplotlib-Datumszahlen; sonst float."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        import matplotlib.dates as mdates
+
+        return mdates.date2num(values.to_numpy()), True
+    return values.to_numpy(dtype="float64"), False
+
+
+def plot_lines(
+    ax,
+    data: pd.DataFrame,
+    x: str,
+    y: str,
+    hue: str | None = None,
+    method: DownsampleMethod = "minmax",
+    palette: str | List | None = None,
+    legend: bool = True,
+    linewidth: float = 1.2,
+):
+    """
+    Zeichnet eine Linie je `hue`-Wert (oder eine einzelne Linie) als LineCollection.
+
+    Rückgabe: die LineCollection (z. B. für Farben/Legende im Aufrufer).
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+    from matplotlib.lines import Line2D
+
+    cols = [x, y] + ([hue] if hue else [])
+    df = data[cols]
+    keys = [hue, x] if hue else [x]
+    # doppelte x-Werte je Serie: Mittelwert statt Bootstrap-Konfidenzband
+    if df.duplicated(keys).any():
+        df = df.groupby(keys, as_index=False, sort=False)[y].mean()
+    df = df.sort_values(keys, kind="stable")
+
+    if hue:
+        # nach (hue, x) sortiert -> Codes sind monoton, Serien liegen zusammenhängend
+        codes, labels = pd.factorize(df[hue], sort=True)
+        bounds = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1], True])
+    else:
+        labels = [None]
+        bounds = np.array([0, len(df)])
+
+    xs, is_date = _to_float_x(df[x])
+    ys = df[y].to_numpy(dtype="float64")
+    n_px = _axes_width_px(ax)
+
+    colors = (
+        plt.get_cmap(palette).colors if isinstance(palette, str)
+        else (palette or plt.rcParams["axes.prop_cycle"].by_key()["color"])
+    )
+
+    segments, seg_colors = [], []
+    for i, label in enumerate(labels):
+        lo, hi = bounds[i], bounds[i + 1]
+        sx, sy = downsample(xs[lo:hi], ys[lo:hi], n_px, method)
+        segments.append(np.column_stack([sx, sy]))
+        seg_colors.append(colors[i % len(colors)])
+
+    lc = LineCollection(segments, colors=seg_colors, linewidths=linewidth)
+    ax.add_collection(lc)
+    ax.autoscale_view()
+    if is_date:
+        ax.xaxis_date()
+
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+    if hue and legend:
+        handles = [Line2D([0], [0], color=c, lw=linewidth) for c in seg_colors]
+        ax.legend(handles, [str(lbl) for lbl in labels], title=hue)
+    return lc
@@ -0,0 +1,39 @@
+# src/visualization/plot_io.py
+# Gemeinsames Ausgeben von Figuren: interaktiv anzeigen oder headless als Datei speichern.
+
+from __future__ import annotations
+
+from pathlib import Path
+
+# Zielordner des Diagnoseberichts (report.py)
+REPORT_DIR = Path("results") / "plots" / "diagnostics"
+
+
+def apply_style() -> None:
+    """
+    Entspricht optisch `sns.set(style="whitegrid")` (Raster + "deep"-Palette),
+    nutzt aber die in Matplotlib mitgelieferten Styles – seaborn/scipy müssen
+    dafür nicht importiert werden (spart mehrere Sekunden je Prozess).
+    """
+    import matplotlib.pyplot as plt
+
+    plt.style.use(["seaborn-v0_8-whitegrid", "seaborn-v0_8-deep", "seaborn-v0_8-notebook"])
+
+
+def finish_figure(fig, save_path: Path | None = None, dpi: int = 150) -> Path | None:
+    """
+    save_path=None -> plt.show() (bisheriges Verhalten der Skripte)
+    sonst          -> Figur speichern und schließen (kein GUI-Backend nötig)
+    """
+    import matplotlib.pyplot as plt
+
+    fig.tight_layout()
+    if save_path is None:
+        plt.show()
+        return None
+
+    save_path = Path(save_path)
+    save_path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(save_path, dpi=dpi, bbox_inches="tight")
+    plt.close(fig)
+    return save_path
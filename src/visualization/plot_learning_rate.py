@@ -6,10 +6,10 @@ und zeigt die Learning Rate auf separater Achse.
 
 from pathlib import Path
 import argparse
-import pandas as pd
-import matplotlib.pyplot as plt
 import yaml
 
+from src.utils.metrics_reader import read_epoch_metrics
+
 
 def load_cfg() -> dict:
     """Lädt die Basiskonfiguration aus configs/trainer_tft_baseline.yaml (falls vorhanden)."""
@@ -22,6 +22,8 @@ def load_cfg() -> dict:
 
 
 def main():
+    import matplotlib.pyplot as plt
+
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "--run",
@@ -31,18 +33,8 @@ def main():
     )
     args = parser.parse_args()
 
-    csv_path = Path(args.run) / "metrics.csv"
-    if not csv_path.exists():
-        raise FileNotFoundError(f"metrics.csv nicht gefunden: {csv_path}")
-
-    # CSV laden
-    df = pd.read_csv(csv_path)
-    df = df.dropna(how="all", axis=0).reset_index(drop=True)
-    if "epoch" not in df.columns:
-        df["epoch"] = range(len(df))
-
-    # pro Epoche letzten Wert
-    df_epoch = df.groupby("epoch").last().reset_index()
+    # pro Epoche letzten Wert (gestreamt, Parquet-Sidecar wird wiederverwendet)
+    df_epoch = read_epoch_metrics(Path(args.run))
 
     # Plot vorbereiten
     fig, ax = plt.subplots(figsize=(9, 5))
@@ -0,0 +1,81 @@
+# src/visualization/report.py
+"""
+Headless-Diagnosebericht: rendert alle Daten-Plots parallel als PNG.
+
+- Kein `plt.show()`, Backend "Agg" (läuft auf Servern/Schedulern ohne Display)
+- Jeder Plot liest nur die kleinen Rollup-Tabellen (src/data/rollups.py)
+- Ein Prozess je Plot-Modul (ProcessPoolExecutor)
+
+Aufruf:
+    python -m src.visualization.report
+    python -m src plot-report --out results/plots/diagnostics --jobs 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List
+
+from src.visualization.plot_io import REPORT_DIR
+
+# Plot-Module mit render(out_dir) -> List[Path]
+REPORT_MODULES = (
+    "src.visualization.view_data_plot",
+    "src.visualization.data_alignment_plot",
+    "src.visualization.data_cleaning_plot_compare",
+    "src.visualization.data_cleaning_plot_overview",
+    "src.visualization.data_cleaning_plot_diff",
+)
+
+
+def _init_worker() -> None:
+    # Backend festlegen, bevor pyplot in den Plot-Funktionen importiert wird
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _render_module(module_name: str, out_dir: Path) -> List[Path]:
+    return importlib.import_module(module_name).render(out_dir)
+
+
+def render_report(out_dir: Path = REPORT_DIR, jobs: int | None = None) -> List[Path]:
+    """Rendert alle Plots aus REPORT_MODULES nach out_dir; liefert die geschriebenen Dateien."""
+    jobs = jobs or min(len(REPORT_MODULES), os.cpu_count() or 1)
+    written: List[Path] = []
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+        futures = {pool.submit(_render_module, m, out_dir): m for m in REPORT_MODULES}
+        for fut in as_completed(futures):
+            module_name = futures[fut]
+            try:
+                paths = fut.result()
+            except FileNotFoundError as e:
+                # fehlende Variante (z. B. Cleaning noch nicht gelaufen) -> übrige Plots trotzdem rendern
+                print(f"[report] Übersprungen: {module_name}\n  {e}")
+                continue
+            written.extend(paths)
+            for p in paths:
+                print(f"[report] {p}")
+
+    return written
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Diagnose-Plots headless und parallel rendern.")
+    ap.add_argument("--out", type=str, default=str(REPORT_DIR), help="Zielordner der PNGs")
+    ap.add_argument("--jobs", type=int, default=None, help="Anzahl Prozesse (Default: je Plot-Modul einer)")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    written = render_report(Path(args.out), args.jobs)
+    print(f"[report] {len(written)} Plots in {time.perf_counter() - t0:.1f}s geschrieben: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,45 @@
 # src/data/view_data_plot.py
 """
 Visualisiert tägliche Verkaufszahlen pro Buchprodukt (Book Sales Dataset).
+Quelle: data/interim/rollups/raw.parquet (siehe src/data/rollups.py).
 """
 from pathlib import Path
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# Datenpfad wie bisher (Jan-2022 Dataset!)
-DATA_DIR = Path(__file__).resolve().parents[2] / "data" / "raw" / "tabular-playground-series-sep-2022"
-
-train_df = pd.read_csv(DATA_DIR / "train.csv")
-train_df["date"] = pd.to_datetime(train_df["date"])
-
-# Gruppieren
-daily_sales_product = train_df.groupby(["date", "product"], as_index=False)["num_sold"].sum()
-daily_sales_store = train_df.groupby(["date", "store"], as_index=False)["num_sold"].sum()
-daily_sales_country = train_df.groupby(["date", "country"], as_index=False)["num_sold"].sum()
-
-# --- Product ---
-fig, ax = plt.subplots(figsize=(18, 6))
-sns.lineplot(x="date", y="num_sold", hue="product", data=daily_sales_product, ax=ax)
-ax.set_title("Daily total sales per product")
-plt.tight_layout()
-plt.show()
-
-# --- Store ---
-fig, ax = plt.subplots(figsize=(18, 6))
-sns.lineplot(x="date", y="num_sold", hue="store", data=daily_sales_store, ax=ax)
-ax.set_title("Daily total sales per store")
-plt.tight_layout()
-plt.show()
-
-# --- Country ---
-fig, ax = plt.subplots(figsize=(18, 6))
-sns.lineplot(x="date", y="num_sold", hue="country", data=daily_sales_country, ax=ax)
-ax.set_title("Daily total sales per country")
-plt.tight_layout()
-plt.show()
+from typing import List
+
+from src.data.rollups import load_rollup
+from src.visualization.fast_lines import plot_lines
+from src.visualization.plot_io import REPORT_DIR, finish_figure
+
+# Ebene -> Titel (je Ebene eine Figur)
+LEVEL_TITLES = {
+    "product": "Daily total sales per product",
+    "store": "Daily total sales per store",
+    "country": "Daily total sales per country",
+}
+
+
+def plot_daily_sales(level: str, save_path: Path | None = None) -> Path | None:
+    import matplotlib.pyplot as plt
+
+    daily = load_rollup("raw", "daily", level)
+
+    fig, ax = plt.subplots(figsize=(18, 6))
+    plot_lines(ax, daily, x="date", y="num_sold", hue=level)
+    ax.set_title(LEVEL_TITLES[level])
+    return finish_figure(fig, save_path)
+
+
+def render(out_dir: Path = REPORT_DIR) -> List[Path]:
+    """Headless: alle Figuren als PNG speichern (für report.py)."""
+    return [plot_daily_sales(level, out_dir / f"raw_{level}.png") for level in LEVEL_TITLES]
+
+
+def main() -> None:
+    for level in LEVEL_TITLES:
+        plot_daily_sales(level)
+
+
+if __name__ == "__main__":
+    main()
+
+# python -m src.visualization.view_data_plot